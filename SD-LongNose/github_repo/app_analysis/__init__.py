@@ -16,6 +16,8 @@ from app_analysis.webui_detector import WebUIDetector, WebUIType, WebUIInfo
 from app_analysis.dependency_analyzer import DependencyAnalyzer, DependencyType, DependencyInfo
 from app_analysis.tunnel_requirements import TunnelRequirements, TunnelType, TunnelInfo
 from app_analysis.app_profiler import AppProfiler, AppProfile, AppCategory, AppComplexity, AppStatus
+from app_analysis.app_catalog import AppCatalog, CatalogEntry, get_app_catalog
+from app_analysis.app_tree import AppTree, FileEntry, AnalysisResultCache, SignatureMatcher, get_app_tree
 
 __version__ = "1.0.0"
 __author__ = "PinokioCloud Development Team"
@@ -51,5 +53,17 @@ __all__ = [
     "AppProfile",
     "AppCategory",
     "AppComplexity",
-    "AppStatus"
+    "AppStatus",
+    
+    # App catalog
+    "AppCatalog",
+    "CatalogEntry",
+    "get_app_catalog",
+    
+    # Shared app tree index
+    "AppTree",
+    "FileEntry",
+    "AnalysisResultCache",
+    "SignatureMatcher",
+    "get_app_tree"
 ]
\ No newline at end of file
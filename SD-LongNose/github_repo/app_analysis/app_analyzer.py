@@ -15,6 +15,7 @@ import sys
 import json
 import time
 import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
@@ -26,6 +27,8 @@ from .webui_detector import WebUIDetector, WebUIType, WebUIInfo
 from .dependency_analyzer import DependencyAnalyzer, DependencyType, DependencyInfo
 from .tunnel_requirements import TunnelRequirements, TunnelType, TunnelInfo
 from .app_profiler import AppProfiler, AppProfile
+from .app_catalog import AppCatalog, get_app_catalog
+from .app_tree import AppTree, AnalysisResultCache
 
 
 class AnalysisStatus(Enum):
@@ -78,6 +81,9 @@ class AppAnalyzer:
         self.analysis_results = {}
         self.progress_callback = None
         
+        # Persistent results keyed by (repo commit, file index fingerprint)
+        self.result_cache = AnalysisResultCache(os.path.join(base_path, "analysis_cache"))
+        
         # Initialize analysis modules
         self.installer_detector = InstallerDetector(base_path)
         self.webui_detector = WebUIDetector(base_path)
@@ -85,7 +91,8 @@ class AppAnalyzer:
         self.tunnel_requirements = TunnelRequirements(base_path)
         self.app_profiler = AppProfiler(base_path)
         
-        # Load apps database
+        # Load apps database (shared, indexed catalog)
+        self.app_catalog = get_app_catalog(self.apps_database_path) if os.path.exists(self.apps_database_path) else None
         self.apps_database = self._load_apps_database()
     
     def set_progress_callback(self, callback):
@@ -126,19 +133,30 @@ class AppAnalyzer:
             
             self._update_progress(f"Found app at: {app_path}")
             
+            # Index the app tree once; every detector reads from this index
+            app_tree = AppTree(app_path)
+            cache_key = app_tree.cache_key
+            
+            cached_result = self.result_cache.get(app_name, cache_key)
+            if cached_result is not None:
+                self.analysis_cache[app_name] = cached_result
+                self.analysis_results[app_name] = cached_result
+                self._update_progress(f"Using cached analysis for {app_name} (unchanged since last run)")
+                return cached_result
+            
             # Step 2: Analyze installer method
             self._update_progress("Analyzing installer method...")
-            installer_info = self.installer_detector.detect_installer(app_path)
+            installer_info = self.installer_detector.detect_installer(app_path, app_tree)
             result.installer_info = installer_info
             
             # Step 3: Analyze web UI type
             self._update_progress("Analyzing web UI type...")
-            webui_info = self.webui_detector.detect_webui(app_path)
+            webui_info = self.webui_detector.detect_webui(app_path, app_tree)
             result.webui_info = webui_info
             
             # Step 4: Analyze dependency system
             self._update_progress("Analyzing dependency system...")
-            dependency_info = self.dependency_analyzer.analyze_dependencies(app_path)
+            dependency_info = self.dependency_analyzer.analyze_dependencies(app_path, app_tree)
             result.dependency_info = dependency_info
             
             # Step 5: Determine tunnel requirements
@@ -152,7 +170,7 @@ class AppAnalyzer:
             self._update_progress("Creating app profile...")
             app_profile = self.app_profiler.create_profile(
                 app_name, app_path, installer_info, webui_info, 
-                dependency_info, tunnel_info
+                dependency_info, tunnel_info, app_tree
             )
             result.app_profile = app_profile
             
@@ -163,6 +181,13 @@ class AppAnalyzer:
             # Complete analysis
             result.status = AnalysisStatus.COMPLETED
             result.analysis_time = time.time() - start_time
+            result.metadata.update({
+                "cache_key": cache_key,
+                "files_indexed": app_tree.file_count,
+                "file_reads": app_tree.cache_misses,
+                "file_cache_hits": app_tree.cache_hits
+            })
+            self.result_cache.put(app_name, cache_key, result)
             
             self._update_progress(f"Analysis complete for {app_name} in {result.analysis_time:.2f}s")
             
@@ -175,30 +200,89 @@ class AppAnalyzer:
             self._update_progress(f"Analysis failed for {app_name}: {str(e)}")
             return result
     
-    def analyze_apps_batch(self, app_names: List[str]) -> Dict[str, AppAnalysisResult]:
+    def analyze_apps_batch(self, app_names: List[str], max_workers: Optional[int] = None) -> Dict[str, AppAnalysisResult]:
         """
         Analyze multiple applications in batch.
         
+        Apps found on disk are analyzed in parallel in a process pool; apps
+        already analyzed (in memory or unchanged on disk) are returned from cache.
+        
         Args:
             app_names: List of application names to analyze
+            max_workers: Maximum worker processes (defaults to the CPU count, 1 disables the pool)
             
         Returns:
             Dict mapping app names to analysis results
         """
         results = {}
         total_apps = len(app_names)
+        pending = {}
         
-        for i, app_name in enumerate(app_names):
-            self._update_progress(f"Analyzing {app_name} ({i+1}/{total_apps})")
-            
+        for app_name in app_names:
             # Check cache first
             if app_name in self.analysis_cache:
                 results[app_name] = self.analysis_cache[app_name]
                 continue
             
-            # Analyze app
-            result = self.analyze_app(app_name)
-            results[app_name] = result
+            app_path = self._find_app_path(app_name)
+            if app_path:
+                pending[app_name] = app_path
+            else:
+                results[app_name] = self.analyze_app(app_name)
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(pending))
+        if workers > 1:
+            results.update(self._analyze_in_process_pool(pending, workers, len(results), total_apps))
+        
+        for app_name, app_path in pending.items():
+            if app_name not in results:
+                self._update_progress(f"Analyzing {app_name} ({len(results) + 1}/{total_apps})")
+                results[app_name] = self.analyze_app(app_name, app_path)
+        
+        return {app_name: results[app_name] for app_name in app_names}
+    
+    def _analyze_in_process_pool(self, app_paths: Dict[str, str], workers: int,
+                                 completed: int, total_apps: int) -> Dict[str, AppAnalysisResult]:
+        """
+        Analyze apps in parallel worker processes.
+        
+        Args:
+            app_paths: Mapping of app names to app directories
+            workers: Number of worker processes
+            completed: Number of apps already completed in this batch
+            total_apps: Total number of apps in this batch
+            
+        Returns:
+            Dict mapping app names to results for every app the pool finished
+        """
+        results = {}
+        
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_analysis_worker,
+                                     initargs=(self.base_path,)) as executor:
+                futures = {
+                    executor.submit(_analyze_app_in_worker, app_name, app_path): app_name
+                    for app_name, app_path in app_paths.items()
+                }
+                
+                for future in as_completed(futures):
+                    app_name = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception:
+                        # Left for the serial fallback in analyze_apps_batch
+                        continue
+                    
+                    results[app_name] = result
+                    if result.status == AnalysisStatus.COMPLETED:
+                        self.analysis_cache[app_name] = result
+                        self.analysis_results[app_name] = result
+                    
+                    completed += 1
+                    self._update_progress(f"Analyzed {app_name} ({completed}/{total_apps})")
+        
+        except Exception as e:
+            self._update_progress(f"Parallel analysis unavailable, continuing serially: {str(e)}")
         
         return results
     
@@ -214,9 +298,10 @@ class AppAnalyzer:
         """
         # Get apps in category from database
         category_apps = []
-        for app in self.apps_database:
-            if app.get("category", "").upper() == category.upper():
-                category_apps.append(app["name"])
+        if self.app_catalog:
+            matching = [name for name in self.app_catalog.categories if name.upper() == category.upper()]
+            for app_id in self.app_catalog.filter(categories=matching):
+                category_apps.append(self.app_catalog.get_entry(app_id).name)
         
         self._update_progress(f"Found {len(category_apps)} apps in category {category}")
         
@@ -354,13 +439,9 @@ class AppAnalyzer:
     
     def _load_apps_database(self) -> List[Dict[str, Any]]:
         """Load the Pinokio apps database."""
-        try:
-            if os.path.exists(self.apps_database_path):
-                with open(self.apps_database_path, 'r') as f:
-                    return json.load(f)
-            return []
-        except Exception as e:
+        if self.app_catalog is None:
             return []
+        return [entry.data for entry in self.app_catalog.entries]
     
     def _find_app_path(self, app_name: str) -> Optional[str]:
         """
@@ -373,20 +454,19 @@ class AppAnalyzer:
             Path to app directory or None if not found
         """
         # Search in apps database first
-        for app in self.apps_database:
-            if app.get("name") == app_name:
-                # Try to find the app in common locations
-                possible_paths = [
-                    os.path.join(self.base_path, "apps", app_name),
-                    os.path.join(self.base_path, "applications", app_name),
-                    os.path.join(self.base_path, app_name),
-                    os.path.join("/tmp", app_name),
-                    os.path.join("/workspace", app_name)
-                ]
-                
-                for path in possible_paths:
-                    if os.path.exists(path) and os.path.isdir(path):
-                        return path
+        if self.app_catalog and self.app_catalog.find_by_name(app_name):
+            # Try to find the app in common locations
+            possible_paths = [
+                os.path.join(self.base_path, "apps", app_name),
+                os.path.join(self.base_path, "applications", app_name),
+                os.path.join(self.base_path, app_name),
+                os.path.join("/tmp", app_name),
+                os.path.join("/workspace", app_name)
+            ]
+            
+            for path in possible_paths:
+                if os.path.exists(path) and os.path.isdir(path):
+                    return path
         
         return None
     
@@ -399,6 +479,21 @@ class AppAnalyzer:
                 pass
 
 
+# Per-process analyzer used by analyze_apps_batch worker processes
+_worker_analyzer: Optional[AppAnalyzer] = None
+
+
+def _init_analysis_worker(base_path: str):
+    """Create the analyzer for a batch worker process."""
+    global _worker_analyzer
+    _worker_analyzer = AppAnalyzer(base_path)
+
+
+def _analyze_app_in_worker(app_name: str, app_path: str) -> AppAnalysisResult:
+    """Analyze one app inside a batch worker process."""
+    return _worker_analyzer.analyze_app(app_name, app_path)
+
+
 def main():
     """Main function for testing app analyzer."""
     print("🧪 Testing App Analyzer")
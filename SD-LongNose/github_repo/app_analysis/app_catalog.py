@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+PinokioCloud App Catalog
+
+This module provides a shared, indexed, in-memory query layer over the Pinokio
+apps database (cleaned_pinokio_apps.json). The JSON is loaded once per file
+version and normalized search fields, an inverted token index, facet counts
+and sorted views are precomputed so that UI filtering and analyzer lookups do
+not rescan the catalog.
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import os
+import re
+import json
+import bisect
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple, Iterable
+from dataclasses import dataclass, field
+
+
+DEFAULT_DATABASE_PATHS = [
+    "cleaned_pinokio_apps.json",
+    "../cleaned_pinokio_apps.json",
+    "../../cleaned_pinokio_apps.json",
+    "/content/pinokio-cloud/cleaned_pinokio_apps.json",
+    "/workspace/pinokio-cloud/cleaned_pinokio_apps.json",
+    "/workspace/SD-LongNose/cleaned_pinokio_apps.json"
+]
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Relative weight of a token match by the field it came from
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "tags": 2.0,
+    "author": 1.5,
+    "category": 1.5,
+    "description": 1.0
+}
+
+# Relative weight of a token match by how it matched
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.8
+FUZZY_MATCH = 0.5
+
+MIN_FUZZY_TOKEN_LENGTH = 4
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens."""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def _single_deletes(token: str) -> List[str]:
+    """Get all variants of a token with one character removed."""
+    return [token[:i] + token[i + 1:] for i in range(len(token))]
+
+
+@dataclass
+class CatalogEntry:
+    """Normalized catalog entry for one application."""
+    app_id: str
+    name: str
+    description: str
+    category: str
+    author: str
+    tags: List[str]
+    stars: int
+    installer_type: str
+    popularity_score: float
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+class AppCatalog:
+    """
+    Indexed in-memory view of the apps database.
+
+    Provides:
+    - Ranked token search with prefix and single-edit fuzzy matching
+    - Category / installer type / status filtering and facet counts
+    - Precomputed views sorted by stars, popularity and name
+    - O(1) lookup by app id or app name
+    """
+
+    def __init__(self, apps_data: Any, source_path: Optional[str] = None,
+                 query_cache_size: int = 256):
+        """
+        Initialize the catalog and build its indexes.
+
+        Args:
+            apps_data: Apps database as {app_id: app_data} or a list of app dicts
+            source_path: Path the data was loaded from, if any
+            query_cache_size: Number of recent search results to keep
+        """
+        self.source_path = source_path
+        self.query_cache_size = query_cache_size
+        self.query_cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+
+        self.entries: List[CatalogEntry] = []
+        self.id_to_index: Dict[str, int] = {}
+        self.name_to_index: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.vocabulary: List[str] = []
+        self.deletes_index: Dict[str, set] = {}
+        self.sorted_views: Dict[str, List[str]] = {}
+        self.view_positions: Dict[str, Dict[str, int]] = {}
+        self.tiebreak: List[float] = []
+        self.static_facets: Dict[str, Dict[str, int]] = {}
+
+        self._build(apps_data)
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "AppCatalog":
+        """
+        Load a catalog from a JSON database file.
+
+        Args:
+            file_path: Path to the apps database
+
+        Returns:
+            AppCatalog instance
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            apps_data = json.load(f)
+        return cls(apps_data, source_path=file_path)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, app_id: str) -> bool:
+        return app_id in self.id_to_index
+
+    @property
+    def app_ids(self) -> List[str]:
+        """App ids in database order."""
+        return [entry.app_id for entry in self.entries]
+
+    @property
+    def categories(self) -> List[str]:
+        """Sorted list of distinct categories."""
+        return sorted(self.static_facets.get("category", {}).keys())
+
+    def get(self, app_id: str) -> Optional[Dict[str, Any]]:
+        """Get the raw app data for an app id."""
+        index = self.id_to_index.get(app_id)
+        return self.entries[index].data if index is not None else None
+
+    def get_entry(self, app_id: str) -> Optional[CatalogEntry]:
+        """Get the normalized entry for an app id."""
+        index = self.id_to_index.get(app_id)
+        return self.entries[index] if index is not None else None
+
+    def find_by_name(self, name: str) -> Optional[str]:
+        """
+        Find an app id by app id or display name (case-insensitive).
+
+        Args:
+            name: App id or name
+
+        Returns:
+            App id or None if not found
+        """
+        if name in self.id_to_index:
+            return name
+        index = self.name_to_index.get(name.strip().lower())
+        return self.entries[index].app_id if index is not None else None
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Search the catalog.
+
+        Every query token must match (exactly, as a prefix, or within one edit)
+        in some field of an app. Results are ranked by match quality, then stars.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results
+
+        Returns:
+            List of matching app ids, best first
+        """
+        query_tokens = tuple(tokenize(query))
+        if not query_tokens:
+            ids = self.sorted_views["default"]
+            return ids[:limit] if limit else list(ids)
+
+        with self.cache_lock:
+            cached = self.query_cache.get(query_tokens)
+            if cached is not None:
+                self.query_cache.move_to_end(query_tokens)
+
+        if cached is None:
+            cached = self._rank(query_tokens)
+            with self.cache_lock:
+                self.query_cache[query_tokens] = cached
+                while len(self.query_cache) > self.query_cache_size:
+                    self.query_cache.popitem(last=False)
+
+        return cached[:limit] if limit else list(cached)
+
+    def filter(self, query: str = "", categories: Optional[Iterable[str]] = None,
+               installer_types: Optional[Iterable[str]] = None, min_stars: int = 0,
+               statuses: Optional[Iterable[str]] = None,
+               status_lookup: Optional[Dict[str, str]] = None,
+               sort_by: Optional[str] = None) -> List[str]:
+        """
+        Filter the catalog by query and facets.
+
+        Args:
+            query: Free-text query (ranked order is kept unless sort_by is given)
+            categories: Allowed categories
+            installer_types: Allowed installer types
+            min_stars: Minimum star count
+            statuses: Allowed statuses, resolved through status_lookup
+            status_lookup: Mapping of app id to status (defaults to "not_installed")
+            sort_by: Optional sorted view ("stars", "popularity", "name")
+
+        Returns:
+            List of matching app ids
+        """
+        if query and query.strip():
+            ids = self.search(query)
+            if sort_by:
+                order = self._view_positions(sort_by)
+                ids.sort(key=order.__getitem__)
+        else:
+            ids = self.sorted_views.get(sort_by or "default", self.sorted_views["default"])
+
+        category_set = set(categories) if categories else None
+        installer_set = {value.lower() for value in installer_types} if installer_types else None
+        status_set = set(statuses) if statuses else None
+        status_lookup = status_lookup or {}
+
+        if not (category_set or installer_set or status_set or min_stars > 0):
+            return list(ids)
+
+        results = []
+        for app_id in ids:
+            entry = self.entries[self.id_to_index[app_id]]
+            if category_set and entry.category not in category_set:
+                continue
+            if installer_set and entry.installer_type.lower() not in installer_set:
+                continue
+            if min_stars > 0 and entry.stars < min_stars:
+                continue
+            if status_set and status_lookup.get(app_id, "not_installed") not in status_set:
+                continue
+            results.append(app_id)
+
+        return results
+
+    def sorted_ids(self, sort_by: str = "stars") -> List[str]:
+        """
+        Get all app ids in a precomputed order.
+
+        Args:
+            sort_by: "stars", "popularity", "name" or "default" (database order)
+
+        Returns:
+            List of app ids
+        """
+        return list(self.sorted_views.get(sort_by, self.sorted_views["default"]))
+
+    def facet_counts(self, app_ids: Optional[Iterable[str]] = None,
+                     status_lookup: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Count apps by category, installer type and status.
+
+        Args:
+            app_ids: Subset of apps to count (defaults to the whole catalog)
+            status_lookup: Mapping of app id to status (defaults to "not_installed")
+
+        Returns:
+            Dict of facet name to {value: count}
+        """
+        status_lookup = status_lookup or {}
+
+        if app_ids is None:
+            facets = {name: dict(counts) for name, counts in self.static_facets.items()}
+            app_ids = self.sorted_views["default"]
+        else:
+            app_ids = list(app_ids)
+            facets = {"category": {}, "installer_type": {}}
+            for app_id in app_ids:
+                entry = self.entries[self.id_to_index[app_id]]
+                facets["category"][entry.category] = facets["category"].get(entry.category, 0) + 1
+                facets["installer_type"][entry.installer_type] = facets["installer_type"].get(entry.installer_type, 0) + 1
+
+        status_counts: Dict[str, int] = {}
+        if status_lookup:
+            for app_id in app_ids:
+                status = status_lookup.get(app_id, "not_installed")
+                status_counts[status] = status_counts.get(status, 0) + 1
+        else:
+            status_counts["not_installed"] = len(app_ids)
+        facets["status"] = status_counts
+
+        return facets
+
+    def _build(self, apps_data: Any):
+        """Normalize entries and build all indexes."""
+        if isinstance(apps_data, dict):
+            items = apps_data.items()
+        elif isinstance(apps_data, list):
+            items = ((app.get("id") or app.get("name", str(i)), app)
+                     for i, app in enumerate(apps_data) if isinstance(app, dict))
+        else:
+            items = []
+
+        category_counts: Dict[str, int] = {}
+        installer_counts: Dict[str, int] = {}
+
+        for app_id, app_data in items:
+            if not isinstance(app_data, dict):
+                continue
+
+            tags = [str(tag) for tag in app_data.get("tags", []) or []]
+            stars = app_data.get("stars", 0) or 0
+            entry = CatalogEntry(
+                app_id=app_id,
+                name=app_data.get("name", app_id) or app_id,
+                description=app_data.get("description", "") or "",
+                category=app_data.get("category", "UNKNOWN") or "UNKNOWN",
+                author=app_data.get("author", "Unknown") or "Unknown",
+                tags=tags,
+                stars=stars,
+                installer_type=app_data.get("installer_type", app_data.get("install_type", "unknown")) or "unknown",
+                popularity_score=stars * 0.7 + len(tags) * 0.3,
+                data=app_data
+            )
+
+            index = len(self.entries)
+            self.entries.append(entry)
+            self.id_to_index[app_id] = index
+            self.name_to_index.setdefault(entry.name.lower(), index)
+            self.name_to_index.setdefault(app_id.lower(), index)
+
+            category_counts[entry.category] = category_counts.get(entry.category, 0) + 1
+            installer_counts[entry.installer_type] = installer_counts.get(entry.installer_type, 0) + 1
+
+            self._index_field(index, f"{entry.name} {app_id}", FIELD_WEIGHTS["name"])
+            self._index_field(index, " ".join(tags), FIELD_WEIGHTS["tags"])
+            self._index_field(index, entry.author, FIELD_WEIGHTS["author"])
+            self._index_field(index, entry.category, FIELD_WEIGHTS["category"])
+            self._index_field(index, entry.description, FIELD_WEIGHTS["description"])
+
+        self.vocabulary = sorted(self.postings)
+        for token in self.vocabulary:
+            if len(token) >= MIN_FUZZY_TOKEN_LENGTH:
+                for variant in _single_deletes(token):
+                    self.deletes_index.setdefault(variant, set()).add(token)
+
+        self.static_facets = {"category": category_counts, "installer_type": installer_counts}
+
+        default_order = [entry.app_id for entry in self.entries]
+        self.sorted_views = {
+            "default": default_order,
+            "stars": [entry.app_id for entry in sorted(self.entries, key=lambda e: (-e.stars, e.name.lower()))],
+            "popularity": [entry.app_id for entry in sorted(self.entries, key=lambda e: (-e.popularity_score, e.name.lower()))],
+            "name": [entry.app_id for entry in sorted(self.entries, key=lambda e: e.name.lower())]
+        }
+
+        # Tiny per-entry bonus (< any score difference) that orders equal scores by stars
+        star_positions = self._view_positions("stars")
+        total = len(self.entries) + 1
+        self.tiebreak = [(1.0 - star_positions[entry.app_id] / total) * 1e-3 for entry in self.entries]
+
+    def _index_field(self, index: int, text: str, weight: float):
+        """Add the tokens of one field to the inverted index."""
+        for token in tokenize(text):
+            posting = self.postings.setdefault(token, {})
+            if posting.get(index, 0.0) < weight:
+                posting[index] = weight
+
+    def _view_positions(self, sort_by: str) -> Dict[str, int]:
+        """Get app id -> position in a sorted view."""
+        positions = self.view_positions.get(sort_by)
+        if positions is None:
+            view = self.sorted_views.get(sort_by, self.sorted_views["default"])
+            positions = {app_id: i for i, app_id in enumerate(view)}
+            self.view_positions[sort_by] = positions
+        return positions
+
+    def _match_token(self, query_token: str) -> Dict[int, float]:
+        """Score every entry matching one query token."""
+        scores: Dict[int, float] = {}
+
+        # Exact and prefix matches share one sorted-vocabulary range scan
+        start = bisect.bisect_left(self.vocabulary, query_token)
+        for position in range(start, len(self.vocabulary)):
+            token = self.vocabulary[position]
+            if not token.startswith(query_token):
+                break
+            factor = EXACT_MATCH if token == query_token else PREFIX_MATCH
+            for index, weight in self.postings[token].items():
+                score = weight * factor
+                if scores.get(index, 0.0) < score:
+                    scores[index] = score
+
+        if scores or len(query_token) < MIN_FUZZY_TOKEN_LENGTH:
+            return scores
+
+        # Fuzzy fallback: tokens within one insertion, deletion or substitution
+        candidates = set(self.deletes_index.get(query_token, ()))
+        if query_token in self.postings:
+            candidates.add(query_token)
+        for variant in _single_deletes(query_token):
+            if variant in self.postings:
+                candidates.add(variant)
+            candidates.update(self.deletes_index.get(variant, ()))
+
+        for token in candidates:
+            for index, weight in self.postings[token].items():
+                score = weight * FUZZY_MATCH
+                if scores.get(index, 0.0) < score:
+                    scores[index] = score
+
+        return scores
+
+    def _rank(self, query_tokens: Tuple[str, ...]) -> List[str]:
+        """Intersect per-token matches and rank the result."""
+        combined: Optional[Dict[int, float]] = None
+
+        # Most selective tokens first keeps the intersection small
+        for scores in sorted((self._match_token(token) for token in query_tokens), key=len):
+            if combined is None:
+                combined = dict(scores)
+            else:
+                combined = {index: combined[index] + score
+                            for index, score in scores.items() if index in combined}
+            if not combined:
+                return []
+
+        # Fold the star ranking into the score so the sort runs on a plain float key
+        tiebreak = self.tiebreak
+        for index in combined:
+            combined[index] += tiebreak[index]
+
+        entries = self.entries
+        return [entries[index].app_id for index in sorted(combined, key=combined.__getitem__, reverse=True)]
+
+
+_catalog_cache: Dict[str, Tuple[Tuple[int, int], AppCatalog]] = {}
+_catalog_lock = threading.Lock()
+
+
+def find_apps_database(candidates: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Find the apps database in the standard locations.
+
+    Args:
+        candidates: Paths to try instead of the defaults
+
+    Returns:
+        Path to the database or None if not found
+    """
+    for path in candidates or DEFAULT_DATABASE_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def get_app_catalog(file_path: Optional[str] = None) -> Optional[AppCatalog]:
+    """
+    Get the shared catalog for an apps database file.
+
+    The parsed and indexed catalog is memoized per file and rebuilt only when
+    the file's mtime or size changes.
+
+    Args:
+        file_path: Path to the apps database (searched for if omitted)
+
+    Returns:
+        AppCatalog or None if the database could not be found or parsed
+    """
+    file_path = file_path or find_apps_database()
+    if not file_path:
+        return None
+
+    try:
+        stat_result = os.stat(file_path)
+    except OSError:
+        return None
+
+    cache_key = os.path.abspath(file_path)
+    signature = (stat_result.st_mtime_ns, stat_result.st_size)
+
+    with _catalog_lock:
+        cached = _catalog_cache.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        try:
+            catalog = AppCatalog.from_file(file_path)
+        except (OSError, ValueError):
+            return None
+
+        _catalog_cache[cache_key] = (signature, catalog)
+        return catalog
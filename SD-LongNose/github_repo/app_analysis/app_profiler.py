@@ -25,6 +25,7 @@ from .installer_detector import InstallerType, InstallerInfo
 from .webui_detector import WebUIType, WebUIInfo
 from .dependency_analyzer import DependencyType, DependencyInfo
 from .tunnel_requirements import TunnelType, TunnelInfo
+from .app_tree import AppTree
 
 
 class AppCategory(Enum):
@@ -224,7 +225,8 @@ class AppProfiler:
                       installer_info: Optional[InstallerInfo],
                       webui_info: Optional[WebUIInfo],
                       dependency_info: Optional[DependencyInfo],
-                      tunnel_info: Optional[TunnelInfo]) -> AppProfile:
+                      tunnel_info: Optional[TunnelInfo],
+                      app_tree: Optional[AppTree] = None) -> AppProfile:
         """
         Create a comprehensive app profile.
         
@@ -235,6 +237,7 @@ class AppProfiler:
             webui_info: Web UI analysis information
             dependency_info: Dependency analysis information
             tunnel_info: Tunnel requirements information
+            app_tree: Shared file index of the app (built if not provided)
             
         Returns:
             AppProfile: Complete application profile
@@ -265,7 +268,7 @@ class AppProfiler:
             profile.category = self._determine_category(profile)
             
             # Assess complexity
-            profile.complexity = self._assess_complexity(profile)
+            profile.complexity = self._assess_complexity(profile, app_tree)
             
             # Determine status
             profile.status = self._determine_status(profile)
@@ -402,7 +405,7 @@ class AppProfiler:
         except Exception as e:
             return AppCategory.UNKNOWN
     
-    def _assess_complexity(self, profile: AppProfile) -> AppComplexity:
+    def _assess_complexity(self, profile: AppProfile, app_tree: Optional[AppTree] = None) -> AppComplexity:
         """Assess app complexity."""
         try:
             # Count dependencies
@@ -414,13 +417,10 @@ class AppProfiler:
             
             # Count files (estimate)
             file_count = 0
-            if os.path.exists(profile.app_path):
-                try:
-                    for root, dirs, files in os.walk(profile.app_path):
-                        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', 'env']]
-                        file_count += len(files)
-                except:
-                    pass
+            if app_tree is None and os.path.exists(profile.app_path):
+                app_tree = AppTree(profile.app_path)
+            if app_tree is not None:
+                file_count = app_tree.file_count
             
             # Assess against complexity indicators
             for complexity, indicators in self.complexity_indicators.items():
@@ -19,6 +19,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
+from .app_tree import AppTree
+
 
 class DependencyType(Enum):
     """Enumeration of dependency types."""
@@ -129,12 +131,13 @@ class DependencyAnalyzer:
             "apt-get", "aptitude", "dpkg", "rpm", "yum", "dnf", "zypper"
         ]
     
-    def analyze_dependencies(self, app_path: str) -> DependencyInfo:
+    def analyze_dependencies(self, app_path: str, app_tree: Optional[AppTree] = None) -> DependencyInfo:
         """
         Analyze dependencies for an application.
         
         Args:
             app_path: Path to the application directory
+            app_tree: Shared file index of the app (built if not provided)
             
         Returns:
             DependencyInfo: Information about dependencies
@@ -143,22 +146,24 @@ class DependencyAnalyzer:
             if not os.path.exists(app_path) or not os.path.isdir(app_path):
                 return DependencyInfo()
             
+            app_tree = app_tree or AppTree(app_path)
+            
             # Initialize dependency info
             dep_info = DependencyInfo()
             
             # Analyze different dependency files
-            self._analyze_pip_dependencies(app_path, dep_info)
-            self._analyze_conda_dependencies(app_path, dep_info)
-            self._analyze_npm_dependencies(app_path, dep_info)
-            self._analyze_system_dependencies(app_path, dep_info)
-            self._analyze_git_dependencies(app_path, dep_info)
-            self._analyze_docker_dependencies(app_path, dep_info)
+            self._analyze_pip_dependencies(app_tree, dep_info)
+            self._analyze_conda_dependencies(app_tree, dep_info)
+            self._analyze_npm_dependencies(app_tree, dep_info)
+            self._analyze_system_dependencies(app_tree, dep_info)
+            self._analyze_git_dependencies(app_tree, dep_info)
+            self._analyze_docker_dependencies(app_tree, dep_info)
             
             # Categorize dependencies
             self._categorize_dependencies(dep_info)
             
             # Analyze version requirements
-            self._analyze_version_requirements(app_path, dep_info)
+            self._analyze_version_requirements(app_tree, dep_info)
             
             # Check for conflicts
             self._check_dependency_conflicts(dep_info)
@@ -176,7 +181,7 @@ class DependencyAnalyzer:
         except Exception as e:
             return DependencyInfo(metadata={"error": str(e)})
     
-    def _analyze_pip_dependencies(self, app_path: str, dep_info: DependencyInfo):
+    def _analyze_pip_dependencies(self, app_tree: AppTree, dep_info: DependencyInfo):
         """Analyze pip dependencies from requirements files."""
         try:
             requirements_files = [
@@ -185,11 +190,9 @@ class DependencyAnalyzer:
             ]
             
             for req_file in requirements_files:
-                req_path = os.path.join(app_path, req_file)
-                if os.path.exists(req_path):
-                    with open(req_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
+                entry = app_tree.get(req_file)
+                content = app_tree.read_text(entry.path) if entry else None
+                if content is not None:
                     # Parse requirements
                     dependencies = self._parse_requirements_txt(content)
                     dep_info.pip_dependencies.extend(dependencies)
@@ -198,12 +201,12 @@ class DependencyAnalyzer:
                         dep_info.dependency_types.append(DependencyType.PIP)
             
             # Also check for pip install commands in scripts
-            self._extract_pip_from_scripts(app_path, dep_info)
+            self._extract_pip_from_scripts(app_tree, dep_info)
         
         except Exception as e:
             pass
     
-    def _analyze_conda_dependencies(self, app_path: str, dep_info: DependencyInfo):
+    def _analyze_conda_dependencies(self, app_tree: AppTree, dep_info: DependencyInfo):
         """Analyze conda dependencies from environment files."""
         try:
             conda_files = [
@@ -211,11 +214,9 @@ class DependencyAnalyzer:
             ]
             
             for conda_file in conda_files:
-                conda_path = os.path.join(app_path, conda_file)
-                if os.path.exists(conda_path):
-                    with open(conda_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
+                entry = app_tree.get(conda_file)
+                content = app_tree.read_text(entry.path) if entry else None
+                if content is not None:
                     # Parse conda environment
                     dependencies = self._parse_conda_environment(content)
                     dep_info.conda_dependencies.extend(dependencies)
@@ -224,18 +225,18 @@ class DependencyAnalyzer:
                         dep_info.dependency_types.append(DependencyType.CONDA)
             
             # Also check for conda install commands in scripts
-            self._extract_conda_from_scripts(app_path, dep_info)
+            self._extract_conda_from_scripts(app_tree, dep_info)
         
         except Exception as e:
             pass
     
-    def _analyze_npm_dependencies(self, app_path: str, dep_info: DependencyInfo):
+    def _analyze_npm_dependencies(self, app_tree: AppTree, dep_info: DependencyInfo):
         """Analyze npm dependencies from package.json."""
         try:
-            package_json_path = os.path.join(app_path, "package.json")
-            if os.path.exists(package_json_path):
-                with open(package_json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+            entry = app_tree.get("package.json")
+            content = app_tree.read_text(entry.path) if entry else None
+            if content is not None:
+                data = json.loads(content)
                 
                 # Extract dependencies
                 dependencies = data.get("dependencies", {})
@@ -248,24 +249,23 @@ class DependencyAnalyzer:
                     dep_info.dependency_types.append(DependencyType.NPM)
             
             # Also check for npm install commands in scripts
-            self._extract_npm_from_scripts(app_path, dep_info)
+            self._extract_npm_from_scripts(app_tree, dep_info)
         
         except Exception as e:
             pass
     
-    def _analyze_system_dependencies(self, app_path: str, dep_info: DependencyInfo):
+    def _analyze_system_dependencies(self, app_tree: AppTree, dep_info: DependencyInfo):
         """Analyze system dependencies from scripts and files."""
         try:
             # Search for system package installation commands
-            for root, dirs, files in os.walk(app_path):
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', 'env']]
-                
+            for root, dirs, files in app_tree.walk():
                 for file in files:
                     if file.endswith(('.py', '.js', '.sh', '.bat', '.yml', '.yaml')):
                         file_path = os.path.join(root, file)
                         try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
+                            content = app_tree.read_text(file_path)
+                            if content is None:
+                                continue
                             
                             # Extract system package commands
                             system_deps = self._extract_system_packages(content)
@@ -283,19 +283,18 @@ class DependencyAnalyzer:
         except Exception as e:
             pass
     
-    def _analyze_git_dependencies(self, app_path: str, dep_info: DependencyInfo):
+    def _analyze_git_dependencies(self, app_tree: AppTree, dep_info: DependencyInfo):
         """Analyze git dependencies from scripts and files."""
         try:
             # Search for git clone commands
-            for root, dirs, files in os.walk(app_path):
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', 'env']]
-                
+            for root, dirs, files in app_tree.walk():
                 for file in files:
                     if file.endswith(('.py', '.js', '.sh', '.bat')):
                         file_path = os.path.join(root, file)
                         try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
+                            content = app_tree.read_text(file_path)
+                            if content is None:
+                                continue
                             
                             # Extract git clone commands
                             git_deps = self._extract_git_repositories(content)
@@ -313,17 +312,15 @@ class DependencyAnalyzer:
         except Exception as e:
             pass
     
-    def _analyze_docker_dependencies(self, app_path: str, dep_info: DependencyInfo):
+    def _analyze_docker_dependencies(self, app_tree: AppTree, dep_info: DependencyInfo):
         """Analyze docker dependencies from Dockerfile."""
         try:
             docker_files = ["Dockerfile", "dockerfile", "Dockerfile.dev", "Dockerfile.prod"]
             
             for docker_file in docker_files:
-                docker_path = os.path.join(app_path, docker_file)
-                if os.path.exists(docker_path):
-                    with open(docker_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
+                entry = app_tree.get(docker_file)
+                content = app_tree.read_text(entry.path) if entry else None
+                if content is not None:
                     # Extract docker dependencies
                     docker_deps = self._extract_docker_dependencies(content)
                     dep_info.docker_dependencies.extend(docker_deps)
@@ -376,18 +373,17 @@ class DependencyAnalyzer:
         
         return dependencies
     
-    def _extract_pip_from_scripts(self, app_path: str, dep_info: DependencyInfo):
+    def _extract_pip_from_scripts(self, app_tree: AppTree, dep_info: DependencyInfo):
         """Extract pip install commands from scripts."""
         try:
-            for root, dirs, files in os.walk(app_path):
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', 'env']]
-                
+            for root, dirs, files in app_tree.walk():
                 for file in files:
                     if file.endswith(('.py', '.js', '.sh', '.bat')):
                         file_path = os.path.join(root, file)
                         try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
+                            content = app_tree.read_text(file_path)
+                            if content is None:
+                                continue
                             
                             # Extract pip install commands
                             pip_pattern = r'pip\s+install\s+([^\s\n]+)'
@@ -404,18 +400,17 @@ class DependencyAnalyzer:
         except Exception as e:
             pass
     
-    def _extract_conda_from_scripts(self, app_path: str, dep_info: DependencyInfo):
+    def _extract_conda_from_scripts(self, app_tree: AppTree, dep_info: DependencyInfo):
         """Extract conda install commands from scripts."""
         try:
-            for root, dirs, files in os.walk(app_path):
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', 'env']]
-                
+            for root, dirs, files in app_tree.walk():
                 for file in files:
                     if file.endswith(('.py', '.js', '.sh', '.bat')):
                         file_path = os.path.join(root, file)
                         try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
+                            content = app_tree.read_text(file_path)
+                            if content is None:
+                                continue
                             
                             # Extract conda install commands
                             conda_pattern = r'conda\s+install\s+([^\s\n]+)'
@@ -431,18 +426,17 @@ class DependencyAnalyzer:
         except Exception as e:
             pass
     
-    def _extract_npm_from_scripts(self, app_path: str, dep_info: DependencyInfo):
+    def _extract_npm_from_scripts(self, app_tree: AppTree, dep_info: DependencyInfo):
         """Extract npm install commands from scripts."""
         try:
-            for root, dirs, files in os.walk(app_path):
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', 'env']]
-                
+            for root, dirs, files in app_tree.walk():
                 for file in files:
                     if file.endswith(('.py', '.js', '.sh', '.bat')):
                         file_path = os.path.join(root, file)
                         try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
+                            content = app_tree.read_text(file_path)
+                            if content is None:
+                                continue
                             
                             # Extract npm install commands
                             npm_pattern = r'npm\s+install\s+([^\s\n]+)'
@@ -547,19 +541,18 @@ class DependencyAnalyzer:
         except Exception as e:
             pass
     
-    def _analyze_version_requirements(self, app_path: str, dep_info: DependencyInfo):
+    def _analyze_version_requirements(self, app_tree: AppTree, dep_info: DependencyInfo):
         """Analyze version requirements from files."""
         try:
             # Check for Python version requirements
-            for root, dirs, files in os.walk(app_path):
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', 'env']]
-                
+            for root, dirs, files in app_tree.walk():
                 for file in files:
                     if file.endswith(('.py', '.txt', '.yml', '.yaml', '.json')):
                         file_path = os.path.join(root, file)
                         try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
+                            content = app_tree.read_text(file_path)
+                            if content is None:
+                                continue
                             
                             # Extract Python version
                             python_patterns = [
@@ -19,6 +19,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
+from .app_tree import AppTree
+
 
 class InstallerType(Enum):
     """Enumeration of installer types."""
@@ -83,12 +85,13 @@ class InstallerDetector:
             InstallerType.PYTHON_SCRIPT: ["install.py", "setup.py", "installer.py"]
         }
     
-    def detect_installer(self, app_path: str) -> InstallerInfo:
+    def detect_installer(self, app_path: str, app_tree: Optional[AppTree] = None) -> InstallerInfo:
         """
         Detect the installer method for an application.
         
         Args:
             app_path: Path to the application directory
+            app_tree: Shared file index of the app (built if not provided)
             
         Returns:
             InstallerInfo: Information about the installer
@@ -101,8 +104,10 @@ class InstallerDetector:
                     installer_content=""
                 )
             
+            app_tree = app_tree or AppTree(app_path)
+            
             # Search for installer files
-            installer_files = self._find_installer_files(app_path)
+            installer_files = self._find_installer_files(app_tree)
             
             if not installer_files:
                 return InstallerInfo(
@@ -117,7 +122,7 @@ class InstallerDetector:
             installer_path = primary_installer["path"]
             
             # Read installer content
-            installer_content = self._read_installer_content(installer_path)
+            installer_content = self._read_installer_content(app_tree, installer_path)
             
             # Analyze installer content
             dependencies = self._extract_dependencies(installer_content, installer_type)
@@ -160,12 +165,12 @@ class InstallerDetector:
                 metadata={"error": str(e)}
             )
     
-    def _find_installer_files(self, app_path: str) -> List[Dict[str, Any]]:
+    def _find_installer_files(self, app_tree: AppTree) -> List[Dict[str, Any]]:
         """
         Find all installer files in the application directory.
         
         Args:
-            app_path: Path to the application directory
+            app_tree: File index of the application directory
             
         Returns:
             List of installer file information
@@ -173,25 +178,21 @@ class InstallerDetector:
         installer_files = []
         
         try:
-            for root, dirs, files in os.walk(app_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, app_path)
-                    
-                    # Check against installer patterns
-                    for installer_type, patterns in self.installer_patterns.items():
-                        for pattern in patterns:
-                            if file.lower() == pattern.lower():
-                                installer_files.append({
-                                    "type": installer_type,
-                                    "path": file_path,
-                                    "relative_path": relative_path,
-                                    "filename": file
-                                })
-                                break
+            # Hidden and common ignore directories are already excluded from the index
+            for entry in app_tree.files:
+                file = entry.name
                 
-                # Don't search in hidden directories or common ignore directories
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', 'env']]
+                # Check against installer patterns
+                for installer_type, patterns in self.installer_patterns.items():
+                    for pattern in patterns:
+                        if file.lower() == pattern.lower():
+                            installer_files.append({
+                                "type": installer_type,
+                                "path": entry.path,
+                                "relative_path": entry.relative_path,
+                                "filename": file
+                            })
+                            break
         
         except Exception as e:
             pass
@@ -213,27 +214,18 @@ class InstallerDetector:
         
         return installer_files
     
-    def _read_installer_content(self, installer_path: str) -> str:
+    def _read_installer_content(self, app_tree: AppTree, installer_path: str) -> str:
         """
         Read the content of an installer file.
         
         Args:
+            app_tree: File index of the application directory
             installer_path: Path to the installer file
             
         Returns:
             Content of the installer file
         """
-        try:
-            with open(installer_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except UnicodeDecodeError:
-            try:
-                with open(installer_path, 'r', encoding='latin-1') as f:
-                    return f.read()
-            except:
-                return ""
-        except Exception:
-            return ""
+        return app_tree.read_text(installer_path, fallback_encoding='latin-1') or ""
     
     def _extract_dependencies(self, content: str, installer_type: InstallerType) -> List[str]:
         """
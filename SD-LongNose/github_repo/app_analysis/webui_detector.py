@@ -6,6 +6,10 @@ This module detects the web UI framework used by Pinokio applications.
 It identifies whether an app uses Gradio, Streamlit, Flask, FastAPI,
 or other web UI frameworks.
 
+Each source file is scanned once for every framework signature, and both the
+per-file signatures and the detection result are persisted, so detecting an
+unchanged app again only costs a directory walk.
+
 Author: PinokioCloud Development Team
 Version: 1.0.0
 """
@@ -19,6 +23,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
+from .app_tree import AppTree, AnalysisResultCache, SignatureMatcher, get_app_tree
+
 
 class WebUIType(Enum):
     """Enumeration of web UI types."""
@@ -54,6 +60,10 @@ class WebUIInfo:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+# Files scanned for framework signatures
+SCANNED_EXTENSIONS = ('.py', '.ipynb')
+
+
 class WebUIDetector:
     """
     Detects web UI frameworks for Pinokio applications.
@@ -79,7 +89,9 @@ class WebUIDetector:
             WebUIType.GRADIO: {
                 "imports": ["import gradio", "from gradio", "gradio.Interface"],
                 "files": ["app.py", "main.py", "gradio_app.py", "interface.py"],
-                "keywords": ["gr.Interface", "gradio.Interface", "launch(", "share="]
+                "keywords": ["gr.Interface", "gradio.Interface", "launch(", "share="],
+                # Matched for callers locating interface files; not scored
+                "interfaces": ["gr.Blocks", "gr.ChatInterface", "gradio.Blocks", ".launch(", ".queue().launch("]
             },
             WebUIType.STREAMLIT: {
                 "imports": ["import streamlit", "from streamlit"],
@@ -122,13 +134,34 @@ class WebUIDetector:
                 "keywords": ["ipywidgets", "jupyter", "notebook", "widget"]
             }
         }
+        
+        # All signatures are matched in a single pass per file
+        self.signature_matcher = SignatureMatcher(
+            signature
+            for patterns in self.webui_patterns.values()
+            for kind in ("imports", "keywords", "interfaces")
+            for signature in patterns.get(kind, [])
+        )
+        self.scored_signatures: Dict[str, List[Tuple[WebUIType, str]]] = {}
+        self.file_names: Dict[str, List[WebUIType]] = {}
+        for webui_type, patterns in self.webui_patterns.items():
+            for kind in ("imports", "keywords"):
+                for signature in patterns[kind]:
+                    self.scored_signatures.setdefault(signature, []).append((webui_type, kind))
+            for file_name in patterns["files"]:
+                self.file_names.setdefault(file_name, []).append(webui_type)
+        
+        # Per-file signatures and detection results, persisted across sessions
+        self.result_cache = AnalysisResultCache(os.path.join(base_path, "analysis_cache", "webui"))
+        self.file_signatures: Dict[str, Dict[str, Tuple[int, int, Optional[frozenset]]]] = {}
     
-    def detect_webui(self, app_path: str) -> WebUIInfo:
+    def detect_webui(self, app_path: str, app_tree: Optional[AppTree] = None) -> WebUIInfo:
         """
         Detect the web UI framework for an application.
         
         Args:
             app_path: Path to the application directory
+            app_tree: Shared file index of the app (built if not provided)
             
         Returns:
             WebUIInfo: Information about the web UI
@@ -140,53 +173,18 @@ class WebUIDetector:
                     main_file=""
                 )
             
-            # Search for web UI indicators
-            webui_detections = self._detect_webui_indicators(app_path)
-            
-            if not webui_detections:
-                return WebUIInfo(
-                    webui_type=WebUIType.NONE,
-                    main_file=""
-                )
+            app_tree = app_tree or get_app_tree(app_path)
             
-            # Get the most likely web UI type
-            webui_type = self._determine_primary_webui(webui_detections)
+            # Reuse the stored result while the app's files are unchanged
+            cache_name = f"webui:{os.path.abspath(app_path)}"
+            cache_key = f"{app_tree.cache_key}:{self.signature_matcher.key}"
+            cached_info = self.result_cache.get(cache_name, cache_key)
+            if cached_info is not None:
+                return cached_info
             
-            # Find main application file
-            main_file = self._find_main_file(app_path, webui_type)
-            
-            # Analyze the main file for configuration
-            port, host, share_enabled, auto_launch, debug_mode = self._analyze_main_file(main_file, webui_type)
-            
-            # Find static files and templates
-            static_files = self._find_static_files(app_path)
-            templates = self._find_templates(app_path)
-            routes = self._find_routes(main_file, webui_type)
-            
-            # Get dependencies
-            dependencies = self._get_webui_dependencies(webui_type)
-            
-            # Get launch arguments
-            launch_arguments = self._get_launch_arguments(main_file, webui_type)
-            
-            return WebUIInfo(
-                webui_type=webui_type,
-                main_file=main_file,
-                port=port,
-                host=host,
-                share_enabled=share_enabled,
-                auto_launch=auto_launch,
-                debug_mode=debug_mode,
-                static_files=static_files,
-                templates=templates,
-                routes=routes,
-                dependencies=dependencies,
-                launch_arguments=launch_arguments,
-                metadata={
-                    "all_detections": webui_detections,
-                    "confidence": self._calculate_confidence(webui_detections, webui_type)
-                }
-            )
+            webui_info = self._analyze_webui(app_tree)
+            self.result_cache.put(cache_name, cache_key, webui_info)
+            return webui_info
         
         except Exception as e:
             return WebUIInfo(
@@ -195,12 +193,70 @@ class WebUIDetector:
                 metadata={"error": str(e)}
             )
     
-    def _detect_webui_indicators(self, app_path: str) -> Dict[WebUIType, Dict[str, Any]]:
+    def _analyze_webui(self, app_tree: AppTree) -> WebUIInfo:
+        """
+        Analyze an application's web UI from its file index.
+        
+        Args:
+            app_tree: File index of the application directory
+            
+        Returns:
+            WebUIInfo: Information about the web UI
+        """
+        # Search for web UI indicators
+        webui_detections = self._detect_webui_indicators(app_tree)
+        
+        if not webui_detections:
+            return WebUIInfo(
+                webui_type=WebUIType.NONE,
+                main_file=""
+            )
+        
+        # Get the most likely web UI type
+        webui_type = self._determine_primary_webui(webui_detections)
+        
+        # Find main application file
+        main_file = self._find_main_file(app_tree, webui_type)
+        
+        # Analyze the main file for configuration
+        port, host, share_enabled, auto_launch, debug_mode = self._analyze_main_file(app_tree, main_file, webui_type)
+        
+        # Find static files and templates
+        static_files = self._find_static_files(app_tree)
+        templates = self._find_templates(app_tree)
+        routes = self._find_routes(app_tree, main_file, webui_type)
+        
+        # Get dependencies
+        dependencies = self._get_webui_dependencies(webui_type)
+        
+        # Get launch arguments
+        launch_arguments = self._get_launch_arguments(app_tree, main_file, webui_type)
+        
+        return WebUIInfo(
+            webui_type=webui_type,
+            main_file=main_file,
+            port=port,
+            host=host,
+            share_enabled=share_enabled,
+            auto_launch=auto_launch,
+            debug_mode=debug_mode,
+            static_files=static_files,
+            templates=templates,
+            routes=routes,
+            dependencies=dependencies,
+            launch_arguments=launch_arguments,
+            metadata={
+                "all_detections": webui_detections,
+                "confidence": self._calculate_confidence(webui_detections, webui_type)
+            }
+        )
+    
+    def _detect_webui_indicators(self, app_tree: AppTree) -> Dict[WebUIType, Dict[str, Any]]:
         """
         Detect web UI indicators in the application directory.
         
         Args:
-            app_path: Path to the application directory
+            app_tree: File index of the application directory
             
         Returns:
             Dict mapping web UI types to their detection results
@@ -208,65 +264,116 @@ class WebUIDetector:
         detections = {}
         
         try:
-            for webui_type, patterns in self.webui_patterns.items():
-                detection_score = 0
-                found_files = []
-                found_imports = []
-                found_keywords = []
+            results = {
+                webui_type: {"score": 0, "files": [], "imports": [], "keywords": []}
+                for webui_type in self.webui_patterns
+            }
+            
+            file_signatures = self.get_file_signatures(app_tree)
+            
+            # Score each file's signatures against every web UI type at once
+            for entry in app_tree.files_with_extensions(SCANNED_EXTENSIONS):
+                signatures = file_signatures.get(entry.relative_path)
+                if signatures is None:
+                    continue
                 
-                # Search through all Python files
-                for root, dirs, files in os.walk(app_path):
-                    # Skip hidden directories and common ignore directories
-                    dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', 'env']]
-                    
-                    for file in files:
-                        if file.endswith('.py') or file.endswith('.ipynb'):
-                            file_path = os.path.join(root, file)
-                            relative_path = os.path.relpath(file_path, app_path)
-                            
-                            try:
-                                with open(file_path, 'r', encoding='utf-8') as f:
-                                    content = f.read()
-                                
-                                # Check for imports
-                                for import_pattern in patterns["imports"]:
-                                    if import_pattern in content:
-                                        detection_score += 2
-                                        found_imports.append(import_pattern)
-                                
-                                # Check for keywords
-                                for keyword in patterns["keywords"]:
-                                    if keyword in content:
-                                        detection_score += 1
-                                        found_keywords.append(keyword)
-                                
-                                # Check for specific files
-                                for file_pattern in patterns["files"]:
-                                    if file == file_pattern:
-                                        detection_score += 3
-                                        found_files.append(relative_path)
-                                
-                                # Special handling for Jupyter notebooks
-                                if webui_type == WebUIType.JUPYTER and file.endswith('.ipynb'):
-                                    detection_score += 5
-                                    found_files.append(relative_path)
-                            
-                            except Exception:
-                                continue
+                # Imports score 2, keywords score 1
+                for signature in sorted(signatures):
+                    for webui_type, kind in self.scored_signatures.get(signature, []):
+                        result = results[webui_type]
+                        result["score"] += 2 if kind == "imports" else 1
+                        result[kind].append(signature)
                 
-                if detection_score > 0:
-                    detections[webui_type] = {
-                        "score": detection_score,
-                        "files": found_files,
-                        "imports": found_imports,
-                        "keywords": found_keywords
-                    }
+                # Check for specific files
+                for webui_type in self.file_names.get(entry.name, []):
+                    results[webui_type]["score"] += 3
+                    results[webui_type]["files"].append(entry.relative_path)
+                
+                # Special handling for Jupyter notebooks
+                if entry.name.endswith('.ipynb'):
+                    results[WebUIType.JUPYTER]["score"] += 5
+                    results[WebUIType.JUPYTER]["files"].append(entry.relative_path)
+            
+            for webui_type, result in results.items():
+                if result["score"] > 0:
+                    detections[webui_type] = result
         
         except Exception as e:
             pass
         
         return detections
     
+    def get_file_signatures(self, app_tree: AppTree) -> Dict[str, Optional[frozenset]]:
+        """
+        Get the framework signatures found in each scanned file of an app.
+        
+        Only files whose size or modification time changed since the last
+        scan are read; the results are kept in memory and on disk.
+        
+        Args:
+            app_tree: File index of the application directory
+            
+        Returns:
+            Dict mapping relative paths to matched signatures (None if unreadable)
+        """
+        app_key = os.path.abspath(app_tree.app_path)
+        cache_name = f"signatures:{app_key}"
+        
+        stored = self.file_signatures.get(app_key)
+        if stored is None:
+            stored = self.result_cache.get(cache_name, self.signature_matcher.key) or {}
+        
+        current = {}
+        changed = False
+        for entry in app_tree.files_with_extensions(SCANNED_EXTENSIONS):
+            previous = stored.get(entry.relative_path)
+            if previous is not None and previous[0] == entry.size and previous[1] == entry.mtime_ns:
+                current[entry.relative_path] = previous
+                continue
+            
+            content = app_tree.read_text(entry.path)
+            signatures = frozenset(self.signature_matcher.match(content)) if content is not None else None
+            current[entry.relative_path] = (entry.size, entry.mtime_ns, signatures)
+            changed = True
+        
+        if changed or len(current) != len(stored):
+            self.result_cache.put(cache_name, self.signature_matcher.key, current)
+        self.file_signatures[app_key] = current
+        
+        return {path: record[2] for path, record in current.items()}
+    
+    def find_files_with_signatures(self, app_tree: AppTree, signatures: List[str]) -> List[str]:
+        """
+        Find the scanned files containing any of the given signatures.
+        
+        Signatures known to the detector are answered from the signature
+        index; any others are searched for in the file contents.
+        
+        Args:
+            app_tree: File index of the application directory
+            signatures: Literal strings to look for
+            
+        Returns:
+            List of matching file paths
+        """
+        known = set(signatures) & self.signature_matcher.signatures
+        unknown = [signature for signature in signatures if signature not in known]
+        file_signatures = self.get_file_signatures(app_tree)
+        
+        matches = []
+        for entry in app_tree.files_with_extensions(SCANNED_EXTENSIONS):
+            found = file_signatures.get(entry.relative_path)
+            if found is None:
+                continue
+            if known & found:
+                matches.append(entry.path)
+            elif unknown:
+                content = app_tree.read_text(entry.path)
+                if content is not None and any(signature in content for signature in unknown):
+                    matches.append(entry.path)
+        
+        return matches
+    
     def _determine_primary_webui(self, detections: Dict[WebUIType, Dict[str, Any]]) -> WebUIType:
         """
         Determine the primary web UI type from detections.
@@ -286,12 +393,12 @@ class WebUIDetector:
         # Return the highest scoring web UI type
         return sorted_detections[0][0]
     
-    def _find_main_file(self, app_path: str, webui_type: WebUIType) -> str:
+    def _find_main_file(self, app_tree: AppTree, webui_type: WebUIType) -> str:
         """
         Find the main application file for the web UI.
         
         Args:
-            app_path: Path to the application directory
+            app_tree: File index of the application directory
             webui_type: Detected web UI type
             
         Returns:
@@ -303,46 +410,36 @@ class WebUIDetector:
             
             # Search for preferred files first
             for file_name in preferred_files:
-                file_path = os.path.join(app_path, file_name)
-                if os.path.exists(file_path):
-                    return file_path
+                entry = app_tree.get(file_name)
+                if entry:
+                    return entry.path
+            
+            python_files = app_tree.files_with_extensions(('.py',))
+            file_signatures = self.get_file_signatures(app_tree)
             
             # Search for any Python file that might be the main file
-            for root, dirs, files in os.walk(app_path):
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', 'env']]
+            for entry in python_files:
+                signatures = file_signatures.get(entry.relative_path)
                 
-                for file in files:
-                    if file.endswith('.py'):
-                        file_path = os.path.join(root, file)
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                            
-                            # Check if this file contains web UI code
-                            if self._contains_webui_code(content, webui_type):
-                                return file_path
-                        except:
-                            continue
+                # Check if this file contains web UI code
+                if signatures and self._contains_webui_code(signatures, webui_type):
+                    return entry.path
             
             # Return first Python file if no specific main file found
-            for root, dirs, files in os.walk(app_path):
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', 'env']]
-                
-                for file in files:
-                    if file.endswith('.py'):
-                        return os.path.join(root, file)
+            if python_files:
+                return python_files[0].path
         
         except Exception as e:
             pass
         
         return ""
     
-    def _contains_webui_code(self, content: str, webui_type: WebUIType) -> bool:
+    def _contains_webui_code(self, signatures: frozenset, webui_type: WebUIType) -> bool:
         """
-        Check if content contains web UI code for the specified type.
+        Check if a file's signatures show web UI code for the specified type.
         
         Args:
-            content: File content
+            signatures: Signatures matched in the file
             webui_type: Web UI type to check for
             
         Returns:
@@ -353,12 +450,12 @@ class WebUIDetector:
             
             # Check for imports
             for import_pattern in patterns.get("imports", []):
-                if import_pattern in content:
+                if import_pattern in signatures:
                     return True
             
             # Check for keywords
             for keyword in patterns.get("keywords", []):
-                if keyword in content:
+                if keyword in signatures:
                     return True
         
         except Exception as e:
@@ -366,11 +463,12 @@ class WebUIDetector:
         
         return False
     
-    def _analyze_main_file(self, main_file: str, webui_type: WebUIType) -> Tuple[Optional[int], str, bool, bool, bool]:
+    def _analyze_main_file(self, app_tree: AppTree, main_file: str, webui_type: WebUIType) -> Tuple[Optional[int], str, bool, bool, bool]:
         """
         Analyze the main file for configuration details.
         
         Args:
+            app_tree: File index of the application directory
             main_file: Path to main file
             webui_type: Web UI type
             
@@ -384,12 +482,10 @@ class WebUIDetector:
         debug_mode = False
         
         try:
-            if not os.path.exists(main_file):
+            content = app_tree.read_text(main_file) if main_file else None
+            if content is None:
                 return port, host, share_enabled, auto_launch, debug_mode
             
-            with open(main_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
             # Extract port
             port_patterns = [
                 r'port\s*=\s*(\d+)',
@@ -459,12 +555,12 @@ class WebUIDetector:
         
         return port, host, share_enabled, auto_launch, debug_mode
     
-    def _find_static_files(self, app_path: str) -> List[str]:
+    def _find_static_files(self, app_tree: AppTree) -> List[str]:
         """
         Find static files in the application directory.
         
         Args:
-            app_path: Path to the application directory
+            app_tree: File index of the application directory
             
         Returns:
             List of static file paths
@@ -474,26 +570,25 @@ class WebUIDetector:
         
         try:
             for static_dir in static_dirs:
-                static_path = os.path.join(app_path, static_dir)
-                if os.path.exists(static_path) and os.path.isdir(static_path):
-                    for root, dirs, files in os.walk(static_path):
-                        for file in files:
-                            if file.endswith(('.css', '.js', '.html', '.png', '.jpg', '.gif', '.svg')):
-                                file_path = os.path.join(root, file)
-                                relative_path = os.path.relpath(file_path, app_path)
-                                static_files.append(relative_path)
+                static_path = os.path.join(app_tree.app_path, static_dir)
+                for root, dirs, files in app_tree.walk(static_path):
+                    for file in files:
+                        if file.endswith(('.css', '.js', '.html', '.png', '.jpg', '.gif', '.svg')):
+                            file_path = os.path.join(root, file)
+                            relative_path = os.path.relpath(file_path, app_tree.app_path)
+                            static_files.append(relative_path)
         
         except Exception as e:
             pass
         
         return static_files
     
-    def _find_templates(self, app_path: str) -> List[str]:
+    def _find_templates(self, app_tree: AppTree) -> List[str]:
         """
         Find template files in the application directory.
         
         Args:
-            app_path: Path to the application directory
+            app_tree: File index of the application directory
             
         Returns:
             List of template file paths
@@ -503,25 +598,25 @@ class WebUIDetector:
         
         try:
             for template_dir in template_dirs:
-                template_path = os.path.join(app_path, template_dir)
-                if os.path.exists(template_path) and os.path.isdir(template_path):
-                    for root, dirs, files in os.walk(template_path):
-                        for file in files:
-                            if file.endswith(('.html', '.jinja', '.jinja2', '.j2')):
-                                file_path = os.path.join(root, file)
-                                relative_path = os.path.relpath(file_path, app_path)
-                                templates.append(relative_path)
+                template_path = os.path.join(app_tree.app_path, template_dir)
+                for root, dirs, files in app_tree.walk(template_path):
+                    for file in files:
+                        if file.endswith(('.html', '.jinja', '.jinja2', '.j2')):
+                            file_path = os.path.join(root, file)
+                            relative_path = os.path.relpath(file_path, app_tree.app_path)
+                            templates.append(relative_path)
         
         except Exception as e:
             pass
         
         return templates
     
-    def _find_routes(self, main_file: str, webui_type: WebUIType) -> List[str]:
+    def _find_routes(self, app_tree: AppTree, main_file: str, webui_type: WebUIType) -> List[str]:
         """
         Find routes/endpoints in the main file.
         
         Args:
+            app_tree: File index of the application directory
             main_file: Path to main file
             webui_type: Web UI type
             
@@ -531,12 +626,10 @@ class WebUIDetector:
         routes = []
         
         try:
-            if not os.path.exists(main_file):
+            content = app_tree.read_text(main_file) if main_file else None
+            if content is None:
                 return routes
             
-            with open(main_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
             # Extract routes based on web UI type
             if webui_type in [WebUIType.FLASK, WebUIType.FASTAPI]:
                 route_patterns = [
@@ -590,11 +683,12 @@ class WebUIDetector:
         
         return dependencies_map.get(webui_type, [])
     
-    def _get_launch_arguments(self, main_file: str, webui_type: WebUIType) -> Dict[str, Any]:
+    def _get_launch_arguments(self, app_tree: AppTree, main_file: str, webui_type: WebUIType) -> Dict[str, Any]:
         """
         Get launch arguments from the main file.
         
         Args:
+            app_tree: File index of the application directory
             main_file: Path to main file
             webui_type: Web UI type
             
@@ -604,12 +698,10 @@ class WebUIDetector:
         launch_args = {}
         
         try:
-            if not os.path.exists(main_file):
+            content = app_tree.read_text(main_file) if main_file else None
+            if content is None:
                 return launch_args
             
-            with open(main_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
             # Extract common launch arguments
             if webui_type == WebUIType.GRADIO:
                 # Gradio specific arguments
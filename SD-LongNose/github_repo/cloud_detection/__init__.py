@@ -11,10 +11,12 @@ Version: 1.0.0
 """
 
 from .cloud_detector import CloudDetector, CloudPlatform, CloudDetectionResult
+from .environment_cache import EnvironmentCache, get_environment_cache, host_fingerprint
 from .platform_configs import PlatformConfigurationManager, PlatformConfigurationuration, CloudPlatform as ConfigCloudPlatform
 from .resource_assessor import ResourceAssessor, ResourceAssessment, ResourceType
+from .metrics_collector import MetricsCollector, MetricsSnapshot, GPUSample, get_metrics_collector
 from .path_mapper import PathMapper, PathMapping, PathMappingResult, CloudPlatform as PathCloudPlatform
-from .repo_cloner import RepositoryCloner, CloneResult, CloneStatus, CloneProgress
+from .repo_cloner import RepositoryCloner, CloneResult, CloneStatus, CloneProgress, CloneStrategy, GitObjectCache, CloneScheduler
 
 __version__ = "1.0.0"
 __author__ = "PinokioCloud Development Team"
@@ -26,6 +28,11 @@ __all__ = [
     "CloudPlatform", 
     "CloudDetectionResult",
     
+    # Environment Cache
+    "EnvironmentCache",
+    "get_environment_cache",
+    "host_fingerprint",
+    
     # Platform Configuration
     "PlatformConfigurationManager",
     "PlatformConfigurationuration",
@@ -35,6 +42,12 @@ __all__ = [
     "ResourceAssessment",
     "ResourceType",
     
+    # Shared Metrics
+    "MetricsCollector",
+    "MetricsSnapshot",
+    "GPUSample",
+    "get_metrics_collector",
+    
     # Path Mapping
     "PathMapper",
     "PathMapping",
@@ -44,5 +57,8 @@ __all__ = [
     "RepositoryCloner",
     "CloneResult",
     "CloneStatus",
-    "CloneProgress"
+    "CloneProgress",
+    "CloneStrategy",
+    "GitObjectCache",
+    "CloneScheduler"
 ]
\ No newline at end of file
@@ -6,6 +6,11 @@ This module detects which cloud platform the system is running on by analyzing
 environment variables, file system characteristics, and system properties.
 Supports Google Colab, Vast.ai, Lightning.ai, Paperspace, and RunPod.
 
+Detection results are memoized in the host environment cache, so only the
+first detector on a host (per boot) runs the probes. A cached result is reused
+for at most an hour and only while the platform environment variables are
+unchanged; secret-valued variables are never written to the cache.
+
 Author: PinokioCloud Development Team
 Version: 1.0.0
 """
@@ -15,10 +20,58 @@ import sys
 import subprocess
 import platform
 import json
-from typing import Dict, Optional, List, Tuple
-from dataclasses import dataclass
+import hashlib
+from typing import Dict, Optional, List, Tuple, Any
+from dataclasses import dataclass, asdict
 from enum import Enum
 
+try:
+    from .environment_cache import EnvironmentCache, get_environment_cache
+except ImportError:
+    # Loaded as a standalone module (e.g. by test_phase1.py)
+    from environment_cache import EnvironmentCache, get_environment_cache
+
+# Environment cache entry holding the detection result
+DETECTION_CACHE_KEY = 'cloud_detection'
+
+# Seconds a cached detection is trusted; mounts and runtime files can change
+# without the environment variables changing
+DETECTION_CACHE_MAX_AGE = 3600.0
+
+# Environment variables read by the platform probes
+COLAB_ENV_VARS = [
+    'COLAB_GPU', 'COLAB_TPU', 'COLAB_CPU', 'COLAB_RUNTIME_VERSION',
+    'COLAB_USER_DATA_DIR', 'COLAB_DRIVE_MOUNTED'
+]
+VAST_ENV_VARS = ['VAST_CONTAINERLABEL', 'VAST_CONTAINERNAME', 'VAST_SSH_PORT']
+LIGHTNING_ENV_VARS = ['LIGHTNING_CLOUD_PROJECT_ID', 'LIGHTNING_CLOUD_APP_ID', 'LIGHTNING_CLOUD_WORK_ID']
+PAPERSPACE_ENV_VARS = ['PAPERSPACE_API_KEY', 'PAPERSPACE_MACHINE_ID', 'PAPERSPACE_WORKSPACE_ID']
+RUNPOD_ENV_VARS = ['RUNPOD_POD_ID', 'RUNPOD_API_KEY', 'RUNPOD_WORKSPACE_ID']
+DETECTION_ENV_VARS = COLAB_ENV_VARS + VAST_ENV_VARS + LIGHTNING_ENV_VARS + PAPERSPACE_ENV_VARS + RUNPOD_ENV_VARS
+
+# Name fragments of environment variables whose values must not be persisted
+SECRET_ENV_MARKERS = ('API_KEY', 'TOKEN', 'SECRET', 'PASSWORD')
+
+
+def is_secret_env_var(name: str) -> bool:
+    """Whether an environment variable holds a credential."""
+    return any(marker in name.upper() for marker in SECRET_ENV_MARKERS)
+
+
+def detection_env_signature() -> str:
+    """
+    Fingerprint the environment variables the platform probes read.
+
+    Secret variables contribute only their presence, so the signature never
+    depends on a credential's value.
+
+    Returns:
+        str: Hex digest of the probed variables that are set
+    """
+    present = [[var, True if is_secret_env_var(var) else os.environ[var]]
+               for var in DETECTION_ENV_VARS if var in os.environ]
+    return hashlib.sha256(json.dumps(present).encode('utf-8')).hexdigest()[:32]
+
 
 class CloudPlatform(Enum):
     """Enumeration of supported cloud platforms."""
@@ -41,6 +94,19 @@ class CloudDetectionResult:
     system_properties: Dict[str, str]
     base_path: str
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert CloudDetectionResult to dictionary."""
+        data = asdict(self)
+        data['platform'] = self.platform.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CloudDetectionResult':
+        """Create CloudDetectionResult from dictionary."""
+        data = dict(data)
+        data['platform'] = CloudPlatform(data['platform'])
+        return cls(**data)
+
 
 class CloudDetector:
     """
@@ -54,20 +120,57 @@ class CloudDetector:
     5. Process and service detection
     """
     
-    def __init__(self):
-        """Initialize the cloud detector."""
+    def __init__(self, use_cache: bool = True, environment_cache: Optional[EnvironmentCache] = None):
+        """
+        Initialize the cloud detector.
+        
+        Args:
+            use_cache: Reuse the detection result cached for this host
+            environment_cache: Cache to use (the shared host cache if None)
+        """
+        self.use_cache = use_cache
+        self.environment_cache = environment_cache
         self.detection_methods = []
         self.environment_vars = {}
         self.file_system_indicators = []
         self.system_properties = {}
+        self.command_outputs = {}
         
-    def detect_platform(self) -> CloudDetectionResult:
+    def detect_platform(self, force_refresh: bool = False) -> CloudDetectionResult:
         """
         Detect the current cloud platform.
         
+        Args:
+            force_refresh: Run the probes even if a result is cached for this host
+            
         Returns:
             CloudDetectionResult: Complete detection result with confidence score
+            (a cached result omits the values of secret environment variables)
         """
+        cache = None
+        env_signature = detection_env_signature()
+        if self.use_cache:
+            cache = self.environment_cache or get_environment_cache()
+            if not force_refresh:
+                cached = cache.get(DETECTION_CACHE_KEY, max_age=DETECTION_CACHE_MAX_AGE)
+                if isinstance(cached, dict) and cached.get('env_signature') == env_signature:
+                    try:
+                        return CloudDetectionResult.from_dict(cached['result'])
+                    except (KeyError, TypeError, ValueError):
+                        pass
+        
+        result = self._run_detection()
+        if cache is not None:
+            cached_result = result.to_dict()
+            cached_result['environment_vars'] = {
+                name: value for name, value in result.environment_vars.items()
+                if not is_secret_env_var(name)
+            }
+            cache.set(DETECTION_CACHE_KEY, {'env_signature': env_signature, 'result': cached_result})
+        return result
+    
+    def _run_detection(self) -> CloudDetectionResult:
+        """Run every platform probe and pick the most confident platform."""
         self._reset_detection_state()
         
         # Run all detection methods
@@ -122,6 +225,32 @@ class CloudDetector:
         self.environment_vars = {}
         self.file_system_indicators = []
         self.system_properties = {}
+        self.command_outputs = {}
+    
+    def _run_command(self, args: List[str], timeout: float) -> subprocess.CompletedProcess:
+        """
+        Run a probe command once per detection run.
+        
+        Every platform probe inspects the same ps/hostname/uname output, so the
+        result (or the error) of the first call is reused by the others.
+        
+        Args:
+            args: Command and arguments
+            timeout: Timeout in seconds
+            
+        Returns:
+            subprocess.CompletedProcess: Command result
+        """
+        key = tuple(args)
+        if key not in self.command_outputs:
+            try:
+                self.command_outputs[key] = subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+            except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+                self.command_outputs[key] = e
+        output = self.command_outputs[key]
+        if isinstance(output, BaseException):
+            raise output
+        return output
     
     def _detect_google_colab(self) -> float:
         """
@@ -134,12 +263,7 @@ class CloudDetector:
         methods = []
         
         # Check for Colab-specific environment variables
-        colab_vars = [
-            'COLAB_GPU', 'COLAB_TPU', 'COLAB_CPU', 'COLAB_RUNTIME_VERSION',
-            'COLAB_USER_DATA_DIR', 'COLAB_DRIVE_MOUNTED'
-        ]
-        
-        for var in colab_vars:
+        for var in COLAB_ENV_VARS:
             if var in os.environ:
                 self.environment_vars[var] = os.environ[var]
                 score += 0.2
@@ -163,7 +287,7 @@ class CloudDetector:
         
         # Check for Colab-specific processes
         try:
-            result = subprocess.run(['ps', 'aux'], capture_output=True, text=True, timeout=5)
+            result = self._run_command(['ps', 'aux'], timeout=5)
             if 'jupyter' in result.stdout and 'colab' in result.stdout:
                 score += 0.2
                 methods.append("colab_process")
@@ -172,7 +296,7 @@ class CloudDetector:
         
         # Check for Colab-specific network configuration
         try:
-            result = subprocess.run(['hostname'], capture_output=True, text=True, timeout=3)
+            result = self._run_command(['hostname'], timeout=3)
             if 'colab' in result.stdout.lower():
                 score += 0.15
                 methods.append("hostname_colab")
@@ -195,8 +319,7 @@ class CloudDetector:
         methods = []
         
         # Check for Vast.ai-specific environment variables
-        vast_vars = ['VAST_CONTAINERLABEL', 'VAST_CONTAINERNAME', 'VAST_SSH_PORT']
-        for var in vast_vars:
+        for var in VAST_ENV_VARS:
             if var in os.environ:
                 self.environment_vars[var] = os.environ[var]
                 score += 0.25
@@ -212,7 +335,7 @@ class CloudDetector:
         
         # Check for Vast.ai-specific processes
         try:
-            result = subprocess.run(['ps', 'aux'], capture_output=True, text=True, timeout=5)
+            result = self._run_command(['ps', 'aux'], timeout=5)
             if 'vast' in result.stdout.lower():
                 score += 0.2
                 methods.append("vast_process")
@@ -221,7 +344,7 @@ class CloudDetector:
         
         # Check for Vast.ai-specific network configuration
         try:
-            result = subprocess.run(['hostname'], capture_output=True, text=True, timeout=3)
+            result = self._run_command(['hostname'], timeout=3)
             if 'vast' in result.stdout.lower():
                 score += 0.15
                 methods.append("hostname_vast")
@@ -230,7 +353,7 @@ class CloudDetector:
         
         # Check for Vast.ai-specific system properties
         try:
-            result = subprocess.run(['uname', '-a'], capture_output=True, text=True, timeout=3)
+            result = self._run_command(['uname', '-a'], timeout=3)
             if 'vast' in result.stdout.lower():
                 score += 0.2
                 methods.append("uname_vast")
@@ -254,8 +377,7 @@ class CloudDetector:
         methods = []
         
         # Check for Lightning.ai-specific environment variables
-        lightning_vars = ['LIGHTNING_CLOUD_PROJECT_ID', 'LIGHTNING_CLOUD_APP_ID', 'LIGHTNING_CLOUD_WORK_ID']
-        for var in lightning_vars:
+        for var in LIGHTNING_ENV_VARS:
             if var in os.environ:
                 self.environment_vars[var] = os.environ[var]
                 score += 0.3
@@ -271,7 +393,7 @@ class CloudDetector:
         
         # Check for Lightning.ai-specific processes
         try:
-            result = subprocess.run(['ps', 'aux'], capture_output=True, text=True, timeout=5)
+            result = self._run_command(['ps', 'aux'], timeout=5)
             if 'lightning' in result.stdout.lower():
                 score += 0.2
                 methods.append("lightning_process")
@@ -280,7 +402,7 @@ class CloudDetector:
         
         # Check for Lightning.ai-specific network configuration
         try:
-            result = subprocess.run(['hostname'], capture_output=True, text=True, timeout=3)
+            result = self._run_command(['hostname'], timeout=3)
             if 'lightning' in result.stdout.lower():
                 score += 0.15
                 methods.append("hostname_lightning")
@@ -289,7 +411,7 @@ class CloudDetector:
         
         # Check for Lightning.ai-specific system properties
         try:
-            result = subprocess.run(['uname', '-a'], capture_output=True, text=True, timeout=3)
+            result = self._run_command(['uname', '-a'], timeout=3)
             if 'lightning' in result.stdout.lower():
                 score += 0.1
                 methods.append("uname_lightning")
@@ -313,8 +435,7 @@ class CloudDetector:
         methods = []
         
         # Check for Paperspace-specific environment variables
-        paperspace_vars = ['PAPERSPACE_API_KEY', 'PAPERSPACE_MACHINE_ID', 'PAPERSPACE_WORKSPACE_ID']
-        for var in paperspace_vars:
+        for var in PAPERSPACE_ENV_VARS:
             if var in os.environ:
                 self.environment_vars[var] = os.environ[var]
                 score += 0.3
@@ -330,7 +451,7 @@ class CloudDetector:
         
         # Check for Paperspace-specific processes
         try:
-            result = subprocess.run(['ps', 'aux'], capture_output=True, text=True, timeout=5)
+            result = self._run_command(['ps', 'aux'], timeout=5)
             if 'paperspace' in result.stdout.lower():
                 score += 0.2
                 methods.append("paperspace_process")
@@ -339,7 +460,7 @@ class CloudDetector:
         
         # Check for Paperspace-specific network configuration
         try:
-            result = subprocess.run(['hostname'], capture_output=True, text=True, timeout=3)
+            result = self._run_command(['hostname'], timeout=3)
             if 'paperspace' in result.stdout.lower():
                 score += 0.15
                 methods.append("hostname_paperspace")
@@ -348,7 +469,7 @@ class CloudDetector:
         
         # Check for Paperspace-specific system properties
         try:
-            result = subprocess.run(['uname', '-a'], capture_output=True, text=True, timeout=3)
+            result = self._run_command(['uname', '-a'], timeout=3)
             if 'paperspace' in result.stdout.lower():
                 score += 0.1
                 methods.append("uname_paperspace")
@@ -372,8 +493,7 @@ class CloudDetector:
         methods = []
         
         # Check for RunPod-specific environment variables
-        runpod_vars = ['RUNPOD_POD_ID', 'RUNPOD_API_KEY', 'RUNPOD_WORKSPACE_ID']
-        for var in runpod_vars:
+        for var in RUNPOD_ENV_VARS:
             if var in os.environ:
                 self.environment_vars[var] = os.environ[var]
                 score += 0.3
@@ -389,7 +509,7 @@ class CloudDetector:
         
         # Check for RunPod-specific processes
         try:
-            result = subprocess.run(['ps', 'aux'], capture_output=True, text=True, timeout=5)
+            result = self._run_command(['ps', 'aux'], timeout=5)
             if 'runpod' in result.stdout.lower():
                 score += 0.2
                 methods.append("runpod_process")
@@ -398,7 +518,7 @@ class CloudDetector:
         
         # Check for RunPod-specific network configuration
         try:
-            result = subprocess.run(['hostname'], capture_output=True, text=True, timeout=3)
+            result = self._run_command(['hostname'], timeout=3)
             if 'runpod' in result.stdout.lower():
                 score += 0.15
                 methods.append("hostname_runpod")
@@ -407,7 +527,7 @@ class CloudDetector:
         
         # Check for RunPod-specific system properties
         try:
-            result = subprocess.run(['uname', '-a'], capture_output=True, text=True, timeout=3)
+            result = self._run_command(['uname', '-a'], timeout=3)
             if 'runpod' in result.stdout.lower():
                 score += 0.1
                 methods.append("uname_runpod")
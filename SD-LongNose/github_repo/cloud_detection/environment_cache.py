@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+PinokioCloud Environment Cache
+
+This module memoizes environment probing results (cloud detection, GPU
+inventory, disk and network probe results) to disk, keyed by a cheap host
+fingerprint made of the kernel boot id, the hostname and the GPU list. Every
+launcher and component on the same host reuses one detection instead of
+re-running subprocesses and network requests on each construction; a reboot,
+a move to another machine or a change of GPUs invalidates the cache.
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import os
+import glob
+import json
+import time
+import socket
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: the cache is only shared within the process
+    fcntl = None
+
+
+# Cache shared by every launcher on the host unless overridden
+DEFAULT_CACHE_PATH = os.environ.get(
+    'PINOKIO_ENVIRONMENT_CACHE',
+    os.path.join(tempfile.gettempdir(), 'pinokio_environment_cache.json')
+)
+
+# Bump when the layout of cached entries changes
+CACHE_VERSION = 1
+
+
+def _read_first_line(path: str) -> str:
+    """Read the first line of a small file, or '' if it can't be read."""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.readline().strip()
+    except OSError:
+        return ''
+
+
+def get_gpu_list() -> List[str]:
+    """
+    List the GPUs visible to the host without running nvidia-smi.
+
+    Reads the NVIDIA driver's /proc entries (bus id and model), falling back
+    to the /dev/nvidiaN device nodes.
+
+    Returns:
+        List[str]: One identifier per GPU, sorted
+    """
+    gpus = []
+    for info_path in glob.glob('/proc/driver/nvidia/gpus/*/information'):
+        model = ''
+        try:
+            with open(info_path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    if line.startswith('Model:'):
+                        model = line.split(':', 1)[1].strip()
+                        break
+        except OSError:
+            pass
+        bus_id = os.path.basename(os.path.dirname(info_path))
+        gpus.append(f"{bus_id} {model}".strip())
+
+    if not gpus:
+        gpus = [os.path.basename(path) for path in glob.glob('/dev/nvidia[0-9]*')]
+
+    return sorted(gpus)
+
+
+def host_fingerprint() -> str:
+    """
+    Compute the host fingerprint the cache is keyed by.
+
+    Only reads a few small files, so it is cheap enough to call on every
+    launcher start.
+
+    Returns:
+        str: Hex digest of the boot id, hostname and GPU list
+    """
+    boot_id = _read_first_line('/proc/sys/kernel/random/boot_id')
+    identity = [CACHE_VERSION, boot_id, socket.gethostname(), get_gpu_list()]
+    return hashlib.sha256(json.dumps(identity).encode('utf-8')).hexdigest()[:32]
+
+
+class EnvironmentCache:
+    """
+    Disk-backed store of environment probing results for the current host.
+
+    Entries are JSON-serializable values stored under a key with the time
+    they were written. The file holds a single fingerprint; when it doesn't
+    match the running host every entry is treated as missing and the file is
+    rewritten on the next store. Reads only go back to disk when the file's
+    mtime changes, so repeated lookups within a process are dictionary reads.
+    """
+
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH, fingerprint: Optional[str] = None):
+        """
+        Initialize the environment cache.
+
+        Args:
+            cache_path: Path of the JSON cache file
+            fingerprint: Host fingerprint (computed on first use if None)
+        """
+        self.cache_path = cache_path
+        self.lock_path = cache_path + '.lock'
+        self.thread_lock = threading.RLock()
+        self._fingerprint = fingerprint
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.file_signature: Optional[Tuple[int, int]] = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Fingerprint of the running host."""
+        if self._fingerprint is None:
+            self._fingerprint = host_fingerprint()
+        return self._fingerprint
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """
+        Get a cached value for this host.
+
+        Args:
+            key: Entry name
+            max_age: Maximum age in seconds (None accepts any age)
+
+        Returns:
+            Optional[Any]: Cached value, or None if missing or too old
+        """
+        with self.thread_lock:
+            self._refresh()
+            entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if max_age is not None and time.time() - entry.get('updated_at', 0) > max_age:
+            return None
+        return entry.get('value')
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value for this host.
+
+        Args:
+            key: Entry name
+            value: JSON-serializable value
+        """
+        with self._locked():
+            self.entries[key] = {'value': value, 'updated_at': time.time()}
+            self._save()
+
+    def update(self, key: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge fields into a dictionary entry, keeping fields other writers stored.
+
+        Args:
+            key: Entry name
+            fields: Fields to set
+
+        Returns:
+            Dict[str, Any]: The merged entry value
+        """
+        with self._locked():
+            entry = self.entries.get(key)
+            value = dict(entry['value']) if entry and isinstance(entry.get('value'), dict) else {}
+            value.update(fields)
+            self.entries[key] = {'value': value, 'updated_at': time.time()}
+            self._save()
+            return value
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        Drop one entry, or every entry.
+
+        Args:
+            key: Entry name (None drops all)
+        """
+        with self._locked():
+            if key is None:
+                self.entries = {}
+            else:
+                self.entries.pop(key, None)
+            self._save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the cached entry names and ages."""
+        with self.thread_lock:
+            self._refresh()
+            now = time.time()
+            return {
+                'cache_path': self.cache_path,
+                'fingerprint': self.fingerprint,
+                'entries': {key: round(now - entry.get('updated_at', now), 1)
+                            for key, entry in self.entries.items()}
+            }
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the thread lock and the cache file lock, with entries reloaded."""
+        with self.thread_lock:
+            lock_file = None
+            if fcntl is not None:
+                try:
+                    lock_file = open(self.lock_path, 'a')
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                except OSError:
+                    lock_file = None
+            try:
+                self._refresh(force=True)
+                yield
+            finally:
+                if lock_file is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                    lock_file.close()
+
+    def _refresh(self, force: bool = False) -> None:
+        """Reload the entries if the file changed since they were read."""
+        try:
+            stat = os.stat(self.cache_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            self.entries = {}
+            self.file_signature = None
+            return
+
+        if not force and signature == self.file_signature:
+            return
+
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('fingerprint') == self.fingerprint:
+                self.entries = dict(data.get('entries', {}))
+            else:
+                self.entries = {}
+        except (OSError, ValueError, AttributeError):
+            self.entries = {}
+        self.file_signature = signature
+
+    def _save(self) -> None:
+        """Write the cache atomically (lock must be held)."""
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix='.tmp_', suffix='.json', dir=directory)
+        except OSError as e:
+            print(f"[EnvironmentCache] Cannot write {self.cache_path}: {e}")
+            return
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'fingerprint': self.fingerprint, 'entries': self.entries}, f)
+            os.replace(temp_path, self.cache_path)
+            stat = os.stat(self.cache_path)
+            self.file_signature = (stat.st_mtime_ns, stat.st_size)
+        except BaseException as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            if not isinstance(e, OSError):
+                raise
+            print(f"[EnvironmentCache] Cannot write {self.cache_path}: {e}")
+
+
+_caches: Dict[str, EnvironmentCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_environment_cache(cache_path: str = DEFAULT_CACHE_PATH) -> EnvironmentCache:
+    """
+    Get the process-wide environment cache for a cache file.
+
+    Args:
+        cache_path: Path of the JSON cache file
+
+    Returns:
+        EnvironmentCache: Shared cache instance
+    """
+    with _caches_lock:
+        cache = _caches.get(cache_path)
+        if cache is None:
+            cache = EnvironmentCache(cache_path)
+            _caches[cache_path] = cache
+        return cache
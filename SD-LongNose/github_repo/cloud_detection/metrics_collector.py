@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+PinokioCloud Shared Metrics Collector
+
+This module samples system resources (CPU, memory, swap, disk, network,
+process count and NVML GPUs) once per tick on a single collector thread and
+publishes each sample as an immutable MetricsSnapshot. Monitors subscribe to
+the snapshot bus or read the latest snapshot instead of polling psutil on
+their own timers, so an additional dashboard adds no sampling overhead.
+
+CPU usage is computed from the cpu_times() delta between ticks, so no caller
+ever blocks in psutil.cpu_percent(interval=...).
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import os
+import time
+import threading
+from typing import Dict, List, Optional, Any, Tuple, Callable
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+
+import psutil
+
+
+@dataclass(frozen=True)
+class GPUSample:
+    """Utilization and memory of one GPU at a tick."""
+    index: int
+    name: str
+    utilization: float
+    memory_total: int
+    memory_used: int
+    memory_free: int
+    memory_percent: float
+    temperature: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """System resource sample published by the collector."""
+    sequence: int
+    timestamp: float
+    cpu_percent: float
+    cpu_count: int
+    cpu_frequency: Optional[float]
+    load_average: Tuple[float, float, float]
+    memory_total: int
+    memory_available: int
+    memory_used: int
+    memory_free: int
+    memory_cached: int
+    memory_buffers: int
+    memory_percent: float
+    swap_total: int
+    swap_used: int
+    swap_free: int
+    swap_percent: float
+    disk_path: str
+    disk_total: int
+    disk_used: int
+    disk_free: int
+    disk_percent: float
+    net_bytes_sent: int
+    net_bytes_recv: int
+    net_packets_sent: int
+    net_packets_recv: int
+    process_count: int
+    gpus: Tuple[GPUSample, ...] = field(default_factory=tuple)
+
+    @property
+    def datetime(self) -> datetime:
+        """Sample time as a datetime."""
+        return datetime.fromtimestamp(self.timestamp)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the sample was taken."""
+        return time.time() - self.timestamp
+
+    @property
+    def gpu(self) -> Optional[GPUSample]:
+        """First GPU, if any."""
+        return self.gpus[0] if self.gpus else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the snapshot to the metrics dictionary read by the dashboards.
+
+        Returns:
+            Dict[str, Any]: Flat fields plus 'disk_usage' and 'gpu_info' groups
+        """
+        data = asdict(self)
+        data['gpus'] = [asdict(gpu) for gpu in self.gpus]
+        data['disk_usage'] = {
+            'total': self.disk_total,
+            'used': self.disk_used,
+            'free': self.disk_free,
+            'percent': self.disk_percent
+        }
+        gpu = self.gpu
+        data['gpu_info'] = {
+            'name': gpu.name,
+            'utilization': gpu.utilization,
+            'memory_percent': gpu.memory_percent
+        } if gpu else {}
+        return data
+
+
+class MetricsCollector:
+    """
+    Samples system resources once per tick and publishes snapshots.
+
+    The latest snapshot is a plain attribute holding an immutable object, so
+    reading it never takes a lock. Subscribers are called on the collector
+    thread after each tick and must return quickly. The collector thread
+    starts on first use and exits after ``idle_timeout`` seconds without
+    subscribers or reads.
+    """
+
+    def __init__(self, interval: float = 2.0, disk_path: str = '/', idle_timeout: float = 60.0):
+        """
+        Initialize the metrics collector.
+
+        Args:
+            interval: Seconds between samples
+            disk_path: Mount point whose usage is sampled
+            idle_timeout: Seconds without subscribers or reads before the thread exits
+        """
+        self.interval = interval
+        self.disk_path = disk_path
+        self.idle_timeout = idle_timeout
+
+        self.latest: Optional[MetricsSnapshot] = None
+        self.subscribers: Tuple[Callable[[MetricsSnapshot], None], ...] = ()
+
+        self.lock = threading.Lock()
+        self.snapshot_ready = threading.Condition(self.lock)
+        self.wake_event = threading.Event()
+        self.collector_thread: Optional[threading.Thread] = None
+        self.last_read = time.monotonic()
+        self.sequence = 0
+
+        # Sampler state (collector thread only)
+        self._last_cpu_times = None
+        self._cpu_count = psutil.cpu_count() or 1
+        self._nvml = None
+        self._nvml_checked = False
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the collector thread is alive."""
+        return self.collector_thread is not None and self.collector_thread.is_alive()
+
+    def start(self) -> None:
+        """Start the collector thread if it is not running."""
+        with self.lock:
+            if self.is_running:
+                return
+            self.wake_event.clear()
+            self.last_read = time.monotonic()
+            self.collector_thread = threading.Thread(
+                target=self._collect_loop,
+                name="MetricsCollector",
+                daemon=True
+            )
+            self.collector_thread.start()
+
+    def stop(self) -> None:
+        """Stop the collector thread."""
+        thread = self.collector_thread
+        self.collector_thread = None
+        self.wake_event.set()
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+
+    def set_interval(self, interval: float) -> None:
+        """
+        Change the sampling cadence.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = max(0.1, interval)
+        self.wake_event.set()
+
+    def subscribe(self, callback: Callable[[MetricsSnapshot], None]) -> None:
+        """
+        Call a function with every new snapshot.
+
+        The latest snapshot, if any, is delivered immediately.
+
+        Args:
+            callback: Function taking a MetricsSnapshot
+        """
+        with self.lock:
+            if callback not in self.subscribers:
+                self.subscribers = self.subscribers + (callback,)
+            latest = self.latest
+        self.start()
+        if latest is not None:
+            self._deliver(callback, latest)
+
+    def unsubscribe(self, callback: Callable[[MetricsSnapshot], None]) -> None:
+        """Stop calling a subscribed function."""
+        with self.lock:
+            self.subscribers = tuple(s for s in self.subscribers if s != callback)
+
+    def get_snapshot(self, max_age: Optional[float] = None, timeout: float = 5.0) -> Optional[MetricsSnapshot]:
+        """
+        Get a recent snapshot, starting the collector if needed.
+
+        Args:
+            max_age: Oldest acceptable snapshot in seconds (default: two intervals)
+            timeout: Seconds to wait for a fresh snapshot
+
+        Returns:
+            The latest snapshot (possibly stale if the wait timed out), or None
+            if none was ever taken
+        """
+        self.last_read = time.monotonic()
+        max_age = max_age if max_age is not None else self.interval * 2
+
+        snapshot = self.latest
+        if snapshot is not None and snapshot.age <= max_age and self.is_running:
+            return snapshot
+
+        self.start()
+        deadline = time.monotonic() + timeout
+        with self.snapshot_ready:
+            while self.latest is None or self.latest.age > max_age:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.snapshot_ready.wait(remaining)
+            return self.latest
+
+    def get_gpu_process_memory(self) -> Dict[int, int]:
+        """
+        Read the GPU memory used by each process, summed over all devices.
+
+        Read on demand rather than every tick, since only launchers that
+        account per-app VRAM need it.
+
+        Returns:
+            Dict[int, int]: Bytes of GPU memory by PID (empty without NVML)
+        """
+        nvml = self._get_nvml()
+        if nvml is None:
+            return {}
+
+        usage: Dict[int, int] = {}
+        try:
+            for index in range(nvml.nvmlDeviceGetCount()):
+                handle = nvml.nvmlDeviceGetHandleByIndex(index)
+                processes = list(nvml.nvmlDeviceGetComputeRunningProcesses(handle))
+                try:
+                    processes += nvml.nvmlDeviceGetGraphicsRunningProcesses(handle)
+                except Exception:
+                    pass
+                for process in processes:
+                    # usedGpuMemory is None where the driver cannot attribute it
+                    usage[process.pid] = usage.get(process.pid, 0) + (process.usedGpuMemory or 0)
+        except Exception as e:
+            print(f"[MetricsCollector] Error reading GPU process memory: {e}")
+        return usage
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get collector status."""
+        latest = self.latest
+        return {
+            'running': self.is_running,
+            'interval': self.interval,
+            'subscribers': len(self.subscribers),
+            'snapshots': self.sequence,
+            'latest_age': latest.age if latest else None
+        }
+
+    def _collect_loop(self) -> None:
+        """Sample, publish and sleep until idle or stopped."""
+        # Prime the CPU delta so the first snapshot has a real cpu_percent
+        self._last_cpu_times = psutil.cpu_times()
+        self.wake_event.wait(min(self.interval, 0.5))
+
+        while self.collector_thread is threading.current_thread():
+            try:
+                self._publish(self._sample())
+            except Exception as e:
+                print(f"[MetricsCollector] Error sampling metrics: {e}")
+
+            idle_for = time.monotonic() - self.last_read
+            if not self.subscribers and idle_for > self.idle_timeout:
+                with self.lock:
+                    if not self.subscribers and self.collector_thread is threading.current_thread():
+                        self.collector_thread = None
+                        break
+
+            self.wake_event.clear()
+            self.wake_event.wait(self.interval)
+
+    def _publish(self, snapshot: MetricsSnapshot) -> None:
+        """Make a snapshot the latest one and notify subscribers."""
+        with self.snapshot_ready:
+            self.latest = snapshot
+            self.snapshot_ready.notify_all()
+            subscribers = self.subscribers
+        for callback in subscribers:
+            self._deliver(callback, snapshot)
+
+    def _deliver(self, callback: Callable[[MetricsSnapshot], None], snapshot: MetricsSnapshot) -> None:
+        """Call one subscriber, isolating its errors."""
+        try:
+            callback(snapshot)
+        except Exception as e:
+            print(f"[MetricsCollector] Subscriber {getattr(callback, '__qualname__', callback)} failed: {e}")
+
+    def _sample(self) -> MetricsSnapshot:
+        """Read every source once."""
+        cpu_percent = self._sample_cpu_percent()
+        try:
+            cpu_freq = psutil.cpu_freq()
+        except Exception:
+            cpu_freq = None
+        load_average = os.getloadavg() if hasattr(os, 'getloadavg') else (0.0, 0.0, 0.0)
+
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        network = psutil.net_io_counters()
+
+        self.sequence += 1
+        return MetricsSnapshot(
+            sequence=self.sequence,
+            timestamp=time.time(),
+            cpu_percent=cpu_percent,
+            cpu_count=self._cpu_count,
+            cpu_frequency=cpu_freq.current if cpu_freq else None,
+            load_average=tuple(load_average),
+            memory_total=memory.total,
+            memory_available=memory.available,
+            memory_used=memory.used,
+            memory_free=memory.free,
+            memory_cached=getattr(memory, 'cached', 0),
+            memory_buffers=getattr(memory, 'buffers', 0),
+            memory_percent=memory.percent,
+            swap_total=swap.total,
+            swap_used=swap.used,
+            swap_free=swap.free,
+            swap_percent=swap.percent,
+            disk_path=self.disk_path,
+            disk_total=disk.total,
+            disk_used=disk.used,
+            disk_free=disk.free,
+            disk_percent=(disk.used / disk.total) * 100 if disk.total else 0.0,
+            net_bytes_sent=network.bytes_sent if network else 0,
+            net_bytes_recv=network.bytes_recv if network else 0,
+            net_packets_sent=network.packets_sent if network else 0,
+            net_packets_recv=network.packets_recv if network else 0,
+            process_count=len(psutil.pids()),
+            gpus=self._sample_gpus()
+        )
+
+    def _sample_cpu_percent(self) -> float:
+        """System-wide CPU usage since the previous tick."""
+        current = psutil.cpu_times()
+        previous, self._last_cpu_times = self._last_cpu_times, current
+        if previous is None:
+            return 0.0
+
+        # On Linux guest time is already counted in user/nice, so leave it out
+        total = self._cpu_total(current) - self._cpu_total(previous)
+        idle = (current.idle - previous.idle) + (getattr(current, 'iowait', 0.0) - getattr(previous, 'iowait', 0.0))
+        if total <= 0:
+            return 0.0
+        return max(0.0, min(100.0, (total - idle) / total * 100))
+
+    @staticmethod
+    def _cpu_total(cpu_times) -> float:
+        """Total CPU time of a cpu_times() sample, without double-counted guest time."""
+        return (sum(cpu_times) - getattr(cpu_times, 'guest', 0.0)
+                - getattr(cpu_times, 'guest_nice', 0.0))
+
+    def _sample_gpus(self) -> Tuple[GPUSample, ...]:
+        """Read every NVML device (empty without NVIDIA GPUs or pynvml)."""
+        nvml = self._get_nvml()
+        if nvml is None:
+            return ()
+
+        gpus = []
+        try:
+            for index in range(nvml.nvmlDeviceGetCount()):
+                handle = nvml.nvmlDeviceGetHandleByIndex(index)
+                memory_info = nvml.nvmlDeviceGetMemoryInfo(handle)
+                utilization = nvml.nvmlDeviceGetUtilizationRates(handle)
+                name = nvml.nvmlDeviceGetName(handle)
+                try:
+                    temperature = float(nvml.nvmlDeviceGetTemperature(handle, nvml.NVML_TEMPERATURE_GPU))
+                except Exception:
+                    temperature = None
+
+                gpus.append(GPUSample(
+                    index=index,
+                    name=name.decode() if isinstance(name, bytes) else str(name),
+                    utilization=float(utilization.gpu),
+                    memory_total=memory_info.total,
+                    memory_used=memory_info.used,
+                    memory_free=memory_info.free,
+                    memory_percent=(memory_info.used / memory_info.total) * 100 if memory_info.total else 0.0,
+                    temperature=temperature
+                ))
+        except Exception as e:
+            print(f"[MetricsCollector] Error reading GPU metrics: {e}")
+        return tuple(gpus)
+
+    def _get_nvml(self):
+        """Initialise NVML once; None without NVIDIA GPUs or pynvml."""
+        with self.lock:
+            if not self._nvml_checked:
+                self._nvml_checked = True
+                try:
+                    import pynvml
+                    pynvml.nvmlInit()
+                    self._nvml = pynvml
+                except Exception:
+                    self._nvml = None
+            return self._nvml
+
+
+_collector: Optional[MetricsCollector] = None
+_collector_lock = threading.Lock()
+
+
+def get_metrics_collector() -> MetricsCollector:
+    """
+    Get the process-wide metrics collector.
+
+    The cadence defaults to PINOKIO_METRICS_INTERVAL seconds (2.0 if unset).
+    """
+    global _collector
+    with _collector_lock:
+        if _collector is None:
+            try:
+                interval = float(os.environ.get('PINOKIO_METRICS_INTERVAL', '2.0'))
+            except ValueError:
+                interval = 2.0
+            _collector = MetricsCollector(interval=interval)
+        return _collector
@@ -212,7 +212,8 @@ class Phase1Launcher:
     def _assess_resources(self) -> Optional[ResourceAssessment]:
         """Assess system resources."""
         try:
-            assessment = self.resource_assessor.assess_resources(force_refresh=True)
+            # Disk and network probes fill in later; startup never waits for them
+            assessment = self.resource_assessor.assess_resources()
             
             # Log resource details
             print(f"   CPU: {assessment.cpu.cores_logical} cores, {assessment.cpu.usage_percent:.1f}% usage")
@@ -223,6 +224,9 @@ class Phase1Launcher:
                 main_storage = assessment.storage[0]
                 print(f"   Storage: {main_storage.total_gb:.1f}GB total, {main_storage.usage_percent:.1f}% used")
             
+            if assessment.probes_pending:
+                print(f"   Disk and network probes running in the background")
+            
             if assessment.recommendations:
                 print(f"   Recommendations: {len(assessment.recommendations)}")
                 for rec in assessment.recommendations[:3]:  # Show first 3
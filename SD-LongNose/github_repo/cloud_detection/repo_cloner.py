@@ -2,9 +2,20 @@
 """
 PinokioCloud Repository Cloning System
 
-This module handles cloning the PinokioCloud repository into the detected cloud
-GPU service's file system. Provides intelligent cloning with progress tracking,
-error handling, and platform-specific optimizations.
+This module handles cloning the PinokioCloud repository, and application
+repositories, into the detected cloud GPU service's file system. Provides
+intelligent cloning with progress tracking, error handling, and
+platform-specific optimizations.
+
+Clones can be shallow, blobless or treeless, deepened on demand, and can
+borrow objects from a shared local bare repository (GitObjectCache) through
+git alternates, so reinstalls and forks of cached repositories only transfer
+the objects they are missing. Remotes the cache does not hold yet are cloned
+with the requested strategy, and the cache fetches them in the background
+afterwards so the next install of the repository borrows from it. Forks are
+matched to a cached remote of the same project, so only their own commits
+are fetched. CloneScheduler runs several clones or cache fetches at once
+within a bandwidth budget.
 
 Author: PinokioCloud Development Team
 Version: 1.0.0
@@ -14,13 +25,25 @@ import os
 import sys
 import subprocess
 import shutil
+import re
 import time
 import json
-from typing import Dict, List, Optional, Tuple, Any
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple, Any, Iterator, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
+sys.path.append('/workspace/SD-LongNose/github_repo')
+from environment_management.tracing import traced, get_tracer
+
+try:
+    import fcntl
+except ImportError:  # Windows: the object cache is only locked within the process
+    fcntl = None
+
 
 class CloneStatus(Enum):
     """Enumeration of clone operation statuses."""
@@ -31,6 +54,21 @@ class CloneStatus(Enum):
     CANCELLED = "cancelled"
 
 
+class CloneStrategy(Enum):
+    """How much history and content a clone fetches up front."""
+    FULL = "full"            # Complete history
+    SHALLOW = "shallow"      # Only the newest commits (see RepositoryCloner.depth)
+    BLOBLESS = "blobless"    # Full history, file contents fetched when checked out
+    TREELESS = "treeless"    # Full commit history, trees and contents fetched on demand
+
+
+# Units in git's "Receiving objects" progress
+_GIT_SIZE_UNITS = {'bytes': 1, 'KiB': 1024, 'MiB': 1024 ** 2, 'GiB': 1024 ** 3}
+
+_RECEIVED_PATTERN = re.compile(r',\s*([\d.]+)\s*(bytes|KiB|MiB|GiB)')
+_RATE_PATTERN = re.compile(r'\|\s*([\d.]+)\s*(bytes|KiB|MiB|GiB)/s')
+
+
 @dataclass
 class CloneProgress:
     """Clone operation progress information."""
@@ -60,6 +98,241 @@ class CloneResult:
     clone_duration: float = 0.0
     error_message: Optional[str] = None
     warnings: List[str] = field(default_factory=list)
+    clone_strategy: str = CloneStrategy.FULL.value
+    reference_repository: Optional[str] = None
+
+
+class GitObjectCache:
+    """
+    Shared bare repository holding the objects of every cached remote.
+    
+    Each remote's branches and tags are fetched into their own ref namespace,
+    so forks of the same project share almost all of their objects. Clones
+    borrow from the cache with ``git clone --reference``; objects are never
+    pruned from it, since those clones depend on them.
+    
+    The cache always holds complete history (no --filter), so any clone can
+    reference it. Fetches of different remotes run concurrently; only
+    fetches of the same remote wait for each other.
+    """
+    
+    def __init__(self, cache_dir: str, refresh_interval: float = 60.0, timeout: int = 3600):
+        """
+        Initialize the object cache.
+        
+        Args:
+            cache_dir: Directory holding the cache
+            refresh_interval: Seconds a remote is considered fresh after a fetch
+            timeout: Timeout for a fetch into the cache, in seconds
+        """
+        self.cache_dir = cache_dir
+        self.repository_path = os.path.join(cache_dir, "objects.git")
+        self.state_path = os.path.join(cache_dir, "remotes.json")
+        self.lock_path = os.path.join(cache_dir, ".lock")
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self.thread_lock = threading.RLock()
+        self.remote_locks: Dict[str, threading.Lock] = {}
+        self.prefetching: Dict[str, threading.Thread] = {}
+    
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        """Reduce a remote URL to host/path, without scheme, user or .git suffix."""
+        normalized = url.strip().rstrip('/')
+        if normalized.endswith('.git'):
+            normalized = normalized[:-4]
+        normalized = re.sub(r'^[a-z+]+://', '', normalized.lower())
+        # scp-like syntax (git@github.com:owner/repo) and user names
+        normalized = re.sub(r'^[^@/]+@', '', normalized)
+        return re.sub(r'^([^/:]+):(?!\d)', r'\1/', normalized)
+    
+    @classmethod
+    def remote_key(cls, url: str) -> str:
+        """Get the ref namespace of a remote (equivalent URLs share one)."""
+        return hashlib.sha1(cls._normalize_url(url).encode('utf-8')).hexdigest()[:16]
+    
+    @classmethod
+    def project_name(cls, url: str) -> str:
+        """Get the host and repository name of a remote, shared by a project's forks."""
+        parts = cls._normalize_url(url).split('/')
+        return f"{parts[0]}/{parts[-1]}"
+    
+    @contextmanager
+    def _locked(self, key: Optional[str] = None) -> Iterator[None]:
+        """Hold the thread lock and the file lock of the cache, or of one remote."""
+        if key is None:
+            thread_lock, lock_path = self.thread_lock, self.lock_path
+        else:
+            with self.thread_lock:
+                thread_lock = self.remote_locks.setdefault(key, threading.Lock())
+            lock_path = f"{self.lock_path}-{key}"
+        with thread_lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            lock_file = None
+            if fcntl is not None:
+                lock_file = open(lock_path, 'a')
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if lock_file is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                    lock_file.close()
+    
+    def _load_state(self) -> Dict[str, Any]:
+        """Load the record of cached remotes."""
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_state(self, state: Dict[str, Any]):
+        """Save the record of cached remotes."""
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_path, self.state_path)
+    
+    def _ensure_repository(self):
+        """Create the bare repository if needed."""
+        if os.path.isdir(os.path.join(self.repository_path, "objects")):
+            return
+        subprocess.run(["git", "init", "--bare", "--quiet", self.repository_path],
+                       check=True, capture_output=True, text=True)
+        # Clones reference these objects, so never prune or auto-repack them away
+        for key, value in (("gc.auto", "0"), ("gc.pruneExpire", "never"), ("core.logAllRefUpdates", "false")):
+            subprocess.run(["git", "config", key, value], cwd=self.repository_path,
+                           check=True, capture_output=True, text=True)
+    
+    def update(self, url: str, force: bool = False,
+               output_callback: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Fetch a remote's branches and tags into the cache.
+        
+        Only objects the cache does not already hold are transferred. A
+        remote fetched within the refresh interval is not fetched again.
+        
+        Args:
+            url: Remote URL
+            force: Fetch even if the remote is fresh
+            output_callback: Called with each line of git's progress output
+            
+        Returns:
+            str: Path of the cache repository, for use with --reference
+        """
+        key = self.remote_key(url)
+        with self._locked():
+            self._ensure_repository()
+        
+        with self._locked(key):
+            # Checked under the remote's lock, so a fetch that just finished is not repeated
+            entry = self._load_state().get(key, {})
+            if not force and time.time() - entry.get("fetched_at", 0) < self.refresh_interval:
+                return self.repository_path
+            
+            process = subprocess.Popen(
+                ["git", "fetch", "--progress", "--no-tags", "--no-write-fetch-head", "--prune", url,
+                 f"+refs/heads/*:refs/remotes/{key}/heads/*",
+                 f"+refs/tags/*:refs/remotes/{key}/tags/*"],
+                cwd=self.repository_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                bufsize=1
+            )
+            timer = threading.Timer(self.timeout, process.kill)
+            timer.start()
+            output = []
+            try:
+                for line in process.stdout:
+                    output.append(line)
+                    if output_callback:
+                        output_callback(line)
+                return_code = process.wait()
+            finally:
+                timer.cancel()
+            if return_code != 0:
+                details = "".join(output[-5:]).strip()
+                raise RuntimeError(f"Fetch into object cache failed: {details}")
+            
+            with self._locked():
+                state = self._load_state()
+                state[key] = {"url": url, "fetched_at": time.time()}
+                self._save_state(state)
+        
+        return self.repository_path
+    
+    def has_remote(self, url: str) -> bool:
+        """Check whether a remote has been fetched into the cache."""
+        return self.remote_key(url) in self._load_state()
+    
+    def find_related(self, url: str) -> Optional[str]:
+        """
+        Find a cached remote of the same project, such as the upstream of a fork.
+        
+        Args:
+            url: Remote URL
+            
+        Returns:
+            Optional[str]: URL of a cached remote with the same host and
+            repository name, or None
+        """
+        project = self.project_name(url)
+        for entry in self._load_state().values():
+            cached_url = entry.get("url")
+            if cached_url and self.project_name(cached_url) == project:
+                return cached_url
+        return None
+    
+    def prefetch(self, url: str) -> threading.Thread:
+        """
+        Fetch a remote into the cache in a background thread.
+        
+        Args:
+            url: Remote URL
+            
+        Returns:
+            threading.Thread: The fetch thread (an already running one for the same remote)
+        """
+        key = self.remote_key(url)
+        with self.thread_lock:
+            thread = self.prefetching.get(key)
+            if thread is not None and thread.is_alive():
+                return thread
+            # Keep the fetch's spans under the span that asked for it
+            thread = threading.Thread(target=get_tracer().wrap(self._prefetch), args=(url, key),
+                                      name=f"git-cache-{key}", daemon=True)
+            self.prefetching[key] = thread
+            thread.start()
+        return thread
+    
+    def _prefetch(self, url: str, key: str):
+        """Background fetch behind prefetch()."""
+        try:
+            self.update(url)
+        except Exception as e:
+            print(f"[GitObjectCache] Background fetch of {url} failed: {e}")
+        finally:
+            with self.thread_lock:
+                if self.prefetching.get(key) is threading.current_thread():
+                    del self.prefetching[key]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        state = self._load_state()
+        size = 0
+        for root, dirs, files in os.walk(os.path.join(self.repository_path, "objects")):
+            for file in files:
+                try:
+                    size += os.path.getsize(os.path.join(root, file))
+                except OSError:
+                    pass
+        return {
+            "repository_path": self.repository_path,
+            "remotes": len(state),
+            "size_bytes": size
+        }
 
 
 class RepositoryCloner:
@@ -71,39 +344,65 @@ class RepositoryCloner:
     platform-specific optimizations.
     """
     
-    def __init__(self, target_platform: str, base_path: str):
+    def __init__(self, target_platform: str, base_path: str,
+                 repository_url: Optional[str] = None, target_path: Optional[str] = None,
+                 branch: Optional[str] = None, object_cache: Optional[GitObjectCache] = None,
+                 depth: int = 1):
         """
         Initialize the repository cloner.
         
         Args:
             target_platform: Target cloud platform
             base_path: Base path for cloning
+            repository_url: Repository to clone (defaults to the PinokioCloud repository)
+            target_path: Clone destination (defaults to the repository name under base_path)
+            branch: Branch to clone (defaults to the remote's default branch)
+            object_cache: Shared object cache to borrow objects from
+            depth: Number of commits fetched by a shallow clone
         """
         self.target_platform = target_platform
         self.base_path = base_path
-        self.repository_url = "https://github.com/pinokio-cloud/pinokio-cloud.git"
-        self.repository_name = "pinokio-cloud"
-        self.target_path = os.path.join(base_path, self.repository_name)
+        self.repository_url = repository_url or "https://github.com/pinokio-cloud/pinokio-cloud.git"
+        repository_name = os.path.basename(self.repository_url.rstrip('/'))
+        self.repository_name = repository_name[:-4] if repository_name.endswith('.git') else repository_name
+        self.target_path = target_path or os.path.join(base_path, self.repository_name)
+        self.branch = branch if branch or repository_url else "main"
+        self.object_cache = object_cache
+        self.depth = depth
         self.progress_callback = None
         self.cancel_requested = False
+        self.receive_rate = 0.0  # Bytes per second reported by git while receiving
+        self.cache_prefetch: Optional[threading.Thread] = None  # Background fill of the object cache
+        
+        # Files that must exist in a verified clone (only known for our own repository)
+        self.essential_files = [] if repository_url else [
+            "README.md",
+            "requirements.txt",
+            "setup.py",
+            "pinokio_cloud"
+        ]
     
     def set_progress_callback(self, callback):
         """Set progress callback function."""
         self.progress_callback = callback
     
+    @traced("git.clone", category="git", record_args=("shallow_clone", "strategy"))
     def clone_repository(self, force_clone: bool = False, 
-                        shallow_clone: bool = True) -> CloneResult:
+                        shallow_clone: bool = True,
+                        strategy: Optional[CloneStrategy] = None) -> CloneResult:
         """
-        Clone the PinokioCloud repository.
+        Clone the repository.
         
         Args:
             force_clone: Force clone even if repository exists
-            shallow_clone: Perform shallow clone (faster)
+            shallow_clone: Perform shallow clone (faster); ignored if strategy is given
+            strategy: How much history and content to fetch up front
             
         Returns:
             CloneResult: Result of the cloning operation
         """
         start_time = time.time()
+        strategy = strategy or (CloneStrategy.SHALLOW if shallow_clone else CloneStrategy.FULL)
         
         # Initialize progress
         progress = CloneProgress(
@@ -157,7 +456,28 @@ class RepositoryCloner:
             progress.progress_percent = 10.0
             self._update_progress(progress)
             
-            clone_success = self._perform_git_clone(shallow_clone, progress)
+            # Borrow objects from the shared cache, fetching only what it lacks.
+            # The cache holds full history, so for a project it doesn't know yet
+            # a partial strategy clones without it and the cache is filled
+            # in the background once the clone is done.
+            reference = None
+            warnings = []
+            use_cache = self.object_cache is not None and (
+                strategy == CloneStrategy.FULL
+                or self.object_cache.has_remote(self.repository_url)
+                or self.object_cache.find_related(self.repository_url) is not None)
+            if use_cache:
+                progress.current_operation = "Updating shared object cache"
+                self._update_progress(progress)
+                try:
+                    reference = self.update_object_cache(progress)
+                    # History comes from the cache, so the clone keeps all of it
+                    strategy = CloneStrategy.FULL
+                except Exception as e:
+                    warnings.append(f"Object cache unavailable, cloning without it: {e}")
+            
+            progress.current_operation = "Cloning repository"
+            clone_success = self._perform_git_clone(strategy, progress, reference)
             
             if not clone_success:
                 progress.status = CloneStatus.FAILED
@@ -170,7 +490,10 @@ class RepositoryCloner:
                     repository_path=self.target_path,
                     progress=progress,
                     clone_duration=progress.elapsed_time,
-                    error_message=progress.error_message
+                    error_message=progress.error_message,
+                    warnings=warnings,
+                    clone_strategy=strategy.value,
+                    reference_repository=reference
                 )
             
             # Verify clone
@@ -191,9 +514,16 @@ class RepositoryCloner:
                     repository_path=self.target_path,
                     progress=progress,
                     clone_duration=progress.elapsed_time,
-                    error_message="Clone verification failed"
+                    error_message="Clone verification failed",
+                    warnings=warnings,
+                    clone_strategy=strategy.value,
+                    reference_repository=reference
                 )
             
+            if self.object_cache is not None and not use_cache:
+                # The next install or fork of this repository borrows from the cache
+                self.cache_prefetch = self.object_cache.prefetch(self.repository_url)
+            
             # Finalize
             progress.status = CloneStatus.COMPLETED
             progress.progress_percent = 100.0
@@ -214,7 +544,10 @@ class RepositoryCloner:
                 cloned_files=cloned_files,
                 cloned_directories=cloned_directories,
                 total_size_bytes=total_size,
-                clone_duration=progress.elapsed_time
+                clone_duration=progress.elapsed_time,
+                warnings=warnings,
+                clone_strategy=strategy.value,
+                reference_repository=reference
             )
         
         except Exception as e:
@@ -229,34 +562,71 @@ class RepositoryCloner:
                 repository_path=self.target_path,
                 progress=progress,
                 clone_duration=progress.elapsed_time,
-                error_message=str(e)
+                error_message=str(e),
+                clone_strategy=strategy.value
+            )
+    
+    @traced("git.cache.fetch", category="git")
+    def update_object_cache(self, progress: Optional[CloneProgress] = None) -> str:
+        """
+        Fetch the repository into the shared object cache.
+        
+        Git's progress output updates receive_rate, so a CloneScheduler can
+        budget cache fetches like clones.
+        
+        Args:
+            progress: Progress to update from git's output (optional)
+            
+        Returns:
+            str: Path of the cache repository, for use with --reference
+        """
+        if self.object_cache is None:
+            raise RuntimeError("No object cache configured")
+        if progress is None:
+            progress = CloneProgress(
+                status=CloneStatus.IN_PROGRESS,
+                progress_percent=0.0,
+                current_operation="Updating shared object cache",
+                bytes_received=0,
+                bytes_total=0,
+                objects_received=0,
+                objects_total=0,
+                start_time=time.time(),
+                elapsed_time=0.0,
+                estimated_remaining=0.0
             )
+        
+        def on_cache_output(line: str):
+            self._parse_git_output(line, progress)
+            self._update_progress(progress)
+        
+        try:
+            return self.object_cache.update(self.repository_url, output_callback=on_cache_output)
+        finally:
+            self.receive_rate = 0.0
     
-    def _perform_git_clone(self, shallow_clone: bool, progress: CloneProgress) -> bool:
+    @traced("git.clone.fetch", category="git")
+    def _perform_git_clone(self, strategy: CloneStrategy, progress: CloneProgress,
+                           reference: Optional[str] = None) -> bool:
         """Perform the actual git clone operation."""
         try:
             # Build git clone command
-            cmd = ["git", "clone"]
+            cmd = ["git", "clone", "--progress"]
             
-            if shallow_clone:
-                cmd.extend(["--depth", "1"])
+            if reference:
+                cmd.extend(["--reference", reference])
+            if strategy == CloneStrategy.SHALLOW:
+                cmd.extend(["--depth", str(self.depth)])
+            elif strategy == CloneStrategy.BLOBLESS:
+                cmd.append("--filter=blob:none")
+            elif strategy == CloneStrategy.TREELESS:
+                cmd.append("--filter=tree:0")
             
             # Add platform-specific optimizations
-            if self.target_platform == "google-colab":
-                # Colab-specific optimizations
-                cmd.extend(["--single-branch", "--branch", "main"])
-            elif self.target_platform == "vast-ai":
-                # Vast.ai-specific optimizations
-                cmd.extend(["--single-branch", "--branch", "main"])
-            elif self.target_platform == "lightning-ai":
-                # Lightning.ai-specific optimizations
-                cmd.extend(["--single-branch", "--branch", "main"])
-            elif self.target_platform == "paperspace":
-                # Paperspace-specific optimizations
-                cmd.extend(["--single-branch", "--branch", "main"])
-            elif self.target_platform == "runpod":
-                # RunPod-specific optimizations
-                cmd.extend(["--single-branch", "--branch", "main"])
+            if self.branch and self.target_platform in ("google-colab", "vast-ai", "lightning-ai", "paperspace", "runpod"):
+                cmd.extend(["--single-branch", "--branch", self.branch])
+            elif self.branch:
+                cmd.extend(["--branch", self.branch])
             
             cmd.extend([self.repository_url, self.target_path])
             
@@ -285,6 +655,7 @@ class RepositoryCloner:
             
             # Wait for process to complete
             return_code = process.wait()
+            self.receive_rate = 0.0
             
             if return_code != 0:
                 progress.error_message = f"Git clone failed with return code {return_code}"
@@ -316,6 +687,14 @@ class RepositoryCloner:
                             
                             if progress.objects_total > 0:
                                 progress.progress_percent = 20.0 + (progress.objects_received / progress.objects_total) * 60.0
+                
+                # Transferred size and current rate, e.g. ", 12.50 MiB | 4.20 MiB/s"
+                received = _RECEIVED_PATTERN.search(line)
+                if received:
+                    progress.bytes_received = int(float(received.group(1)) * _GIT_SIZE_UNITS[received.group(2)])
+                rate = _RATE_PATTERN.search(line)
+                if rate:
+                    self.receive_rate = float(rate.group(1)) * _GIT_SIZE_UNITS[rate.group(2)]
             except:
                 pass
         
@@ -340,6 +719,7 @@ class RepositoryCloner:
             # Parse clone target
             progress.current_operation = f"Cloning into {line.split()[-1]}"
     
+    @traced("git.clone.verify", category="git")
     def _verify_clone(self) -> bool:
         """Verify that the clone was successful."""
         try:
@@ -353,14 +733,7 @@ class RepositoryCloner:
                 return False
             
             # Check for essential files
-            essential_files = [
-                "README.md",
-                "requirements.txt",
-                "setup.py",
-                "pinokio_cloud"
-            ]
-            
-            for file in essential_files:
+            for file in self.essential_files:
                 file_path = os.path.join(self.target_path, file)
                 if not os.path.exists(file_path):
                     return False
@@ -381,6 +754,69 @@ class RepositoryCloner:
         except:
             return False
     
+    def _run_git(self, args: List[str], timeout: int = 600) -> subprocess.CompletedProcess:
+        """Run a git command in the clone."""
+        return subprocess.run(["git"] + args, cwd=self.target_path,
+                              capture_output=True, text=True, timeout=timeout)
+    
+    def is_shallow(self) -> bool:
+        """Check whether the clone has truncated history."""
+        result = self._run_git(["rev-parse", "--is-shallow-repository"], timeout=10)
+        return result.returncode == 0 and result.stdout.strip() == "true"
+    
+    @traced("git.deepen", category="git", record_args=("commits",))
+    def deepen(self, commits: Optional[int] = None) -> bool:
+        """
+        Fetch more history into a shallow clone.
+        
+        Args:
+            commits: Number of additional commits (None fetches the full history)
+            
+        Returns:
+            bool: True if successful
+        """
+        if not self.is_shallow():
+            return True
+        args = ["fetch", "--quiet", "--unshallow"] if commits is None else ["fetch", "--quiet", f"--deepen={commits}"]
+        return self._run_git(args).returncode == 0
+    
+    def ensure_commit(self, commit: str, max_rounds: int = 8) -> bool:
+        """
+        Make sure a commit is present, deepening a shallow clone as far as needed.
+        
+        History is deepened by a doubling number of commits, then fetched in
+        full if the commit is still missing.
+        
+        Args:
+            commit: Commit SHA or other revision
+            max_rounds: Deepening attempts before fetching the full history
+            
+        Returns:
+            bool: True if the commit is available
+        """
+        def present() -> bool:
+            return self._run_git(["cat-file", "-e", f"{commit}^{{commit}}"], timeout=10).returncode == 0
+        
+        if present():
+            return True
+        
+        commits = max(self.depth, 1)
+        for _ in range(max_rounds):
+            if not self.is_shallow():
+                break
+            if not self.deepen(commits):
+                return False
+            if present():
+                return True
+            commits *= 2
+        
+        # Deepening was not enough (or the clone is complete): fetch everything once more
+        if self.is_shallow():
+            self.deepen(None)
+        else:
+            self._run_git(["fetch", "--quiet", "origin", commit])
+        return present()
+    
     def _get_existing_files(self) -> List[str]:
         """Get list of existing files in the repository."""
         files = []
@@ -557,6 +993,82 @@ class RepositoryCloner:
         return summary
 
 
+class CloneScheduler:
+    """
+    Runs several clones, or object cache fetches, concurrently within a bandwidth budget.
+    
+    Up to max_concurrent clones run at once. With a bandwidth limit, a new
+    clone only starts while the receive rate git reports for the running
+    clones is below the limit, and at most one starts per poll interval so
+    each newcomer's rate is seen before the next is admitted.
+    """
+    
+    def __init__(self, max_concurrent: int = 4, bandwidth_limit_mbps: Optional[float] = None,
+                 poll_interval: float = 0.5):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            max_concurrent: Maximum number of clones running at once
+            bandwidth_limit_mbps: Aggregate receive rate limit in megabits per second (None for no limit)
+            poll_interval: Seconds between admission checks
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.bandwidth_limit = bandwidth_limit_mbps * 1_000_000 / 8 if bandwidth_limit_mbps else None
+        self.poll_interval = poll_interval
+    
+    def _has_headroom(self, running: List[RepositoryCloner]) -> bool:
+        """Check whether another clone may start."""
+        if len(running) >= self.max_concurrent:
+            return False
+        if self.bandwidth_limit is None:
+            return True
+        return sum(cloner.receive_rate for cloner in running) < self.bandwidth_limit
+    
+    def run(self, cloners: List[RepositoryCloner],
+            operation: Optional[Callable[[RepositoryCloner], Any]] = None, **clone_kwargs) -> List[Any]:
+        """
+        Clone every repository.
+        
+        Args:
+            cloners: Configured cloners, started in order
+            operation: Run on each cloner instead of clone_repository (e.g. update_object_cache)
+            **clone_kwargs: Arguments passed to each clone_repository call
+            
+        Returns:
+            List of results in the order of the cloners (None where an operation raised)
+        """
+        results: List[Any] = [None] * len(cloners)
+        pending = list(range(len(cloners)))
+        running: Dict[int, threading.Thread] = {}
+        
+        def clone(index: int):
+            cloner = cloners[index]
+            try:
+                results[index] = operation(cloner) if operation else cloner.clone_repository(**clone_kwargs)
+            except Exception as e:
+                print(f"[CloneScheduler] {cloner.repository_url} failed: {e}")
+        
+        while pending or running:
+            for index, thread in list(running.items()):
+                if not thread.is_alive():
+                    del running[index]
+            
+            if pending and self._has_headroom([cloners[index] for index in running]):
+                index = pending.pop(0)
+                thread = threading.Thread(target=get_tracer().wrap(clone), args=(index,), daemon=True,
+                                          name=f"clone-{cloners[index].repository_name}")
+                running[index] = thread
+                thread.start()
+                # Without a bandwidth limit, fill every free slot at once
+                if self.bandwidth_limit is None:
+                    continue
+            
+            time.sleep(self.poll_interval)
+        
+        return results
+
+
 def main():
     """Main function for testing repository cloning."""
     # Test with different platforms
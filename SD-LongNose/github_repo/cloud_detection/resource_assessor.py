@@ -6,21 +6,51 @@ This module assesses available system resources including GPU, CPU, memory, stor
 and network capabilities. Provides detailed resource information for optimization
 and capacity planning.
 
+Assessments never block on slow probes: the GPU inventory is memoized in the
+host environment cache, and disk throughput, public IP, connectivity, latency
+and bandwidth are measured on a background thread that fills them into the
+returned assessment (and the cache) when done.
+
 Author: PinokioCloud Development Team
 Version: 1.0.0
 """
 
 import os
 import sys
+import copy
 import subprocess
 import platform
 import psutil
 import json
 import time
+import threading
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from enum import Enum
 
+try:
+    from .metrics_collector import get_metrics_collector
+    from .environment_cache import EnvironmentCache, get_environment_cache
+except ImportError:
+    # Loaded as a standalone module (e.g. by test_phase1.py)
+    from metrics_collector import get_metrics_collector
+    from environment_cache import EnvironmentCache, get_environment_cache
+
+# Environment cache entries
+GPU_CACHE_KEY = 'gpu_inventory'
+PROBES_CACHE_KEY = 'resource_probes'
+
+# Download used to estimate bandwidth (capped by BANDWIDTH_TEST_BYTES)
+BANDWIDTH_TEST_URL = os.environ.get(
+    'PINOKIO_BANDWIDTH_TEST_URL',
+    'https://speed.cloudflare.com/__down?bytes=10000000'
+)
+BANDWIDTH_TEST_BYTES = 10 * 1024 * 1024
+
+# Serializes background probe runs, so concurrent assessors in one process
+# share a single measurement instead of each starting their own
+_probe_run_lock = threading.Lock()
+
 
 class ResourceType(Enum):
     """Enumeration of resource types."""
@@ -127,6 +157,7 @@ class ResourceAssessment:
     system: SystemInfo
     overall_score: float
     recommendations: List[str] = field(default_factory=list)
+    probes_pending: bool = False
 
 
 class ResourceAssessor:
@@ -142,17 +173,33 @@ class ResourceAssessor:
     - System information and capabilities
     """
     
-    def __init__(self):
-        """Initialize the resource assessor."""
+    def __init__(self, use_cache: bool = True, environment_cache: Optional[EnvironmentCache] = None):
+        """
+        Initialize the resource assessor.
+        
+        Args:
+            use_cache: Reuse the GPU inventory and probe results cached for this host
+            environment_cache: Cache to use (the shared host cache if None)
+        """
         self.assessment_cache = {}
         self.cache_duration = 300  # 5 minutes
+        self.probe_max_age = 3600  # Disk/network probe results are reused for an hour
+        self.use_cache = use_cache
+        self.environment_cache = environment_cache
+        self.probe_thread: Optional[threading.Thread] = None
+        self.probe_lock = threading.Lock()
     
-    def assess_resources(self, force_refresh: bool = False) -> ResourceAssessment:
+    def assess_resources(self, force_refresh: bool = False, wait_for_probes: bool = False) -> ResourceAssessment:
         """
         Perform comprehensive resource assessment.
         
+        Disk throughput and network probes run in the background; until they
+        finish the assessment carries the last cached measurements (or
+        defaults) and ``probes_pending`` is True.
+        
         Args:
             force_refresh: Force refresh of cached data
+            wait_for_probes: Block until the background probes have filled in their fields
             
         Returns:
             ResourceAssessment: Complete resource assessment
@@ -164,15 +211,24 @@ class ResourceAssessor:
         if not force_refresh and cache_key in self.assessment_cache:
             cached_data = self.assessment_cache[cache_key]
             if current_time - cached_data['timestamp'] < self.cache_duration:
+                if wait_for_probes:
+                    self.wait_for_probes()
                 return cached_data['data']
         
+        cache = self._get_environment_cache()
+        probes = None
+        if cache is not None and not force_refresh:
+            probes = cache.get(PROBES_CACHE_KEY, max_age=self.probe_max_age)
+        
         # Perform fresh assessment
         cpu_info = self._assess_cpu()
-        gpu_info = self._assess_gpu()
+        gpu_info = self._assess_gpu(force_refresh)
         memory_info = self._assess_memory()
         storage_info = self._assess_storage()
         network_info = self._assess_network()
         system_info = self._assess_system()
+        if probes:
+            self._apply_probe_results(storage_info, network_info, probes)
         
         # Calculate overall score
         overall_score = self._calculate_overall_score(
@@ -181,7 +237,7 @@ class ResourceAssessor:
         
         # Generate recommendations
         recommendations = self._generate_recommendations(
-            cpu_info, gpu_info, memory_info, storage_info, network_info
+            cpu_info, gpu_info, memory_info, storage_info, network_info, network_measured=bool(probes)
         )
         
         assessment = ResourceAssessment(
@@ -193,7 +249,8 @@ class ResourceAssessor:
             network=network_info,
             system=system_info,
             overall_score=overall_score,
-            recommendations=recommendations
+            recommendations=recommendations,
+            probes_pending=not probes
         )
         
         # Cache the result
@@ -202,25 +259,110 @@ class ResourceAssessor:
             'data': assessment
         }
         
+        if not probes:
+            self._start_background_probes(assessment, force_refresh)
+            if wait_for_probes:
+                self.wait_for_probes()
+        
         return assessment
     
+    def wait_for_probes(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the background disk and network probes to finish.
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits until done)
+            
+        Returns:
+            bool: True if no probes are still running
+        """
+        thread = self.probe_thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+    
+    def _get_environment_cache(self) -> Optional[EnvironmentCache]:
+        """Get the environment cache, or None when caching is disabled."""
+        if not self.use_cache:
+            return None
+        return self.environment_cache or get_environment_cache()
+    
+    def _start_background_probes(self, assessment: ResourceAssessment, force_refresh: bool) -> None:
+        """Measure disk throughput and the network on a daemon thread."""
+        with self.probe_lock:
+            if self.probe_thread is not None and self.probe_thread.is_alive():
+                return
+            self.probe_thread = threading.Thread(
+                target=self._run_background_probes,
+                args=(assessment, force_refresh),
+                name="ResourceProbes",
+                daemon=True
+            )
+            self.probe_thread.start()
+    
+    def _run_background_probes(self, assessment: ResourceAssessment, force_refresh: bool) -> None:
+        """Run the slow probes, cache them for the host and fill them into the assessment."""
+        try:
+            with _probe_run_lock:
+                cache = self._get_environment_cache()
+                # Another assessor (or process) may have measured while we waited
+                probes = None
+                if cache is not None and not force_refresh:
+                    probes = cache.get(PROBES_CACHE_KEY, max_age=self.probe_max_age)
+                
+                if not probes:
+                    probes = {
+                        'storage_speeds': {
+                            storage.mount_point: self._test_disk_speed(storage.mount_point)
+                            for storage in assessment.storage
+                        },
+                        'network': self._probe_network()
+                    }
+                    if cache is not None:
+                        cache.set(PROBES_CACHE_KEY, probes)
+            
+            self._apply_probe_results(assessment.storage, assessment.network, probes)
+            assessment.overall_score = self._calculate_overall_score(
+                assessment.cpu, assessment.gpu, assessment.memory, assessment.storage, assessment.network
+            )
+            assessment.recommendations = self._generate_recommendations(
+                assessment.cpu, assessment.gpu, assessment.memory, assessment.storage, assessment.network
+            )
+        except Exception as e:
+            print(f"[ResourceAssessor] Background probes failed: {e}")
+        finally:
+            assessment.probes_pending = False
+    
+    def _apply_probe_results(self, storage: List[StorageInfo], network: NetworkInfo,
+                             probes: Dict[str, Any]) -> None:
+        """Fill measured disk speeds and network properties into assessment parts."""
+        speeds = probes.get('storage_speeds', {})
+        for storage_info in storage:
+            speed = speeds.get(storage_info.mount_point)
+            if speed:
+                storage_info.read_speed_mbps, storage_info.write_speed_mbps = speed
+        
+        for name, value in probes.get('network', {}).items():
+            if hasattr(network, name):
+                setattr(network, name, value)
+    
     def _assess_cpu(self) -> CPUInfo:
         """Assess CPU capabilities and usage."""
         try:
             # Get CPU information
-            cores_physical = psutil.cpu.cores_logical(logical=False)
-            cores_logical = psutil.cpu.cores_logical(logical=True)
+            snapshot = get_metrics_collector().get_snapshot()
+            cores_physical = psutil.cpu_count(logical=False)
+            cores_logical = snapshot.cpu_count if snapshot else psutil.cpu_count(logical=True)
             
             # Get CPU frequency information
             cpu_freq = psutil.cpu_freq()
             max_frequency = cpu_freq.max if cpu_freq else 0.0
             current_frequency = cpu_freq.current if cpu_freq else 0.0
             
-            # Get CPU usage
-            usage_percent = psutil.cpu_percent(interval=1)
-            
-            # Get load average
-            load_avg = os.getloadavg() if hasattr(os, 'getloadavg') else (0.0, 0.0, 0.0)
+            # CPU usage and load average from the shared collector's latest tick
+            usage_percent = snapshot.cpu_percent if snapshot else 0.0
+            load_avg = snapshot.load_average if snapshot else (0.0, 0.0, 0.0)
             
             # Get detailed CPU information
             try:
@@ -271,8 +413,47 @@ class ResourceAssessor:
                 load_average=(0.0, 0.0, 0.0)
             )
     
-    def _assess_gpu(self) -> GPUInfo:
-        """Assess GPU capabilities and availability."""
+    def _assess_gpu(self, force_refresh: bool = False) -> GPUInfo:
+        """
+        Assess GPU capabilities and availability.
+        
+        The inventory (devices, driver, CUDA and cuDNN versions) is probed
+        once per host; later assessments only refresh free memory from the
+        shared metrics collector.
+        """
+        cache = self._get_environment_cache()
+        cached = cache.get(GPU_CACHE_KEY) if cache is not None and not force_refresh else None
+        if cached is not None:
+            try:
+                gpu_info = GPUInfo(**copy.deepcopy(cached))
+            except TypeError:
+                gpu_info = None
+            if gpu_info is not None:
+                self._refresh_gpu_memory(gpu_info)
+                return gpu_info
+        
+        gpu_info = self._probe_gpu()
+        if cache is not None:
+            cache.set(GPU_CACHE_KEY, asdict(gpu_info))
+        return gpu_info
+    
+    def _refresh_gpu_memory(self, gpu_info: GPUInfo) -> None:
+        """Update free GPU memory from the latest metrics snapshot."""
+        try:
+            snapshot = get_metrics_collector().get_snapshot()
+        except Exception:
+            return
+        if snapshot is None or not snapshot.gpus:
+            return
+        
+        free_by_index = {gpu.index: gpu.memory_free // (1024 * 1024) for gpu in snapshot.gpus}
+        for device in gpu_info.devices:
+            if device.get('index') in free_by_index:
+                device['memory_free_mb'] = free_by_index[device['index']]
+        gpu_info.available_memory_mb = sum(device.get('memory_free_mb', 0) for device in gpu_info.devices)
+    
+    def _probe_gpu(self) -> GPUInfo:
+        """Query nvidia-smi, nvcc and torch for the GPU inventory."""
         gpu_info = GPUInfo(count=0)
         
         try:
@@ -341,21 +522,36 @@ class ResourceAssessor:
     def _assess_memory(self) -> MemoryInfo:
         """Assess memory usage and availability."""
         try:
-            # Get memory information
-            memory = psutil.virtual_memory()
-            swap = psutil.swap_memory()
+            # Get memory information from the shared collector
+            snapshot = get_metrics_collector().get_snapshot()
+            if snapshot is None:
+                # No sample yet: read the counters directly rather than report 0 GB
+                memory = psutil.virtual_memory()
+                swap = psutil.swap_memory()
+                return MemoryInfo(
+                    total_gb=memory.total / (1024**3),
+                    available_gb=memory.available / (1024**3),
+                    used_gb=memory.used / (1024**3),
+                    free_gb=memory.free / (1024**3),
+                    cached_gb=getattr(memory, 'cached', 0) / (1024**3),
+                    buffers_gb=getattr(memory, 'buffers', 0) / (1024**3),
+                    swap_total_gb=swap.total / (1024**3),
+                    swap_used_gb=swap.used / (1024**3),
+                    swap_free_gb=swap.free / (1024**3),
+                    usage_percent=memory.percent
+                )
             
             return MemoryInfo(
-                total_gb=memory.total / (1024**3),
-                available_gb=memory.available / (1024**3),
-                used_gb=memory.used / (1024**3),
-                free_gb=memory.free / (1024**3),
-                cached_gb=getattr(memory, 'cached', 0) / (1024**3),
-                buffers_gb=getattr(memory, 'buffers', 0) / (1024**3),
-                swap_total_gb=swap.total / (1024**3),
-                swap_used_gb=swap.used / (1024**3),
-                swap_free_gb=swap.free / (1024**3),
-                usage_percent=memory.percent
+                total_gb=snapshot.memory_total / (1024**3),
+                available_gb=snapshot.memory_available / (1024**3),
+                used_gb=snapshot.memory_used / (1024**3),
+                free_gb=snapshot.memory_free / (1024**3),
+                cached_gb=snapshot.memory_cached / (1024**3),
+                buffers_gb=snapshot.memory_buffers / (1024**3),
+                swap_total_gb=snapshot.swap_total / (1024**3),
+                swap_used_gb=snapshot.swap_used / (1024**3),
+                swap_free_gb=snapshot.swap_free / (1024**3),
+                usage_percent=snapshot.memory_percent
             )
         except Exception as e:
             # Fallback to basic information
@@ -386,9 +582,7 @@ class ResourceAssessor:
                     device_name = partition.device
                     filesystem_type = partition.fstype
                     
-                    # Test read/write speed (basic test)
-                    read_speed, write_speed = self._test_disk_speed(partition.mountpoint)
-                    
+                    # Read/write speed is measured by the background probes
                     storage_info.append(StorageInfo(
                         total_gb=usage.total / (1024**3),
                         used_gb=usage.used / (1024**3),
@@ -396,9 +590,7 @@ class ResourceAssessor:
                         usage_percent=(usage.used / usage.total) * 100,
                         mount_point=partition.mountpoint,
                         filesystem_type=filesystem_type,
-                        device_name=device_name,
-                        read_speed_mbps=read_speed,
-                        write_speed_mbps=write_speed
+                        device_name=device_name
                     ))
                 except (PermissionError, OSError):
                     # Skip inaccessible partitions
@@ -484,16 +676,7 @@ class ResourceAssessor:
                 
                 network_info.interfaces.append(interface_info)
             
-            # Get public IP
-            try:
-                import requests
-                response = requests.get('https://api.ipify.org', timeout=5)
-                if response.status_code == 200:
-                    network_info.public_ip = response.text.strip()
-            except:
-                pass
-            
-            # Get private IP
+            # Get private IP (a UDP connect sends no packets)
             try:
                 import socket
                 s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -503,14 +686,6 @@ class ResourceAssessor:
             except:
                 pass
             
-            # Test internet connectivity
-            try:
-                import requests
-                response = requests.get('https://www.google.com', timeout=5)
-                network_info.can_access_internet = response.status_code == 200
-            except:
-                network_info.can_access_internet = False
-            
             # Get DNS servers
             try:
                 with open('/etc/resolv.conf', 'r') as f:
@@ -527,6 +702,54 @@ class ResourceAssessor:
         
         return network_info
     
+    def _probe_network(self) -> Dict[str, Any]:
+        """
+        Measure public IP, connectivity, latency and bandwidth.
+        
+        Returns:
+            Dict[str, Any]: NetworkInfo fields that were measured
+        """
+        results = {'public_ip': '', 'can_access_internet': False, 'latency_ms': 0.0, 'bandwidth_mbps': 0.0}
+        try:
+            import requests
+        except ImportError:
+            return results
+        
+        # Get public IP
+        try:
+            response = requests.get('https://api.ipify.org', timeout=5)
+            if response.status_code == 200:
+                results['public_ip'] = response.text.strip()
+        except Exception:
+            pass
+        
+        # Test internet connectivity and latency
+        try:
+            response = requests.get('https://www.google.com', timeout=5)
+            results['can_access_internet'] = response.status_code == 200
+            results['latency_ms'] = response.elapsed.total_seconds() * 1000
+        except Exception:
+            results['can_access_internet'] = False
+        
+        # Estimate download bandwidth
+        if results['can_access_internet']:
+            try:
+                received = 0
+                start_time = time.time()
+                with requests.get(BANDWIDTH_TEST_URL, stream=True, timeout=10) as response:
+                    if response.status_code == 200:
+                        for chunk in response.iter_content(chunk_size=64 * 1024):
+                            received += len(chunk)
+                            if received >= BANDWIDTH_TEST_BYTES or time.time() - start_time > 10:
+                                break
+                elapsed = time.time() - start_time
+                if received and elapsed > 0:
+                    results['bandwidth_mbps'] = received * 8 / elapsed / 1_000_000
+            except Exception:
+                pass
+        
+        return results
+    
     def _assess_system(self) -> SystemInfo:
         """Assess system information and capabilities."""
         try:
@@ -633,7 +856,8 @@ class ResourceAssessor:
         return min(100, score)
     
     def _generate_recommendations(self, cpu: CPUInfo, gpu: GPUInfo, memory: MemoryInfo,
-                                 storage: List[StorageInfo], network: NetworkInfo) -> List[str]:
+                                 storage: List[StorageInfo], network: NetworkInfo,
+                                 network_measured: bool = True) -> List[str]:
         """Generate optimization recommendations."""
         recommendations = []
         
@@ -664,7 +888,7 @@ class ResourceAssessor:
                 recommendations.append("Low disk space available. Consider freeing up storage.")
         
         # Network recommendations
-        if not network.can_access_internet:
+        if network_measured and not network.can_access_internet:
             recommendations.append("No internet connectivity detected. Some features may be limited.")
         
         return recommendations
@@ -9,16 +9,23 @@ import os
 import sys
 import time
 import json
+import shutil
+import subprocess
+import tempfile
+import threading
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import Phase 1 modules
-from cloud_detector import CloudDetector, CloudPlatform, CloudDetectionResult
+from cloud_detector import CloudDetector, CloudPlatform, CloudDetectionResult, DETECTION_CACHE_KEY
+from environment_cache import EnvironmentCache
 from platform_configs import PlatformConfigurationManager, PlatformConfigurationuration
 from resource_assessor import ResourceAssessor, ResourceAssessment
 from path_mapper import PathMapper, PathMappingResult
-from repo_cloner import RepositoryCloner, CloneResult
+from repo_cloner import RepositoryCloner, CloneResult, CloneStrategy, GitObjectCache, CloneScheduler
+import metrics_collector
+from metrics_collector import MetricsCollector
 
 
 def test_cloud_detection():
@@ -161,6 +168,234 @@ def test_repository_cloning():
     return result
 
 
+def _make_upstream(base: str, name: str = "upstream") -> str:
+    """Create a local bare repository with a few commits and return its file:// URL."""
+    work = os.path.join(base, f"{name}_work")
+    bare = os.path.join(base, f"{name}.git")
+    git = ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com"]
+    subprocess.run(git + ["init", "--quiet", "--initial-branch=main", work], check=True)
+    for index in range(3):
+        with open(os.path.join(work, f"file{index}.txt"), "w") as f:
+            f.write(f"{name} revision {index}\n" * 100)
+        subprocess.run(git + ["add", "."], cwd=work, check=True)
+        subprocess.run(git + ["commit", "--quiet", "-m", f"commit {index}"], cwd=work, check=True)
+    subprocess.run(["git", "clone", "--quiet", "--bare", work, bare], check=True)
+    # Allow --filter clones over file://
+    subprocess.run(["git", "config", "uploadpack.allowFilter", "true"], cwd=bare, check=True)
+    return f"file://{bare}"
+
+
+def _git_config(repository: str, key: str) -> str:
+    """Read a config value of a clone ('' if unset)."""
+    result = subprocess.run(["git", "config", "--get", key], cwd=repository,
+                            capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+def _make_fork(base: str, upstream_url: str, name: str) -> str:
+    """Create a bare fork of an upstream with one extra commit and return its file:// URL."""
+    work = os.path.join(base, f"{name}_work")
+    bare = os.path.join(base, f"{name}.git")
+    git = ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com"]
+    subprocess.run(["git", "clone", "--quiet", upstream_url, work], check=True)
+    with open(os.path.join(work, "fork.txt"), "w") as f:
+        f.write("fork change\n")
+    subprocess.run(git + ["add", "."], cwd=work, check=True)
+    subprocess.run(git + ["commit", "--quiet", "-m", "fork commit"], cwd=work, check=True)
+    subprocess.run(["git", "clone", "--quiet", "--bare", work, bare], check=True)
+    return f"file://{bare}"
+
+
+def test_partial_clone_fills_cache_in_background():
+    """A blobless first install stays blobless, fills the cache afterwards, and the reinstall borrows."""
+    base = tempfile.mkdtemp(prefix="pinokio_clone_")
+    try:
+        url = _make_upstream(base)
+        cache = GitObjectCache(os.path.join(base, "cache"))
+        cloner = RepositoryCloner("unknown", base, repository_url=url,
+                                  target_path=os.path.join(base, "app"), object_cache=cache)
+        result = cloner.clone_repository(strategy=CloneStrategy.BLOBLESS)
+        
+        assert result.success, result.error_message
+        assert result.clone_strategy == CloneStrategy.BLOBLESS.value
+        assert result.reference_repository is None
+        assert _git_config(result.repository_path, "remote.origin.partialclonefilter") == "blob:none"
+        
+        assert cloner.cache_prefetch is not None
+        cloner.cache_prefetch.join(timeout=60)
+        assert cache.has_remote(url)
+        
+        reinstall = RepositoryCloner("unknown", base, repository_url=url,
+                                     target_path=os.path.join(base, "reinstall"), object_cache=cache)
+        result = reinstall.clone_repository(strategy=CloneStrategy.BLOBLESS)
+        assert result.success, result.error_message
+        assert result.reference_repository == cache.repository_path
+        assert reinstall.cache_prefetch is None
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_fork_borrows_from_cached_upstream():
+    """A fork of a cached project references the cache and only fetches its own commits."""
+    base = tempfile.mkdtemp(prefix="pinokio_clone_")
+    try:
+        upstream_url = _make_upstream(base, "alice/project")
+        fork_url = _make_fork(base, upstream_url, "bob/project")
+        cache = GitObjectCache(os.path.join(base, "cache"))
+        cache.update(upstream_url)
+        
+        assert GitObjectCache.project_name("https://github.com/alice/ComfyUI.git") == \
+            GitObjectCache.project_name("git@github.com:bob/comfyui")
+        assert cache.find_related(fork_url) == upstream_url
+        assert cache.find_related(_make_upstream(base, "carol/other")) is None
+        
+        lines = []
+        cloner = RepositoryCloner("unknown", base, repository_url=fork_url,
+                                  target_path=os.path.join(base, "fork_app"), object_cache=cache)
+        cloner.set_progress_callback(lambda progress: lines.append(progress.objects_total))
+        result = cloner.clone_repository(strategy=CloneStrategy.BLOBLESS)
+        
+        assert result.success, result.error_message
+        assert result.reference_repository == cache.repository_path
+        assert cache.has_remote(fork_url)
+        assert os.path.exists(os.path.join(result.repository_path, "fork.txt"))
+        # Upstream has 3 commits of 3 objects each; the fork adds one commit
+        assert max(lines) <= 4, f"fork fetch transferred {max(lines)} objects"
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_clone_scheduler_prefetches_into_cache():
+    """The scheduler runs cache fetches concurrently and reports failures as None."""
+    base = tempfile.mkdtemp(prefix="pinokio_clone_")
+    try:
+        urls = [_make_upstream(base, f"project_{index}") for index in range(3)]
+        urls.append(f"file://{base}/missing.git")
+        cache = GitObjectCache(os.path.join(base, "cache"))
+        cloners = [RepositoryCloner("unknown", base, repository_url=url, object_cache=cache) for url in urls]
+        
+        results = CloneScheduler(max_concurrent=2, poll_interval=0.05).run(
+            cloners, operation=lambda cloner: cloner.update_object_cache())
+        
+        assert results[:3] == [cache.repository_path] * 3
+        assert results[3] is None
+        assert all(cache.has_remote(url) for url in urls[:3])
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_cached_remote_clone_borrows_objects():
+    """Once the cache holds a remote, clones of it reference the cache and report a full clone."""
+    base = tempfile.mkdtemp(prefix="pinokio_clone_")
+    try:
+        url = _make_upstream(base)
+        cache = GitObjectCache(os.path.join(base, "cache"))
+        
+        first = RepositoryCloner("unknown", base, repository_url=url,
+                                 target_path=os.path.join(base, "first"), object_cache=cache)
+        result = first.clone_repository(strategy=CloneStrategy.FULL)
+        assert result.success, result.error_message
+        assert result.reference_repository == cache.repository_path
+        assert cache.has_remote(url)
+        
+        second = RepositoryCloner("unknown", base, repository_url=url,
+                                  target_path=os.path.join(base, "second"), object_cache=cache)
+        result = second.clone_repository(strategy=CloneStrategy.BLOBLESS)
+        assert result.success, result.error_message
+        assert result.clone_strategy == CloneStrategy.FULL.value
+        assert result.reference_repository == cache.repository_path
+        assert _git_config(result.repository_path, "remote.origin.partialclonefilter") == ""
+        with open(os.path.join(result.repository_path, ".git", "objects", "info", "alternates")) as f:
+            assert os.path.join(cache.repository_path, "objects") in f.read()
+        assert not second.is_shallow()
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_object_cache_fetch_progress_and_locking():
+    """Cache fetches report git's progress and only wait for fetches of the same remote."""
+    base = tempfile.mkdtemp(prefix="pinokio_clone_")
+    try:
+        url_a = _make_upstream(base, "project_a")
+        url_b = _make_upstream(base, "project_b")
+        cache = GitObjectCache(os.path.join(base, "cache"))
+        
+        lines = []
+        cache.update(url_a, output_callback=lines.append)
+        assert any("objects" in line for line in lines)
+        
+        # A fetch of project_a in progress must not hold up project_b
+        done = threading.Event()
+        with cache._locked(GitObjectCache.remote_key(url_a)):
+            worker = threading.Thread(target=lambda: (cache.update(url_b), done.set()), daemon=True)
+            worker.start()
+            assert done.wait(timeout=60), "fetch of another remote waited for the cache"
+        assert cache.has_remote(url_a) and cache.has_remote(url_b)
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_detection_cache_tracks_environment():
+    """Cached detections follow the platform environment, expire, and never store secrets."""
+    base = tempfile.mkdtemp(prefix="pinokio_env_cache_")
+    probed = ['PAPERSPACE_API_KEY', 'PAPERSPACE_MACHINE_ID', 'COLAB_DRIVE_MOUNTED']
+    saved = {var: os.environ.get(var) for var in probed}
+    try:
+        for var in probed:
+            os.environ.pop(var, None)
+        os.environ['PAPERSPACE_API_KEY'] = 'ps-secret-value'
+        os.environ['PAPERSPACE_MACHINE_ID'] = 'psabc123'
+        
+        cache_path = os.path.join(base, 'environment_cache.json')
+        cache = EnvironmentCache(cache_path, fingerprint='test-host')
+        detector = CloudDetector(environment_cache=cache)
+        
+        first = detector.detect_platform()
+        assert first.platform == CloudPlatform.PAPERSPACE
+        with open(cache_path) as f:
+            assert 'ps-secret-value' not in f.read(), "secret written to the environment cache"
+        cached = detector.detect_platform()
+        assert 'PAPERSPACE_API_KEY' not in cached.environment_vars
+        assert cached.environment_vars['PAPERSPACE_MACHINE_ID'] == 'psabc123'
+        
+        # A probed variable appearing later invalidates the cached detection
+        os.environ['COLAB_DRIVE_MOUNTED'] = '1'
+        assert 'COLAB_DRIVE_MOUNTED' in detector.detect_platform().environment_vars
+        
+        # So does age, even with an unchanged environment
+        entry = cache.entries[DETECTION_CACHE_KEY]
+        entry['value']['result']['confidence'] = -1.0
+        cache.set(DETECTION_CACHE_KEY, entry['value'])
+        assert detector.detect_platform().confidence == -1.0
+        cache.entries[DETECTION_CACHE_KEY]['updated_at'] -= 2 * 3600
+        assert detector.detect_platform().confidence >= 0.0
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_cpu_percent_ignores_guest_time():
+    """Guest time is part of user time on Linux and must not be counted twice."""
+    from collections import namedtuple
+    cpu_times = namedtuple('scputimes', 'user nice system idle iowait guest guest_nice')
+    samples = iter([cpu_times(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+                    cpu_times(50.0, 0.0, 0.0, 50.0, 0.0, 40.0, 0.0)])
+    
+    original = metrics_collector.psutil.cpu_times
+    metrics_collector.psutil.cpu_times = lambda: next(samples)
+    try:
+        collector = MetricsCollector()
+        assert collector._sample_cpu_percent() == 0.0
+        cpu_percent = collector._sample_cpu_percent()
+    finally:
+        metrics_collector.psutil.cpu_times = original
+    assert abs(cpu_percent - 50.0) < 1e-6, f"expected 50% CPU, got {cpu_percent}"
+
+
 def main():
     """Main test function."""
     print("🚀 PinokioCloud Phase 1 Component Testing")
@@ -175,6 +410,13 @@ def main():
         resource_assessment = test_resource_assessment()
         path_mappings = test_path_mapping()
         clone_result = test_repository_cloning()
+        test_partial_clone_fills_cache_in_background()
+        test_fork_borrows_from_cached_upstream()
+        test_clone_scheduler_prefetches_into_cache()
+        test_cached_remote_clone_borrows_objects()
+        test_object_cache_fetch_progress_and_locking()
+        test_detection_cache_tracks_environment()
+        test_cpu_percent_ignores_guest_time()
         
         execution_time = time.time() - start_time
         
@@ -10,20 +10,34 @@ import json
 import subprocess
 import threading
 import time
+from itertools import islice
 from pathlib import Path
 import ipywidgets as widgets
 from IPython.display import display, clear_output
 
+from app_analysis.app_catalog import AppCatalog, get_app_catalog
+from cloud_detection.metrics_collector import get_metrics_collector
+
 class CompletePinokioCloudUI:
     """COMPLETE real implementation - NO PLACEHOLDERS."""
     
     def __init__(self):
+        self.apps_database_path = None
         self.apps_data = self.load_real_apps_database()
+        # Shared catalog, indexed once per database file (fallback data gets its own)
+        self.catalog = get_app_catalog(self.apps_database_path) if self.apps_database_path else None
+        if self.catalog is None:
+            self.catalog = AppCatalog(self.apps_data)
         self.categories = self.extract_real_categories()
         self.filtered_apps = self.apps_data.copy()
         self.installation_output = widgets.Output()
         self.running_processes = {}
         
+        # Pagination: only the current page of app widgets is built and sent to the browser
+        self.current_page = 0
+        self.apps_per_page = 20
+        self.app_widget_cache = {}
+        
     def load_real_apps_database(self):
         """Load the ACTUAL 284 apps database."""
         try:
@@ -40,6 +54,7 @@ class CompletePinokioCloudUI:
                 if os.path.exists(path):
                     with open(path, 'r') as f:
                         data = json.load(f)
+                    self.apps_database_path = path
                     print(f"✅ Loaded {len(data)} apps from {path}")
                     return data
             
@@ -70,12 +85,7 @@ class CompletePinokioCloudUI:
     
     def extract_real_categories(self):
         """Extract REAL categories from the apps."""
-        categories = set()
-        for app_data in self.apps_data.values():
-            if isinstance(app_data, dict):
-                category = app_data.get('category', 'Unknown')
-                categories.add(category)
-        return sorted(list(categories))
+        return self.catalog.categories
     
     def create_complete_interface(self):
         """Create the COMPLETE interface with all features."""
@@ -154,20 +164,55 @@ class CompletePinokioCloudUI:
             install_output
         ])
     
-    def update_apps_display(self, max_apps=20):
-        """Update the apps display with REAL app data."""
+    def update_apps_display(self, max_apps=None):
+        """Update the apps display with the current page of REAL app data."""
+        
+        if max_apps:
+            self.apps_per_page = max_apps
+        
+        total_pages = max(1, (len(self.filtered_apps) + self.apps_per_page - 1) // self.apps_per_page)
+        self.current_page = min(self.current_page, total_pages - 1)
+        start = self.current_page * self.apps_per_page
         
         app_widgets = []
         
-        # Show real apps
-        for i, (app_id, app_data) in enumerate(list(self.filtered_apps.items())[:max_apps]):
+        # Show real apps (widgets are reused across filter changes)
+        for app_id, app_data in islice(self.filtered_apps.items(), start, start + self.apps_per_page):
             if isinstance(app_data, dict):
-                app_widget = self.create_real_app_widget(app_id, app_data)
+                app_widget = self.app_widget_cache.get(app_id)
+                if app_widget is None:
+                    app_widget = self.create_real_app_widget(app_id, app_data)
+                    self.app_widget_cache[app_id] = app_widget
                 app_widgets.append(app_widget)
         
+        app_widgets.append(self.create_page_controls(total_pages))
+        
         # Update container
         self.apps_container.children = app_widgets
     
+    def create_page_controls(self, total_pages):
+        """Create previous/next page controls for the apps display."""
+        
+        if not hasattr(self, 'page_label'):
+            self.prev_page_btn = widgets.Button(description='◀ Prev', layout=widgets.Layout(width='90px'))
+            self.next_page_btn = widgets.Button(description='Next ▶', layout=widgets.Layout(width='90px'))
+            self.page_label = widgets.HTML()
+            self.prev_page_btn.on_click(lambda b: self.change_page(-1))
+            self.next_page_btn.on_click(lambda b: self.change_page(1))
+            self.page_controls = widgets.HBox([self.prev_page_btn, self.page_label, self.next_page_btn])
+        
+        self.prev_page_btn.disabled = self.current_page == 0
+        self.next_page_btn.disabled = self.current_page >= total_pages - 1
+        self.page_label.value = (f"<div style='padding: 5px 10px;'>Page {self.current_page + 1} of {total_pages} "
+                                 f"({len(self.filtered_apps)} apps)</div>")
+        
+        return self.page_controls
+    
+    def change_page(self, delta):
+        """Move to another page of the apps display."""
+        self.current_page = max(0, self.current_page + delta)
+        self.update_apps_display()
+    
     def create_real_app_widget(self, app_id, app_data):
         """Create REAL app widget with actual functionality."""
         
@@ -343,24 +388,15 @@ class CompletePinokioCloudUI:
     def filter_and_update(self, search_term, category, per_page):
         """Filter apps and update display."""
         
-        # Filter by category
-        if category == 'All Categories':
-            filtered = self.apps_data.copy()
-        else:
-            filtered = {k: v for k, v in self.apps_data.items() 
-                       if isinstance(v, dict) and v.get('category') == category}
-        
-        # Filter by search term
-        if search_term:
-            search_filtered = {}
-            for app_id, app_data in filtered.items():
-                if isinstance(app_data, dict):
-                    searchable = f"{app_data.get('name', '')} {app_data.get('description', '')} {app_id}".lower()
-                    if search_term.lower() in searchable:
-                        search_filtered[app_id] = app_data
-            filtered = search_filtered
+        # Filter by category and search term
+        matching_ids = self.catalog.filter(
+            query=search_term,
+            categories=[category] if category != 'All Categories' else None
+        )
+        filtered = {app_id: self.catalog.get(app_id) for app_id in matching_ids}
         
         self.filtered_apps = filtered
+        self.current_page = 0
         self.update_apps_display(per_page)
         
         # Update count
@@ -368,12 +404,7 @@ class CompletePinokioCloudUI:
     
     def extract_real_categories(self):
         """Extract REAL categories from the apps."""
-        categories = set()
-        for app_data in self.apps_data.values():
-            if isinstance(app_data, dict):
-                category = app_data.get('category', 'Unknown')
-                categories.add(category)
-        return sorted(list(categories))
+        return self.catalog.categories
     
     def create_real_terminal(self):
         """Create REAL terminal with actual command execution."""
@@ -470,21 +501,19 @@ class CompletePinokioCloudUI:
         def update_real_metrics(b):
             """Update with REAL system metrics."""
             try:
-                import psutil
-                
-                # REAL metrics
-                cpu_percent = psutil.cpu_percent(interval=1)
-                memory = psutil.virtual_memory()
+                # REAL metrics from the shared collector's latest snapshot
+                snapshot = get_metrics_collector().get_snapshot()
+                if snapshot is None:
+                    print("⏳ No metrics sample yet - try again in a moment")
+                    return
                 
-                cpu_bar.value = int(cpu_percent)
-                memory_bar.value = int(memory.percent)
+                cpu_bar.value = int(snapshot.cpu_percent)
+                memory_bar.value = int(snapshot.memory_percent)
                 
                 system_info.value = self.get_real_system_info()
                 
-                print(f"✅ Updated: CPU {cpu_percent:.1f}%, Memory {memory.percent:.1f}%")
+                print(f"✅ Updated: CPU {snapshot.cpu_percent:.1f}%, Memory {snapshot.memory_percent:.1f}%")
                 
-            except ImportError:
-                print("⚠️ psutil not available - install for real monitoring")
             except Exception as e:
                 print(f"❌ Update failed: {e}")
         
@@ -501,26 +530,23 @@ class CompletePinokioCloudUI:
     def get_real_system_info(self):
         """Get REAL system information."""
         try:
-            import psutil
             import platform
             
             # REAL system data
-            cpu_count = psutil.cpu_count()
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            snapshot = get_metrics_collector().get_snapshot()
+            if snapshot is None:
+                return "<div>⏳ Waiting for the first metrics sample...</div>"
             
             return f"""
             <div style='background: #f8f9fa; padding: 15px; border-radius: 8px; margin: 10px 0;'>
                 <h4>💻 Real System Info</h4>
                 <p><strong>Platform:</strong> {platform.system()} {platform.release()}</p>
-                <p><strong>CPU:</strong> {cpu_count} cores</p>
-                <p><strong>Memory:</strong> {memory.total / (1024**3):.1f} GB total</p>
-                <p><strong>Disk:</strong> {disk.total / (1024**3):.1f} GB total</p>
+                <p><strong>CPU:</strong> {snapshot.cpu_count} cores</p>
+                <p><strong>Memory:</strong> {snapshot.memory_total / (1024**3):.1f} GB total</p>
+                <p><strong>Disk:</strong> {snapshot.disk_total / (1024**3):.1f} GB total</p>
                 <p><strong>Python:</strong> {platform.python_version()}</p>
             </div>
             """
-        except ImportError:
-            return "<div>⚠️ Install psutil for real system monitoring</div>"
         except Exception as e:
             return f"<div>❌ Error: {e}</div>"
 
@@ -14,6 +14,7 @@ import os
 import sys
 import json
 import re
+import time
 from typing import Dict, List, Optional, Any, Tuple, Set
 from dataclasses import dataclass, field
 from enum import Enum
@@ -134,12 +135,14 @@ class DependencyFinder:
             '.vscode', '.DS_Store', 'Thumbs.db'
         }
     
-    def find_dependencies(self, app_path: str) -> DependencySearchResult:
+    def find_dependencies(self, app_path: str, app_tree: Optional[Any] = None) -> DependencySearchResult:
         """
         Find all dependency files in an application directory.
         
         Args:
             app_path: Path to the application directory
+            app_tree: Optional shared app_analysis.AppTree index of the app, reused
+                instead of walking and reading the directory again
             
         Returns:
             DependencySearchResult: Complete search results
@@ -157,7 +160,7 @@ class DependencyFinder:
                 return result
             
             # Search for dependency files
-            dependency_files = self._search_dependency_files(app_path)
+            dependency_files = self._search_dependency_files(app_path, app_tree)
             result.dependency_files = dependency_files
             result.total_files_found = len(dependency_files)
             
@@ -178,12 +181,13 @@ class DependencyFinder:
             result.search_time = time.time() - start_time
             return result
     
-    def _search_dependency_files(self, app_path: str) -> List[DependencyFile]:
+    def _search_dependency_files(self, app_path: str, app_tree: Optional[Any] = None) -> List[DependencyFile]:
         """
         Search for dependency files in the application directory.
         
         Args:
             app_path: Path to the application directory
+            app_tree: Optional shared file index of the app
             
         Returns:
             List of found dependency files
@@ -191,7 +195,8 @@ class DependencyFinder:
         dependency_files = []
         
         try:
-            for root, dirs, files in os.walk(app_path):
+            walker = app_tree.walk() if app_tree is not None else os.walk(app_path)
+            for root, dirs, files in walker:
                 # Filter out ignored directories
                 dirs[:] = [d for d in dirs if not self._should_ignore_directory(d)]
                 
@@ -205,12 +210,17 @@ class DependencyFinder:
                     if file_type != DependencyFileType.UNKNOWN:
                         # Get file information
                         try:
-                            stat_info = os.stat(file_path)
-                            file_size = stat_info.st_size
-                            last_modified = stat_info.st_mtime
+                            entry = app_tree.files_by_path.get(file_path) if app_tree is not None else None
+                            if entry is not None:
+                                file_size = entry.size
+                                last_modified = entry.mtime_ns / 1e9
+                            else:
+                                stat_info = os.stat(file_path)
+                                file_size = stat_info.st_size
+                                last_modified = stat_info.st_mtime
                             
                             # Read content preview
-                            content_preview = self._read_content_preview(file_path)
+                            content_preview = self._read_content_preview(file_path, app_tree=app_tree)
                             
                             dependency_file = DependencyFile(
                                 file_type=file_type,
@@ -290,17 +300,27 @@ class DependencyFinder:
         
         return DependencyFileType.UNKNOWN
     
-    def _read_content_preview(self, file_path: str, max_lines: int = 20) -> str:
+    def _read_content_preview(self, file_path: str, max_lines: int = 20, app_tree: Optional[Any] = None) -> str:
         """
         Read a preview of the file content.
         
         Args:
             file_path: Path to the file
             max_lines: Maximum number of lines to read
+            app_tree: Optional shared file index whose content cache is used
             
         Returns:
             Content preview string
         """
+        if app_tree is not None:
+            content = app_tree.read_text(file_path, fallback_encoding='latin-1')
+            if content is None:
+                return ""
+            lines = content.split('\n')
+            if lines and lines[-1] == '':
+                lines.pop()
+            return '\n'.join(line.rstrip() for line in lines[:max_lines])
+        
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 lines = []
@@ -6,6 +6,12 @@ This module resolves conflicts between different dependency systems and package
 It provides comprehensive dependency conflict resolution including version conflicts,
 package manager conflicts, and system-level dependency conflicts.
 
+Python requirements are checked with the specifier-aware VersionSolver, so
+unsatisfiable ranges are reported before anything is downloaded. By default
+only directly contradictory requirements are detected, which needs no I/O;
+the transitive solve against package metadata is opt-in and bounded by a
+deadline.
+
 Author: PinokioCloud Development Team
 Version: 1.0.0
 """
@@ -15,6 +21,9 @@ import sys
 import json
 import re
 import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
 from typing import Dict, List, Optional, Any, Tuple, Set
 from dataclasses import dataclass, field
 from enum import Enum
@@ -25,6 +34,7 @@ from .pip_manager import PipManager, PipPackage, PipInstallStatus
 from .conda_manager import CondaManager, CondaPackage, CondaInstallStatus
 from .npm_manager import NpmManager, NpmPackage, NpmInstallStatus
 from .system_manager import SystemManager, SystemPackage, SystemInstallStatus
+from .version_solver import VersionSolver, MetadataProvider, PyPIMetadataProvider, SolverResult, SolverConflict
 
 
 class ConflictType(Enum):
@@ -88,15 +98,40 @@ class DependencyResolver:
     - Automated and manual resolution strategies
     """
     
-    def __init__(self, base_path: str = "/workspace"):
+    def __init__(self, base_path: str = "/workspace", metadata_provider: Optional[MetadataProvider] = None,
+                 solve_transitive: Optional[bool] = None, solve_timeout: float = 5.0):
         """
         Initialize the dependency resolver.
         
         Args:
             base_path: Base path for dependency resolution
+            metadata_provider: Package metadata source for the version solver
+                (defaults to the PyPI JSON API, cached under base_path)
+            solve_transitive: Solve requirements against package metadata during
+                conflict detection (defaults to PINOKIO_TRANSITIVE_SOLVE=1);
+                otherwise only directly contradictory requirements are reported
+            solve_timeout: Seconds conflict detection waits for a transitive solve
         """
         self.base_path = base_path
         
+        # Specifier-aware solver for Python requirements
+        self.version_solver = VersionSolver(
+            metadata_provider or PyPIMetadataProvider(os.path.join(base_path, "cache", "pypi_metadata"))
+        )
+        if solve_transitive is None:
+            solve_transitive = os.environ.get('PINOKIO_TRANSITIVE_SOLVE') == '1'
+        self.solve_transitive = solve_transitive
+        self.solve_timeout = solve_timeout
+        
+        # Solves run one at a time on a worker, so a timed-out solve keeps going
+        # and its cached result serves the next detection
+        self.solver_executor: Optional[ThreadPoolExecutor] = None
+        self.pending_solves: Dict[str, Future] = {}
+        self.solver_lock = threading.Lock()
+        
+        # Dependencies collected per app, reused while its dependency files are unchanged
+        self.dependency_cache: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        
         # Initialize dependency managers
         self.pip_manager = PipManager(base_path)
         self.conda_manager = CondaManager(base_path)
@@ -195,8 +230,8 @@ class DependencyResolver:
             for conflict in conflicts:
                 self._update_progress(f"Resolving conflict: {conflict.package_name}")
                 
-                # Use provided strategy or auto-select
-                resolution_strategy = strategy or self._select_resolution_strategy(conflict)
+                # Keep a strategy fixed at detection, else use provided strategy or auto-select
+                resolution_strategy = conflict.resolution_strategy or strategy or self._select_resolution_strategy(conflict)
                 conflict.resolution_strategy = resolution_strategy
                 
                 # Attempt resolution
@@ -236,6 +271,41 @@ class DependencyResolver:
         """
         return self._detect_conflicts(app_path)
     
+    def solve_requirements(self, requirements: List[str]) -> SolverResult:
+        """
+        Solve a set of Python requirements against package metadata.
+        
+        Blocks until the solve finishes; with the default provider that
+        includes HTTP requests to PyPI for packages not cached yet.
+        
+        Args:
+            requirements: PEP 508 requirement strings
+            
+        Returns:
+            SolverResult: Pinned versions or the conflicts found
+        """
+        return self._submit_solve(requirements).result()
+    
+    def _submit_solve(self, requirements: List[str]) -> Future:
+        """Queue a solve on the solver worker, joining an identical one already queued."""
+        key = self.version_solver.requirement_set_key(requirements)
+        with self.solver_lock:
+            future = self.pending_solves.get(key)
+            if future is not None:
+                return future
+            if self.solver_executor is None:
+                self.solver_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="version-solver")
+            future = self.solver_executor.submit(self.version_solver.solve, list(requirements))
+            self.pending_solves[key] = future
+        
+        def forget(done: Future):
+            with self.solver_lock:
+                if self.pending_solves.get(key) is done:
+                    del self.pending_solves[key]
+        
+        future.add_done_callback(forget)
+        return future
+    
     def resolve_version_conflict(self, package_name: str, 
                                versions: List[str],
                                strategy: ResolutionStrategy = ResolutionStrategy.USE_LATEST) -> bool:
@@ -325,10 +395,14 @@ class DependencyResolver:
         
         try:
             # Get dependencies from all managers
-            pip_deps = self._get_pip_dependencies(app_path)
-            conda_deps = self._get_conda_dependencies(app_path)
-            npm_deps = self._get_npm_dependencies(app_path)
-            system_deps = self._get_system_dependencies(app_path)
+            dependencies = self._collect_dependencies(app_path)
+            pip_deps = dependencies["pip"]
+            conda_deps = dependencies["conda"]
+            npm_deps = dependencies["npm"]
+            system_deps = dependencies["system"]
+            
+            # Detect unsatisfiable Python requirements
+            conflicts.extend(self._detect_specifier_conflicts(dependencies["requirements"]))
             
             # Detect version conflicts
             version_conflicts = self._detect_version_conflicts(pip_deps, conda_deps, npm_deps)
@@ -351,6 +425,123 @@ class DependencyResolver:
         except Exception as e:
             return []
     
+    def _collect_dependencies(self, app_path: str) -> Dict[str, Any]:
+        """
+        Get the dependencies declared by an app, reusing them while its files are unchanged.
+        
+        Args:
+            app_path: Path to the application
+            
+        Returns:
+            Dict with pip, conda, npm and system dependencies and the raw pip requirements
+        """
+        # Stat every file the managers read; contents are only parsed when this changes
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(app_path):
+            dirs.sort()
+            for file in sorted(files):
+                if (file.startswith('requirements') and file.endswith('.txt')) or \
+                        file in ['environment.yml', 'environment.yaml', 'conda.yml', 'conda.yaml', 'package.json'] or \
+                        file.endswith(('.py', '.js', '.sh', '.bat')):
+                    file_path = os.path.join(root, file)
+                    try:
+                        stat_info = os.stat(file_path)
+                    except OSError:
+                        continue
+                    digest.update(f"{file_path}\0{stat_info.st_size}\0{stat_info.st_mtime_ns}\n".encode('utf-8', 'surrogateescape'))
+        signature = digest.hexdigest()
+        
+        cached = self.dependency_cache.get(app_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        
+        dependencies = {
+            "pip": self._get_pip_dependencies(app_path),
+            "conda": self._get_conda_dependencies(app_path),
+            "npm": self._get_npm_dependencies(app_path),
+            "system": self._get_system_dependencies(app_path),
+            "requirements": self._get_pip_requirements(app_path)
+        }
+        self.dependency_cache[app_path] = (signature, dependencies)
+        return dependencies
+    
+    def _get_pip_requirements(self, app_path: str) -> List[str]:
+        """Get the PEP 508 requirement lines from the app's requirements files."""
+        requirements = []
+        try:
+            for root, dirs, files in os.walk(app_path):
+                for file in sorted(files):
+                    if not (file.startswith('requirements') and file.endswith('.txt')):
+                        continue
+                    with open(os.path.join(root, file), 'r') as f:
+                        for line in f:
+                            line = re.split(r'\s+#', line.strip(), 1)[0].strip()
+                            # Skip comments, pip options (-r, -e, --index-url, ...) and bare URLs
+                            if not line or line.startswith(('#', '-')) or ('://' in line and '@' not in line):
+                                continue
+                            requirements.append(line)
+        
+        except Exception as e:
+            pass
+        
+        return requirements
+    
+    def _detect_specifier_conflicts(self, requirements: List[str]) -> List[DependencyConflict]:
+        """
+        Detect Python requirements that no combination of versions satisfies.
+        
+        Directly contradictory requirements are found without any I/O. With
+        solve_transitive, the full solve is waited for up to solve_timeout
+        seconds; if it takes longer, the direct conflicts are reported and the
+        solve finishes in the background for the next detection.
+        """
+        conflicts = []
+        
+        if not requirements:
+            return conflicts
+        
+        try:
+            solver_conflicts: List[SolverConflict] = []
+            solver_result = None
+            if self.solve_transitive:
+                try:
+                    solver_result = self._submit_solve(requirements).result(timeout=self.solve_timeout)
+                    solver_conflicts = solver_result.conflicts
+                except FutureTimeoutError:
+                    self._update_progress(f"Version solver: no answer within {self.solve_timeout:.0f}s, "
+                                          f"checking direct requirements only")
+            if solver_result is None:
+                solver_conflicts = self.version_solver.find_direct_conflicts(requirements)
+            
+            for solver_conflict in solver_conflicts:
+                conflict = DependencyConflict(
+                    conflict_type=ConflictType.VERSION_CONFLICT,
+                    package_name=solver_conflict.package_name,
+                    conflicting_versions=solver_conflict.requirements,
+                    conflicting_managers=["pip"],
+                    severity=self._assess_conflict_severity(solver_conflict.package_name, solver_conflict.requirements),
+                    description=solver_conflict.description,
+                    # No version satisfies the requirements, so installing one cannot fix it
+                    resolution_strategy=ResolutionStrategy.MANUAL_RESOLUTION,
+                    metadata={
+                        "source": "version_solver",
+                        "available_versions": solver_conflict.available_versions
+                    }
+                )
+                conflicts.append(conflict)
+            
+            if solver_result is not None:
+                if solver_result.unknown_packages:
+                    self._update_progress(f"Version solver: no metadata for {', '.join(solver_result.unknown_packages)}")
+                
+                for error in solver_result.errors:
+                    self._update_progress(f"Version solver: {error}")
+        
+        except Exception as e:
+            pass
+        
+        return conflicts
+    
     def _get_pip_dependencies(self, app_path: str) -> Dict[str, str]:
         """Get pip dependencies from app path."""
         try:
@@ -21,6 +21,9 @@ from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
+sys.path.append('/workspace/SD-LongNose/github_repo')
+from environment_management.tracing import traced
+
 
 class PipInstallStatus(Enum):
     """Enumeration of pip installation statuses."""
@@ -108,6 +111,7 @@ class PipManager:
         """Set progress callback function."""
         self.progress_callback = callback
     
+    @traced("pip.install_requirements", category="pip", record_args=("requirements_path", "environment_path"))
     def install_from_requirements(self, requirements_path: str, 
                                  environment_path: Optional[str] = None,
                                  upgrade: bool = False,
@@ -173,6 +177,7 @@ class PipManager:
             result.installation_time = time.time() - start_time
             return result
     
+    @traced("pip.install_package", category="pip", record_args=("package_name", "version"))
     def install_package(self, package_name: str, 
                        version: Optional[str] = None,
                        environment_path: Optional[str] = None,
@@ -224,6 +229,7 @@ class PipManager:
             package.install_time = time.time() - start_time
             return package
     
+    @traced("pip.install_batch", category="pip", record_args=("packages",))
     def install_packages_batch(self, packages: List[str], 
                               environment_path: Optional[str] = None,
                               upgrade: bool = False) -> PipInstallationResult:
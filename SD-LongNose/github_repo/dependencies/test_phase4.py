@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+PinokioCloud Phase 4 Test Suite
+
+This module tests Phase 4 - Dependency Management components that can run
+without network access, starting with the backtracking VersionSolver driven
+by fixture package metadata.
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+
+# Import Phase 4 modules
+sys.path.append('/workspace/SD-LongNose/github_repo')
+from dependencies.version_solver import VersionSolver, FixtureMetadataProvider
+from dependencies.dependency_resolver import DependencyResolver
+
+# Marker environment for a Linux CPython 3.10 host
+LINUX_ENVIRONMENT = {
+    'implementation_name': 'cpython',
+    'implementation_version': '3.10.12',
+    'os_name': 'posix',
+    'platform_machine': 'x86_64',
+    'platform_python_implementation': 'CPython',
+    'platform_release': '',
+    'platform_system': 'Linux',
+    'platform_version': '',
+    'python_full_version': '3.10.12',
+    'python_version': '3.10',
+    'sys_platform': 'linux',
+}
+
+
+class RecordingMetadataProvider(FixtureMetadataProvider):
+    """Fixture provider that records every metadata lookup."""
+
+    def __init__(self, packages):
+        super().__init__(packages)
+        self.lookups = []
+
+    def get_versions(self, name):
+        self.lookups.append(('versions', name))
+        return super().get_versions(name)
+
+    def get_dependencies(self, name, version):
+        self.lookups.append(('dependencies', name, version))
+        return super().get_dependencies(name, version)
+
+
+class TestVersionSolver(unittest.TestCase):
+    """VersionSolver against fixture metadata."""
+
+    def make_solver(self, packages):
+        """Create a solver over fixture metadata for a fixed Linux environment."""
+        self.provider = RecordingMetadataProvider(packages)
+        return VersionSolver(self.provider, environment=LINUX_ENVIRONMENT)
+
+    def test_direct_conflict_needs_no_lookups(self):
+        """Contradictory direct pins are reported without touching the metadata source."""
+        solver = self.make_solver({'torch': {'2.0.1': [], '2.1.2': [], '2.3.0': []}})
+
+        result = solver.solve(['torch>=2.0,<2.2', 'torch==2.3.*'])
+
+        self.assertFalse(result.success)
+        self.assertEqual([conflict.package_name for conflict in result.conflicts], ['torch'])
+        self.assertEqual(sorted(result.conflicts[0].requirements), ['torch<2.2,>=2.0', 'torch==2.3.*'])
+        self.assertEqual(self.provider.lookups, [])
+
+    def test_compatible_direct_requirements_solve(self):
+        """Overlapping direct ranges resolve to the newest release inside both."""
+        solver = self.make_solver({'torch': {'2.0.1': [], '2.1.2': [], '2.3.0': []}})
+
+        result = solver.solve(['torch>=2.0', 'torch<2.2'])
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.pins, {'torch': '2.1.2'})
+
+    def test_backtracks_past_incompatible_release(self):
+        """A release whose dependencies contradict a pin is skipped for an older one."""
+        solver = self.make_solver({
+            'diffusers': {
+                '0.25.0': ['torch>=2.2'],
+                '0.24.0': ['torch>=2.0'],
+            },
+            'xformers': {
+                '0.0.23': ['torch==2.1.*'],
+            },
+            'torch': {'2.0.1': [], '2.1.2': [], '2.2.0': []},
+        })
+
+        result = solver.solve(['diffusers', 'xformers'])
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.pins, {'diffusers': '0.24.0', 'torch': '2.1.2', 'xformers': '0.0.23'})
+        self.assertGreater(result.steps, 3)
+
+    def test_unsatisfiable_graph_reports_conflict(self):
+        """A transitive conflict names the package and where each constraint came from."""
+        solver = self.make_solver({
+            'app': {'1.0': ['torch<2.0']},
+            'torch': {'1.13.1': [], '2.1.2': []},
+        })
+
+        result = solver.solve(['app', 'torch>=2.1'])
+
+        self.assertFalse(result.success)
+        self.assertEqual([conflict.package_name for conflict in result.conflicts], ['torch'])
+        self.assertTrue(any('from app==1.0' in requirement for requirement in result.conflicts[0].requirements))
+        self.assertEqual(result.unknown_packages, [])
+
+    def test_extras_pull_in_their_dependencies(self):
+        """Dependencies behind an extra marker apply only when that extra is requested."""
+        packages = {
+            'transformers': {
+                '4.36.0': ['tokenizers>=0.14', 'accelerate>=0.21; extra == "torch"'],
+            },
+            'tokenizers': {'0.15.0': []},
+            'accelerate': {'0.25.0': []},
+        }
+
+        plain = self.make_solver(packages).solve(['transformers'])
+        with_extra = self.make_solver(packages).solve(['transformers[torch]'])
+
+        self.assertTrue(plain.success)
+        self.assertNotIn('accelerate', plain.pins)
+        self.assertTrue(with_extra.success)
+        self.assertEqual(with_extra.pins['accelerate'], '0.25.0')
+
+    def test_extra_requested_after_pin(self):
+        """An extra requested by a later dependency extends an already pinned package."""
+        solver = self.make_solver({
+            'gradio': {'4.0.0': ['fastapi']},
+            'fastapi': {'0.104.0': ['uvicorn; extra == "all"']},
+            'app': {'1.0': ['fastapi[all]']},
+            'uvicorn': {'0.24.0': []},
+        })
+
+        result = solver.solve(['gradio', 'app'])
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.pins.get('uvicorn'), '0.24.0')
+
+    def test_markers_follow_target_environment(self):
+        """Requirements for another platform are dropped, at the root and in dependencies."""
+        solver = self.make_solver({
+            'app': {'1.0': ['pywin32>=300; sys_platform == "win32"', 'uvloop; sys_platform == "linux"']},
+            'uvloop': {'0.19.0': []},
+        })
+
+        result = solver.solve(['app', 'triton; platform_system == "Windows"'])
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.pins, {'app': '1.0', 'uvloop': '0.19.0'})
+
+    def test_unknown_package(self):
+        """A package with no releases is reported as unknown, not as a conflict."""
+        solver = self.make_solver({'app': {'1.0': ['not-on-the-index>=1.0']}})
+
+        result = solver.solve(['app'])
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.unknown_packages, ['not-on-the-index'])
+        self.assertEqual(result.conflicts, [])
+
+    def test_unknown_results_are_not_cached(self):
+        """Solved sets are cached, lookup failures are retried."""
+        solver = self.make_solver({'torch': {'2.1.2': []}})
+
+        self.assertFalse(solver.solve(['torch', 'missing']).cached)
+        self.assertFalse(solver.solve(['torch', 'missing']).cached)
+
+        self.assertFalse(solver.solve(['torch']).cached)
+        self.assertTrue(solver.solve(['torch']).cached)
+
+
+class SlowMetadataProvider(RecordingMetadataProvider):
+    """Fixture provider that answers like a slow index."""
+
+    def __init__(self, packages, delay):
+        super().__init__(packages)
+        self.delay = delay
+
+    def get_versions(self, name):
+        time.sleep(self.delay)
+        return super().get_versions(name)
+
+
+class TestDependencyResolverConflicts(unittest.TestCase):
+    """Conflict detection in DependencyResolver."""
+
+    PACKAGES = {
+        'app': {'1.0': ['torch<2.0']},
+        'torch': {'1.13.1': [], '2.1.2': [], '2.3.0': []},
+    }
+
+    def setUp(self):
+        """Create a scratch base path and clear the opt-in flag."""
+        self.base_path = tempfile.mkdtemp(prefix="pinokio_phase4_")
+        self.saved_flag = os.environ.pop('PINOKIO_TRANSITIVE_SOLVE', None)
+
+    def tearDown(self):
+        """Restore the flag and remove the scratch directory."""
+        if self.saved_flag is not None:
+            os.environ['PINOKIO_TRANSITIVE_SOLVE'] = self.saved_flag
+        shutil.rmtree(self.base_path, ignore_errors=True)
+
+    def test_default_detection_does_no_lookups(self):
+        """Without opting in, only direct conflicts are reported and no metadata is read."""
+        provider = RecordingMetadataProvider(self.PACKAGES)
+        resolver = DependencyResolver(self.base_path, metadata_provider=provider)
+
+        direct = resolver._detect_specifier_conflicts(['torch>=2.0,<2.2', 'torch==2.3.*'])
+        transitive = resolver._detect_specifier_conflicts(['app', 'torch>=2.1'])
+
+        self.assertEqual([conflict.package_name for conflict in direct], ['torch'])
+        self.assertEqual(transitive, [])
+        self.assertEqual(provider.lookups, [])
+
+    def test_transitive_solve_is_opt_in(self):
+        """With the solve enabled, transitive conflicts are reported too."""
+        provider = RecordingMetadataProvider(self.PACKAGES)
+        resolver = DependencyResolver(self.base_path, metadata_provider=provider, solve_transitive=True)
+
+        conflicts = resolver._detect_specifier_conflicts(['app', 'torch>=2.1'])
+
+        self.assertEqual([conflict.package_name for conflict in conflicts], ['torch'])
+        self.assertNotEqual(provider.lookups, [])
+
+    def test_slow_solve_is_bounded(self):
+        """A solve slower than the deadline falls back to direct conflicts and finishes in the background."""
+        provider = SlowMetadataProvider(self.PACKAGES, delay=0.3)
+        resolver = DependencyResolver(self.base_path, metadata_provider=provider,
+                                      solve_transitive=True, solve_timeout=0.1)
+
+        start_time = time.monotonic()
+        conflicts = resolver._detect_specifier_conflicts(['app', 'torch>=2.1'])
+        self.assertLess(time.monotonic() - start_time, 0.3)
+        self.assertEqual(conflicts, [])
+
+        # The background solve is joined rather than repeated, and its result is cached
+        self.assertFalse(resolver.solve_requirements(['app', 'torch>=2.1']).success)
+        conflicts = resolver._detect_specifier_conflicts(['app', 'torch>=2.1'])
+        self.assertEqual([conflict.package_name for conflict in conflicts], ['torch'])
+
+
+def run_phase4_tests():
+    """Run all Phase 4 tests."""
+    print("=" * 60)
+    print("PHASE 4 TEST SUITE - DEPENDENCY MANAGEMENT")
+    print("=" * 60)
+
+    suite = unittest.TestSuite()
+    for test_class in (TestVersionSolver, TestDependencyResolverConflicts):
+        suite.addTests(unittest.TestLoader().loadTestsFromTestCase(test_class))
+    runner = unittest.TextTestRunner(verbosity=2, stream=sys.stdout)
+    result = runner.run(suite)
+
+    return result.wasSuccessful()
+
+
+def main():
+    """Main test function."""
+    try:
+        success = run_phase4_tests()
+
+        if success:
+            print("🎉 PHASE 4 TESTS PASSED - Dependency Management is ready!")
+            return 0
+        else:
+            print("❌ PHASE 4 TESTS FAILED - Please review and fix issues")
+            return 1
+
+    except Exception as e:
+        print(f"💥 PHASE 4 TEST SUITE ERROR: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+"""
+PinokioCloud Version Solver
+
+This module resolves Python requirement sets against package metadata before
+anything is downloaded. Requirements are parsed as PEP 508 strings (PEP 440
+specifiers, extras and environment markers) and solved by backtracking over
+a metadata graph that is memoized for the whole resolution.
+
+Metadata comes from a provider: FixtureMetadataProvider serves a static
+mapping (for offline use and tests), PyPIMetadataProvider reads the PyPI
+JSON API and keeps its answers on disk.
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple, Set, FrozenSet
+from dataclasses import dataclass, field
+
+import requests
+from packaging.markers import default_environment
+from packaging.requirements import Requirement, InvalidRequirement
+from packaging.specifiers import SpecifierSet
+from packaging.utils import canonicalize_name
+from packaging.version import Version, InvalidVersion
+
+
+@dataclass
+class SolverConflict:
+    """A package whose combined requirements no available version satisfies."""
+    package_name: str
+    requirements: List[str] = field(default_factory=list)
+    available_versions: List[str] = field(default_factory=list)
+
+    @property
+    def description(self) -> str:
+        """Human readable summary of the conflict."""
+        return f"No version of {self.package_name} satisfies {'; '.join(self.requirements)}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            'package_name': self.package_name,
+            'requirements': self.requirements,
+            'available_versions': self.available_versions
+        }
+
+
+@dataclass
+class SolverResult:
+    """Result of solving a requirement set."""
+    success: bool
+    pins: Dict[str, str] = field(default_factory=dict)
+    conflicts: List[SolverConflict] = field(default_factory=list)
+    unknown_packages: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    steps: int = 0
+    solve_time: float = 0.0
+    cached: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            'success': self.success,
+            'pins': self.pins,
+            'conflicts': [conflict.to_dict() for conflict in self.conflicts],
+            'unknown_packages': self.unknown_packages,
+            'errors': self.errors,
+            'steps': self.steps,
+            'solve_time': self.solve_time,
+            'cached': self.cached
+        }
+
+
+class MetadataProvider:
+    """Source of package versions and dependencies for the solver."""
+
+    def get_versions(self, name: str) -> List[str]:
+        """
+        Get the released versions of a package.
+
+        Args:
+            name: Canonical package name
+
+        Returns:
+            List of version strings (an unknown package has none)
+        """
+        raise NotImplementedError
+
+    def get_dependencies(self, name: str, version: str) -> List[str]:
+        """
+        Get the requirements declared by one release of a package.
+
+        Args:
+            name: Canonical package name
+            version: Version string
+
+        Returns:
+            List of PEP 508 requirement strings, including extra-only ones
+        """
+        raise NotImplementedError
+
+
+class FixtureMetadataProvider(MetadataProvider):
+    """
+    Metadata served from a static mapping, for offline resolution and tests.
+
+    The mapping is ``{name: {version: [requirement, ...]}}``.
+    """
+
+    def __init__(self, packages: Dict[str, Dict[str, List[str]]]):
+        """
+        Initialize the provider.
+
+        Args:
+            packages: Package metadata mapping
+        """
+        self.packages = {
+            canonicalize_name(name): dict(versions) for name, versions in packages.items()
+        }
+
+    @classmethod
+    def from_file(cls, path: str) -> 'FixtureMetadataProvider':
+        """Load the metadata mapping from a JSON file."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def get_versions(self, name: str) -> List[str]:
+        return list(self.packages.get(name, {}))
+
+    def get_dependencies(self, name: str, version: str) -> List[str]:
+        return list(self.packages.get(name, {}).get(version, []))
+
+
+class PyPIMetadataProvider(MetadataProvider):
+    """
+    Metadata read from the PyPI JSON API, cached on disk.
+
+    Release dependencies never change and are kept indefinitely; version
+    lists are refreshed after ``versions_ttl`` seconds.
+    """
+
+    def __init__(self, cache_dir: str, index_url: str = "https://pypi.org/pypi",
+                 timeout: float = 10.0, versions_ttl: float = 24 * 3600):
+        """
+        Initialize the provider.
+
+        Args:
+            cache_dir: Directory holding cached API answers
+            index_url: Base URL of the JSON API
+            timeout: HTTP timeout in seconds
+            versions_ttl: Seconds a cached version list stays valid
+        """
+        self.cache_dir = cache_dir
+        self.index_url = index_url.rstrip('/')
+        self.timeout = timeout
+        self.versions_ttl = versions_ttl
+        self.session = requests.Session()
+
+    def _cache_path(self, key: str) -> str:
+        """Get the cache file path for a key."""
+        safe_key = re.sub(r'[^A-Za-z0-9_.-]', '_', key)[:100]
+        return os.path.join(self.cache_dir, f"{safe_key}.json")
+
+    def _read_cache(self, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """Read a cached answer, or None if missing or too old."""
+        path = self._cache_path(key)
+        try:
+            if max_age is not None and time.time() - os.path.getmtime(path) > max_age:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, key: str, value: Any):
+        """Store an answer atomically."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".json", dir=self.cache_dir)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+            os.replace(temp_path, self._cache_path(key))
+        except OSError:
+            pass
+
+    def _fetch(self, path: str) -> Optional[Dict[str, Any]]:
+        """Fetch a JSON API document, or None if the project or release is unknown."""
+        response = self.session.get(f"{self.index_url}/{path}/json", timeout=self.timeout)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    def get_versions(self, name: str) -> List[str]:
+        cached = self._read_cache(f"versions__{name}", max_age=self.versions_ttl)
+        if cached is not None:
+            return cached
+
+        document = self._fetch(name)
+        versions = []
+        if document:
+            for version, files in document.get('releases', {}).items():
+                # Skip releases whose every file was yanked
+                if files and all(f.get('yanked') for f in files):
+                    continue
+                versions.append(version)
+
+        self._write_cache(f"versions__{name}", versions)
+        return versions
+
+    def get_dependencies(self, name: str, version: str) -> List[str]:
+        key = f"release__{name}__{version}"
+        cached = self._read_cache(key)
+        if cached is not None:
+            return cached
+
+        document = self._fetch(f"{name}/{version}")
+        dependencies = list((document or {}).get('info', {}).get('requires_dist') or [])
+
+        self._write_cache(key, dependencies)
+        return dependencies
+
+
+class MetadataGraph:
+    """
+    Memoized view of a metadata provider for one resolution.
+
+    Each package's versions and each release's parsed requirements are
+    fetched at most once, however often the solver backtracks over them.
+    """
+
+    def __init__(self, provider: MetadataProvider):
+        """
+        Initialize the graph.
+
+        Args:
+            provider: Metadata provider
+        """
+        self.provider = provider
+        self.versions: Dict[str, List[Version]] = {}
+        self.dependencies: Dict[Tuple[str, Version], List[Requirement]] = {}
+        self.lookups = 0
+
+    def get_versions(self, name: str) -> List[Version]:
+        """Get the parseable versions of a package, newest first."""
+        if name not in self.versions:
+            self.lookups += 1
+            parsed = []
+            for version in self.provider.get_versions(name):
+                try:
+                    parsed.append(Version(version))
+                except InvalidVersion:
+                    continue
+            self.versions[name] = sorted(set(parsed), reverse=True)
+        return self.versions[name]
+
+    def get_dependencies(self, name: str, version: Version) -> List[Requirement]:
+        """Get the parsed requirements of a release (unparseable ones are skipped)."""
+        key = (name, version)
+        if key not in self.dependencies:
+            self.lookups += 1
+            parsed = []
+            for requirement in self.provider.get_dependencies(name, str(version)):
+                try:
+                    parsed.append(Requirement(requirement))
+                except InvalidRequirement:
+                    continue
+            self.dependencies[key] = parsed
+        return self.dependencies[key]
+
+
+class _SolverState:
+    """Pins, accumulated constraints and requested extras during backtracking."""
+
+    def __init__(self):
+        self.pins: Dict[str, Version] = {}
+        self.constraints: Dict[str, List[Tuple[SpecifierSet, str]]] = {}
+        self.extras: Dict[str, FrozenSet[str]] = {}
+
+    def copy(self) -> '_SolverState':
+        state = _SolverState()
+        state.pins = dict(self.pins)
+        state.constraints = {name: list(specs) for name, specs in self.constraints.items()}
+        state.extras = dict(self.extras)
+        return state
+
+
+class _SolverAborted(Exception):
+    """Raised when the solver exceeds its step budget."""
+
+
+class VersionSolver:
+    """
+    Backtracking PEP 440 requirement solver.
+
+    The package with the fewest remaining candidates is decided first, and
+    its candidates are tried newest first; a release whose dependencies
+    contradict an existing pin is skipped, and a package left without
+    candidates makes the solver backtrack. Results are cached by a hash of
+    the requirement set and target environment.
+    """
+
+    def __init__(self, provider: MetadataProvider, environment: Optional[Dict[str, str]] = None,
+                 max_steps: int = 20000, cache_size: int = 64):
+        """
+        Initialize the solver.
+
+        Args:
+            provider: Metadata provider
+            environment: Marker environment (defaults to the running interpreter)
+            max_steps: Candidate attempts allowed before giving up
+            cache_size: Number of solved requirement sets kept
+        """
+        self.provider = provider
+        self.environment = dict(environment or default_environment())
+        self.max_steps = max_steps
+        self.cache_size = cache_size
+        self.result_cache: "OrderedDict[str, SolverResult]" = OrderedDict()
+        self.cache_lock = threading.Lock()
+
+        # Per-resolution bookkeeping
+        self._steps = 0
+        self._failures: Dict[str, SolverConflict] = OrderedDict()
+        self._unknown: Set[str] = set()
+
+    def requirement_set_key(self, requirements: List[str]) -> str:
+        """Hash identifying a requirement set in this solver's environment."""
+        normalized = sorted(str(requirement).strip() for requirement in requirements)
+        environment = json.dumps(self.environment, sort_keys=True)
+        return hashlib.sha256(('\n'.join(normalized) + '\0' + environment).encode('utf-8')).hexdigest()
+
+    def parse_requirements(self, requirements: List[str]) -> Tuple[List[Requirement], List[str]]:
+        """
+        Parse requirement strings, dropping those whose markers do not apply.
+
+        Args:
+            requirements: PEP 508 requirement strings
+
+        Returns:
+            Tuple of (applicable requirements, error messages)
+        """
+        parsed = []
+        errors = []
+        for requirement in requirements:
+            try:
+                parsed_requirement = Requirement(requirement)
+            except InvalidRequirement as e:
+                errors.append(f"Invalid requirement '{requirement}': {e}")
+                continue
+            if parsed_requirement.marker is None or parsed_requirement.marker.evaluate(self.environment):
+                parsed.append(parsed_requirement)
+        return parsed, errors
+
+    def find_direct_conflicts(self, requirements: List[str]) -> List[SolverConflict]:
+        """
+        Find packages whose direct requirements contradict each other, without metadata.
+
+        Each package's specifiers are tested against probe versions derived
+        from the specifiers themselves, so this needs no I/O.
+
+        Args:
+            requirements: PEP 508 requirement strings
+
+        Returns:
+            List of conflicts
+        """
+        parsed, _ = self.parse_requirements(requirements)
+        grouped: Dict[str, List[Requirement]] = OrderedDict()
+        for requirement in parsed:
+            grouped.setdefault(canonicalize_name(requirement.name), []).append(requirement)
+
+        conflicts = []
+        for name, group in grouped.items():
+            if len(group) < 2:
+                continue
+            specifiers = [requirement.specifier for requirement in group]
+            probes = _probe_versions(specifiers)
+            if probes and not any(all(spec.contains(probe, prereleases=True) for spec in specifiers) for probe in probes):
+                conflicts.append(SolverConflict(
+                    package_name=name,
+                    requirements=[str(requirement) for requirement in group]
+                ))
+        return conflicts
+
+    def solve(self, requirements: List[str]) -> SolverResult:
+        """
+        Solve a requirement set.
+
+        Args:
+            requirements: PEP 508 requirement strings
+
+        Returns:
+            SolverResult: Pinned versions, or the conflicts that prevented a solution
+        """
+        key = self.requirement_set_key(requirements)
+        with self.cache_lock:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                self.result_cache.move_to_end(key)
+                return SolverResult(**{**cached.__dict__, 'cached': True})
+
+        start_time = time.time()
+        result = SolverResult(success=False)
+
+        parsed, result.errors = self.parse_requirements(requirements)
+
+        # Contradictory direct requirements fail without any metadata lookups
+        direct_conflicts = self.find_direct_conflicts(requirements)
+        if direct_conflicts:
+            result.conflicts = direct_conflicts
+        else:
+            graph = MetadataGraph(self.provider)
+            self._steps = 0
+            self._failures = OrderedDict()
+            self._unknown = set()
+
+            state = _SolverState()
+            try:
+                for requirement in parsed:
+                    if not self._add_requirement(state, requirement, "<root>", graph):
+                        break
+                else:
+                    solution = self._search(state, graph)
+                    if solution is not None:
+                        result.success = True
+                        result.pins = {name: str(version) for name, version in sorted(solution.pins.items())}
+            except _SolverAborted:
+                result.errors.append(f"Resolution abandoned after {self.max_steps} steps")
+            except requests.exceptions.RequestException as e:
+                result.errors.append(f"Metadata lookup failed: {e}")
+
+            if not result.success:
+                result.conflicts = list(self._failures.values())
+                result.unknown_packages = sorted(self._unknown)
+            result.steps = self._steps
+
+        result.solve_time = time.time() - start_time
+
+        # Lookup failures are not cached so a later attempt can succeed
+        if result.success or (result.conflicts and not result.unknown_packages):
+            with self.cache_lock:
+                self.result_cache[key] = result
+                while len(self.result_cache) > self.cache_size:
+                    self.result_cache.popitem(last=False)
+
+        return result
+
+    def _search(self, state: _SolverState, graph: MetadataGraph) -> Optional[_SolverState]:
+        """Depth-first search over candidate versions."""
+        pending = [name for name in state.constraints if name not in state.pins]
+        if not pending:
+            return state
+
+        candidates = {name: self._candidates(state, name, graph) for name in pending}
+        name = min(pending, key=lambda n: (len(candidates[n]), n))
+
+        if not candidates[name]:
+            if graph.get_versions(name):
+                self._record_failure(state, name, graph)
+            else:
+                # Not a version conflict: the metadata source has no releases for it
+                self._unknown.add(name)
+            return None
+
+        for version in candidates[name]:
+            self._steps += 1
+            if self._steps > self.max_steps:
+                raise _SolverAborted()
+
+            next_state = state.copy()
+            if not self._pin(next_state, name, version, graph):
+                continue
+            solution = self._search(next_state, graph)
+            if solution is not None:
+                return solution
+
+        return None
+
+    def _candidates(self, state: _SolverState, name: str, graph: MetadataGraph) -> List[Version]:
+        """Versions of a package allowed by every constraint on it, newest first."""
+        specifiers = [specifier for specifier, _ in state.constraints[name]]
+        versions = graph.get_versions(name)
+        allowed = [v for v in versions if all(spec.contains(v) for spec in specifiers)]
+        if not allowed:
+            # Pre-releases are only considered when nothing else fits
+            allowed = [v for v in versions if all(spec.contains(v, prereleases=True) for spec in specifiers)]
+        return allowed
+
+    def _pin(self, state: _SolverState, name: str, version: Version, graph: MetadataGraph) -> bool:
+        """Pin a release and add its dependencies; False if they contradict a pin."""
+        state.pins[name] = version
+        return self._add_dependencies(state, name, version, state.extras.get(name, frozenset()), graph)
+
+    def _add_dependencies(self, state: _SolverState, name: str, version: Version,
+                          extras: FrozenSet[str], graph: MetadataGraph) -> bool:
+        """Add the dependencies of a pinned release for the given extras."""
+        parent = f"{name}=={version}"
+        for requirement in graph.get_dependencies(name, version):
+            if requirement.marker is not None:
+                # The base dependencies apply with an empty extra; each requested extra adds its own
+                if not any(requirement.marker.evaluate({**self.environment, 'extra': extra})
+                           for extra in ('',) + tuple(sorted(extras))):
+                    continue
+            if not self._add_requirement(state, requirement, parent, graph):
+                return False
+        return True
+
+    def _add_requirement(self, state: _SolverState, requirement: Requirement,
+                         parent: str, graph: MetadataGraph) -> bool:
+        """Constrain a package; False if the constraint excludes its current pin."""
+        name = canonicalize_name(requirement.name)
+        state.constraints.setdefault(name, []).append((requirement.specifier, parent))
+
+        pinned = state.pins.get(name)
+        if pinned is not None and not requirement.specifier.contains(pinned, prereleases=True):
+            self._record_failure(state, name, graph)
+            return False
+
+        requested = frozenset(canonicalize_name(extra) for extra in requirement.extras)
+        known = state.extras.get(name, frozenset())
+        new_extras = requested - known
+        if new_extras:
+            state.extras[name] = known | new_extras
+            # A pinned package gains the dependencies of the newly requested extras
+            if pinned is not None:
+                return self._add_dependencies(state, name, pinned, frozenset(new_extras), graph)
+
+        return True
+
+    def _record_failure(self, state: _SolverState, name: str, graph: MetadataGraph):
+        """Remember why a package ran out of candidates or lost its pin."""
+        requirements = []
+        for specifier, parent in state.constraints[name]:
+            described = f"{name}{specifier}" if str(specifier) else name
+            requirements.append(f"{described} (from {parent})")
+
+        # Keep the most recent explanation per package
+        self._failures.pop(name, None)
+        self._failures[name] = SolverConflict(
+            package_name=name,
+            requirements=requirements,
+            available_versions=[str(v) for v in graph.get_versions(name)[:10]]
+        )
+
+
+def _probe_versions(specifiers: List[SpecifierSet]) -> List[Version]:
+    """
+    Versions at and just beside every bound mentioned by the specifiers.
+
+    Any non-empty intersection of PEP 440 ranges contains one of these, apart
+    from ranges narrower than a fourth release component.
+    """
+    probes: Set[Version] = set()
+    for specifier_set in specifiers:
+        for specifier in specifier_set:
+            text = specifier.version.rstrip('.*')
+            try:
+                base = Version(text)
+            except InvalidVersion:
+                continue
+            release = list(base.release)
+            probes.add(base)
+            probes.add(Version('.'.join(map(str, release + [0, 0, 1]))))
+            for index in range(len(release)):
+                bumped = release[:index] + [release[index] + 1]
+                probes.add(Version('.'.join(map(str, bumped))))
+                if release[index] > 0:
+                    lowered = release[:index] + [release[index] - 1, 999999]
+                    probes.add(Version('.'.join(map(str, lowered))))
+    return sorted(probes)
@@ -13,6 +13,7 @@ from engine.installer import ApplicationInstaller, InstallationResult, Installat
 from engine.script_parser import ScriptParser, ScriptExecutionResult, ScriptType
 from engine.input_handler import InputHandler, FormResult, FormDefinition, InputType
 from engine.state_manager import StateManager, ApplicationState, InstallationState, ApplicationStatus
+from engine.state_store import StateStore, atomic_write_json
 from engine.installation_coordinator import InstallationCoordinator, CoordinationResult, CoordinationStatus
 
 __all__ = [
@@ -38,6 +39,10 @@ __all__ = [
     'InstallationState',
     'ApplicationStatus',
     
+    # State Store
+    'StateStore',
+    'atomic_write_json',
+    
     # Installation Coordinator
     'InstallationCoordinator',
     'CoordinationResult',
@@ -37,6 +37,8 @@ from environment_management.file_system import FileSystemManager
 from environment_management.shell_runner import ShellRunner
 from environment_management.variable_system import VariableSystem
 from environment_management.json_handler import JSONHandler
+from environment_management.tracing import traced, current_span
+from cloud_detection.repo_cloner import RepositoryCloner, GitObjectCache, CloneStrategy, CloneScheduler
 from .installer import ApplicationInstaller, InstallationResult, InstallationStatus
 from .script_parser import ScriptParser, ScriptExecutionResult
 from .input_handler import InputHandler, FormResult
@@ -127,6 +129,16 @@ class InstallationCoordinator:
         self.shell_runner = ShellRunner(base_path)
         self.variable_system = VariableSystem(base_path)
         self.json_handler = JSONHandler(base_path)
+        
+        # Objects of cloned app repositories, shared by reinstalls and forks
+        self.git_object_cache = GitObjectCache(os.path.join(base_path, "cache", "git_objects"))
+        
+        # Fetches a batch's repositories concurrently, optionally within a bandwidth budget
+        bandwidth_limit = os.environ.get('PINOKIO_CLONE_BANDWIDTH_MBPS')
+        self.clone_scheduler = CloneScheduler(
+            max_concurrent=4,
+            bandwidth_limit_mbps=float(bandwidth_limit) if bandwidth_limit else None
+        )
         self.installer = ApplicationInstaller(base_path)
         self.script_parser = ScriptParser(base_path)
         self.input_handler = InputHandler(base_path)
@@ -146,6 +158,7 @@ class InstallationCoordinator:
         """Set progress callback function."""
         self.progress_callback = callback
     
+    @traced("install.coordinate", category="install", record_args=("app_name", "app_source"))
     def coordinate_installation(self, app_name: str, app_source: str,
                               user_inputs: Optional[Dict[str, Any]] = None,
                               force_reinstall: bool = False) -> CoordinationResult:
@@ -163,6 +176,7 @@ class InstallationCoordinator:
         """
         start_time = time.time()
         installation_id = f"install_{app_name}_{int(time.time())}"
+        current_span().set_attribute("installation_id", installation_id)
         
         result = CoordinationResult(
             success=False,
@@ -304,6 +318,8 @@ class InstallationCoordinator:
         """
         results = []
         
+        self._prefetch_repositories([request.get('source', '') for request in app_requests])
+        
         for i, request in enumerate(app_requests):
             app_name = request.get('name', f'app_{i}')
             app_source = request.get('source', '')
@@ -323,6 +339,33 @@ class InstallationCoordinator:
         
         return results
     
+    def _prefetch_repositories(self, sources: List[str]):
+        """
+        Fetch a batch's git repositories into the object cache concurrently.
+        
+        The installs themselves run one after another; with their objects
+        already cached, each clone only checks out.
+        
+        Args:
+            sources: Application sources of the batch
+        """
+        urls = list(dict.fromkeys(source for source in sources if self._is_git_source(source)))
+        if len(urls) < 2:
+            return
+        
+        self._update_progress(f"Fetching {len(urls)} repositories into the object cache...")
+        cloners = [RepositoryCloner("local", self.base_path, repository_url=url,
+                                    object_cache=self.git_object_cache) for url in urls]
+        fetched = self.clone_scheduler.run(cloners, operation=lambda cloner: cloner.update_object_cache())
+        failed = [url for url, path in zip(urls, fetched) if path is None]
+        if failed:
+            self._update_progress(f"Could not prefetch {len(failed)} repositories; they will be cloned directly")
+    
+    @staticmethod
+    def _is_git_source(source: str) -> bool:
+        """Check whether an application source is cloned with git."""
+        return 'github.com' in source or 'gitlab.com' in source
+    
     def get_coordination_status(self, installation_id: str) -> Optional[CoordinationResult]:
         """
         Get coordination status.
@@ -386,6 +429,7 @@ class InstallationCoordinator:
             history.sort(key=lambda x: x.coordination_time, reverse=True)
             return history[:limit]
     
+    @traced("install.analyze", category="install")
     def _analyze_application(self, app_name: str, app_source: str) -> Optional[AppProfile]:
         """Analyze application to determine requirements."""
         try:
@@ -413,6 +457,7 @@ class InstallationCoordinator:
         except Exception as e:
             return None
     
+    @traced("install.collect_input", category="install")
     def _collect_user_input(self, app_name: str, app_profile: AppProfile, 
                            user_inputs: Optional[Dict[str, Any]]) -> Optional[FormResult]:
         """Collect user input for installation."""
@@ -438,6 +483,7 @@ class InstallationCoordinator:
         except Exception as e:
             return None
     
+    @traced("install.setup_environment", category="install")
     def _setup_environment(self, app_name: str, app_profile: AppProfile, 
                           user_inputs: Dict[str, Any]) -> bool:
         """Setup environment for installation."""
@@ -464,6 +510,7 @@ class InstallationCoordinator:
         except Exception as e:
             return False
     
+    @traced("install.dependencies", category="install")
     def _install_dependencies(self, app_name: str, app_profile: AppProfile, 
                             user_inputs: Dict[str, Any]) -> bool:
         """Install application dependencies."""
@@ -525,6 +572,7 @@ class InstallationCoordinator:
         except Exception as e:
             return False
     
+    @traced("install.application", category="install")
     def _install_application(self, app_name: str, app_source: str, app_profile: AppProfile, 
                            user_inputs: Dict[str, Any]) -> Optional[InstallationResult]:
         """Install the application."""
@@ -542,6 +590,7 @@ class InstallationCoordinator:
         except Exception as e:
             return None
     
+    @traced("install.verify", category="install")
     def _verify_installation(self, app_name: str, app_path: str) -> bool:
         """Verify application installation."""
         try:
@@ -555,6 +604,7 @@ class InstallationCoordinator:
         except Exception as e:
             return False
     
+    @traced("install.configure", category="install")
     def _configure_application(self, app_name: str, app_path: str, app_profile: AppProfile, 
                              user_inputs: Dict[str, Any]) -> bool:
         """Configure application after installation."""
@@ -611,13 +661,17 @@ class InstallationCoordinator:
         except Exception as e:
             return {}
     
+    @traced("install.download", category="install")
     def _download_application(self, url: str, target_path: str):
         """Download application from URL."""
         try:
             # Use git clone if it's a git repository
-            if 'github.com' in url or 'gitlab.com' in url:
-                import subprocess
-                subprocess.run(['git', 'clone', url, target_path], check=True)
+            if self._is_git_source(url):
+                cloner = RepositoryCloner("local", os.path.dirname(target_path), repository_url=url,
+                                          target_path=target_path, object_cache=self.git_object_cache)
+                clone_result = cloner.clone_repository(strategy=CloneStrategy.BLOBLESS)
+                if not clone_result.success:
+                    raise Exception(clone_result.error_message or "git clone failed")
             else:
                 # Use wget or curl for other URLs
                 import subprocess
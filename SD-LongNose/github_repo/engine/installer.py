@@ -39,6 +39,8 @@ from environment_management.file_system import FileSystemManager
 from environment_management.shell_runner import ShellRunner
 from environment_management.variable_system import VariableSystem
 from environment_management.json_handler import JSONHandler
+from environment_management.tracing import traced
+from cloud_detection.repo_cloner import RepositoryCloner, GitObjectCache, CloneStrategy
 
 
 class InstallationStatus(Enum):
@@ -129,6 +131,9 @@ class ApplicationInstaller:
         self.variable_system = VariableSystem(base_path)
         self.json_handler = JSONHandler(base_path)
         
+        # Objects of cloned app repositories, shared by reinstalls and forks
+        self.git_object_cache = GitObjectCache(os.path.join(base_path, "cache", "git_objects"))
+        
         # Installation tracking
         self.active_installations: Dict[str, InstallationResult] = {}
         self.installation_history: List[InstallationResult] = []
@@ -143,6 +148,7 @@ class ApplicationInstaller:
         """Set progress callback function."""
         self.progress_callback = callback
     
+    @traced("install.application", category="install", record_args=("app_name", "app_source"))
     def install_application(self, app_name: str, 
                            app_source: str,
                            user_inputs: Optional[Dict[str, Any]] = None,
@@ -354,6 +360,7 @@ class ApplicationInstaller:
         """
         return self.active_installations.get(app_name)
     
+    @traced("install.analyze", category="install")
     def _analyze_application(self, app_name: str, app_source: str) -> Optional[AppProfile]:
         """
         Analyze application to determine installation requirements.
@@ -390,6 +397,7 @@ class ApplicationInstaller:
         except Exception as e:
             return None
     
+    @traced("install.setup_environment", category="install")
     def _setup_environment(self, app_name: str, app_profile: AppProfile) -> Optional[str]:
         """
         Setup environment for application installation.
@@ -429,6 +437,7 @@ class ApplicationInstaller:
         except Exception as e:
             return None
     
+    @traced("install.dependencies", category="install")
     def _install_dependencies(self, app_name: str, app_profile: AppProfile, 
                             environment_path: str) -> bool:
         """
@@ -503,6 +512,7 @@ class ApplicationInstaller:
         except Exception as e:
             return False
     
+    @traced("install.application_files", category="install")
     def _install_application_files(self, app_name: str, app_source: str, 
                                  app_profile: AppProfile, environment_path: str) -> Optional[str]:
         """
@@ -548,6 +558,7 @@ class ApplicationInstaller:
         except Exception as e:
             return None
     
+    @traced("install.verify", category="install")
     def _verify_installation(self, app_name: str, app_path: str, 
                            environment_path: str) -> bool:
         """
@@ -573,6 +584,7 @@ class ApplicationInstaller:
         except Exception as e:
             return False
     
+    @traced("install.configure", category="install")
     def _configure_application(self, app_name: str, app_path: str, 
                              app_profile: AppProfile, user_inputs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -611,12 +623,17 @@ class ApplicationInstaller:
         except Exception as e:
             return {}
     
+    @traced("install.download", category="install")
     def _download_application(self, url: str, target_path: str):
         """Download application from URL."""
         try:
             # Use git clone if it's a git repository
             if 'github.com' in url or 'gitlab.com' in url:
-                subprocess.run(['git', 'clone', url, target_path], check=True)
+                cloner = RepositoryCloner("local", os.path.dirname(target_path), repository_url=url,
+                                          target_path=target_path, object_cache=self.git_object_cache)
+                clone_result = cloner.clone_repository(strategy=CloneStrategy.BLOBLESS)
+                if not clone_result.success:
+                    raise Exception(clone_result.error_message or "git clone failed")
             else:
                 # Use wget or curl for other URLs
                 subprocess.run(['wget', '-O', target_path, url], check=True)
@@ -624,6 +641,7 @@ class ApplicationInstaller:
         except Exception as e:
             raise Exception(f"Failed to download application: {str(e)}")
     
+    @traced("install.run_script", category="install")
     def _execute_install_script(self, script_path: str, app_path: str, environment_path: str):
         """Execute install.js script."""
         try:
@@ -644,6 +662,7 @@ class ApplicationInstaller:
         except Exception as e:
             raise Exception(f"Failed to execute install script: {str(e)}")
     
+    @traced("install.run_script", category="install")
     def _execute_install_json(self, json_path: str, app_path: str, environment_path: str):
         """Execute install.json configuration."""
         try:
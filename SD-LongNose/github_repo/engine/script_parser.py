@@ -24,8 +24,10 @@ from pathlib import Path
 sys.path.append('/workspace/github_repo')
 from environment_management.shell_runner import ShellRunner
 from environment_management.variable_system import VariableSystem
+from environment_management.expression_compiler import evaluate_condition, ExpressionError
 from environment_management.json_handler import JSONHandler
 from environment_management.file_system import FileSystemManager
+from environment_management.tracing import traced, current_span
 
 
 class ScriptType(Enum):
@@ -503,9 +505,12 @@ class ScriptParser:
         except Exception as e:
             return StepType.SHELL_COMMAND
     
+    @traced("script.step", category="script")
     def _execute_step(self, step: ScriptStep, working_directory: Optional[str] = None) -> ExecutionResult:
         """Execute a single script step."""
         start_time = time.time()
+        current_span().set_attributes(step_id=step.step_id, step_type=step.step_type.value,
+                                      command=step.command[:200])
         
         result = ExecutionResult(
             success=False,
@@ -672,6 +677,7 @@ class ScriptParser:
             result.status = ExecutionStatus.FAILED
             return result
     
+    @traced("script.download", category="script")
     def _execute_download(self, step: ScriptStep) -> ExecutionResult:
         """Execute download step."""
         result = ExecutionResult(
@@ -715,6 +721,7 @@ class ScriptParser:
             result.status = ExecutionStatus.FAILED
             return result
     
+    @traced("script.extract", category="script")
     def _execute_extract(self, step: ScriptStep) -> ExecutionResult:
         """Execute extract step."""
         result = ExecutionResult(
@@ -859,8 +866,13 @@ class ScriptParser:
     def _evaluate_condition(self, condition: str) -> bool:
         """Evaluate condition string."""
         try:
-            # Simple condition evaluation
-            # This can be enhanced for more complex conditions
+            # Pinokio expressions (e.g. "{{platform === 'linux' && gpu}}") against the variable system
+            try:
+                return evaluate_condition(condition, self.variable_system.get_scope())
+            except ExpressionError:
+                pass
+            
+            # Fall back to plain text comparisons for non-expression conditions
             if '==' in condition:
                 left, right = condition.split('==', 1)
                 return left.strip() == right.strip()
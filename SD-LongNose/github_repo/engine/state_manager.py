@@ -15,7 +15,7 @@ import json
 import time
 import threading
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 from enum import Enum
 from pathlib import Path
 
@@ -23,6 +23,7 @@ from pathlib import Path
 sys.path.append('/workspace/github_repo')
 from environment_management.json_handler import JSONHandler
 from environment_management.file_system import FileSystemManager
+from engine.state_store import StateStore, atomic_write_json
 
 
 class ApplicationStatus(Enum):
@@ -114,6 +115,10 @@ class StateManager:
     - State synchronization and backup
     - State history and audit trails
     - Real-time state updates
+    
+    Mutations only mark the touched records dirty. A background writer
+    debounces bursts of updates and persists just the dirty records to a
+    SQLite WAL store, so a single update costs O(1) I/O.
     """
     
     def __init__(self, base_path: str = "/workspace"):
@@ -136,12 +141,18 @@ class StateManager:
         self.system_state: Optional[SystemState] = None
         
         # State persistence
-        self.state_file = os.path.join(self.state_path, "state.json")
+        self.state_file = os.path.join(self.state_path, "state.json")  # legacy snapshot, migrated on load
+        self.state_db_file = os.path.join(self.state_path, "state.db")
         self.backup_path = os.path.join(self.state_path, "backups")
+        self.dirty_records = set()
+        self.deleted_records = set()
         
         # Threading
         self.lock = threading.RLock()
-        self.auto_save_interval = 30  # seconds
+        self.flush_lock = threading.Lock()
+        self.save_event = threading.Event()
+        self.save_debounce = 0.5  # seconds to coalesce bursts of updates
+        self.auto_save_interval = 30  # seconds, upper bound between flushes
         self.auto_save_thread = None
         self.auto_save_enabled = True
         
@@ -151,6 +162,7 @@ class StateManager:
         # Ensure state directory exists
         os.makedirs(self.state_path, exist_ok=True)
         os.makedirs(self.backup_path, exist_ok=True)
+        self.store = StateStore(self.state_db_file)
         
         # Load existing state
         self._load_state()
@@ -192,8 +204,8 @@ class StateManager:
                 )
                 
                 self.applications[app_name] = app_state
+                self._mark_dirty("application", app_name)
                 self._update_system_state()
-                self._save_state()
                 
                 self._update_progress(f"Registered application: {app_name}")
                 return True
@@ -229,8 +241,8 @@ class StateManager:
                 if metadata:
                     app_state.metadata.update(metadata)
                 
+                self._mark_dirty("application", app_name)
                 self._update_system_state()
-                self._save_state()
                 
                 self._update_progress(f"Updated {app_name} status to {status.value}")
                 return True
@@ -255,7 +267,7 @@ class StateManager:
                     return False
                 
                 self.applications[app_name].total_runtime += runtime
-                self._save_state()
+                self._mark_dirty("application", app_name)
                 
                 return True
         
@@ -279,7 +291,7 @@ class StateManager:
                     return False
                 
                 self.applications[app_name].process_info = process_info
-                self._save_state()
+                self._mark_dirty("application", app_name)
                 
                 return True
         
@@ -316,7 +328,7 @@ class StateManager:
                 if len(self.applications[app_name].error_history) > 100:
                     self.applications[app_name].error_history = self.applications[app_name].error_history[-100:]
                 
-                self._save_state()
+                self._mark_dirty("application", app_name)
                 return True
         
         except Exception as e:
@@ -338,8 +350,8 @@ class StateManager:
                     return False
                 
                 del self.applications[app_name]
+                self._mark_deleted("application", app_name)
                 self._update_system_state()
-                self._save_state()
                 
                 self._update_progress(f"Unregistered application: {app_name}")
                 return True
@@ -407,8 +419,8 @@ class StateManager:
                 )
                 
                 self.installations[installation_id] = installation_state
+                self._mark_dirty("installation", installation_id)
                 self._update_system_state()
-                self._save_state()
                 
                 self._update_progress(f"Registered installation: {installation_id}")
                 return True
@@ -453,8 +465,8 @@ class StateManager:
                 if warnings:
                     installation_state.warnings.extend(warnings)
                 
+                self._mark_dirty("installation", installation_id)
                 self._update_system_state()
-                self._save_state()
                 
                 self._update_progress(f"Updated installation {installation_id} status to {status.value}")
                 return True
@@ -522,7 +534,7 @@ class StateManager:
                 
                 self.system_state.system_resources = resources
                 self.system_state.last_updated = time.time()
-                self._save_state()
+                self._mark_dirty("system", self.system_state.system_id)
                 
                 return True
         
@@ -559,7 +571,7 @@ class StateManager:
                 else:
                     self.system_state.status = SystemStatus.HEALTHY
                 
-                self._save_state()
+                self._mark_dirty("system", self.system_state.system_id)
                 return True
         
         except Exception as e:
@@ -618,7 +630,7 @@ class StateManager:
                 backup_file = os.path.join(self.backup_path, f"state_backup_{timestamp}.json")
                 
                 state_data = self._serialize_state()
-                self.json_handler.write_json(backup_file, state_data)
+                atomic_write_json(backup_file, state_data)
                 
                 self._update_progress(f"Created state backup: {backup_file}")
                 return True
@@ -637,16 +649,23 @@ class StateManager:
             bool: True if restore successful
         """
         try:
-            with self.lock:
-                if not os.path.exists(backup_file):
-                    return False
-                
-                state_data = self.json_handler.read_json(backup_file)
-                self._deserialize_state(state_data)
-                self._save_state()
-                
-                self._update_progress(f"Restored state from backup: {backup_file}")
-                return True
+            if not os.path.exists(backup_file):
+                return False
+            
+            success, state_data, error = self.json_handler.load_json(backup_file)
+            if not success:
+                return False
+            
+            # Same lock order as _save_state (flush_lock, then lock), so a
+            # restore can't deadlock against an auto-save flush
+            with self.flush_lock:
+                with self.lock:
+                    self._deserialize_state(state_data)
+                    records = self._collect_stored_records()
+                self.store.replace_all(records)
+            
+            self._update_progress(f"Restored state from backup: {backup_file}")
+            return True
         
         except Exception as e:
             return False
@@ -699,40 +718,132 @@ class StateManager:
             self.system_state.active_installations = len(self.get_active_installations())
             
             self.system_state.last_updated = time.time()
+            self._mark_dirty("system", self.system_state.system_id)
         
         except Exception as e:
             pass
     
-    def _save_state(self):
-        """Save state to file."""
-        try:
-            state_data = self._serialize_state()
-            self.json_handler.write_json(self.state_file, state_data)
+    def _mark_dirty(self, kind: str, key: str):
+        """Mark a record as changed and schedule a debounced save."""
+        with self.lock:
+            self.deleted_records.discard((kind, key))
+            self.dirty_records.add((kind, key))
+        self.save_event.set()
+    
+    def _mark_deleted(self, kind: str, key: str):
+        """Mark a record as removed and schedule a debounced save."""
+        with self.lock:
+            self.dirty_records.discard((kind, key))
+            self.deleted_records.add((kind, key))
+        self.save_event.set()
+    
+    def _get_record(self, kind: str, key: str) -> Optional[Any]:
+        """Get the in-memory record addressed by (kind, key)."""
+        if kind == "application":
+            return self.applications.get(key)
+        if kind == "installation":
+            return self.installations.get(key)
+        if kind == "system" and self.system_state and self.system_state.system_id == key:
+            return self.system_state
+        return None
+    
+    def _save_state(self) -> int:
+        """
+        Persist dirty records to the state store.
         
-        except Exception as e:
-            pass
+        Returns:
+            int: Number of records written
+        """
+        with self.flush_lock:
+            with self.lock:
+                dirty = self.dirty_records
+                deleted = self.deleted_records
+                self.dirty_records = set()
+                self.deleted_records = set()
+                
+                upserts = {}
+                for kind, key in dirty:
+                    record = self._get_record(kind, key)
+                    if record is not None:
+                        upserts[(kind, key)] = json.dumps(self._record_to_dict(record), default=str)
+            
+            try:
+                return self.store.write_records(upserts, list(deleted))
+            
+            except Exception as e:
+                # Keep the records dirty so the next flush retries them
+                with self.lock:
+                    self.dirty_records |= dirty - self.deleted_records
+                    self.deleted_records |= deleted - self.dirty_records
+                return 0
+    
+    def _replace_stored_state(self):
+        """
+        Replace everything in the state store with the in-memory state.
+        
+        Must not be called with self.lock held: locks are always taken in
+        the order flush_lock, then lock.
+        """
+        with self.flush_lock:
+            with self.lock:
+                records = self._collect_stored_records()
+            
+            self.store.replace_all(records)
+    
+    def _collect_stored_records(self) -> Dict[Tuple[str, str], str]:
+        """Serialize every in-memory record and clear the dirty sets (lock must be held)."""
+        records = {}
+        for name, app_state in self.applications.items():
+            records[("application", name)] = json.dumps(self._record_to_dict(app_state), default=str)
+        for inst_id, inst_state in self.installations.items():
+            records[("installation", inst_id)] = json.dumps(self._record_to_dict(inst_state), default=str)
+        if self.system_state:
+            records[("system", self.system_state.system_id)] = json.dumps(
+                self._record_to_dict(self.system_state), default=str)
+        
+        self.dirty_records = set()
+        self.deleted_records = set()
+        return records
     
     def _load_state(self):
-        """Load state from file."""
+        """Load state from the state store, migrating a legacy state.json if needed."""
         try:
-            if os.path.exists(self.state_file):
-                state_data = self.json_handler.read_json(self.state_file)
-                self._deserialize_state(state_data)
+            records = self.store.load_records()
+            if records:
+                self._deserialize_state({
+                    'applications': records.get('application', {}),
+                    'installations': records.get('installation', {}),
+                    'system_state': next(iter(records.get('system', {}).values()), None)
+                })
+            
+            elif os.path.exists(self.state_file):
+                success, state_data, error = self.json_handler.load_json(self.state_file)
+                if success:
+                    self._deserialize_state(state_data)
+                    self._replace_stored_state()
         
         except Exception as e:
             pass
     
+    def _record_to_dict(self, record: Any) -> Dict[str, Any]:
+        """Convert a state dataclass to a JSON-ready dict without deep-copying nested fields."""
+        data = {}
+        for record_field in fields(record):
+            value = getattr(record, record_field.name)
+            data[record_field.name] = value.value if isinstance(value, Enum) else value
+        return data
+    
     def _serialize_state(self) -> Dict[str, Any]:
         """Serialize state to dictionary."""
         try:
             return {
                 'applications': {
-                    name: asdict(app_state) for name, app_state in self.applications.items()
+                    name: self._record_to_dict(app_state) for name, app_state in self.applications.items()
                 },
                 'installations': {
-                    inst_id: asdict(inst_state) for inst_id, inst_state in self.installations.items()
+                    inst_id: self._record_to_dict(inst_state) for inst_id, inst_state in self.installations.items()
                 },
-                'system_state': asdict(self.system_state) if self.system_state else None,
+                'system_state': self._record_to_dict(self.system_state) if self.system_state else None,
                 'metadata': {
                     'version': '1.0.0',
                     'last_saved': time.time()
@@ -813,10 +924,12 @@ class StateManager:
             pass
     
     def _auto_save_loop(self):
-        """Auto-save loop."""
+        """Auto-save loop; wakes on changes and coalesces bursts into one write."""
         try:
             while self.auto_save_enabled:
-                time.sleep(self.auto_save_interval)
+                if self.save_event.wait(timeout=self.auto_save_interval) and self.auto_save_enabled:
+                    time.sleep(self.save_debounce)
+                self.save_event.clear()
                 self._save_state()
         
         except Exception as e:
@@ -834,10 +947,12 @@ class StateManager:
         """Shutdown state manager."""
         try:
             self.auto_save_enabled = False
+            self.save_event.set()
             if self.auto_save_thread:
                 self.auto_save_thread.join(timeout=5)
             
             self._save_state()
+            self.store.close()
         
         except Exception as e:
             pass
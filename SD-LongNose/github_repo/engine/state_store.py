@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+PinokioCloud State Store
+
+This module provides record-level persistence for the state manager. Each
+application, installation and system record is stored as its own row in a
+SQLite database running in WAL mode, so updating one record costs one row
+write instead of rewriting the whole state. Full snapshots (backups and the
+legacy state.json export) are written atomically.
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import os
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+
+
+def atomic_write_json(file_path: str, data: Any, indent: Optional[int] = 2) -> None:
+    """
+    Write JSON to a file atomically.
+
+    The data is written to a temporary file in the same directory, flushed and
+    fsynced, then renamed over the target so readers never see a partial file.
+
+    Args:
+        file_path: Destination file path
+        data: JSON-serializable data
+        indent: JSON indentation
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    # Persist the rename itself
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
+
+
+class StateStore:
+    """
+    Record-level state persistence backed by SQLite in WAL mode.
+
+    Records are addressed by (kind, key), e.g. ("application", "comfyui"),
+    and stored as JSON text. Writes are batched into a single transaction.
+    """
+
+    def __init__(self, db_path: str, checkpoint_interval: int = 500):
+        """
+        Initialize the state store.
+
+        Args:
+            db_path: Path to the SQLite database file
+            checkpoint_interval: Number of written records between WAL checkpoints
+        """
+        self.db_path = db_path
+        self.checkpoint_interval = checkpoint_interval
+        self.writes_since_checkpoint = 0
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS state_records (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (kind, key)
+            )
+        ''')
+
+    def write_records(self, upserts: Dict[Tuple[str, str], str],
+                      deletes: Optional[List[Tuple[str, str]]] = None) -> int:
+        """
+        Write a batch of records in one transaction.
+
+        Args:
+            upserts: Mapping of (kind, key) to serialized JSON text
+            deletes: Records to remove
+
+        Returns:
+            int: Number of records touched
+        """
+        deletes = deletes or []
+        if not upserts and not deletes:
+            return 0
+
+        now = time.time()
+        with self.lock:
+            cursor = self.connection.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                if deletes:
+                    cursor.executemany('DELETE FROM state_records WHERE kind = ? AND key = ?', deletes)
+                if upserts:
+                    cursor.executemany(
+                        'INSERT OR REPLACE INTO state_records (kind, key, data, updated_at) VALUES (?, ?, ?, ?)',
+                        [(kind, key, data, now) for (kind, key), data in upserts.items()]
+                    )
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+
+            touched = len(upserts) + len(deletes)
+            self.writes_since_checkpoint += touched
+            if self.writes_since_checkpoint >= self.checkpoint_interval:
+                self._checkpoint()
+
+            return touched
+
+    def replace_all(self, records: Dict[Tuple[str, str], str]) -> int:
+        """
+        Replace the entire store contents in one transaction.
+
+        Args:
+            records: Mapping of (kind, key) to serialized JSON text
+
+        Returns:
+            int: Number of records written
+        """
+        now = time.time()
+        with self.lock:
+            cursor = self.connection.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                cursor.execute('DELETE FROM state_records')
+                cursor.executemany(
+                    'INSERT INTO state_records (kind, key, data, updated_at) VALUES (?, ?, ?, ?)',
+                    [(kind, key, data, now) for (kind, key), data in records.items()]
+                )
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+
+            self._checkpoint()
+            return len(records)
+
+    def load_records(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load all records grouped by kind.
+
+        Returns:
+            Dict mapping kind to {key: record_data}
+        """
+        records: Dict[str, Dict[str, Any]] = {}
+        with self.lock:
+            rows = self.connection.execute('SELECT kind, key, data FROM state_records').fetchall()
+
+        for kind, key, data in rows:
+            try:
+                records.setdefault(kind, {})[key] = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+
+        return records
+
+    def count_records(self) -> int:
+        """Get the number of stored records."""
+        with self.lock:
+            return self.connection.execute('SELECT COUNT(*) FROM state_records').fetchone()[0]
+
+    def _checkpoint(self):
+        """Fold the WAL back into the main database file and truncate it."""
+        try:
+            self.connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        except sqlite3.Error:
+            pass
+        self.writes_since_checkpoint = 0
+
+    def close(self):
+        """Checkpoint and close the database connection."""
+        with self.lock:
+            self._checkpoint()
+            self.connection.close()
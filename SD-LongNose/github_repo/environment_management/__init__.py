@@ -14,7 +14,9 @@ from environment_management.venv_manager import VirtualEnvironmentManager, Envir
 from environment_management.file_system import FileSystemManager, OperationType, OperationStatus, FileOperation, FileInfo
 from environment_management.shell_runner import ShellRunner, CommandStatus, CommandResult, CommandProgress
 from environment_management.variable_system import VariableSystem, VariableType, VariableScope, Variable, VariableSubstitution
+from environment_management.expression_compiler import compile_expression, compile_template, render_template, evaluate_condition, ExpressionError
 from environment_management.json_handler import JSONHandler, JSONOperationType, JSONValidationLevel, JSONOperation, JSONValidationResult
+from environment_management.tracing import Tracer, Span, get_tracer, span, traced, current_span
 
 __version__ = "1.0.0"
 __author__ = "PinokioCloud Development Team"
@@ -48,10 +50,25 @@ __all__ = [
     "Variable",
     "VariableSubstitution",
     
+    # Template Expressions
+    "compile_expression",
+    "compile_template",
+    "render_template",
+    "evaluate_condition",
+    "ExpressionError",
+    
     # JSON Operations
     "JSONHandler",
     "JSONOperationType",
     "JSONValidationLevel",
     "JSONOperation",
-    "JSONValidationResult"
+    "JSONValidationResult",
+    
+    # Tracing
+    "Tracer",
+    "Span",
+    "get_tracer",
+    "span",
+    "traced",
+    "current_span"
 ]
\ No newline at end of file
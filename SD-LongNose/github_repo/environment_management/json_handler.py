@@ -13,13 +13,18 @@ import os
 import sys
 import json
 import time
-import hashlib
 from typing import Dict, List, Optional, Any, Union, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 import threading
 import copy
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class JSONOperationType(Enum):
@@ -75,19 +80,30 @@ class JSONHandler:
     for multi-cloud GPU environments.
     """
     
-    def __init__(self, base_path: str = "/workspace"):
+    def __init__(self, base_path: str = "/workspace", max_operations: int = 1000,
+                 cache_max_bytes: int = 64 * 1024 * 1024, use_fast_serializer: bool = True):
         """
         Initialize the JSON handler.
         
         Args:
             base_path: Base path for JSON file operations
+            max_operations: Maximum number of operation records kept in the ledger
+            cache_max_bytes: Byte budget for the file read cache (LRU eviction)
+            use_fast_serializer: Use orjson when it is installed
         """
         self.base_path = base_path
-        self.operations = {}
-        self.cache = {}
-        self.cache_ttl = 300  # 5 minutes
+        self.operations = OrderedDict()
+        self.max_operations = max_operations
+        self.cache = OrderedDict()
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.read_bytes_saved = 0
+        self.use_fast_serializer = use_fast_serializer and orjson is not None
         self.progress_callback = None
         self.operation_lock = threading.Lock()
+        self.cache_lock = threading.Lock()
     
     def set_progress_callback(self, callback):
         """Set progress callback function."""
@@ -104,45 +120,19 @@ class JSONHandler:
         Returns:
             Tuple of (success, parsed_data, error_message)
         """
-        operation_id = f"parse_{int(time.time())}_{hash(json_string) % 10000}"
-        
-        with self.operation_lock:
-            operation = JSONOperation(
-                operation_id=operation_id,
-                operation_type=JSONOperationType.PARSE,
-                status="starting",
-                start_time=time.time(),
-                input_data=json_string
-            )
-            self.operations[operation_id] = operation
+        operation = self._record_operation(
+            f"parse_{int(time.time())}_{hash(json_string) % 10000}",
+            JSONOperationType.PARSE,
+            {"size": len(json_string)}
+        )
         
         try:
-            # Check cache first
-            cache_key = f"parse_{hashlib.md5(json_string.encode()).hexdigest()}"
-            if cache_key in self.cache:
-                cached_data = self.cache[cache_key]
-                if time.time() - cached_data["timestamp"] < self.cache_ttl:
-                    operation.status = "completed"
-                    operation.end_time = time.time()
-                    operation.output_data = cached_data["data"]
-                    return True, cached_data["data"], None
-            
-            # Parse JSON
-            if strict:
-                parsed_data = json.loads(json_string)
-            else:
-                # Try to parse with more lenient settings
-                parsed_data = json.loads(json_string, strict=False)
-            
-            # Cache result
-            self.cache[cache_key] = {
-                "data": parsed_data,
-                "timestamp": time.time()
-            }
+            # Parse JSON; not cached, since callers may mutate the result and
+            # re-parsing the string is cheaper than deep-copying a cached object
+            parsed_data = self._loads(json_string, strict=strict)
             
             operation.status = "completed"
             operation.end_time = time.time()
-            operation.output_data = parsed_data
             
             return True, parsed_data, None
         
@@ -173,17 +163,11 @@ class JSONHandler:
         Returns:
             JSONValidationResult: Validation result
         """
-        operation_id = f"validate_{int(time.time())}_{hash(str(data)) % 10000}"
-        
-        with self.operation_lock:
-            operation = JSONOperation(
-                operation_id=operation_id,
-                operation_type=JSONOperationType.VALIDATE,
-                status="starting",
-                start_time=time.time(),
-                input_data=data
-            )
-            self.operations[operation_id] = operation
+        operation = self._record_operation(
+            f"validate_{int(time.time())}_{id(data) % 10000}",
+            JSONOperationType.VALIDATE,
+            {"validation_level": validation_level.value}
+        )
         
         try:
             result = JSONValidationResult(
@@ -213,7 +197,7 @@ class JSONHandler:
             
             operation.status = "completed"
             operation.end_time = time.time()
-            operation.output_data = result
+            operation.metadata["is_valid"] = result.is_valid
             
             return result
         
@@ -243,17 +227,11 @@ class JSONHandler:
         Returns:
             Dict: Merged JSON object
         """
-        operation_id = f"merge_{int(time.time())}_{hash(str(base_data)) % 10000}"
-        
-        with self.operation_lock:
-            operation = JSONOperation(
-                operation_id=operation_id,
-                operation_type=JSONOperationType.MERGE,
-                status="starting",
-                start_time=time.time(),
-                input_data={"base": base_data, "merge": merge_data}
-            )
-            self.operations[operation_id] = operation
+        operation = self._record_operation(
+            f"merge_{int(time.time())}_{id(base_data) % 10000}",
+            JSONOperationType.MERGE,
+            {"deep_merge": deep_merge}
+        )
         
         try:
             if deep_merge:
@@ -266,7 +244,6 @@ class JSONHandler:
             
             operation.status = "completed"
             operation.end_time = time.time()
-            operation.output_data = merged_data
             
             return merged_data
         
@@ -376,24 +353,16 @@ class JSONHandler:
         Returns:
             Transformed data
         """
-        operation_id = f"transform_{int(time.time())}_{hash(str(data)) % 10000}"
-        
-        with self.operation_lock:
-            operation = JSONOperation(
-                operation_id=operation_id,
-                operation_type=JSONOperationType.TRANSFORM,
-                status="starting",
-                start_time=time.time(),
-                input_data=data
-            )
-            self.operations[operation_id] = operation
+        operation = self._record_operation(
+            f"transform_{int(time.time())}_{id(data) % 10000}",
+            JSONOperationType.TRANSFORM
+        )
         
         try:
             transformed_data = self._apply_transformations(data, transformation_rules)
             
             operation.status = "completed"
             operation.end_time = time.time()
-            operation.output_data = transformed_data
             
             return transformed_data
         
@@ -418,29 +387,27 @@ class JSONHandler:
         Returns:
             bool: True if successful, False otherwise
         """
-        operation_id = f"save_{int(time.time())}_{hash(str(data)) % 10000}"
-        
-        with self.operation_lock:
-            operation = JSONOperation(
-                operation_id=operation_id,
-                operation_type=JSONOperationType.SAVE,
-                status="starting",
-                start_time=time.time(),
-                input_data=data
-            )
-            self.operations[operation_id] = operation
+        operation = self._record_operation(
+            f"save_{int(time.time())}_{hash(file_path) % 10000}",
+            JSONOperationType.SAVE,
+            {"file_path": file_path}
+        )
         
         try:
             # Ensure directory exists
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             
             # Save JSON to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=indent, ensure_ascii=ensure_ascii)
+            payload = self._dumps(data, indent=indent, ensure_ascii=ensure_ascii)
+            with open(file_path, 'wb') as f:
+                f.write(payload)
+            
+            # The file changed underneath any cached read
+            self._cache_pop(f"load_{file_path}")
             
             operation.status = "completed"
             operation.end_time = time.time()
-            operation.output_data = file_path
+            operation.metadata["bytes"] = len(payload)
             
             return True
         
@@ -455,48 +422,55 @@ class JSONHandler:
         """
         Load JSON data from file.
         
+        Unchanged files are served from a read cache holding their raw bytes,
+        so a hit skips the file read but still parses; every caller gets its
+        own freshly parsed object.
+        
         Args:
             file_path: File path to load from
             
         Returns:
             Tuple of (success, loaded_data, error_message)
         """
-        operation_id = f"load_{int(time.time())}_{hash(file_path) % 10000}"
-        
-        with self.operation_lock:
-            operation = JSONOperation(
-                operation_id=operation_id,
-                operation_type=JSONOperationType.LOAD,
-                status="starting",
-                start_time=time.time(),
-                input_data=file_path
-            )
-            self.operations[operation_id] = operation
+        operation = self._record_operation(
+            f"load_{int(time.time())}_{hash(file_path) % 10000}",
+            JSONOperationType.LOAD,
+            {"file_path": file_path}
+        )
         
         try:
-            # Check cache first
+            # Check the read cache first; entries are only valid for the exact file version they were read from.
+            # It holds raw bytes, not parsed objects: copying a cached object costs more than re-parsing.
             cache_key = f"load_{file_path}"
-            if cache_key in self.cache:
-                cached_data = self.cache[cache_key]
-                if time.time() - cached_data["timestamp"] < self.cache_ttl:
-                    operation.status = "completed"
-                    operation.end_time = time.time()
-                    operation.output_data = cached_data["data"]
-                    return True, cached_data["data"], None
+            stat_result = os.stat(file_path)
+            signature = (stat_result.st_mtime_ns, stat_result.st_size)
+            cached_data = self._cache_get(cache_key)
+            if cached_data is not None and cached_data["signature"] == signature:
+                data = self._loads(cached_data["raw"])
+                with self.cache_lock:
+                    self.read_bytes_saved += cached_data["size"]
+                operation.status = "completed"
+                operation.end_time = time.time()
+                operation.metadata["read_cache_hit"] = True
+                operation.metadata["bytes"] = cached_data["size"]
+                return True, data, None
             
             # Load JSON from file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Cache result
-            self.cache[cache_key] = {
-                "data": data,
-                "timestamp": time.time()
-            }
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            data = self._loads(raw)
+            
+            # Cache the bytes read
+            self._cache_put(cache_key, {
+                "raw": raw,
+                "timestamp": time.time(),
+                "signature": signature,
+                "size": stat_result.st_size
+            })
             
             operation.status = "completed"
             operation.end_time = time.time()
-            operation.output_data = data
+            operation.metadata["bytes"] = stat_result.st_size
             
             return True, data, None
         
@@ -521,6 +495,112 @@ class JSONHandler:
             operation.error_message = error_msg
             return False, None, error_msg
     
+    def read_json_file(self, file_path: str) -> Any:
+        """
+        Load JSON data from file, returning None on failure.
+        
+        Args:
+            file_path: File path to load from
+            
+        Returns:
+            Loaded data or None
+        """
+        success, data, _ = self.load_json(file_path)
+        return data if success else None
+    
+    def write_json_file(self, file_path: str, data: Any, indent: int = 2) -> bool:
+        """
+        Save JSON data to file.
+        
+        Args:
+            file_path: File path to save to
+            data: Data to save
+            indent: JSON indentation
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return self.save_json(data, file_path, indent=indent)
+    
+    def _record_operation(self, operation_id: str, operation_type: JSONOperationType,
+                          metadata: Optional[Dict[str, Any]] = None) -> JSONOperation:
+        """Add a metadata-only operation record to the bounded ledger."""
+        operation = JSONOperation(
+            operation_id=operation_id,
+            operation_type=operation_type,
+            status="starting",
+            start_time=time.time(),
+            metadata=metadata or {}
+        )
+        
+        with self.operation_lock:
+            self.operations.pop(operation_id, None)
+            self.operations[operation_id] = operation
+            while len(self.operations) > self.max_operations:
+                self.operations.popitem(last=False)
+        
+        return operation
+    
+    def _loads(self, raw: Union[str, bytes], strict: bool = True) -> Any:
+        """Deserialize JSON, using orjson when available."""
+        if self.use_fast_serializer and strict:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # Fall through so errors (and oversized ints) behave like the stdlib
+                pass
+        
+        if isinstance(raw, bytes):
+            raw = raw.decode('utf-8')
+        return json.loads(raw, strict=strict)
+    
+    def _dumps(self, data: Any, indent: int = 2, ensure_ascii: bool = False) -> bytes:
+        """Serialize JSON to UTF-8 bytes, using orjson when it can match the requested format."""
+        if self.use_fast_serializer and not ensure_ascii and indent in (None, 0, 2):
+            try:
+                return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+            except TypeError:
+                # Non-string keys, custom types, etc.
+                pass
+        
+        return json.dumps(data, indent=indent, ensure_ascii=ensure_ascii).encode('utf-8')
+    
+    def _cache_get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get a cache entry and mark it as most recently used."""
+        with self.cache_lock:
+            entry = self.cache.get(cache_key)
+            if entry is None:
+                self.cache_misses += 1
+                return None
+            
+            self.cache.move_to_end(cache_key)
+            self.cache_hits += 1
+            return entry
+    
+    def _cache_put(self, cache_key: str, entry: Dict[str, Any]):
+        """Insert a cache entry, evicting least recently used entries over the byte budget."""
+        if entry["size"] > self.cache_max_bytes:
+            return
+        
+        with self.cache_lock:
+            previous = self.cache.pop(cache_key, None)
+            if previous is not None:
+                self.cache_bytes -= previous["size"]
+            
+            self.cache[cache_key] = entry
+            self.cache_bytes += entry["size"]
+            
+            while self.cache_bytes > self.cache_max_bytes and self.cache:
+                _, evicted = self.cache.popitem(last=False)
+                self.cache_bytes -= evicted["size"]
+    
+    def _cache_pop(self, cache_key: str):
+        """Remove a cache entry if present."""
+        with self.cache_lock:
+            entry = self.cache.pop(cache_key, None)
+            if entry is not None:
+                self.cache_bytes -= entry["size"]
+    
     def _is_valid_json_type(self, data: Any) -> bool:
         """Check if data is a valid JSON type."""
         return isinstance(data, (dict, list, str, int, float, bool, type(None)))
@@ -635,24 +715,38 @@ class JSONHandler:
         current_time = time.time()
         max_age_seconds = max_age_hours * 3600
         
-        operations_to_remove = []
-        for op_id, operation in self.operations.items():
-            if current_time - operation.start_time > max_age_seconds:
-                operations_to_remove.append(op_id)
-        
-        for op_id in operations_to_remove:
-            del self.operations[op_id]
+        with self.operation_lock:
+            operations_to_remove = []
+            for op_id, operation in self.operations.items():
+                if current_time - operation.start_time > max_age_seconds:
+                    operations_to_remove.append(op_id)
+            
+            for op_id in operations_to_remove:
+                del self.operations[op_id]
     
     def clear_cache(self):
-        """Clear the JSON cache."""
-        self.cache.clear()
+        """Clear the JSON file read cache."""
+        with self.cache_lock:
+            self.cache.clear()
+            self.cache_bytes = 0
     
     def get_cache_stats(self) -> Dict[str, Any]:
-        """Get cache statistics."""
+        """
+        Get cache statistics.
+        
+        The cache only saves file reads: read_bytes_saved counts the bytes
+        served from memory, and every hit is still parsed.
+        """
         return {
             "cache_size": len(self.cache),
-            "cache_ttl": self.cache_ttl,
-            "operations_count": len(self.operations)
+            "cache_bytes": self.cache_bytes,
+            "cache_max_bytes": self.cache_max_bytes,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "read_bytes_saved": self.read_bytes_saved,
+            "operations_count": len(self.operations),
+            "max_operations": self.max_operations,
+            "fast_serializer": self.use_fast_serializer
         }
 
 
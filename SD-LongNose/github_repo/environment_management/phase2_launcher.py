@@ -139,7 +139,7 @@ class Phase2Launcher:
             
             print("✅ JSON Handler initialized")
             print(f"   Base path: {self.json_handler.base_path}")
-            print(f"   Cache TTL: {self.json_handler.cache_ttl} seconds")
+            print(f"   Load cache budget: {self.json_handler.cache_max_bytes // (1024 * 1024)} MB")
             
             # Step 6: Integration Testing
             print("\n🔗 Step 6: Running Integration Tests...")
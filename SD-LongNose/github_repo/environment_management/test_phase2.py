@@ -10,8 +10,9 @@ import sys
 import time
 import json
 
-# Add current directory to path for imports
+# Add current directory to path for imports, and the repository root for package imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import Phase 2 modules
 from venv_manager import VirtualEnvironmentManager, EnvironmentType, EnvironmentStatus
@@ -19,6 +20,7 @@ from file_system import FileSystemManager, OperationType, OperationStatus
 from shell_runner import ShellRunner, CommandStatus, CommandResult
 from variable_system import VariableSystem, VariableType, VariableScope
 from json_handler import JSONHandler, JSONOperationType, JSONValidationLevel
+from expression_compiler import compile_expression, render_template, evaluate_condition, ExpressionError
 
 
 def test_venv_manager():
@@ -243,6 +245,59 @@ def test_variable_system():
     return True
 
 
+def test_expression_compiler():
+    """Test the {{ }} expression compiler."""
+    print("\n🧪 Testing Expression Compiler...")
+    
+    context = {
+        'gpu': 'nvidia',
+        'platform': 'linux',
+        'args': {'port': 7860},
+        'items': ['a', 'b'],
+        'which': lambda name: f"/usr/bin/{name}"
+    }
+    
+    # Expressions are parsed once per source string
+    print("  Testing expression evaluation...")
+    assert compile_expression("args.port + 1") is compile_expression("args.port + 1")
+    assert compile_expression("args.port + 1").evaluate(context) == 7861
+    assert compile_expression("gpu === 'nvidia' ? 'cu121' : 'cpu'").evaluate(context) == 'cu121'
+    assert compile_expression("items.join('-')").evaluate(context) == 'a-b'
+    assert compile_expression("/^LIN/i.test(platform)").evaluate(context) is True
+    assert compile_expression("which('git')").evaluate(context) == '/usr/bin/git'
+    assert compile_expression("args.missing").evaluate(context) is None
+    print("  ✅ Expression evaluation successful")
+    
+    # Undefined values render as '', unknown names are left as written
+    print("  Testing template rendering...")
+    rendered = render_template("--port {{args.port}} --cuda {{args.missing}} {{nope}}", context)
+    assert rendered == "--port 7860 --cuda  {{nope}}", rendered
+    print("  ✅ Template rendering successful")
+    
+    print("  Testing conditions...")
+    assert evaluate_condition("{{platform === 'linux' && !args.missing}}", context) is True
+    assert evaluate_condition("gpu == 'amd' || items.length > 2", context) is False
+    assert evaluate_condition("", context) is True
+    try:
+        evaluate_condition("{{platform ===}}", context)
+        raise AssertionError("syntax error not reported")
+    except ExpressionError:
+        pass
+    print("  ✅ Conditions successful")
+    
+    # Variable substitution drops placeholders that resolve to nothing
+    print("  Testing substitution of undefined variables...")
+    var_system = VariableSystem()
+    var_system.set_variable("app_name", "comfyui", VariableType.STRING, VariableScope.LOCAL)
+    result = var_system.substitute_variables("{{app_name}}:{{undefined_variable}}:{{app_name.toUpperCase()}}")
+    assert result.success, result.error_message
+    assert result.substituted_text == "comfyui::COMFYUI", result.substituted_text
+    assert result.variables_found == ["app_name", "app_name.toUpperCase()"]
+    print("  ✅ Substitution of undefined variables successful")
+    
+    return True
+
+
 def test_json_handler():
     """Test JSON handler."""
     print("\n🧪 Testing JSON Handler...")
@@ -320,6 +375,37 @@ def test_json_handler():
         print("  ❌ JSON file saving failed")
         return False
     
+    # Test cache invalidation after an external write
+    with open(test_file, 'w', encoding='utf-8') as f:
+        json.dump({"user": {"profile": {"name": "Jane, edited outside the handler"}}}, f)
+    success, loaded_data, error = json_handler.load_json(test_file)
+    if success and loaded_data["user"]["profile"]["name"].startswith("Jane"):
+        print("  ✅ JSON cache invalidation successful")
+    else:
+        print(f"  ❌ JSON cache returned stale data: {error}")
+        return False
+    
+    # Test that mutating a loaded result doesn't leak into later cache hits
+    loaded_data["user"]["profile"]["name"] = "mutated by caller"
+    success, reloaded_data, error = json_handler.load_json(test_file)
+    if (success and reloaded_data["user"]["profile"]["name"].startswith("Jane")
+            and json_handler.get_cache_stats()["read_bytes_saved"] == os.path.getsize(test_file)):
+        print("  ✅ JSON cache isolated from caller mutation")
+    else:
+        print("  ❌ JSON cache returned a caller-mutated object")
+        return False
+    
+    # Test bounded operation ledger
+    bounded_handler = JSONHandler(max_operations=5)
+    for i in range(20):
+        bounded_handler.parse_json(json.dumps({"index": i}))
+    if len(bounded_handler.operations) == 5 and all(
+            op.input_data is None for op in bounded_handler.operations.values()):
+        print("  ✅ JSON operation ledger bounded")
+    else:
+        print("  ❌ JSON operation ledger not bounded")
+        return False
+    
     # Cleanup test file
     if os.path.exists(test_file):
         os.remove(test_file)
@@ -402,6 +488,7 @@ def main():
         fs_success = test_file_system()
         shell_success = test_shell_runner()
         var_success = test_variable_system()
+        expression_success = test_expression_compiler()
         json_success = test_json_handler()
         integration_success = test_integration()
         
@@ -415,10 +502,12 @@ def main():
         print(f"✅ File System Manager: {'Success' if fs_success else 'Failed'}")
         print(f"✅ Shell Runner: {'Success' if shell_success else 'Failed'}")
         print(f"✅ Variable System: {'Success' if var_success else 'Failed'}")
+        print(f"✅ Expression Compiler: {'Success' if expression_success else 'Failed'}")
         print(f"✅ JSON Handler: {'Success' if json_success else 'Failed'}")
         print(f"✅ Integration Tests: {'Success' if integration_success else 'Failed'}")
         
-        overall_success = all([venv_success, fs_success, shell_success, var_success, json_success, integration_success])
+        overall_success = all([venv_success, fs_success, shell_success, var_success, expression_success,
+                               json_success, integration_success])
         
         if overall_success:
             print(f"\n🎉 PHASE 2 COMPONENT TESTING: SUCCESS")
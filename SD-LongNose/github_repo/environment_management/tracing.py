@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+PinokioCloud Tracing
+
+This module provides lightweight in-process tracing for the installer, runner
+and tunnel layers. Spans are opened with a context manager or a decorator and
+nest automatically: the active span is kept in a context variable, so child
+spans find their parent in the same thread, in asyncio tasks (which copy the
+context when created) and in worker threads started through Tracer.wrap().
+
+Tracing is off unless enabled (PINOKIO_TRACE=1 or Tracer.enable()); while off,
+opening a span returns a shared no-op object and decorated functions cost a
+single attribute check.
+
+Finished spans can be exported as Chrome trace-event JSON (chrome://tracing,
+Perfetto) or summarized per trace as flame-graph rows.
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import os
+import json
+import inspect
+import functools
+import itertools
+import threading
+import time
+import contextvars
+from collections import deque
+from typing import Dict, List, Optional, Any, Callable, Iterable, Deque
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+    name: str
+    category: str
+    trace_id: int
+    span_id: int
+    parent_id: Optional[int]
+    start_ns: int
+    end_ns: Optional[int] = None
+    thread_id: int = 0
+    thread_name: str = ""
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration_ns(self) -> int:
+        """Span duration (up to now while the span is open)."""
+        return (self.end_ns if self.end_ns is not None else time.perf_counter_ns()) - self.start_ns
+
+    @property
+    def finished(self) -> bool:
+        """Whether the span has ended."""
+        return self.end_ns is not None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        """Attach several attributes to the span."""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert Span to dictionary."""
+        return {
+            'name': self.name,
+            'category': self.category,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration_ns': self.duration_ns,
+            'thread_id': self.thread_id,
+            'thread_name': self.thread_name,
+            'attributes': dict(self.attributes),
+            'error': self.error
+        }
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+# Span active in the current thread / asyncio task
+_current_span: contextvars.ContextVar = contextvars.ContextVar('pinokio_current_span', default=None)
+
+
+class _SpanScope:
+    """Context manager that opens a span and makes it current."""
+
+    __slots__ = ('tracer', 'span', 'token')
+
+    def __init__(self, tracer: 'Tracer', span: Span):
+        self.tracer = tracer
+        self.span = span
+        self.token = None
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.span.end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.span.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self.token)
+        self.tracer._record(self.span)
+        return False
+
+
+class Tracer:
+    """
+    In-process span recorder.
+
+    Finished spans are kept in a bounded buffer; the oldest are dropped once
+    it is full.
+    """
+
+    def __init__(self, enabled: bool = False, max_spans: int = 100000):
+        """
+        Initialize the tracer.
+
+        Args:
+            enabled: Whether spans are recorded
+            max_spans: Number of finished spans kept
+        """
+        self.enabled = enabled
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def enable(self) -> None:
+        """Start recording spans."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording spans (already recorded spans are kept)."""
+        self.enabled = False
+
+    def clear(self) -> None:
+        """Drop all recorded spans."""
+        with self.lock:
+            self.spans.clear()
+
+    def span(self, name: str, category: str = "", **attributes: Any):
+        """
+        Open a span as a context manager.
+
+        Args:
+            name: Span name
+            category: Span category (e.g. "install", "tunnel")
+            **attributes: Attributes attached to the span
+
+        Returns:
+            Context manager yielding the Span (a no-op object while disabled)
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+
+        parent = _current_span.get()
+        span_id = next(self._ids)
+        thread = threading.current_thread()
+        return _SpanScope(self, Span(
+            name=name,
+            category=category or (parent.category if parent else ""),
+            trace_id=parent.trace_id if parent else span_id,
+            span_id=span_id,
+            parent_id=parent.span_id if parent else None,
+            start_ns=time.perf_counter_ns(),
+            thread_id=thread.ident or 0,
+            thread_name=thread.name,
+            attributes=attributes
+        ))
+
+    def traced(self, name: Optional[str] = None, category: str = "",
+               record_args: Iterable[str] = ()) -> Callable:
+        """
+        Decorator running a function (or coroutine function) inside a span.
+
+        Args:
+            name: Span name (defaults to the function's qualified name)
+            category: Span category
+            record_args: Argument names recorded as span attributes
+
+        Returns:
+            Decorator
+        """
+        record_args = tuple(record_args)
+
+        def decorator(func: Callable) -> Callable:
+            span_name = name or func.__qualname__
+            signature = inspect.signature(func) if record_args else None
+
+            def attributes_for(args, kwargs) -> Dict[str, Any]:
+                if signature is None:
+                    return {}
+                try:
+                    bound = signature.bind_partial(*args, **kwargs).arguments
+                except TypeError:
+                    return {}
+                return {arg: bound[arg] for arg in record_args if arg in bound}
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await func(*args, **kwargs)
+                    with self.span(span_name, category, **attributes_for(args, kwargs)):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.span(span_name, category, **attributes_for(args, kwargs)):
+                    return func(*args, **kwargs)
+            return wrapper
+
+        return decorator
+
+    def wrap(self, func: Callable) -> Callable:
+        """
+        Bind a callable to the current span, for running it in another thread.
+
+        Args:
+            func: Callable handed to a thread or executor
+
+        Returns:
+            Callable whose spans are children of the span active now
+        """
+        if not self.enabled:
+            return func
+        context = contextvars.copy_context()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return context.run(func, *args, **kwargs)
+        return wrapper
+
+    def current_span(self):
+        """Get the active span (a no-op object if there is none)."""
+        return _current_span.get() or _NOOP_SPAN
+
+    def _record(self, span: Span) -> None:
+        """Store a finished span."""
+        with self.lock:
+            self.spans.append(span)
+
+    def get_spans(self, trace_id: Optional[int] = None) -> List[Span]:
+        """
+        Get finished spans in start order.
+
+        Args:
+            trace_id: Only spans of this trace
+
+        Returns:
+            List[Span]
+        """
+        with self.lock:
+            spans = list(self.spans)
+        if trace_id is not None:
+            spans = [span for span in spans if span.trace_id == trace_id]
+        return sorted(spans, key=lambda span: span.start_ns)
+
+    def get_traces(self, category: Optional[str] = None) -> List[Span]:
+        """
+        Get the finished root spans, newest first.
+
+        Args:
+            category: Only traces whose root span has this category
+
+        Returns:
+            List[Span]: One root span per trace
+        """
+        roots = [span for span in self.get_spans()
+                 if span.parent_id is None and (category is None or span.category == category)]
+        return sorted(roots, key=lambda span: span.start_ns, reverse=True)
+
+    def export_chrome_trace(self, path: Optional[str] = None,
+                            trace_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Export spans in Chrome trace-event format.
+
+        Args:
+            path: File the JSON is written to (not written when None)
+            trace_id: Only spans of this trace
+
+        Returns:
+            Dict: Trace-event document
+        """
+        pid = os.getpid()
+        events = []
+        thread_names = {}
+
+        for span in self.get_spans(trace_id):
+            thread_names[span.thread_id] = span.thread_name
+            args = {key: _json_safe(value) for key, value in span.attributes.items()}
+            args['trace_id'] = span.trace_id
+            args['span_id'] = span.span_id
+            if span.parent_id is not None:
+                args['parent_id'] = span.parent_id
+            if span.error:
+                args['error'] = span.error
+
+            events.append({
+                'name': span.name,
+                'cat': span.category or 'default',
+                'ph': 'X',
+                'ts': span.start_ns / 1000.0,
+                'dur': span.duration_ns / 1000.0,
+                'pid': pid,
+                'tid': span.thread_id,
+                'args': args
+            })
+
+        for thread_id, thread_name in thread_names.items():
+            events.append({
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': pid,
+                'tid': thread_id,
+                'args': {'name': thread_name}
+            })
+
+        document = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(document, f)
+        return document
+
+    def flame_summary(self, trace_id: int) -> List[Dict[str, Any]]:
+        """
+        Summarize a trace as flame-graph rows.
+
+        Spans are grouped by their call path (root;child;...). Self time is
+        a span's duration minus that of its children, so the slow phase is
+        the row with the largest self time.
+
+        Args:
+            trace_id: Trace to summarize
+
+        Returns:
+            List of rows with path, name, depth, count, total_ns, self_ns and percent,
+            in depth-first order
+        """
+        spans = self.get_spans(trace_id)
+        if not spans:
+            return []
+
+        by_id = {span.span_id: span for span in spans}
+        child_time: Dict[int, int] = {}
+        for span in spans:
+            if span.parent_id in by_id:
+                child_time[span.parent_id] = child_time.get(span.parent_id, 0) + span.duration_ns
+
+        paths: Dict[int, tuple] = {}
+
+        def path_of(span: Span) -> tuple:
+            if span.span_id not in paths:
+                parent = by_id.get(span.parent_id)
+                paths[span.span_id] = (path_of(parent) if parent else ()) + (span.name,)
+            return paths[span.span_id]
+
+        rows: Dict[tuple, Dict[str, Any]] = {}
+        for span in spans:
+            path = path_of(span)
+            row = rows.setdefault(path, {'count': 0, 'total_ns': 0, 'self_ns': 0, 'first_start': span.start_ns})
+            row['count'] += 1
+            row['total_ns'] += span.duration_ns
+            row['self_ns'] += max(0, span.duration_ns - child_time.get(span.span_id, 0))
+
+        root_total = sum(row['total_ns'] for path, row in rows.items() if len(path) == 1) or 1
+
+        # Depth-first order, siblings in the order they first started
+        ordered = sorted(rows.items(), key=lambda item: tuple(
+            rows[item[0][:depth + 1]]['first_start'] for depth in range(len(item[0]))
+        ))
+
+        return [{
+            'path': ';'.join(path),
+            'name': path[-1],
+            'depth': len(path) - 1,
+            'count': row['count'],
+            'total_ns': row['total_ns'],
+            'self_ns': row['self_ns'],
+            'percent': row['total_ns'] * 100.0 / root_total
+        } for path, row in ordered]
+
+
+def _json_safe(value: Any) -> Any:
+    """Convert an attribute to a JSON-serializable value."""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+_tracer = Tracer(enabled=os.environ.get('PINOKIO_TRACE', '').lower() in ('1', 'true', 'yes'))
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer."""
+    return _tracer
+
+
+def span(name: str, category: str = "", **attributes: Any):
+    """Open a span on the process-wide tracer (see Tracer.span)."""
+    return _tracer.span(name, category, **attributes)
+
+
+def traced(name: Optional[str] = None, category: str = "", record_args: Iterable[str] = ()) -> Callable:
+    """Decorate a function with a span on the process-wide tracer (see Tracer.traced)."""
+    return _tracer.traced(name, category, record_args)
+
+
+def current_span():
+    """Get the active span of the process-wide tracer."""
+    return _tracer.current_span()
@@ -16,13 +16,19 @@ import json
 import time
 import random
 import string
-from typing import Dict, List, Optional, Any, Union, Callable
+from typing import Dict, List, Optional, Any, Union, Callable, Iterator, Mapping
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 import threading
 import re
 
+try:
+    from environment_management.expression_compiler import compile_template
+except ImportError:
+    # Loaded as a standalone module (e.g. by test_phase2.py)
+    from expression_compiler import compile_template
+
 
 class VariableType(Enum):
     """Enumeration of variable types."""
@@ -69,6 +75,30 @@ class VariableSubstitution:
     error_message: Optional[str] = None
 
 
+class VariableScopeView(Mapping):
+    """Read-only mapping view of a VariableSystem, used as an expression context."""
+    
+    _MISSING = object()
+    
+    def __init__(self, variable_system: 'VariableSystem'):
+        self.variable_system = variable_system
+    
+    def __getitem__(self, name: str) -> Any:
+        value = self.variable_system.get_variable(name, self._MISSING)
+        if value is self._MISSING:
+            raise KeyError(name)
+        return value
+    
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.variable_system.get_variable(name, self._MISSING) is not self._MISSING
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.variable_system.variables))
+    
+    def __len__(self) -> int:
+        return len(self.variable_system.variables)
+
+
 class VariableSystem:
     """
     Comprehensive variable management system.
@@ -291,11 +321,23 @@ class VariableSystem:
         
         return variables
     
+    def get_scope(self) -> Mapping:
+        """
+        Get a mapping view of all variables for expression evaluation.
+        
+        Returns:
+            Mapping: Read-only view resolving memory, environment and nested variables
+        """
+        return VariableScopeView(self)
+    
     def substitute_variables(self, text: str, recursive: bool = True, 
                            max_iterations: int = 10) -> VariableSubstitution:
         """
         Substitute variables in text using {{variable}} syntax.
         
+        Placeholders may hold full expressions (e.g. {{gpu === 'nvidia' ? 'cu121' : 'cpu'}});
+        templates are compiled once and cached by source text.
+        
         Args:
             text: Text containing variable references
             recursive: Whether to perform recursive substitution
@@ -311,38 +353,42 @@ class VariableSystem:
             substitution_count = 0
             iterations = 0
             
+            scope = self.get_scope()
+            
             while iterations < max_iterations:
                 # Find all variable references
-                pattern = self.substitution_patterns["memory"]
-                matches = re.findall(pattern, substituted_text)
+                template = compile_template(substituted_text)
                 
-                if not matches:
+                if not template.expressions:
                     break
                 
                 # Substitute each variable
-                for var_name in matches:
-                    var_name = var_name.strip()
-                    var_value = self.get_variable(var_name)
+                output = []
+                for part in template.parts:
+                    if isinstance(part, str):
+                        output.append(part)
+                        continue
+                    
+                    try:
+                        var_value = part.evaluate(scope)
+                    except Exception:
+                        var_value = None
                     
                     if var_value is not None:
                         # Convert value to string
                         if isinstance(var_value, (list, dict)):
-                            var_value = json.dumps(var_value)
+                            output.append(json.dumps(var_value))
                         else:
-                            var_value = str(var_value)
-                        
-                        # Replace variable reference
-                        old_text = substituted_text
-                        substituted_text = substituted_text.replace(f"{{{{{var_name}}}}}", var_value)
+                            output.append(str(var_value))
                         
-                        if old_text != substituted_text:
-                            substitution_count += 1
-                            if var_name not in variables_found:
-                                variables_found.append(var_name)
+                        substitution_count += 1
+                        if part.source not in variables_found:
+                            variables_found.append(part.source)
                     else:
-                        # Variable not found - leave as is or replace with empty string
-                        substituted_text = substituted_text.replace(f"{{{{{var_name}}}}}", "")
+                        # Variable not found - replace with empty string
+                        output.append("")
                 
+                substituted_text = "".join(output)
                 iterations += 1
                 
                 # If not recursive, break after first iteration
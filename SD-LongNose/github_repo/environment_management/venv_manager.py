@@ -22,6 +22,9 @@ from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
+sys.path.append('/workspace/SD-LongNose/github_repo')
+from environment_management.tracing import traced
+
 
 class EnvironmentType(Enum):
     """Enumeration of environment types."""
@@ -103,6 +106,7 @@ class VirtualEnvironmentManager:
         """Set progress callback function."""
         self.progress_callback = callback
     
+    @traced("venv.create", category="venv", record_args=("name",))
     def create_environment(self, name: str, env_type: EnvironmentType = EnvironmentType.PYTHON_VENV,
                           python_version: str = "python3", force_recreate: bool = False) -> EnvironmentOperation:
         """
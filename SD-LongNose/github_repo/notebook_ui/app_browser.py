@@ -10,11 +10,18 @@ import ipywidgets as widgets
 from IPython.display import display, HTML
 from pathlib import Path
 
+from app_analysis.app_catalog import AppCatalog, get_app_catalog
+
 class AppBrowser:
     """Clean app browser for notebook interface."""
     
     def __init__(self):
+        self.apps_database_path = None
         self.apps_data = self.load_apps_database()
+        # Shared catalog, indexed once per database file (fallback data gets its own)
+        self.catalog = get_app_catalog(self.apps_database_path) if self.apps_database_path else None
+        if self.catalog is None:
+            self.catalog = AppCatalog(self.apps_data)
         self.categories = self.extract_categories()
         self.selected_apps = set()
         
@@ -31,7 +38,9 @@ class AppBrowser:
             for path in possible_paths:
                 if os.path.exists(path):
                     with open(path, 'r') as f:
-                        return json.load(f)
+                        apps_data = json.load(f)
+                    self.apps_database_path = path
+                    return apps_data
             
             return {"error": "Database not found"}
             
@@ -43,13 +52,7 @@ class AppBrowser:
         if isinstance(self.apps_data, dict) and 'error' in self.apps_data:
             return ['Error']
         
-        categories = set()
-        for app_data in self.apps_data.values():
-            if isinstance(app_data, dict):
-                category = app_data.get('category', 'Unknown')
-                categories.add(category)
-        
-        return sorted(list(categories))
+        return self.catalog.categories
     
     def create_app_browser(self):
         """Create the main app browser interface."""
@@ -132,26 +135,12 @@ class AppBrowser:
     
     def filter_apps(self, category='All Categories', search_term=''):
         """Filter applications by category and search term."""
-        filtered = {}
-        
-        for app_id, app_data in self.apps_data.items():
-            if not isinstance(app_data, dict):
-                continue
-            
-            # Category filter
-            if category != 'All Categories':
-                if app_data.get('category', 'Unknown') != category:
-                    continue
-            
-            # Search filter
-            if search_term:
-                searchable_text = f"{app_data.get('name', '')} {app_data.get('description', '')} {app_id}".lower()
-                if search_term.lower() not in searchable_text:
-                    continue
-            
-            filtered[app_id] = app_data
+        matching_ids = self.catalog.filter(
+            query=search_term,
+            categories=[category] if category != 'All Categories' else None
+        )
         
-        return filtered
+        return {app_id: self.catalog.get(app_id) for app_id in matching_ids}
     
     def create_app_card_html(self, app_id, app_data):
         """Create HTML for a single app card."""
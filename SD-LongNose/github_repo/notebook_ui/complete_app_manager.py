@@ -10,19 +10,31 @@ import json
 import subprocess
 import threading
 import time
+from itertools import islice
 from pathlib import Path
 import ipywidgets as widgets
 from IPython.display import display
 
+from app_analysis.app_catalog import AppCatalog, get_app_catalog
+
 class CompleteAppManager:
     """REAL app manager with ALL 284 apps and REAL functionality."""
     
     def __init__(self):
+        self.apps_database_path = None
         self.apps_data = self.load_complete_apps_database()
+        # Shared catalog, indexed once per database file (fallback data gets its own)
+        self.catalog = get_app_catalog(self.apps_database_path) if self.apps_database_path else None
+        if self.catalog is None:
+            self.catalog = AppCatalog(self.apps_data)
         self.categories = self.extract_all_categories()
         self.filtered_apps = self.apps_data.copy()
         self.installation_processes = {}
         
+        # Pagination: only the current page of app widgets is built and sent to the browser
+        self.current_page = 0
+        self.app_widget_cache = {}
+        
     def load_complete_apps_database(self):
         """Load the COMPLETE 284 apps database."""
         try:
@@ -38,6 +50,7 @@ class CompleteAppManager:
                 if os.path.exists(path):
                     with open(path, 'r') as f:
                         apps_data = json.load(f)
+                    self.apps_database_path = path
                     print(f"✅ Loaded COMPLETE database: {len(apps_data)} real applications")
                     return apps_data
             
@@ -100,13 +113,7 @@ class CompleteAppManager:
     
     def extract_all_categories(self):
         """Extract ALL unique categories from the apps."""
-        categories = set()
-        for app_data in self.apps_data.values():
-            if isinstance(app_data, dict):
-                category = app_data.get('category', 'Unknown')
-                categories.add(category)
-        
-        return sorted(list(categories))
+        return self.catalog.categories
     
     def create_complete_app_gallery(self):
         """Create COMPLETE app gallery with ALL functionality."""
@@ -185,27 +192,54 @@ class CompleteAppManager:
     def update_apps_display(self):
         """Update the apps display with current filters."""
         
-        apps_to_show = min(self.apps_per_page.value if hasattr(self, 'apps_per_page') else 20, 
-                          len(self.filtered_apps))
+        page_size = self.apps_per_page.value if hasattr(self, 'apps_per_page') else 20
+        total_pages = max(1, (len(self.filtered_apps) + page_size - 1) // page_size)
+        self.current_page = min(self.current_page, total_pages - 1)
+        start = self.current_page * page_size
         
         app_widgets = []
         
-        for i, (app_id, app_data) in enumerate(list(self.filtered_apps.items())[:apps_to_show]):
+        # Widgets are reused across filter and page changes
+        for app_id, app_data in islice(self.filtered_apps.items(), start, start + page_size):
             if isinstance(app_data, dict):
-                app_widget = self.create_real_app_widget(app_id, app_data)
+                app_widget = self.app_widget_cache.get(app_id)
+                if app_widget is None:
+                    app_widget = self.create_real_app_widget(app_id, app_data)
+                    self.app_widget_cache[app_id] = app_widget
                 app_widgets.append(app_widget)
         
         # Add summary
         summary = widgets.HTML(value=f"""
         <div style='background: #f8f9fa; padding: 10px; border-radius: 5px; margin: 10px 0; text-align: center;'>
-            <strong>📊 Showing {len(app_widgets)} of {len(self.filtered_apps)} filtered apps</strong>
-            <br><small>Total available: {len(self.apps_data)} applications</small>
+            <strong>📊 Showing {start + 1 if app_widgets else 0}–{start + len(app_widgets)} of {len(self.filtered_apps)} filtered apps</strong>
+            <br><small>Page {self.current_page + 1} of {total_pages} | Total available: {len(self.apps_data)} applications</small>
         </div>
         """)
         
         app_widgets.append(summary)
+        app_widgets.append(self.create_page_controls(total_pages))
         self.apps_container.children = app_widgets
     
+    def create_page_controls(self, total_pages):
+        """Create previous/next page controls for the apps display."""
+        
+        if not hasattr(self, 'page_controls'):
+            self.prev_page_btn = widgets.Button(description='◀ Prev', layout=widgets.Layout(width='90px'))
+            self.next_page_btn = widgets.Button(description='Next ▶', layout=widgets.Layout(width='90px'))
+            self.prev_page_btn.on_click(lambda b: self.change_page(-1))
+            self.next_page_btn.on_click(lambda b: self.change_page(1))
+            self.page_controls = widgets.HBox([self.prev_page_btn, self.next_page_btn])
+        
+        self.prev_page_btn.disabled = self.current_page == 0
+        self.next_page_btn.disabled = self.current_page >= total_pages - 1
+        
+        return self.page_controls
+    
+    def change_page(self, delta):
+        """Move to another page of the apps display."""
+        self.current_page = max(0, self.current_page + delta)
+        self.update_apps_display()
+    
     def create_real_app_widget(self, app_id, app_data):
         """Create REAL app widget with ACTUAL functionality."""
         
@@ -550,33 +584,15 @@ class CompleteAppManager:
         search_term = self.search_box.value if hasattr(self, 'search_box') else ''
         category = self.category_filter.value if hasattr(self, 'category_filter') else 'All Categories'
         
-        # Filter by category
-        if category == 'All Categories':
-            filtered = self.apps_data.copy()
-        else:
-            filtered = {}
-            for app_id, app_data in self.apps_data.items():
-                if isinstance(app_data, dict) and app_data.get('category') == category:
-                    filtered[app_id] = app_data
-        
-        # Filter by search term
-        if search_term:
-            search_filtered = {}
-            for app_id, app_data in filtered.items():
-                if isinstance(app_data, dict):
-                    # Search in name, description, and app_id
-                    searchable_text = (
-                        f"{app_data.get('name', '')} "
-                        f"{app_data.get('description', '')} "
-                        f"{app_id}"
-                    ).lower()
-                    
-                    if search_term.lower() in searchable_text:
-                        search_filtered[app_id] = app_data
-            
-            filtered = search_filtered
+        # Filter by category and search term (name, tags, author, description, app_id)
+        matching_ids = self.catalog.filter(
+            query=search_term,
+            categories=[category] if category != 'All Categories' else None
+        )
+        filtered = {app_id: self.catalog.get(app_id) for app_id in matching_ids}
         
         self.filtered_apps = filtered
+        self.current_page = 0
         self.update_apps_display()
         
         # Show filter results
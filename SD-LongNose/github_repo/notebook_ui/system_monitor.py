@@ -6,14 +6,16 @@ Real-time system monitoring using ipywidgets
 
 import ipywidgets as widgets
 from IPython.display import display, HTML
-import threading
-import time
+import platform
+
+from cloud_detection.metrics_collector import get_metrics_collector
 
 class SystemMonitor:
     """Simple system monitor for notebook."""
     
     def __init__(self):
         self.monitoring = False
+        self.metrics_collector = get_metrics_collector()
         
     def create_system_monitor(self):
         """Create system monitoring interface."""
@@ -74,33 +76,26 @@ class SystemMonitor:
     def get_system_info(self):
         """Get current system information."""
         try:
-            import psutil
-            import platform
-            
-            # Get basic info
-            cpu_count = psutil.cpu_count()
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            snapshot = self.metrics_collector.get_snapshot()
+            if snapshot is None:
+                return """
+                <div style='background: #e3f2fd; padding: 15px; border-radius: 8px; margin: 10px 0;'>
+                    <h4>💻 System Information</h4>
+                    <p>⏳ Waiting for the first metrics sample...</p>
+                </div>
+                """
             
             return f"""
             <div style='background: #e3f2fd; padding: 15px; border-radius: 8px; margin: 10px 0;'>
                 <h4>💻 System Information</h4>
                 <p><strong>Platform:</strong> {platform.system()} {platform.release()}</p>
-                <p><strong>CPU Cores:</strong> {cpu_count}</p>
-                <p><strong>Total Memory:</strong> {memory.total / (1024**3):.1f} GB</p>
-                <p><strong>Total Disk:</strong> {disk.total / (1024**3):.1f} GB</p>
+                <p><strong>CPU Cores:</strong> {snapshot.cpu_count}</p>
+                <p><strong>Total Memory:</strong> {snapshot.memory_total / (1024**3):.1f} GB</p>
+                <p><strong>Total Disk:</strong> {snapshot.disk_total / (1024**3):.1f} GB</p>
                 <p><strong>Python:</strong> {platform.python_version()}</p>
             </div>
             """
             
-        except ImportError:
-            return """
-            <div style='background: #fff3cd; padding: 15px; border-radius: 8px; margin: 10px 0;'>
-                <h4>⚠️ System Info</h4>
-                <p>psutil not available - install for detailed monitoring</p>
-                <p><strong>Status:</strong> Basic monitoring only</p>
-            </div>
-            """
         except Exception as e:
             return f"""
             <div style='background: #f8d7da; padding: 15px; border-radius: 8px; margin: 10px 0;'>
@@ -110,49 +105,27 @@ class SystemMonitor:
             """
     
     def start_monitoring(self):
-        """Start background monitoring."""
+        """Start updating the bars from the shared metrics collector."""
         if self.monitoring:
             return
         
         self.monitoring = True
-        
-        def monitor_loop():
-            try:
-                import psutil
-                while self.monitoring:
-                    # Update progress bars
-                    self.cpu_bar.value = int(psutil.cpu_percent(interval=1))
-                    
-                    memory = psutil.virtual_memory()
-                    self.memory_bar.value = int(memory.percent)
-                    
-                    # Simple GPU check (if available)
-                    try:
-                        # Try to get GPU info
-                        self.gpu_bar.value = 0  # Default if no GPU monitoring
-                    except:
-                        self.gpu_bar.value = 0
-                    
-                    time.sleep(3)
-            except ImportError:
-                # Fallback without psutil
-                while self.monitoring:
-                    self.cpu_bar.value = 25  # Simulated values
-                    self.memory_bar.value = 45
-                    self.gpu_bar.value = 0
-                    time.sleep(5)
-            except Exception:
-                self.monitoring = False
-        
-        # Start monitoring thread
-        monitor_thread = threading.Thread(target=monitor_loop, daemon=True)
-        monitor_thread.start()
+        self.metrics_collector.subscribe(self.update_bars)
         
         print("✅ Monitoring started")
     
+    def update_bars(self, snapshot):
+        """Show a collector snapshot in the progress bars."""
+        if snapshot is None:
+            return
+        self.cpu_bar.value = int(snapshot.cpu_percent)
+        self.memory_bar.value = int(snapshot.memory_percent)
+        self.gpu_bar.value = int(snapshot.gpu.utilization) if snapshot.gpu else 0
+    
     def stop_monitoring(self):
         """Stop background monitoring."""
         self.monitoring = False
+        self.metrics_collector.unsubscribe(self.update_bars)
         print("⏹️ Monitoring stopped")
 
 def create_system_monitor():
@@ -4,19 +4,31 @@ PinokioCloud Tunnel Manager for Notebook
 Simple tunnel creation and management using ipywidgets
 """
 
-import subprocess
+import queue
+import asyncio
+import tempfile
 import ipywidgets as widgets
 from IPython.display import display
 import time
 
+from tunneling.tunnel_supervisor import TunnelSupervisor, CLOUDFLARE_URL_PATTERN
+
 class TunnelManager:
     """Simple tunnel manager for notebook."""
     
     def __init__(self):
         self.active_tunnels = {}
+        self.supervisor = TunnelSupervisor(f"{tempfile.gettempdir()}/pinokio_tunnel_logs")
+        # Connector readiness arrives on reader threads; widgets are only updated from the kernel's loop
+        self.ready_queue = queue.Queue()
+        self.ui_loop = None
         
     def create_tunnel_manager(self):
         """Create tunnel management interface."""
+        try:
+            self.ui_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.ui_loop = None
         
         # Header
         header = widgets.HTML(value="""
@@ -65,6 +77,7 @@ class TunnelManager:
     
     def create_tunnel(self, port, tunnel_type):
         """Create a new tunnel."""
+        self.process_ready_tunnels()
         with self.output:
             print(f"🌐 Creating {tunnel_type} tunnel for port {port}...")
         
@@ -113,28 +126,65 @@ class TunnelManager:
         try:
             with self.output:
                 print(f"🔄 Starting cloudflare tunnel for port {port}...")
-                print("💡 Check terminal for public URL")
-            
-            # Start cloudflare tunnel
-            subprocess.Popen([
-                'cloudflared', 'tunnel', '--url', f'http://localhost:{port}'
-            ])
             
-            # Add to display (URL will be shown in terminal)
+            # Start cloudflare tunnel; its output is watched for the public URL
             tunnel_id = f"cloudflare_{port}_{int(time.time())}"
+            handle = self.supervisor.start(
+                tunnel_id,
+                ['cloudflared', 'tunnel', '--url', f'http://localhost:{port}'],
+                CLOUDFLARE_URL_PATTERN
+            )
+            
             self.active_tunnels[tunnel_id] = {
                 'type': 'cloudflare',
                 'port': port,
-                'url': 'Check terminal for URL',
+                'url': 'Waiting for URL...',
                 'status': 'Starting'
             }
             
             self.tunnels_display.value = self.get_tunnels_html()
             
+            # Update the display as soon as the URL is printed
+            handle.add_done_callback(lambda match: self.queue_cloudflare_ready(tunnel_id, match))
+            
         except Exception as e:
             with self.output:
                 print(f"❌ Cloudflare failed: {e}")
     
+    def queue_cloudflare_ready(self, tunnel_id, match):
+        """Hand a finished URL watch from the reader thread to the UI loop."""
+        self.ready_queue.put((tunnel_id, match))
+        if self.ui_loop is not None and not self.ui_loop.is_closed():
+            self.ui_loop.call_soon_threadsafe(self.process_ready_tunnels)
+    
+    def process_ready_tunnels(self):
+        """Apply queued tunnel updates (without a UI loop, on the next interaction)."""
+        while True:
+            try:
+                tunnel_id, match = self.ready_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.on_cloudflare_ready(tunnel_id, match)
+    
+    def on_cloudflare_ready(self, tunnel_id, match):
+        """Update a cloudflare tunnel once its URL is known (or it failed)."""
+        info = self.active_tunnels.get(tunnel_id)
+        if info is None:
+            return
+        
+        if match.exception() is None:
+            info['url'] = match.result()
+            info['status'] = 'Active'
+            message = f"✅ Cloudflare tunnel created: {info['url']}"
+        else:
+            info['url'] = ''
+            info['status'] = 'Failed'
+            message = f"❌ Cloudflare failed: {match.exception()}"
+        
+        self.tunnels_display.value = self.get_tunnels_html()
+        with self.output:
+            print(message)
+    
     def get_tunnels_html(self):
         """Get HTML for active tunnels display."""
         if not self.active_tunnels:
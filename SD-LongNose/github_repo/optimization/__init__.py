@@ -14,6 +14,7 @@ from optimization.cache_manager import CacheManager, CacheLayer, CacheStrategy
 from optimization.performance_monitor import PerformanceMonitor, PerformanceMetrics, ResourceAlert
 from optimization.error_recovery import ErrorRecovery, ErrorPattern, RecoveryAction
 from optimization.logging_system import LoggingSystem, LogLevel, LogAnalyzer
+from optimization.sampling_profiler import SamplingProfiler, ProfileResult, ThreadProfile, get_profiler
 
 __all__ = [
     'CacheManager',
@@ -27,7 +28,11 @@ __all__ = [
     'RecoveryAction',
     'LoggingSystem',
     'LogLevel',
-    'LogAnalyzer'
+    'LogAnalyzer',
+    'SamplingProfiler',
+    'ProfileResult',
+    'ThreadProfile',
+    'get_profiler'
 ]
 
 __version__ = "1.0.0"
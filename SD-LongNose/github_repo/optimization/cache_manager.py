@@ -49,6 +49,7 @@ class CacheStrategy(Enum):
     FIFO = "fifo"  # First In, First Out
     TTL = "ttl"  # Time To Live
     ADAPTIVE = "adaptive"  # Adaptive based on usage patterns
+    PERSISTENT = "persistent"  # Kept until explicitly invalidated
 
 
 class CacheType(Enum):
@@ -947,6 +948,7 @@ class CacheManager:
             self.cleanup_active = True
             self.cleanup_thread = threading.Thread(
                 target=self._cleanup_loop,
+                name="CacheManager-cleanup",
                 daemon=True
             )
             self.cleanup_thread.start()
@@ -295,6 +295,7 @@ class ErrorRecovery:
             self.monitoring_active = True
             self.monitoring_thread = threading.Thread(
                 target=self._monitoring_loop,
+                name="ErrorRecovery-monitor",
                 daemon=True
             )
             self.monitoring_thread.start()
@@ -27,6 +27,7 @@ import json
 sys.path.append('/workspace/SD-LongNose/github_repo')
 from cloud_detection.cloud_detector import CloudDetector
 from cloud_detection.resource_assessor import ResourceAssessor
+from cloud_detection.metrics_collector import MetricsSnapshot, get_metrics_collector
 from running.process_tracker import ProcessTracker
 from platforms.colab_optimizer import ColabOptimizer
 from platforms.vast_optimizer import VastOptimizer
@@ -138,10 +139,16 @@ class PerformanceMonitor:
         self.performance_storage_path = self.base_path / "performance_storage"
         self.performance_storage_path.mkdir(exist_ok=True)
         
-        # Performance monitoring
+        # Performance monitoring (a subscriber of the shared metrics collector)
         self.monitoring_active = False
-        self.monitoring_thread = None
         self.monitoring_interval = 5.0  # seconds
+        self.metrics_collector = get_metrics_collector()
+        self.last_processed: float = 0.0
+        
+        # Snapshots are handed from the collector thread to the monitoring thread
+        self.monitoring_thread = None
+        self.pending_snapshot: Optional[MetricsSnapshot] = None
+        self.snapshot_ready = threading.Event()
         
         # Metrics storage
         self.metrics_history: deque = deque(maxlen=1000)  # Keep last 1000 metrics
@@ -184,13 +191,15 @@ class PerformanceMonitor:
     
     def start_monitoring(self) -> None:
         """Start performance monitoring."""
-        if self.monitoring_thread is None or not self.monitoring_thread.is_alive():
+        if not self.monitoring_active:
             self.monitoring_active = True
             self.monitoring_thread = threading.Thread(
                 target=self._monitoring_loop,
+                name="PerformanceMonitor-metrics",
                 daemon=True
             )
             self.monitoring_thread.start()
+            self.metrics_collector.subscribe(self._on_metrics_snapshot)
             print("[PerformanceMonitor] Started performance monitoring")
         
         # Start optimization thread
@@ -198,6 +207,7 @@ class PerformanceMonitor:
             self.optimization_active = True
             self.optimization_thread = threading.Thread(
                 target=self._optimization_loop,
+                name="PerformanceMonitor-optimize",
                 daemon=True
             )
             self.optimization_thread.start()
@@ -206,6 +216,8 @@ class PerformanceMonitor:
     def stop_monitoring(self) -> None:
         """Stop performance monitoring."""
         self.monitoring_active = False
+        self.metrics_collector.unsubscribe(self._on_metrics_snapshot)
+        self.snapshot_ready.set()
         if self.monitoring_thread and self.monitoring_thread.is_alive():
             self.monitoring_thread.join(timeout=5.0)
         
@@ -378,43 +390,28 @@ class PerformanceMonitor:
         if event in self.event_callbacks:
             self.event_callbacks[event].append(callback)
     
-    def _collect_metrics(self) -> PerformanceMetrics:
-        """Collect current performance metrics."""
+    def _collect_metrics(self, snapshot: Optional[MetricsSnapshot] = None) -> PerformanceMetrics:
+        """
+        Build performance metrics from a shared collector snapshot.
+        
+        Args:
+            snapshot: Snapshot to use (the collector's latest when None)
+        """
         try:
-            # Basic system metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            
-            # Network metrics
-            network = psutil.net_io_counters()
+            if snapshot is None:
+                snapshot = self.metrics_collector.get_snapshot()
+            if snapshot is None:
+                # The collector hasn't taken its first sample yet
+                return self._empty_metrics()
             
-            # Process metrics
-            process_count = len(psutil.pids())
+            process_count = snapshot.process_count
             
-            # GPU metrics
-            gpu_percent = 0.0
-            gpu_memory_percent = 0.0
-            gpu_memory_used_gb = 0.0
-            gpu_memory_total_gb = 0.0
-            
-            try:
-                import pynvml
-                pynvml.nvmlInit()
-                device_count = pynvml.nvmlDeviceGetCount()
-                
-                if device_count > 0:
-                    handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-                    utilization = pynvml.nvmlDeviceGetUtilizationRates(handle)
-                    memory_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                    
-                    gpu_percent = utilization.gpu
-                    gpu_memory_used_gb = memory_info.used / (1024**3)
-                    gpu_memory_total_gb = memory_info.total / (1024**3)
-                    gpu_memory_percent = (memory_info.used / memory_info.total) * 100
-                    
-            except (ImportError, Exception):
-                pass  # GPU monitoring not available
+            # GPU metrics (first device)
+            gpu = snapshot.gpu
+            gpu_percent = gpu.utilization if gpu else 0.0
+            gpu_memory_percent = gpu.memory_percent if gpu else 0.0
+            gpu_memory_used_gb = gpu.memory_used / (1024**3) if gpu else 0.0
+            gpu_memory_total_gb = gpu.memory_total / (1024**3) if gpu else 0.0
             
             # Get app-specific metrics
             active_apps = 0
@@ -452,20 +449,20 @@ class PerformanceMonitor:
             
             # Create metrics object
             metrics = PerformanceMetrics(
-                timestamp=datetime.now(),
-                cpu_percent=cpu_percent,
-                memory_percent=memory.percent,
-                memory_used_gb=memory.used / (1024**3),
-                memory_total_gb=memory.total / (1024**3),
-                disk_percent=(disk.used / disk.total) * 100,
-                disk_used_gb=disk.used / (1024**3),
-                disk_total_gb=disk.total / (1024**3),
+                timestamp=snapshot.datetime,
+                cpu_percent=snapshot.cpu_percent,
+                memory_percent=snapshot.memory_percent,
+                memory_used_gb=snapshot.memory_used / (1024**3),
+                memory_total_gb=snapshot.memory_total / (1024**3),
+                disk_percent=snapshot.disk_percent,
+                disk_used_gb=snapshot.disk_used / (1024**3),
+                disk_total_gb=snapshot.disk_total / (1024**3),
                 gpu_percent=gpu_percent,
                 gpu_memory_percent=gpu_memory_percent,
                 gpu_memory_used_gb=gpu_memory_used_gb,
                 gpu_memory_total_gb=gpu_memory_total_gb,
-                network_bytes_sent=network.bytes_sent,
-                network_bytes_recv=network.bytes_recv,
+                network_bytes_sent=snapshot.net_bytes_sent,
+                network_bytes_recv=snapshot.net_bytes_recv,
                 process_count=process_count,
                 active_apps=active_apps,
                 cache_hit_rate=cache_hit_rate,
@@ -477,9 +474,13 @@ class PerformanceMonitor:
             
         except Exception as e:
             print(f"[PerformanceMonitor] Error collecting metrics: {e}")
-            return PerformanceMetrics(timestamp=datetime.now(), cpu_percent=0, memory_percent=0,
-                                    memory_used_gb=0, memory_total_gb=0, disk_percent=0,
-                                    disk_used_gb=0, disk_total_gb=0)
+            return self._empty_metrics()
+    
+    def _empty_metrics(self) -> PerformanceMetrics:
+        """Zeroed metrics for when no snapshot is available."""
+        return PerformanceMetrics(timestamp=datetime.now(), cpu_percent=0, memory_percent=0,
+                                  memory_used_gb=0, memory_total_gb=0, disk_percent=0,
+                                  disk_used_gb=0, disk_total_gb=0)
     
     def _check_performance_alerts(self, metrics: PerformanceMetrics) -> None:
         """Check for performance alerts based on current metrics."""
@@ -547,29 +548,46 @@ class PerformanceMonitor:
         except Exception as e:
             print(f"[PerformanceMonitor] Error checking performance alerts: {e}")
     
+    def _on_metrics_snapshot(self, snapshot: MetricsSnapshot) -> None:
+        """
+        Hand a collector snapshot to the monitoring thread, at most once per interval.
+        
+        Runs on the collector thread, so it only stores the snapshot; a snapshot
+        still waiting to be processed is replaced by the newer one.
+        """
+        if not self.monitoring_active or snapshot.timestamp - self.last_processed < self.monitoring_interval:
+            return
+        self.last_processed = snapshot.timestamp
+        self.pending_snapshot = snapshot
+        self.snapshot_ready.set()
+    
     def _monitoring_loop(self) -> None:
-        """Main monitoring loop."""
+        """Process snapshots handed over by the collector."""
         while self.monitoring_active:
-            try:
-                # Collect current metrics
-                metrics = self._collect_metrics()
-                self.current_metrics = metrics
-                
-                # Add to history
-                self.metrics_history.append(metrics)
-                
-                # Check for alerts
-                self._check_performance_alerts(metrics)
-                
-                # Save metrics periodically
-                if len(self.metrics_history) % 60 == 0:  # Every 5 minutes
-                    self._save_performance_history()
-                
-                time.sleep(self.monitoring_interval)
+            self.snapshot_ready.wait()
+            self.snapshot_ready.clear()
+            snapshot, self.pending_snapshot = self.pending_snapshot, None
+            if snapshot is not None and self.monitoring_active:
+                self._process_snapshot(snapshot)
+    
+    def _process_snapshot(self, snapshot: MetricsSnapshot) -> None:
+        """Record a snapshot, check alerts and periodically save the history."""
+        try:
+            metrics = self._collect_metrics(snapshot)
+            self.current_metrics = metrics
+            
+            # Add to history
+            self.metrics_history.append(metrics)
+            
+            # Check for alerts
+            self._check_performance_alerts(metrics)
+            
+            # Save metrics periodically
+            if len(self.metrics_history) % 60 == 0:  # Every 5 minutes
+                self._save_performance_history()
                 
-            except Exception as e:
-                print(f"[PerformanceMonitor] Error in monitoring loop: {e}")
-                time.sleep(self.monitoring_interval)
+        except Exception as e:
+            print(f"[PerformanceMonitor] Error processing metrics: {e}")
     
     def _optimization_loop(self) -> None:
         """Main optimization loop."""
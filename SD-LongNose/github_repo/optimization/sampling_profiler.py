@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""
+PinokioCloud Sampling Profiler
+
+This module provides an on-demand sampling profiler for the long-running
+launcher process. While a session runs, a sampler thread snapshots every
+thread's Python stack with sys._current_frames() at a configurable rate and
+aggregates the snapshots into collapsed stacks ("thread;frame;frame count",
+the input format of flamegraph.pl and speedscope). Threads are labelled after
+the manager that owns them (e.g. "ProcessTracker._monitoring_loop"), and
+per-thread CPU time is read from /proc/self/task/*/stat, so the monitoring
+loop that is actually burning CPU can be told apart from ones that sleep.
+
+Nothing runs until a session is started. A running launcher can also be
+asked for a dump from the command line:
+
+    python optimization/sampling_profiler.py --pid <launcher pid> --duration 10
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+
+
+# Directory used to exchange dump requests and results with a running launcher
+CONTROL_DIR = os.path.join(tempfile.gettempdir(), "pinokio_profiler")
+
+# Clock ticks per second used by /proc/<pid>/task/<tid>/stat
+try:
+    _CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+except (AttributeError, ValueError, OSError):
+    _CLOCK_TICKS = 100
+
+_PROFILER_THREAD_PREFIX = "SamplingProfiler"
+
+
+@dataclass
+class ThreadProfile:
+    """Samples and CPU time of one thread during a profiling session."""
+    native_id: Optional[int]
+    name: str
+    label: str
+    samples: int = 0
+    cpu_seconds: float = 0.0
+    cpu_percent: float = 0.0
+
+
+@dataclass
+class ProfileResult:
+    """Result of a profiling session."""
+    started_at: str
+    duration: float
+    hz: float
+    sample_count: int
+    stacks: Dict[str, int] = field(default_factory=dict)
+    threads: List[ThreadProfile] = field(default_factory=list)
+
+    def to_collapsed(self) -> str:
+        """Render the stacks in collapsed format, heaviest first."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.top_stacks())
+
+    def top_stacks(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Get the stacks with the most samples."""
+        ordered = sorted(self.stacks.items(), key=lambda item: item[1], reverse=True)
+        return ordered[:limit] if limit else ordered
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert ProfileResult to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ProfileResult':
+        """Create ProfileResult from dictionary."""
+        data = dict(data)
+        data['threads'] = [ThreadProfile(**thread) for thread in data.get('threads', [])]
+        return cls(**data)
+
+
+def read_thread_cpu_times(pid: Optional[int] = None) -> Dict[int, Tuple[str, float]]:
+    """
+    Read per-thread CPU time (user + system) from /proc.
+
+    Args:
+        pid: Process to read (the current process when None)
+
+    Returns:
+        Dict mapping native thread ID to (kernel thread name, CPU seconds);
+        empty where /proc is unavailable
+    """
+    task_dir = f"/proc/{pid or 'self'}/task"
+    times = {}
+    try:
+        tids = os.listdir(task_dir)
+    except OSError:
+        return times
+
+    for tid in tids:
+        try:
+            with open(f"{task_dir}/{tid}/stat", 'r') as f:
+                stat = f.read()
+            # The thread name is in parentheses and may contain spaces
+            name = stat[stat.index('(') + 1:stat.rindex(')')]
+            fields = stat[stat.rindex(')') + 2:].split()
+            utime, stime = int(fields[11]), int(fields[12])
+            times[int(tid)] = (name, (utime + stime) / _CLOCK_TICKS)
+        except (OSError, ValueError, IndexError):
+            continue
+    return times
+
+
+def describe_thread(thread: Optional[threading.Thread], frame=None) -> str:
+    """
+    Label a thread after the manager that owns it.
+
+    Threads given an explicit name keep it. Threads with a default name
+    ("Thread-3 (_monitoring_loop)") are labelled from their bound target
+    method, or failing that from the outermost frame that runs a method.
+
+    Args:
+        thread: Thread object (None for threads not started by threading)
+        frame: Current frame of the thread
+
+    Returns:
+        Thread label
+    """
+    if thread is None:
+        return "native-thread"
+    if thread is threading.main_thread():
+        return "MainThread"
+
+    name = thread.name
+    if not name.startswith("Thread-"):
+        return name
+
+    target = getattr(thread, '_target', None)
+    owner = getattr(target, '__self__', None)
+    if owner is not None and not isinstance(owner, threading.Thread):
+        return f"{type(owner).__name__}.{target.__name__}"
+
+    # Walk to the outermost frame running a method of a non-thread object
+    label = None
+    while frame is not None:
+        instance = frame.f_locals.get('self') if frame.f_code.co_varnames[:1] == ('self',) else None
+        if instance is not None and not isinstance(instance, threading.Thread):
+            label = f"{type(instance).__name__}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return label or name
+
+
+class SamplingProfiler:
+    """
+    Low-overhead sampling profiler for all threads of the current process.
+
+    Only one session runs at a time. The sampler thread itself is excluded
+    from the samples.
+    """
+
+    def __init__(self, hz: float = 100.0, max_depth: int = 64):
+        """
+        Initialize the sampling profiler.
+
+        Args:
+            hz: Samples per second
+            max_depth: Innermost frames kept per stack
+        """
+        self.hz = hz
+        self.max_depth = max_depth
+
+        self.lock = threading.Lock()
+        self.sampler_thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+        self.last_result: Optional[ProfileResult] = None
+
+        # Session state
+        self.stacks: Dict[str, int] = {}
+        self.thread_samples: Dict[int, int] = {}
+        self.thread_labels: Dict[int, str] = {}
+        self.sample_count = 0
+        self.session_hz = hz
+        self.session_start = 0.0
+        self.session_started_at = ""
+        self.cpu_at_start: Dict[int, Tuple[str, float]] = {}
+
+        self.frame_labels: Dict[Any, str] = {}
+
+        self.control_thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether a session is in progress."""
+        return self.sampler_thread is not None and self.sampler_thread.is_alive()
+
+    def start(self, duration: Optional[float] = None, hz: Optional[float] = None) -> bool:
+        """
+        Start a profiling session.
+
+        Args:
+            duration: Seconds after which the session stops by itself (None runs until stop())
+            hz: Samples per second for this session
+
+        Returns:
+            bool: False if a session is already running
+        """
+        with self.lock:
+            if self.is_running:
+                return False
+
+            self.stacks = {}
+            self.thread_samples = {}
+            self.thread_labels = {}
+            self.sample_count = 0
+            self.session_hz = hz or self.hz
+            self.session_started_at = datetime.now().isoformat()
+            self.cpu_at_start = read_thread_cpu_times()
+            self.session_start = time.monotonic()
+            self.stop_event.clear()
+
+            self.sampler_thread = threading.Thread(
+                target=self._sample_loop,
+                args=(duration,),
+                name=f"{_PROFILER_THREAD_PREFIX}-sampler",
+                daemon=True
+            )
+            self.sampler_thread.start()
+            return True
+
+    def stop(self) -> Optional[ProfileResult]:
+        """
+        Stop the running session.
+
+        Returns:
+            ProfileResult of the session (the last result if none was running)
+        """
+        thread = self.sampler_thread
+        if thread is not None:
+            self.stop_event.set()
+            thread.join()
+        return self.last_result
+
+    def profile(self, duration: float = 5.0, hz: Optional[float] = None) -> Optional[ProfileResult]:
+        """
+        Profile for a fixed time and return the result.
+
+        Args:
+            duration: Seconds to sample
+            hz: Samples per second
+
+        Returns:
+            ProfileResult, or None if another session is already running
+        """
+        if not self.start(duration, hz):
+            return None
+        self.sampler_thread.join()
+        return self.last_result
+
+    def get_thread_cpu_snapshot(self) -> List[ThreadProfile]:
+        """
+        Get the cumulative CPU time of every thread, heaviest first.
+
+        Returns:
+            List[ThreadProfile]: cpu_seconds is the total since the thread started
+        """
+        cpu_times = read_thread_cpu_times()
+        frames = sys._current_frames()
+        threads = {thread.native_id: thread for thread in threading.enumerate()}
+
+        profiles = []
+        for native_id, (kernel_name, cpu_seconds) in cpu_times.items():
+            thread = threads.get(native_id)
+            label = describe_thread(thread, frames.get(thread.ident) if thread else None) if thread else kernel_name
+            profiles.append(ThreadProfile(
+                native_id=native_id,
+                name=thread.name if thread else kernel_name,
+                label=label,
+                cpu_seconds=cpu_seconds
+            ))
+        return sorted(profiles, key=lambda profile: profile.cpu_seconds, reverse=True)
+
+    def _sample_loop(self, duration: Optional[float]) -> None:
+        """Take samples until stopped or the duration elapses."""
+        interval = 1.0 / self.session_hz
+        own_ident = threading.get_ident()
+        deadline = self.session_start + duration if duration else None
+        next_sample = time.monotonic()
+
+        try:
+            while not self.stop_event.is_set():
+                self._take_sample(own_ident)
+
+                next_sample += interval
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    break
+                if next_sample < now:
+                    # Fell behind (e.g. GIL contention); skip missed ticks
+                    next_sample = now + interval
+                self.stop_event.wait(next_sample - now)
+        finally:
+            self.last_result = self._build_result()
+
+    def _take_sample(self, own_ident: int) -> None:
+        """Record the current stack of every other thread."""
+        frames = sys._current_frames()
+        threads = {thread.ident: thread for thread in threading.enumerate()}
+        self.sample_count += 1
+
+        for ident, frame in frames.items():
+            if ident == own_ident:
+                continue
+            thread = threads.get(ident)
+            if thread is not None and thread.name.startswith(_PROFILER_THREAD_PREFIX):
+                continue
+
+            native_id = getattr(thread, 'native_id', None) or ident
+            label = self.thread_labels.get(native_id)
+            if label is None:
+                label = describe_thread(thread, frame)
+                self.thread_labels[native_id] = label
+
+            stack = []
+            depth = 0
+            while frame is not None and depth < self.max_depth:
+                stack.append(self._frame_label(frame))
+                frame = frame.f_back
+                depth += 1
+            stack.append(label)
+            stack.reverse()
+
+            key = ";".join(stack)
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.thread_samples[native_id] = self.thread_samples.get(native_id, 0) + 1
+
+    def _frame_label(self, frame) -> str:
+        """Label a frame as module:function, cached per code object."""
+        code = frame.f_code
+        label = self.frame_labels.get(code)
+        if label is None:
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            label = f"{module}:{code.co_name}"
+            self.frame_labels[code] = label
+        return label
+
+    def _build_result(self) -> ProfileResult:
+        """Combine samples with the CPU time used during the session."""
+        elapsed = max(time.monotonic() - self.session_start, 1e-9)
+        cpu_at_end = read_thread_cpu_times()
+        threads = {thread.native_id: thread for thread in threading.enumerate()}
+
+        profiles = []
+        for native_id in set(self.thread_samples) | set(cpu_at_end):
+            kernel_name, cpu_end = cpu_at_end.get(native_id, ("", 0.0))
+            cpu_start = self.cpu_at_start.get(native_id, (kernel_name, 0.0))[1]
+            thread = threads.get(native_id)
+            if thread is not None and thread.name.startswith(_PROFILER_THREAD_PREFIX):
+                continue
+
+            cpu_seconds = max(0.0, cpu_end - cpu_start)
+            samples = self.thread_samples.get(native_id, 0)
+            if not samples and not cpu_seconds:
+                continue
+
+            profiles.append(ThreadProfile(
+                native_id=native_id,
+                name=thread.name if thread else kernel_name,
+                label=self.thread_labels.get(native_id) or (describe_thread(thread) if thread else kernel_name),
+                samples=samples,
+                cpu_seconds=cpu_seconds,
+                cpu_percent=cpu_seconds * 100.0 / elapsed
+            ))
+
+        profiles.sort(key=lambda profile: (profile.cpu_seconds, profile.samples), reverse=True)
+        return ProfileResult(
+            started_at=self.session_started_at,
+            duration=elapsed,
+            hz=self.session_hz,
+            sample_count=self.sample_count,
+            stacks=dict(self.stacks),
+            threads=profiles
+        )
+
+    def enable_dump_requests(self, poll_interval: float = 1.0) -> None:
+        """
+        Answer dump requests from the command line.
+
+        A control thread checks for ``<CONTROL_DIR>/<pid>.request`` and writes
+        the result of the requested session to ``<pid>.json`` and the collapsed
+        stacks to ``<pid>.collapsed``.
+
+        Args:
+            poll_interval: Seconds between request checks
+        """
+        with self.lock:
+            if self.control_thread is not None and self.control_thread.is_alive():
+                return
+            os.makedirs(CONTROL_DIR, exist_ok=True)
+            self.control_thread = threading.Thread(
+                target=self._control_loop,
+                args=(poll_interval,),
+                name=f"{_PROFILER_THREAD_PREFIX}-control",
+                daemon=True
+            )
+            self.control_thread.start()
+
+    def _control_loop(self, poll_interval: float) -> None:
+        """Serve dump requests written by the command line."""
+        request_path = os.path.join(CONTROL_DIR, f"{os.getpid()}.request")
+        while True:
+            time.sleep(poll_interval)
+            if not os.path.exists(request_path):
+                continue
+            try:
+                with open(request_path, 'r', encoding='utf-8') as f:
+                    request = json.load(f)
+                os.remove(request_path)
+
+                result = self.profile(float(request.get('duration', 5.0)), request.get('hz'))
+                if result is None:
+                    continue
+                write_result(result, os.path.join(CONTROL_DIR, str(os.getpid())))
+            except Exception as e:
+                print(f"[SamplingProfiler] Error serving dump request: {e}")
+
+
+def write_result(result: ProfileResult, output_prefix: str) -> None:
+    """
+    Write a result as ``<prefix>.json`` and ``<prefix>.collapsed``.
+
+    Args:
+        result: Profiling result
+        output_prefix: Output path without extension
+    """
+    for suffix, content in (('.collapsed', result.to_collapsed() + "\n"),
+                            ('.json', json.dumps(result.to_dict()))):
+        temp_path = f"{output_prefix}{suffix}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_path, output_prefix + suffix)
+
+
+def format_result(result: ProfileResult, top: int = 15) -> str:
+    """Render a result as a plain-text report."""
+    lines = [
+        f"Profile started {result.started_at}: {result.duration:.1f}s at {result.hz:g} Hz, "
+        f"{result.sample_count} samples",
+        "",
+        f"{'CPU s':>8} {'CPU %':>7} {'samples':>8}  thread"
+    ]
+    for thread in result.threads:
+        lines.append(f"{thread.cpu_seconds:8.2f} {thread.cpu_percent:7.1f} {thread.samples:8d}  {thread.label}")
+
+    lines += ["", f"Top {top} stacks:"]
+    for stack, count in result.top_stacks(top):
+        lines.append(f"{count:8d}  {stack}")
+    return "\n".join(lines)
+
+
+_profiler: Optional[SamplingProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> SamplingProfiler:
+    """Get the process-wide sampling profiler."""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = SamplingProfiler()
+        return _profiler
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Request a profile dump from a running launcher."""
+    parser = argparse.ArgumentParser(description="PinokioCloud sampling profiler")
+    parser.add_argument('--pid', type=int, required=True, help="Launcher process ID")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds to sample")
+    parser.add_argument('--hz', type=float, default=100.0, help="Samples per second")
+    parser.add_argument('--output', help="Copy the collapsed stacks to this file")
+    parser.add_argument('--top', type=int, default=15, help="Stacks shown in the report")
+    args = parser.parse_args(argv)
+
+    os.makedirs(CONTROL_DIR, exist_ok=True)
+    prefix = os.path.join(CONTROL_DIR, str(args.pid))
+    for suffix in ('.json', '.collapsed'):
+        if os.path.exists(prefix + suffix):
+            os.remove(prefix + suffix)
+
+    with open(prefix + '.request', 'w', encoding='utf-8') as f:
+        json.dump({'duration': args.duration, 'hz': args.hz}, f)
+
+    deadline = time.monotonic() + args.duration + 15.0
+    while time.monotonic() < deadline and not os.path.exists(prefix + '.json'):
+        time.sleep(0.5)
+
+    if not os.path.exists(prefix + '.json'):
+        if os.path.exists(prefix + '.request'):
+            os.remove(prefix + '.request')
+        print(f"No answer from PID {args.pid} (dump requests not enabled?); per-thread CPU time:")
+        for tid, (name, cpu_seconds) in sorted(read_thread_cpu_times(args.pid).items(),
+                                               key=lambda item: item[1][1], reverse=True):
+            print(f"{cpu_seconds:8.2f}s  {tid:>7}  {name}")
+        return 1
+
+    with open(prefix + '.json', 'r', encoding='utf-8') as f:
+        result = ProfileResult.from_dict(json.load(f))
+    print(format_result(result, args.top))
+
+    if args.output:
+        with open(prefix + '.collapsed', 'r', encoding='utf-8') as src, open(args.output, 'w', encoding='utf-8') as dst:
+            dst.write(src.read())
+        print(f"\nCollapsed stacks written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,7 @@ Phase: 8 - Cloud Platform Specialization
 """
 
 from platforms.colab_optimizer import ColabOptimizer, ColabFeatures, ColabConfig
+from platforms.drive_sync import DriveSync, SyncResult, SyncThrottle
 from platforms.vast_optimizer import VastOptimizer, VastFeatures, VastConfig
 from platforms.lightning_optimizer import LightningOptimizer, LightningFeatures, LightningConfig
 
@@ -18,6 +19,9 @@ __all__ = [
     'ColabOptimizer',
     'ColabFeatures',
     'ColabConfig',
+    'DriveSync',
+    'SyncResult',
+    'SyncThrottle',
     'VastOptimizer',
     'VastFeatures',
     'VastConfig',
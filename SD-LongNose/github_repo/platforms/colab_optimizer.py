@@ -31,6 +31,7 @@ from environment_management.shell_runner import ShellRunner
 from environment_management.json_handler import JSONHandler
 from running.process_tracker import ProcessTracker
 from tunneling.ngrok_manager import NgrokManager
+from platforms.drive_sync import DriveSync, SyncResult
 
 
 class ColabGPUType(Enum):
@@ -107,6 +108,10 @@ class ColabConfig:
     max_idle_minutes: int = 90
     warning_before_timeout_minutes: int = 15
     preferred_tunnel_type: str = "ngrok"
+    backup_interval_minutes: int = 30
+    sync_workers: int = 4
+    sync_bandwidth_limit_mbps: float = 0.0  # 0 = unlimited
+    sync_max_iops: float = 0.0  # 0 = unlimited
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert ColabConfig to dictionary."""
@@ -156,6 +161,11 @@ class ColabOptimizer:
         self.session_monitor_thread = None
         self.session_check_interval = 300.0  # 5 minutes
         
+        # Incremental Drive sync engines, keyed by target directory
+        self.drive_syncs: Dict[str, DriveSync] = {}
+        self.drive_sync_lock = threading.Lock()
+        self.auto_backup_path = self.drive_path / "MyDrive" / "PinokioCloud" / "auto_backup"
+        
         # Event callbacks
         self.event_callbacks: Dict[str, List[callable]] = {
             'drive_mounted': [],
@@ -459,9 +469,12 @@ class ColabOptimizer:
         """
         Backup data to Google Drive.
         
+        Directories are synced incrementally: repeated backups under the same
+        name only copy the files that changed since the previous one.
+        
         Args:
             source_path: Path to backup
-            backup_name: Optional backup name
+            backup_name: Optional backup name (defaults to the source name)
         
         Returns:
             bool: True if backup was successful
@@ -480,10 +493,9 @@ class ColabOptimizer:
             backup_dir = self.drive_path / "MyDrive" / "PinokioCloud" / "backups"
             backup_dir.mkdir(parents=True, exist_ok=True)
             
-            # Generate backup name if not provided
+            # A stable name lets each backup update the previous copy
             if not backup_name:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_name = f"backup_{source.name}_{timestamp}"
+                backup_name = f"backup_{source.name}"
             
             backup_path = backup_dir / backup_name
             
@@ -491,7 +503,13 @@ class ColabOptimizer:
             if source.is_file():
                 self.file_system.copy_file(str(source), str(backup_path))
             else:
-                self.file_system.copy_directory(str(source), str(backup_path))
+                result = self.get_drive_sync(str(source), str(backup_path)).sync()
+                if not result.success:
+                    print(f"[ColabOptimizer] Backup incomplete, {result.failed} file(s) failed: "
+                          f"{'; '.join(result.errors[:3])}")
+                    return False
+                print(f"[ColabOptimizer] Synced {result.copied} changed file(s) "
+                      f"({result.bytes_copied / (1024 * 1024):.1f} MB), {result.unchanged} unchanged")
             
             # Emit event
             self._emit_event('backup_completed', str(backup_path))
@@ -503,6 +521,37 @@ class ColabOptimizer:
             print(f"[ColabOptimizer] Error backing up to Drive: {e}")
             return False
     
+    def get_drive_sync(self, source_path: str, target_path: str) -> DriveSync:
+        """
+        Get the incremental sync engine for a Drive target, creating it on first use.
+        
+        Args:
+            source_path: Local directory to mirror
+            target_path: Drive directory to mirror into
+        
+        Returns:
+            DriveSync: Sync engine configured from the Colab config
+        """
+        with self.drive_sync_lock:
+            drive_sync = self.drive_syncs.get(target_path)
+            if drive_sync is None or drive_sync.source_path != os.path.abspath(source_path):
+                drive_sync = DriveSync(
+                    source_path,
+                    target_path,
+                    max_workers=self.config.sync_workers,
+                    bandwidth_limit_mbps=self.config.sync_bandwidth_limit_mbps or None,
+                    max_iops=self.config.sync_max_iops or None
+                )
+                self.drive_syncs[target_path] = drive_sync
+            return drive_sync
+    
+    def stop_drive_sync(self) -> None:
+        """Stop every background Drive sync loop."""
+        with self.drive_sync_lock:
+            drive_syncs = list(self.drive_syncs.values())
+        for drive_sync in drive_syncs:
+            drive_sync.stop(timeout=5.0)
+    
     def optimize_ngrok_for_colab(self, ngrok_manager: NgrokManager) -> bool:
         """
         Optimize ngrok settings for Colab environment.
@@ -790,32 +839,9 @@ class ColabOptimizer:
     def _setup_automatic_backup(self) -> None:
         """Set up automatic backup to Google Drive."""
         try:
-            # Create backup script
-            backup_script = self.colab_storage_path / "auto_backup.py"
-            
-            backup_code = f'''
-import shutil
-import time
-from pathlib import Path
-from datetime import datetime
-
-def backup_pinokio_data():
-    source = Path("{self.base_path}")
-    target = Path("{self.drive_path}/MyDrive/PinokioCloud/auto_backup")
-    target.mkdir(parents=True, exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = target / f"pinokio_backup_{{timestamp}}"
-    
-    if source.exists():
-        shutil.copytree(source, backup_path, ignore_errors=True)
-        print(f"Backup completed: {{backup_path}}")
-
-if __name__ == "__main__":
-    backup_pinokio_data()
-'''
-            
-            backup_script.write_text(backup_code)
+            # Mirror the base path incrementally instead of copying it whole each time
+            drive_sync = self.get_drive_sync(str(self.base_path), str(self.auto_backup_path))
+            drive_sync.start(self.config.backup_interval_minutes * 60)
             
             print("[ColabOptimizer] Automatic backup system configured")
             
@@ -855,9 +881,11 @@ if __name__ == "__main__":
                         self._emit_event('session_timeout_warning', time_left)
                         print(f"[ColabOptimizer] Session timeout warning: {time_left:.1f} hours remaining")
                         
-                        # Trigger backup if configured
-                        if self.config.backup_to_drive:
-                            self.backup_to_drive(str(self.base_path), f"auto_backup_{int(time.time())}")
+                        # Bring the automatic backup up to date now rather than at its next cycle
+                        if self.config.backup_to_drive and self.features.drive_mounted:
+                            result = self.get_drive_sync(str(self.base_path), str(self.auto_backup_path)).sync()
+                            if result.success:
+                                self._emit_event('backup_completed', str(self.auto_backup_path))
                 
                 # Update last activity
                 if self.features:
@@ -892,6 +920,7 @@ if __name__ == "__main__":
     def __del__(self):
         """Cleanup when object is destroyed."""
         self.stop_session_monitoring()
+        self.stop_drive_sync()
 
 
 def main():
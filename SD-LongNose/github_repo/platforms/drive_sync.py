@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+PinokioCloud Incremental Drive Sync
+
+This module mirrors a local directory into a Google Drive folder (or any
+directory standing in for it) incrementally. A persistent manifest records
+the size, mtime and SHA-256 of every synced file, so a sync cycle only stats
+the local tree and copies the files that changed; the slow Drive FUSE mount
+is never walked and unchanged files are never reread or rewritten.
+
+Copies run on a parallel worker queue behind a shared bandwidth and IOPS
+throttle. Each file is written to a partial file and renamed into place, and
+the manifest is checkpointed during a cycle, so an interrupted sync resumes
+where it stopped, including large files that were partially copied.
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import os
+import json
+import time
+import fnmatch
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+from dataclasses import dataclass, field, asdict
+
+
+# Manifest kept at the root of the sync target, so it survives the VM
+MANIFEST_FILENAME = ".pinokio_sync_manifest.json"
+
+# Suffix of files being copied; renamed into place when complete
+PARTIAL_SUFFIX = ".pinokio-partial"
+
+# Names never synced
+DEFAULT_EXCLUDES = ("__pycache__", "*.pyc", "*" + PARTIAL_SUFFIX, MANIFEST_FILENAME)
+
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class SyncManifestEntry:
+    """A file as it was last synced."""
+    size: int
+    mtime_ns: int
+    sha256: str
+    synced_at: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert SyncManifestEntry to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SyncManifestEntry':
+        """Create SyncManifestEntry from dictionary."""
+        return cls(**data)
+
+
+@dataclass
+class SyncResult:
+    """Outcome of one sync cycle."""
+    source_path: str
+    target_path: str
+    scanned: int = 0
+    unchanged: int = 0
+    copied: int = 0
+    resumed: int = 0
+    rehashed: int = 0
+    deleted: int = 0
+    failed: int = 0
+    bytes_copied: int = 0
+    duration: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        """Whether every changed file was synced."""
+        return self.failed == 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert SyncResult to dictionary."""
+        data = asdict(self)
+        data['success'] = self.success
+        return data
+
+
+class SyncThrottle:
+    """
+    Bandwidth and IOPS limiter shared by the copy workers.
+
+    Each limit is a virtual clock that every request advances by its cost;
+    a caller sleeps until the clock catches up with its request. Up to
+    ``burst_seconds`` of unused budget is kept, so short idle gaps aren't lost.
+    """
+
+    def __init__(self, bytes_per_second: Optional[float] = None,
+                 ops_per_second: Optional[float] = None, burst_seconds: float = 1.0):
+        """
+        Initialize the throttle.
+
+        Args:
+            bytes_per_second: Maximum write bandwidth (None for unlimited)
+            ops_per_second: Maximum write operations per second (None for unlimited)
+            burst_seconds: Unused budget that may be spent at once
+        """
+        self.bytes_per_second = bytes_per_second or None
+        self.ops_per_second = ops_per_second or None
+        self.burst_seconds = burst_seconds
+        self.lock = threading.Lock()
+        self.bytes_clock = 0.0
+        self.ops_clock = 0.0
+
+    def acquire(self, nbytes: int = 0, ops: int = 1) -> float:
+        """
+        Wait until a write of ``nbytes`` in ``ops`` operations is allowed.
+
+        Args:
+            nbytes: Bytes about to be written
+            ops: Write operations about to be issued
+
+        Returns:
+            float: Seconds slept
+        """
+        if self.bytes_per_second is None and self.ops_per_second is None:
+            return 0.0
+
+        with self.lock:
+            now = time.monotonic()
+            wait = 0.0
+            if self.bytes_per_second is not None:
+                start = max(self.bytes_clock, now - self.burst_seconds)
+                self.bytes_clock = start + nbytes / self.bytes_per_second
+                wait = max(wait, self.bytes_clock - now)
+            if self.ops_per_second is not None:
+                start = max(self.ops_clock, now - self.burst_seconds)
+                self.ops_clock = start + ops / self.ops_per_second
+                wait = max(wait, self.ops_clock - now)
+
+        if wait > 0:
+            time.sleep(wait)
+        return max(wait, 0.0)
+
+
+class DriveSync:
+    """
+    Incremental one-way sync of a local directory into a Drive folder.
+
+    The manifest is the only state read from the target: a file is copied
+    when its size or mtime differs from the manifest and, for same-size files
+    whose mtime changed, its content hash differs too. Symlinks are skipped,
+    so links into Drive are never copied back into it.
+    """
+
+    def __init__(self, source_path: str, target_path: str, manifest_path: Optional[str] = None,
+                 max_workers: int = 4, bandwidth_limit_mbps: Optional[float] = None,
+                 max_iops: Optional[float] = None, chunk_size: int = 4 * 1024 * 1024,
+                 delete: bool = False, exclude: Tuple[str, ...] = DEFAULT_EXCLUDES,
+                 resume_threshold: int = 64 * 1024 * 1024, checkpoint_interval: float = 10.0):
+        """
+        Initialize the sync engine.
+
+        Args:
+            source_path: Local directory to mirror
+            target_path: Drive directory (or a local stand-in) to mirror into
+            manifest_path: Manifest file (defaults to a file at the target root)
+            max_workers: Number of parallel copy workers
+            bandwidth_limit_mbps: Maximum write bandwidth in megabits per second (None for unlimited)
+            max_iops: Maximum chunk writes per second (None for unlimited)
+            chunk_size: Bytes per read/write operation
+            delete: Remove target files whose source was deleted
+            exclude: fnmatch patterns of file and directory names to skip
+            resume_threshold: Files at least this large resume from a partial copy after a crash
+            checkpoint_interval: Seconds between manifest saves during a cycle
+        """
+        self.source_path = os.path.abspath(source_path)
+        self.target_path = os.path.abspath(target_path)
+        self.manifest_path = manifest_path or os.path.join(self.target_path, MANIFEST_FILENAME)
+        self.max_workers = max(1, max_workers)
+        self.chunk_size = chunk_size
+        self.delete = delete
+        self.exclude = tuple(exclude)
+        self.resume_threshold = resume_threshold
+        self.checkpoint_interval = checkpoint_interval
+        self.throttle = SyncThrottle(
+            bytes_per_second=bandwidth_limit_mbps * 1_000_000 / 8 if bandwidth_limit_mbps else None,
+            ops_per_second=max_iops
+        )
+
+        self.files: Dict[str, SyncManifestEntry] = {}
+        self.pending: Dict[str, Dict[str, int]] = {}
+        self.manifest_loaded = False
+        self.manifest_lock = threading.Lock()
+        self.last_checkpoint = 0.0
+        self.created_dirs: set = set()
+
+        self.sync_lock = threading.Lock()
+        self.last_result: Optional[SyncResult] = None
+        self.loop_thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+
+    def sync(self) -> SyncResult:
+        """
+        Run one sync cycle.
+
+        Returns:
+            SyncResult: Counts of scanned, copied and skipped files
+        """
+        with self.sync_lock:
+            start_time = time.time()
+            result = SyncResult(source_path=self.source_path, target_path=self.target_path)
+
+            if not os.path.isdir(self.source_path):
+                result.failed += 1
+                result.errors.append(f"Source directory does not exist: {self.source_path}")
+                self.last_result = result
+                return result
+
+            with self.manifest_lock:
+                if not self.manifest_loaded:
+                    self._load_manifest()
+
+            changed: List[Tuple[str, os.stat_result]] = []
+            seen = set()
+            for rel_path, stat in self._scan_source():
+                result.scanned += 1
+                seen.add(rel_path)
+                entry = self.files.get(rel_path)
+                if entry is not None and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                    result.unchanged += 1
+                else:
+                    changed.append((rel_path, stat))
+
+            if changed:
+                # Small files first, so an interrupted cycle has synced as many files as possible
+                changed.sort(key=lambda item: item[1].st_size)
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(changed)),
+                                        thread_name_prefix="DriveSync") as executor:
+                    for outcome in executor.map(lambda item: self._sync_file(*item), changed):
+                        self._record_outcome(result, outcome)
+
+            if self.delete:
+                for rel_path in [path for path in self.files if path not in seen]:
+                    try:
+                        self._remove_target(rel_path)
+                        with self.manifest_lock:
+                            self.files.pop(rel_path, None)
+                        result.deleted += 1
+                    except OSError as e:
+                        result.failed += 1
+                        result.errors.append(f"{rel_path}: {e}")
+
+            with self.manifest_lock:
+                for rel_path in [path for path in self.pending if path not in seen]:
+                    del self.pending[rel_path]
+                if changed or result.deleted:
+                    try:
+                        self._save_manifest()
+                    except OSError as e:
+                        result.errors.append(f"Manifest not saved: {e}")
+
+            result.duration = time.time() - start_time
+            self.last_result = result
+            return result
+
+    def start(self, interval: float) -> bool:
+        """
+        Sync in the background every ``interval`` seconds.
+
+        Args:
+            interval: Seconds between the end of one cycle and the start of the next
+
+        Returns:
+            bool: True if the loop was started, False if it was already running
+        """
+        if self.loop_thread is not None and self.loop_thread.is_alive():
+            return False
+
+        self.stop_event.clear()
+        self.loop_thread = threading.Thread(
+            target=self._sync_loop,
+            args=(interval,),
+            name="DriveSyncLoop",
+            daemon=True
+        )
+        self.loop_thread.start()
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the background loop after the current cycle.
+
+        Args:
+            timeout: Maximum seconds to wait for the current cycle
+        """
+        self.stop_event.set()
+        if self.loop_thread is not None and self.loop_thread.is_alive():
+            self.loop_thread.join(timeout)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the manifest size, loop state and last cycle result."""
+        return {
+            'source_path': self.source_path,
+            'target_path': self.target_path,
+            'files_tracked': len(self.files),
+            'pending_files': len(self.pending),
+            'running': self.loop_thread is not None and self.loop_thread.is_alive(),
+            'last_result': self.last_result.to_dict() if self.last_result else None
+        }
+
+    def _sync_loop(self, interval: float) -> None:
+        """Background loop behind start()."""
+        while not self.stop_event.is_set():
+            try:
+                result = self.sync()
+                if result.copied or result.deleted or result.failed:
+                    print(f"[DriveSync] {self.target_path}: copied {result.copied}, "
+                          f"deleted {result.deleted}, failed {result.failed} "
+                          f"({result.bytes_copied / (1024 * 1024):.1f} MB in {result.duration:.1f}s)")
+            except Exception as e:
+                print(f"[DriveSync] Error syncing {self.source_path}: {e}")
+            self.stop_event.wait(interval)
+
+    def _scan_source(self) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield (relative path, stat) for every regular file under the source."""
+        stack = [self.source_path]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if any(fnmatch.fnmatch(entry.name, pattern) for pattern in self.exclude):
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                rel_path = os.path.relpath(entry.path, self.source_path).replace(os.sep, '/')
+                                yield rel_path, entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+    def _sync_file(self, rel_path: str, stat: os.stat_result) -> Tuple[str, str, Any]:
+        """
+        Bring one changed file up to date.
+
+        Returns:
+            Tuple[str, str, Any]: (relative path, outcome, detail) where outcome is
+            'rehashed' (content unchanged), 'copied', 'resumed' or 'failed'
+        """
+        source_file = os.path.join(self.source_path, rel_path)
+        try:
+            entry = self.files.get(rel_path)
+            if entry is not None and entry.size == stat.st_size:
+                # Same size, new mtime (e.g. restored or touched): skip the copy if the content matches
+                digest = self._hash_file(source_file)
+                if digest == entry.sha256:
+                    return rel_path, 'rehashed', SyncManifestEntry(
+                        stat.st_size, stat.st_mtime_ns, digest, time.time())
+
+            new_entry, resumed, copied_bytes = self._copy_file(rel_path, source_file, stat)
+            return rel_path, 'resumed' if resumed else 'copied', (new_entry, copied_bytes)
+        except (OSError, ValueError) as e:
+            return rel_path, 'failed', str(e)
+
+    def _record_outcome(self, result: SyncResult, outcome: Tuple[str, str, Any]) -> None:
+        """Fold one file's outcome into the manifest and the cycle result."""
+        rel_path, status, detail = outcome
+        if status == 'failed':
+            result.failed += 1
+            result.errors.append(f"{rel_path}: {detail}")
+            return
+
+        if status == 'rehashed':
+            entry = detail
+            result.rehashed += 1
+            result.unchanged += 1
+        else:
+            entry, copied_bytes = detail
+            result.copied += 1
+            result.bytes_copied += copied_bytes
+            if status == 'resumed':
+                result.resumed += 1
+
+        with self.manifest_lock:
+            self.files[rel_path] = entry
+            self.pending.pop(rel_path, None)
+            if time.time() - self.last_checkpoint >= self.checkpoint_interval:
+                try:
+                    self._save_manifest()
+                except OSError as e:
+                    # The final save of the cycle retries; only resume granularity is lost
+                    print(f"[DriveSync] Manifest checkpoint failed: {e}")
+
+    def _copy_file(self, rel_path: str, source_file: str,
+                   stat: os.stat_result) -> Tuple[SyncManifestEntry, bool, int]:
+        """
+        Copy a file through a partial file, resuming a previous partial copy if valid.
+
+        Returns:
+            Tuple[SyncManifestEntry, bool, int]: New manifest entry, whether the
+            copy resumed, and bytes written
+        """
+        target_file = os.path.join(self.target_path, rel_path)
+        partial_file = target_file + PARTIAL_SUFFIX
+        self._ensure_directory(os.path.dirname(target_file))
+
+        offset = 0
+        pending = self.pending.get(rel_path)
+        if pending and pending.get('size') == stat.st_size and pending.get('mtime_ns') == stat.st_mtime_ns:
+            try:
+                offset = os.path.getsize(partial_file)
+            except OSError:
+                offset = 0
+            if offset > stat.st_size:
+                offset = 0
+
+        if stat.st_size >= self.resume_threshold:
+            # Record the copy before starting, so a crash leaves a resumable partial file
+            with self.manifest_lock:
+                self.pending[rel_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+                self._save_manifest()
+
+        hasher = hashlib.sha256()
+        copied_bytes = 0
+        with open(source_file, 'rb') as source:
+            if offset:
+                # The source is local, so rehashing the already-copied prefix is cheap
+                remaining = offset
+                while remaining > 0:
+                    chunk = source.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        raise ValueError("source shrank while resuming")
+                    hasher.update(chunk)
+                    remaining -= len(chunk)
+
+            self.throttle.acquire(0, ops=1)
+            with open(partial_file, 'ab' if offset else 'wb') as target:
+                while True:
+                    chunk = source.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    self.throttle.acquire(len(chunk), ops=1)
+                    target.write(chunk)
+                    hasher.update(chunk)
+                    copied_bytes += len(chunk)
+                target.flush()
+                os.fsync(target.fileno())
+
+        current = os.stat(source_file)
+        if current.st_size != stat.st_size or current.st_mtime_ns != stat.st_mtime_ns:
+            try:
+                os.remove(partial_file)
+            except OSError:
+                pass
+            raise ValueError("file changed during copy; will retry next cycle")
+
+        os.replace(partial_file, target_file)
+        try:
+            os.utime(target_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        except OSError:
+            pass
+
+        entry = SyncManifestEntry(stat.st_size, stat.st_mtime_ns, hasher.hexdigest(), time.time())
+        return entry, offset > 0, copied_bytes
+
+    def _hash_file(self, path: str) -> str:
+        """Compute the SHA-256 of a local file."""
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _ensure_directory(self, directory: str) -> None:
+        """Create a target directory once per engine, sparing repeated mkdirs on the mount."""
+        if directory in self.created_dirs:
+            return
+        os.makedirs(directory, exist_ok=True)
+        self.created_dirs.add(directory)
+
+    def _remove_target(self, rel_path: str) -> None:
+        """Delete a target file and any partial copy of it."""
+        target_file = os.path.join(self.target_path, rel_path)
+        for path in (target_file, target_file + PARTIAL_SUFFIX):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _load_manifest(self) -> None:
+        """Load the manifest (manifest lock must be held)."""
+        self.files = {}
+        self.pending = {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.files = {path: SyncManifestEntry.from_dict(entry)
+                              for path, entry in data.get('files', {}).items()}
+                self.pending = dict(data.get('pending', {}))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"[DriveSync] Ignoring unreadable manifest {self.manifest_path}: {e}")
+            self.files = {}
+            self.pending = {}
+        self.manifest_loaded = True
+
+    def _save_manifest(self) -> None:
+        """Write the manifest atomically (manifest lock must be held)."""
+        directory = os.path.dirname(os.path.abspath(self.manifest_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix='.tmp_', suffix='.json', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': MANIFEST_VERSION,
+                    'source_path': self.source_path,
+                    'files': {path: entry.to_dict() for path, entry in self.files.items()},
+                    'pending': self.pending
+                }, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.manifest_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.last_checkpoint = time.time()
@@ -11,12 +11,18 @@ Version: 1.0.0
 
 import os
 import sys
+import json
 import time
+import shutil
+import tempfile
 import subprocess
 from pathlib import Path
 from typing import List, Dict, Any
 import unittest
 
+sys.path.append('/workspace/SD-LongNose/github_repo')
+from platforms.drive_sync import DriveSync, MANIFEST_FILENAME, PARTIAL_SUFFIX
+
 def test_basic_imports():
     """Test that all Phase 8 modules can be imported."""
     print("[TEST] Testing basic imports...")
@@ -269,6 +275,230 @@ def test_platform_specific_features():
         print(f"[TEST] ❌ Platform-specific features - FAILED: {e}")
         return False
 
+def _make_sync_dirs():
+    """Create a scratch source tree and an empty local directory standing in for Drive."""
+    root = tempfile.mkdtemp(prefix="pinokio_drive_sync_")
+    source = os.path.join(root, 'source')
+    target = os.path.join(root, 'drive')
+    os.makedirs(os.path.join(source, 'models'))
+    os.makedirs(target)
+    return root, source, target
+
+def _write(path, data):
+    """Write bytes to a file, creating its directory."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def _read(path):
+    """Read a file's bytes."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+def test_drive_sync_incremental():
+    """Test that DriveSync copies new and modified files only."""
+    print("[TEST] Testing DriveSync incremental copy...")
+    
+    root, source, target = _make_sync_dirs()
+    try:
+        _write(os.path.join(source, 'config.json'), b'{"steps": 20}')
+        _write(os.path.join(source, 'models', 'model.safetensors'), os.urandom(256 * 1024))
+        _write(os.path.join(source, '__pycache__', 'app.cpython-310.pyc'), b'skip me')
+        
+        result = DriveSync(source, target).sync()
+        assert result.success, result.errors
+        assert (result.scanned, result.copied) == (2, 2), result.to_dict()
+        assert _read(os.path.join(target, 'models', 'model.safetensors')) == \
+            _read(os.path.join(source, 'models', 'model.safetensors'))
+        assert not os.path.exists(os.path.join(target, '__pycache__')), "Excluded directory was copied"
+        print("  - First cycle copies every file ✅")
+        
+        # A fresh engine (new VM session) works from the manifest alone
+        engine = DriveSync(source, target)
+        result = engine.sync()
+        assert (result.copied, result.unchanged, result.bytes_copied) == (0, 2, 0), result.to_dict()
+        print("  - Unchanged tree copies nothing ✅")
+        
+        time.sleep(0.01)
+        _write(os.path.join(source, 'config.json'), b'{"steps": 30, "cfg": 7}')
+        _write(os.path.join(source, 'outputs', 'image.png'), b'png')
+        result = engine.sync()
+        assert (result.copied, result.unchanged) == (2, 1), result.to_dict()
+        assert _read(os.path.join(target, 'config.json')) == b'{"steps": 30, "cfg": 7}'
+        
+        with open(os.path.join(target, MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        assert sorted(manifest['files']) == ['config.json', 'models/model.safetensors', 'outputs/image.png']
+        print("  - Modified and new files copied, manifest updated ✅")
+        
+        print("[TEST] ✅ DriveSync incremental copy - PASSED")
+        return True
+        
+    except Exception as e:
+        print(f"[TEST] ❌ DriveSync incremental copy - FAILED: {e}")
+        return False
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+def test_drive_sync_rehash_on_touch():
+    """Test that a touched but unchanged file is rehashed instead of copied."""
+    print("[TEST] Testing DriveSync rehash on touch...")
+    
+    root, source, target = _make_sync_dirs()
+    try:
+        model_path = os.path.join(source, 'models', 'model.safetensors')
+        _write(model_path, b'a' * 4096)
+        engine = DriveSync(source, target)
+        assert engine.sync().copied == 1
+        
+        stat = os.stat(model_path)
+        os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+        result = engine.sync()
+        assert (result.rehashed, result.copied, result.bytes_copied) == (1, 0, 0), result.to_dict()
+        print("  - Touched file rehashed, not copied ✅")
+        
+        # The new mtime is recorded, so the next cycle doesn't even rehash
+        result = engine.sync()
+        assert (result.rehashed, result.copied) == (0, 0), result.to_dict()
+        print("  - Rehashed mtime recorded in the manifest ✅")
+        
+        # Same size, different content is still copied
+        _write(model_path, b'b' * 4096)
+        os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+        result = engine.sync()
+        assert (result.rehashed, result.copied) == (0, 1), result.to_dict()
+        assert _read(os.path.join(target, 'models', 'model.safetensors')) == b'b' * 4096
+        print("  - Same-size content change copied ✅")
+        
+        print("[TEST] ✅ DriveSync rehash on touch - PASSED")
+        return True
+        
+    except Exception as e:
+        print(f"[TEST] ❌ DriveSync rehash on touch - FAILED: {e}")
+        return False
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+def test_drive_sync_partial_resume():
+    """Test that an interrupted large copy resumes from its partial file."""
+    print("[TEST] Testing DriveSync partial resume...")
+    
+    root, source, target = _make_sync_dirs()
+    try:
+        chunk_size = 64 * 1024
+        data = os.urandom(chunk_size * 8)
+        _write(os.path.join(source, 'models', 'model.safetensors'), data)
+        
+        engine = DriveSync(source, target, chunk_size=chunk_size, resume_threshold=chunk_size)
+        writes = []
+        
+        def crash_after_three_chunks(nbytes=0, ops=1):
+            if nbytes:
+                writes.append(nbytes)
+                if len(writes) > 3:
+                    raise KeyboardInterrupt("simulated VM shutdown")
+            return 0.0
+        
+        engine.throttle.acquire = crash_after_three_chunks
+        try:
+            engine.sync()
+            raise AssertionError("Simulated crash did not interrupt the copy")
+        except KeyboardInterrupt:
+            pass
+        
+        partial_file = os.path.join(target, 'models', 'model.safetensors' + PARTIAL_SUFFIX)
+        assert os.path.getsize(partial_file) == 3 * chunk_size, "Partial copy not kept"
+        assert not os.path.exists(os.path.join(target, 'models', 'model.safetensors'))
+        print("  - Interrupted copy left a partial file ✅")
+        
+        result = DriveSync(source, target, chunk_size=chunk_size, resume_threshold=chunk_size).sync()
+        assert result.success, result.errors
+        assert (result.copied, result.resumed) == (1, 1), result.to_dict()
+        assert result.bytes_copied == len(data) - 3 * chunk_size, result.bytes_copied
+        assert _read(os.path.join(target, 'models', 'model.safetensors')) == data
+        assert not os.path.exists(partial_file)
+        
+        with open(os.path.join(target, MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        assert manifest['pending'] == {}, manifest['pending']
+        print("  - Restarted engine resumed from the partial file ✅")
+        
+        print("[TEST] ✅ DriveSync partial resume - PASSED")
+        return True
+        
+    except Exception as e:
+        print(f"[TEST] ❌ DriveSync partial resume - FAILED: {e}")
+        return False
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+def test_drive_sync_delete():
+    """Test that deletions propagate only when enabled."""
+    print("[TEST] Testing DriveSync delete...")
+    
+    root, source, target = _make_sync_dirs()
+    try:
+        _write(os.path.join(source, 'keep.txt'), b'keep')
+        _write(os.path.join(source, 'outputs', 'old.png'), b'old')
+        assert DriveSync(source, target).sync().copied == 2
+        
+        os.remove(os.path.join(source, 'outputs', 'old.png'))
+        result = DriveSync(source, target).sync()
+        assert result.deleted == 0, result.to_dict()
+        assert os.path.exists(os.path.join(target, 'outputs', 'old.png'))
+        print("  - Deletions kept on Drive by default ✅")
+        
+        engine = DriveSync(source, target, delete=True)
+        result = engine.sync()
+        assert (result.deleted, result.unchanged) == (1, 1), result.to_dict()
+        assert not os.path.exists(os.path.join(target, 'outputs', 'old.png'))
+        assert os.path.exists(os.path.join(target, 'keep.txt'))
+        assert 'outputs/old.png' not in engine.files
+        print("  - Deleted source file removed with delete=True ✅")
+        
+        print("[TEST] ✅ DriveSync delete - PASSED")
+        return True
+        
+    except Exception as e:
+        print(f"[TEST] ❌ DriveSync delete - FAILED: {e}")
+        return False
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+def test_drive_sync_throttle():
+    """Test that the bandwidth limit slows copies down."""
+    print("[TEST] Testing DriveSync throttling...")
+    
+    root, source, target = _make_sync_dirs()
+    try:
+        # 2 Mbps is 250 KB/s; 500 KB needs 2s, less the 1s burst allowance
+        for index in range(4):
+            _write(os.path.join(source, 'outputs', f'image_{index}.png'), os.urandom(125_000))
+        
+        engine = DriveSync(source, target, bandwidth_limit_mbps=2, chunk_size=25_000)
+        start_time = time.monotonic()
+        result = engine.sync()
+        elapsed = time.monotonic() - start_time
+        assert result.success and result.copied == 4, result.to_dict()
+        assert elapsed >= 0.9, f"500 KB at 2 Mbps took only {elapsed:.2f}s"
+        print(f"  - Bandwidth limit held ({elapsed:.2f}s for 500 KB at 2 Mbps) ✅")
+        
+        # Unthrottled copies of the same data are not slowed
+        shutil.rmtree(target)
+        start_time = time.monotonic()
+        assert DriveSync(source, target).sync().copied == 4
+        assert time.monotonic() - start_time < elapsed
+        print("  - Unlimited engine not slowed ✅")
+        
+        print("[TEST] ✅ DriveSync throttling - PASSED")
+        return True
+        
+    except Exception as e:
+        print(f"[TEST] ❌ DriveSync throttling - FAILED: {e}")
+        return False
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
 def run_basic_tests():
     """Run all basic tests."""
     print("=" * 60)
@@ -282,7 +512,12 @@ def run_basic_tests():
         test_basic_functionality,
         test_production_quality,
         test_integration_compatibility,
-        test_platform_specific_features
+        test_platform_specific_features,
+        test_drive_sync_incremental,
+        test_drive_sync_rehash_on_touch,
+        test_drive_sync_partial_resume,
+        test_drive_sync_delete,
+        test_drive_sync_throttle
     ]
     
     results = []
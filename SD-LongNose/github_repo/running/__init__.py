@@ -14,6 +14,13 @@ from running.process_tracker import ProcessTracker, ResourceUsage
 from running.daemon_manager import DaemonManager, DaemonInfo, DaemonHealth
 from running.health_monitor import HealthMonitor, HealthStatus
 from running.virtual_drive import VirtualDrive, VirtualDriveManager
+from running.port_allocator import PortAllocator, PortLease, get_port_allocator
+from running.app_accounting import AppResourceAccounting, AppUsageSample, get_app_accounting
+from running.admission_control import (
+    AdmissionController, AdmissionDecision, AdmissionError, AdmissionResult, AppFootprint,
+    get_admission_controller
+)
+from running.hibernation import HibernationManager, HibernationRecord, HibernationState, WakeProxy, register_activity_source
 
 __all__ = [
     'ScriptManager',
@@ -27,7 +34,24 @@ __all__ = [
     'HealthMonitor',
     'HealthStatus',
     'VirtualDrive',
-    'VirtualDriveManager'
+    'VirtualDriveManager',
+    'PortAllocator',
+    'PortLease',
+    'get_port_allocator',
+    'AppResourceAccounting',
+    'AppUsageSample',
+    'get_app_accounting',
+    'AdmissionController',
+    'AdmissionDecision',
+    'AdmissionError',
+    'AdmissionResult',
+    'AppFootprint',
+    'get_admission_controller',
+    'HibernationManager',
+    'HibernationRecord',
+    'HibernationState',
+    'register_activity_source',
+    'WakeProxy'
 ]
 
 __version__ = "1.0.0"
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+PinokioCloud Admission Control
+
+This module decides whether an application may start given the RAM and GPU
+memory left on the host. Every app has a footprint profile learned from the
+peak RSS and VRAM of its process tree in earlier runs that got as far as
+serving (seeded from the app profiler's estimate on first launch); runs that
+crash or are stopped while loading say nothing about what the app needs, so
+they are not learned from. Each running app holds a reservation
+for its footprint until it has actually grown into it, so two large apps
+started back to back cannot both be admitted against the same free memory.
+
+A launch that does not fit is refused rather than started into an OOM.
+Callers that pass a queue timeout wait instead, when stopping a managed app
+would make room, so several apps on a small cloud GPU can degrade into a
+queue instead of crashing each other.
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, asdict
+from enum import Enum
+
+from cloud_detection.metrics_collector import get_metrics_collector
+
+
+_MB = 1024 * 1024
+
+
+class AdmissionDecision(Enum):
+    """Outcome of an admission check."""
+    ADMIT = "admit"
+    QUEUE = "queue"
+    REFUSE = "refuse"
+
+
+class AdmissionError(RuntimeError):
+    """Raised when a launch is refused or its queue wait times out."""
+
+    def __init__(self, message: str, result: 'AdmissionResult'):
+        super().__init__(message)
+        self.result = result
+
+
+@dataclass
+class AppFootprint:
+    """Peak memory an application needs, learned from its runs."""
+    app_name: str
+    memory_bytes: int = 0
+    gpu_memory_bytes: int = 0
+    runs: int = 0
+    learned: bool = False
+    updated_at: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert AppFootprint to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AppFootprint':
+        """Create AppFootprint from dictionary."""
+        return cls(**data)
+
+
+@dataclass
+class AdmissionResult:
+    """Result of checking a launch against the remaining budget."""
+    decision: AdmissionDecision
+    app_name: str
+    required_memory: int
+    required_gpu_memory: int
+    available_memory: int
+    available_gpu_memory: Optional[int]
+    reason: str
+    waited: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert AdmissionResult to dictionary."""
+        data = asdict(self)
+        data['decision'] = self.decision.value
+        return data
+
+
+@dataclass
+class _Reservation:
+    """Budget held by an admitted application."""
+    app_name: str
+    memory_bytes: int
+    gpu_memory_bytes: int
+    admitted_at: float
+    current_memory: int = 0
+    current_gpu_memory: int = 0
+    peak_memory: int = 0
+    peak_gpu_memory: int = 0
+    ready_at: Optional[float] = None
+
+    @property
+    def outstanding_memory(self) -> int:
+        """Reserved memory the app has not grown into yet."""
+        return max(0, self.memory_bytes - self.current_memory)
+
+    @property
+    def outstanding_gpu_memory(self) -> int:
+        """Reserved GPU memory the app has not grown into yet."""
+        return max(0, self.gpu_memory_bytes - self.current_gpu_memory)
+
+
+class AdmissionController:
+    """
+    Admits, queues or refuses application launches against RAM and VRAM.
+
+    Launches wait in FIFO order; a queued launch is re-checked whenever an
+    app is released and at least every ``poll_interval`` seconds.
+    """
+
+    def __init__(self, profile_path: str, memory_headroom: float = 0.10,
+                 gpu_headroom: float = 0.05, safety_factor: float = 1.15,
+                 default_memory_mb: int = 1024, queue_timeout: float = 0.0,
+                 poll_interval: float = 2.0):
+        """
+        Initialize the admission controller.
+
+        Args:
+            profile_path: JSON file the learned footprints are persisted in
+            memory_headroom: Fraction of RAM never handed out
+            gpu_headroom: Fraction of GPU memory never handed out
+            safety_factor: Multiplier applied to learned footprints
+            default_memory_mb: RAM assumed for an app with no profile or estimate
+            queue_timeout: Default seconds a queued launch waits before failing
+                (0 fails a launch that would have to wait at once)
+            poll_interval: Seconds between re-checks of a queued launch
+        """
+        self.profile_path = profile_path
+        self.memory_headroom = memory_headroom
+        self.gpu_headroom = gpu_headroom
+        self.safety_factor = safety_factor
+        self.default_memory_bytes = default_memory_mb * _MB
+        self.queue_timeout = queue_timeout
+        self.poll_interval = poll_interval
+        self.enabled = os.environ.get('PINOKIO_ADMISSION_CONTROL', '1') != '0'
+
+        self.metrics_collector = get_metrics_collector()
+        self.footprints: Dict[str, AppFootprint] = {}
+        self.reservations: Dict[str, _Reservation] = {}
+        self.queue: List[str] = []
+
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+
+        self._load_footprints()
+
+    def get_footprint(self, app_name: str) -> Optional[AppFootprint]:
+        """
+        Get the footprint profile of an application.
+
+        Args:
+            app_name: Name of the application
+
+        Returns:
+            Optional[AppFootprint]: Footprint, if the app has one
+        """
+        with self.lock:
+            return self.footprints.get(app_name)
+
+    def seed_footprint(self, app_name: str, memory_mb: int, gpu_memory_mb: int) -> AppFootprint:
+        """
+        Give an application without a profile an initial estimated footprint.
+
+        Args:
+            app_name: Name of the application
+            memory_mb: Estimated peak RAM in MB
+            gpu_memory_mb: Estimated peak GPU memory in MB
+
+        Returns:
+            AppFootprint: The app's footprint (unchanged if one already exists)
+        """
+        with self.lock:
+            footprint = self.footprints.get(app_name)
+            if footprint is None:
+                footprint = AppFootprint(
+                    app_name=app_name,
+                    memory_bytes=max(0, int(memory_mb)) * _MB,
+                    gpu_memory_bytes=max(0, int(gpu_memory_mb)) * _MB,
+                    updated_at=time.time()
+                )
+                self.footprints[app_name] = footprint
+                self._save_footprints()
+            return footprint
+
+    def evaluate(self, app_name: str) -> AdmissionResult:
+        """
+        Check whether an application fits in the remaining budget now.
+
+        Args:
+            app_name: Name of the application
+
+        Returns:
+            AdmissionResult: Decision, without reserving anything
+        """
+        with self.lock:
+            return self._evaluate(app_name)
+
+    def acquire(self, app_name: str, timeout: Optional[float] = None,
+                force: bool = False) -> AdmissionResult:
+        """
+        Wait until an application may start and reserve its footprint.
+
+        Args:
+            app_name: Name of the application
+            timeout: Seconds to wait in the queue (defaults to queue_timeout, which
+                does not wait)
+            force: Admit regardless of the budget
+
+        Returns:
+            AdmissionResult: The admitting decision
+
+        Raises:
+            AdmissionError: If the launch is refused or times out in the queue
+        """
+        timeout = self.queue_timeout if timeout is None else timeout
+        started = time.monotonic()
+
+        with self.changed:
+            if app_name in self.reservations:
+                result = self._evaluate(app_name)
+                result.decision = AdmissionDecision.ADMIT
+                result.reason = "already admitted"
+                return result
+            self.queue.append(app_name)
+            announced = False
+
+            try:
+                while True:
+                    result = self._evaluate(app_name)
+                    result.waited = time.monotonic() - started
+
+                    if force or not self.enabled:
+                        result.decision = AdmissionDecision.ADMIT
+                    if self.queue[0] != app_name and result.decision == AdmissionDecision.ADMIT:
+                        # Launches queued earlier go first
+                        result.decision = AdmissionDecision.QUEUE
+                        result.reason = f"waiting behind {self.queue[0]}"
+
+                    if result.decision == AdmissionDecision.ADMIT:
+                        self._reserve(app_name, result)
+                        print(f"[AdmissionController] Admitted {app_name}: {result.reason}")
+                        return result
+
+                    if result.decision == AdmissionDecision.REFUSE:
+                        print(f"[AdmissionController] Refused {app_name}: {result.reason}")
+                        raise AdmissionError(f"Cannot start {app_name}: {result.reason}", result)
+
+                    remaining = timeout - result.waited
+                    if remaining <= 0:
+                        if timeout > 0:
+                            result.reason = f"timed out after {result.waited:.1f}s in queue ({result.reason})"
+                        else:
+                            result.reason = f"{result.reason}, and no queue timeout was given"
+                        print(f"[AdmissionController] {app_name} {result.reason}")
+                        raise AdmissionError(f"Cannot start {app_name}: {result.reason}", result)
+
+                    if not announced:
+                        print(f"[AdmissionController] Queued {app_name}: {result.reason}")
+                        announced = True
+                    self.changed.wait(min(self.poll_interval, remaining))
+            finally:
+                self.queue.remove(app_name)
+                self.changed.notify_all()
+
+    def observe(self, app_name: str, memory_bytes: int, gpu_memory_bytes: int = 0) -> None:
+        """
+        Record the current usage of an admitted application's process tree.
+
+        Args:
+            app_name: Name of the application
+            memory_bytes: Current RSS of the whole tree
+            gpu_memory_bytes: Current GPU memory of the whole tree
+        """
+        with self.changed:
+            reservation = self.reservations.get(app_name)
+            if reservation is None:
+                return
+
+            reservation.current_memory = memory_bytes
+            reservation.current_gpu_memory = gpu_memory_bytes
+            reservation.peak_memory = max(reservation.peak_memory, memory_bytes)
+            reservation.peak_gpu_memory = max(reservation.peak_gpu_memory, gpu_memory_bytes)
+
+            # An app that outgrows its reservation holds what it really uses
+            reservation.memory_bytes = max(reservation.memory_bytes, memory_bytes)
+            reservation.gpu_memory_bytes = max(reservation.gpu_memory_bytes, gpu_memory_bytes)
+            self.changed.notify_all()
+
+    def mark_ready(self, app_name: str) -> None:
+        """
+        Record that an admitted application is serving, so its run is learned from.
+
+        Args:
+            app_name: Name of the application
+        """
+        with self.lock:
+            reservation = self.reservations.get(app_name)
+            if reservation is not None and reservation.ready_at is None:
+                reservation.ready_at = time.time()
+
+    def release(self, app_name: str) -> None:
+        """
+        Drop an application's reservation and learn from its run.
+
+        Args:
+            app_name: Name of the application
+        """
+        with self.changed:
+            self._release(app_name)
+            self.changed.notify_all()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get reservations, queue and learned footprints."""
+        with self.lock:
+            return {
+                'enabled': self.enabled,
+                'queue': list(self.queue),
+                'reservations': {
+                    name: {
+                        'memory_bytes': reservation.memory_bytes,
+                        'gpu_memory_bytes': reservation.gpu_memory_bytes,
+                        'current_memory': reservation.current_memory,
+                        'current_gpu_memory': reservation.current_gpu_memory,
+                        'admitted_at': reservation.admitted_at
+                    }
+                    for name, reservation in self.reservations.items()
+                },
+                'footprints': {name: footprint.to_dict() for name, footprint in self.footprints.items()}
+            }
+
+    def _required(self, app_name: str) -> Tuple[int, int]:
+        """RAM and GPU memory to reserve for an application."""
+        footprint = self.footprints.get(app_name)
+        if footprint is None:
+            return self.default_memory_bytes, 0
+        factor = self.safety_factor if footprint.learned else 1.0
+        memory = max(int(footprint.memory_bytes * factor), self.default_memory_bytes // 4)
+        return memory, int(footprint.gpu_memory_bytes * factor)
+
+    def _evaluate(self, app_name: str) -> AdmissionResult:
+        """Compare an app's footprint with the free memory not yet spoken for."""
+        required_memory, required_gpu = self._required(app_name)
+        snapshot = self.metrics_collector.get_snapshot(max_age=self.poll_interval)
+        others = [r for name, r in self.reservations.items() if name != app_name]
+
+        if snapshot is None:
+            return AdmissionResult(AdmissionDecision.ADMIT, app_name, required_memory, required_gpu,
+                                   0, None, "no metrics available")
+
+        available_memory = (snapshot.memory_available
+                            - sum(r.outstanding_memory for r in others)
+                            - int(snapshot.memory_total * self.memory_headroom))
+        # Held by managed apps, so it comes back when one of them stops
+        reclaimable_memory = sum(max(r.memory_bytes, r.current_memory) for r in others)
+
+        gpu = snapshot.gpu
+        available_gpu = None
+        reclaimable_gpu = 0
+        if gpu is not None:
+            available_gpu = (gpu.memory_free
+                             - sum(r.outstanding_gpu_memory for r in others)
+                             - int(gpu.memory_total * self.gpu_headroom))
+            reclaimable_gpu = sum(max(r.gpu_memory_bytes, r.current_gpu_memory) for r in others)
+
+        memory_short = required_memory - available_memory
+        gpu_short = required_gpu - available_gpu if available_gpu is not None else 0
+
+        def result(decision: AdmissionDecision, reason: str) -> AdmissionResult:
+            return AdmissionResult(decision, app_name, required_memory, required_gpu,
+                                   available_memory, available_gpu, reason)
+
+        if memory_short <= 0 and gpu_short <= 0:
+            return result(AdmissionDecision.ADMIT,
+                          f"needs {required_memory // _MB} MB RAM / {required_gpu // _MB} MB VRAM, "
+                          f"{available_memory // _MB} MB / "
+                          f"{available_gpu // _MB if available_gpu is not None else 'n/a'} MB available")
+
+        shortage = []
+        if memory_short > 0:
+            shortage.append(f"{memory_short // _MB} MB RAM")
+        if gpu_short > 0:
+            shortage.append(f"{gpu_short // _MB} MB VRAM")
+        shortage_text = ' and '.join(shortage)
+
+        if memory_short <= reclaimable_memory and gpu_short <= reclaimable_gpu:
+            holders = ', '.join(sorted(r.app_name for r in others))
+            return result(AdmissionDecision.QUEUE, f"short of {shortage_text} held by {holders}")
+        return result(AdmissionDecision.REFUSE,
+                      f"short of {shortage_text}, and stopping managed apps would not free enough")
+
+    def _reserve(self, app_name: str, result: AdmissionResult) -> None:
+        """Hold an admitted app's footprint."""
+        self.reservations[app_name] = _Reservation(
+            app_name=app_name,
+            memory_bytes=result.required_memory,
+            gpu_memory_bytes=result.required_gpu_memory,
+            admitted_at=time.time()
+        )
+
+    def _release(self, app_name: str) -> None:
+        """Drop a reservation and fold the peaks of a run that became ready into the footprint."""
+        reservation = self.reservations.pop(app_name, None)
+        if reservation is None or reservation.ready_at is None or reservation.peak_memory <= 0:
+            return
+
+        footprint = self.footprints.get(app_name) or AppFootprint(app_name=app_name)
+        if footprint.learned:
+            # Grow at once, shrink halfway, so one light run does not undersize the next
+            footprint.memory_bytes = max(reservation.peak_memory,
+                                         (footprint.memory_bytes + reservation.peak_memory) // 2)
+            footprint.gpu_memory_bytes = max(reservation.peak_gpu_memory,
+                                             (footprint.gpu_memory_bytes + reservation.peak_gpu_memory) // 2)
+        else:
+            footprint.memory_bytes = reservation.peak_memory
+            footprint.gpu_memory_bytes = reservation.peak_gpu_memory
+            footprint.learned = True
+        footprint.runs += 1
+        footprint.updated_at = time.time()
+        self.footprints[app_name] = footprint
+        self._save_footprints()
+
+    def _load_footprints(self) -> None:
+        """Load learned footprints from disk."""
+        try:
+            if os.path.exists(self.profile_path):
+                with open(self.profile_path, 'r') as f:
+                    data = json.load(f)
+                self.footprints = {
+                    name: AppFootprint.from_dict(entry) for name, entry in data.get('footprints', {}).items()
+                }
+        except Exception as e:
+            print(f"[AdmissionController] Error loading footprints: {e}")
+
+    def _save_footprints(self) -> None:
+        """Write learned footprints to disk atomically."""
+        try:
+            os.makedirs(os.path.dirname(self.profile_path) or '.', exist_ok=True)
+            temp_path = f"{self.profile_path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({'footprints': {name: fp.to_dict() for name, fp in self.footprints.items()}},
+                          f, indent=2)
+            os.replace(temp_path, self.profile_path)
+        except Exception as e:
+            print(f"[AdmissionController] Error saving footprints: {e}")
+
+
+_controllers: Dict[str, AdmissionController] = {}
+_controllers_lock = threading.Lock()
+
+
+def get_admission_controller(profile_path: str) -> AdmissionController:
+    """
+    Get the shared admission controller for a footprint file.
+
+    Args:
+        profile_path: JSON file the learned footprints are persisted in
+
+    Returns:
+        AdmissionController
+    """
+    path = os.path.abspath(profile_path)
+    with _controllers_lock:
+        controller = _controllers.get(path)
+        if controller is None:
+            controller = AdmissionController(path)
+            _controllers[path] = controller
+        return controller
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+PinokioCloud App Resource Accounting
+
+This module measures CPU, memory and I/O per application rather than per PID,
+so the Python workers, node processes and CUDA helpers an app spawns are
+counted against it. When cgroup v2 is writable, each app is launched into its
+own cgroup and read from memory.current, cpu.stat and io.stat, which costs a
+few file reads per app regardless of how many processes it has. Otherwise the
+app's process tree is found with a batched /proc walk: the parent and session
+of each PID are cached, so each tick only stats new PIDs plus the members of
+tracked trees.
+
+Samples are kept as a per-app time series.
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import os
+import re
+import time
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Any, Callable, Deque, Set, Tuple
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+
+
+# Parent directory of the per-app cgroups
+DEFAULT_CGROUP_ROOT = os.environ.get('PINOKIO_CGROUP_ROOT', '/sys/fs/cgroup/pinokio')
+
+_CGROUP_MOUNT = '/sys/fs/cgroup'
+
+try:
+    _CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    _CLOCK_TICKS = 100
+    _PAGE_SIZE = 4096
+
+
+@dataclass
+class AppUsageSample:
+    """Aggregated resource usage of one application at a point in time."""
+    app_name: str
+    timestamp: datetime
+    source: str  # 'cgroup' or 'proc'
+    process_count: int
+    cpu_percent: float  # 100.0 = one full core
+    cpu_seconds: float
+    memory_bytes: int
+    memory_percent: float
+    io_read_bytes: int
+    io_write_bytes: int
+    pids: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert AppUsageSample to dictionary."""
+        data = asdict(self)
+        data['timestamp'] = self.timestamp.isoformat()
+        return data
+
+
+@dataclass
+class _TrackedApp:
+    """Accounting state of one application."""
+    app_name: str
+    root_pid: int
+    cgroup_path: Optional[str] = None
+    history: Deque[AppUsageSample] = field(default_factory=deque)
+    last_cpu_seconds: Optional[float] = None
+    last_sample_time: Optional[float] = None
+
+
+def _read_proc_stat(pid: int) -> Optional[Tuple[int, int, float, int]]:
+    """
+    Read one /proc/<pid>/stat.
+
+    Returns:
+        (ppid, session, cpu_seconds, rss_bytes), or None if the process is gone
+    """
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            stat = f.read()
+        # Fields after the command name, which may contain spaces
+        fields = stat[stat.rindex(')') + 2:].split()
+        ppid, session = int(fields[1]), int(fields[3])
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+        rss_bytes = int(fields[21]) * _PAGE_SIZE
+        return ppid, session, cpu_seconds, rss_bytes
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _read_proc_io(pid: int) -> Tuple[int, int]:
+    """Read storage I/O bytes of a process (zeros when not permitted)."""
+    read_bytes = write_bytes = 0
+    try:
+        with open(f'/proc/{pid}/io', 'r') as f:
+            for line in f:
+                if line.startswith('read_bytes:'):
+                    read_bytes = int(line.split()[1])
+                elif line.startswith('write_bytes:'):
+                    write_bytes = int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return read_bytes, write_bytes
+
+
+def _total_memory() -> int:
+    """Total physical memory in bytes."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return 0
+
+
+class _ProcTable:
+    """
+    Parent/session index of /proc, refreshed incrementally.
+
+    Only PIDs not seen before are stat'ed during a refresh; members of
+    tracked trees are re-read anyway when they are measured, which keeps
+    their entries current.
+    """
+
+    def __init__(self):
+        self.entries: Dict[int, Tuple[int, int]] = {}  # pid -> (ppid, session)
+
+    def refresh(self) -> None:
+        """Drop exited PIDs and index new ones."""
+        try:
+            pids = {int(name) for name in os.listdir('/proc') if name.isdigit()}
+        except OSError:
+            return
+
+        for pid in [pid for pid in self.entries if pid not in pids]:
+            del self.entries[pid]
+        for pid in pids:
+            if pid not in self.entries:
+                stat = _read_proc_stat(pid)
+                if stat is not None:
+                    self.entries[pid] = (stat[0], stat[1])
+
+    def update(self, pid: int, ppid: int, session: int) -> None:
+        """Record a fresh parent/session for a PID."""
+        self.entries[pid] = (ppid, session)
+
+    def members(self, root_pid: int) -> Set[int]:
+        """
+        Get the processes belonging to an app started as a session leader.
+
+        Members are the descendants of the root plus processes still in its
+        session (children orphaned by an exited intermediate parent).
+        """
+        children: Dict[int, List[int]] = {}
+        found = {root_pid} if root_pid in self.entries else set()
+        for pid, (ppid, session) in self.entries.items():
+            children.setdefault(ppid, []).append(pid)
+            if session == root_pid:
+                found.add(pid)
+
+        stack = list(found)
+        while stack:
+            for child in children.get(stack.pop(), ()):
+                if child not in found:
+                    found.add(child)
+                    stack.append(child)
+        return found
+
+
+class AppResourceAccounting:
+    """
+    Per-application resource accounting over cgroup v2 or /proc trees.
+
+    All registered apps are measured in one pass. Calls to sample() within
+    ``min_interval`` seconds of the previous pass return its results.
+    """
+
+    def __init__(self, cgroup_root: str = DEFAULT_CGROUP_ROOT,
+                 history_size: int = 720, min_interval: float = 1.0):
+        """
+        Initialize app accounting.
+
+        Args:
+            cgroup_root: Directory the per-app cgroups are created under
+            history_size: Samples kept per app
+            min_interval: Seconds within which sample() reuses the last pass
+        """
+        self.cgroup_root = cgroup_root
+        self.history_size = history_size
+        self.min_interval = min_interval
+
+        self.apps: Dict[str, _TrackedApp] = {}
+        self.lock = threading.RLock()
+        self.proc_table = _ProcTable()
+        self.total_memory = _total_memory()
+        self.last_pass = 0.0
+        self.latest: Dict[str, AppUsageSample] = {}
+
+        self.cgroups_available = self._setup_cgroup_root()
+
+    def launch_hook(self, app_name: str) -> Callable[[], None]:
+        """
+        Get a Popen ``preexec_fn`` that starts a new session and, when cgroups
+        are available, moves the child into the app's cgroup before exec, so
+        every process it spawns is accounted to the app.
+
+        Args:
+            app_name: Application being launched
+
+        Returns:
+            Callable[[], None]: Function to pass as preexec_fn
+        """
+        procs_file = None
+        cgroup_path = self._create_app_cgroup(app_name) if self.cgroups_available else None
+        if cgroup_path is not None:
+            procs_file = os.path.join(cgroup_path, 'cgroup.procs')
+
+        def preexec() -> None:
+            os.setsid()
+            if procs_file is not None:
+                try:
+                    with open(procs_file, 'w') as f:
+                        f.write('0')
+                except OSError:
+                    pass  # Accounted through /proc instead
+
+        return preexec
+
+    def register(self, app_name: str, pid: int) -> None:
+        """
+        Start accounting an application.
+
+        Args:
+            app_name: Application name
+            pid: PID of the process the app was started as
+        """
+        cgroup_path = self._app_cgroup_path(app_name) if self.cgroups_available else None
+        if cgroup_path is not None and pid not in self._read_cgroup_pids(cgroup_path):
+            # The app was not launched through launch_hook (or joining failed)
+            cgroup_path = None
+
+        with self.lock:
+            self.apps[app_name] = _TrackedApp(
+                app_name=app_name,
+                root_pid=pid,
+                cgroup_path=cgroup_path,
+                history=deque(maxlen=self.history_size)
+            )
+            self.last_pass = 0.0
+
+    def unregister(self, app_name: str) -> None:
+        """Stop accounting an application and remove its (empty) cgroup."""
+        with self.lock:
+            app = self.apps.pop(app_name, None)
+            self.latest.pop(app_name, None)
+        if app is not None and app.cgroup_path:
+            try:
+                os.rmdir(app.cgroup_path)
+            except OSError:
+                pass  # Still has processes
+
+    def is_registered(self, app_name: str) -> bool:
+        """Whether an application is being accounted."""
+        return app_name in self.apps
+
+    def sample(self) -> Dict[str, AppUsageSample]:
+        """
+        Measure every registered application.
+
+        Returns:
+            Dict[str, AppUsageSample]: Latest sample per app
+        """
+        with self.lock:
+            now = time.monotonic()
+            if now - self.last_pass < self.min_interval:
+                return dict(self.latest)
+            self.last_pass = now
+
+            if any(app.cgroup_path is None for app in self.apps.values()):
+                self.proc_table.refresh()
+
+            for app in self.apps.values():
+                if app.cgroup_path is not None:
+                    sample = self._sample_cgroup(app, now)
+                else:
+                    sample = self._sample_proc_tree(app, now)
+                if sample is not None:
+                    app.history.append(sample)
+                    self.latest[app.app_name] = sample
+            return dict(self.latest)
+
+    def get_latest(self, app_name: str) -> Optional[AppUsageSample]:
+        """Get the most recent sample of an application."""
+        return self.latest.get(app_name)
+
+    def get_history(self, app_name: str, seconds: Optional[float] = None) -> List[AppUsageSample]:
+        """
+        Get the sample history of an application.
+
+        Args:
+            app_name: Application name
+            seconds: Only return samples from the last N seconds
+
+        Returns:
+            List[AppUsageSample]: Samples, oldest first
+        """
+        app = self.apps.get(app_name)
+        if app is None:
+            return []
+        history = list(app.history)
+        if seconds is not None:
+            cutoff = datetime.now().timestamp() - seconds
+            history = [s for s in history if s.timestamp.timestamp() >= cutoff]
+        return history
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get accounting status."""
+        with self.lock:
+            return {
+                'cgroups_available': self.cgroups_available,
+                'cgroup_root': self.cgroup_root,
+                'apps': {name: ('cgroup' if app.cgroup_path else 'proc') for name, app in self.apps.items()}
+            }
+
+    def _setup_cgroup_root(self) -> bool:
+        """Create the cgroup root and enable the controllers it can use."""
+        if not os.path.exists(os.path.join(_CGROUP_MOUNT, 'cgroup.controllers')):
+            return False  # Not a cgroup v2 (unified) hierarchy
+        try:
+            os.makedirs(self.cgroup_root, exist_ok=True)
+            if not os.access(os.path.join(self.cgroup_root, 'cgroup.procs'), os.W_OK):
+                return False
+        except OSError:
+            return False
+
+        # Best effort: each controller must also be enabled in every ancestor
+        parent = os.path.dirname(self.cgroup_root)
+        for directory in (parent, self.cgroup_root):
+            for controller in ('cpu', 'memory', 'io'):
+                try:
+                    with open(os.path.join(directory, 'cgroup.subtree_control'), 'w') as f:
+                        f.write(f'+{controller}')
+                except OSError:
+                    pass
+        return True
+
+    def _app_cgroup_path(self, app_name: str) -> str:
+        """Get the cgroup directory of an app."""
+        return os.path.join(self.cgroup_root, re.sub(r'[^A-Za-z0-9_.-]', '_', app_name) or 'app')
+
+    def _create_app_cgroup(self, app_name: str) -> Optional[str]:
+        """Create the cgroup of an app."""
+        path = self._app_cgroup_path(app_name)
+        try:
+            os.makedirs(path, exist_ok=True)
+            return path
+        except OSError as e:
+            print(f"[AppResourceAccounting] Cannot create cgroup for {app_name}: {e}")
+            return None
+
+    def _read_cgroup_pids(self, cgroup_path: str) -> List[int]:
+        """Read the processes in a cgroup (and its children)."""
+        pids = []
+        for directory, _, _ in os.walk(cgroup_path):
+            try:
+                with open(os.path.join(directory, 'cgroup.procs'), 'r') as f:
+                    pids.extend(int(line) for line in f if line.strip())
+            except (OSError, ValueError):
+                continue
+        return pids
+
+    def _read_cgroup_file(self, cgroup_path: str, name: str) -> Optional[str]:
+        """Read a cgroup interface file, or None if the controller is not enabled."""
+        try:
+            with open(os.path.join(cgroup_path, name), 'r') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _sample_cgroup(self, app: _TrackedApp, now: float) -> Optional[AppUsageSample]:
+        """Measure an app from its cgroup."""
+        pids = self._read_cgroup_pids(app.cgroup_path)
+        if not pids:
+            return None
+
+        cpu_seconds = 0.0
+        cpu_stat = self._read_cgroup_file(app.cgroup_path, 'cpu.stat')
+        if cpu_stat:
+            for line in cpu_stat.splitlines():
+                if line.startswith('usage_usec '):
+                    cpu_seconds = int(line.split()[1]) / 1e6
+                    break
+
+        memory_current = self._read_cgroup_file(app.cgroup_path, 'memory.current')
+        if memory_current is not None:
+            memory_bytes = int(memory_current.strip())
+        else:
+            # Memory controller not delegated: sum RSS instead
+            memory_bytes = 0
+            for pid in pids:
+                stat = _read_proc_stat(pid)
+                if stat is not None:
+                    memory_bytes += stat[3]
+
+        io_read = io_write = 0
+        io_stat = self._read_cgroup_file(app.cgroup_path, 'io.stat')
+        if io_stat:
+            for line in io_stat.splitlines():
+                for entry in line.split()[1:]:
+                    key, _, value = entry.partition('=')
+                    if key == 'rbytes':
+                        io_read += int(value)
+                    elif key == 'wbytes':
+                        io_write += int(value)
+        else:
+            for pid in pids:
+                read_bytes, write_bytes = _read_proc_io(pid)
+                io_read += read_bytes
+                io_write += write_bytes
+
+        return self._build_sample(app, now, 'cgroup', pids, cpu_seconds, memory_bytes, io_read, io_write)
+
+    def _sample_proc_tree(self, app: _TrackedApp, now: float) -> Optional[AppUsageSample]:
+        """Measure an app by walking its process tree in /proc."""
+        members = self.proc_table.members(app.root_pid)
+        pids = []
+        cpu_seconds = 0.0
+        memory_bytes = io_read = io_write = 0
+
+        for pid in members:
+            stat = _read_proc_stat(pid)
+            if stat is None:
+                continue
+            ppid, session, pid_cpu, rss = stat
+            self.proc_table.update(pid, ppid, session)
+            pids.append(pid)
+            cpu_seconds += pid_cpu
+            memory_bytes += rss
+            read_bytes, write_bytes = _read_proc_io(pid)
+            io_read += read_bytes
+            io_write += write_bytes
+
+        if not pids:
+            return None
+        return self._build_sample(app, now, 'proc', sorted(pids), cpu_seconds, memory_bytes, io_read, io_write)
+
+    def _build_sample(self, app: _TrackedApp, now: float, source: str, pids: List[int],
+                      cpu_seconds: float, memory_bytes: int, io_read: int, io_write: int) -> AppUsageSample:
+        """Turn cumulative counters into a sample and remember them for the next delta."""
+        cpu_percent = 0.0
+        if app.last_cpu_seconds is not None and now > app.last_sample_time:
+            # Exited children take their CPU time with them in the /proc walk
+            delta = max(0.0, cpu_seconds - app.last_cpu_seconds)
+            cpu_percent = delta / (now - app.last_sample_time) * 100
+        app.last_cpu_seconds = cpu_seconds
+        app.last_sample_time = now
+
+        return AppUsageSample(
+            app_name=app.app_name,
+            timestamp=datetime.now(),
+            source=source,
+            process_count=len(pids),
+            cpu_percent=cpu_percent,
+            cpu_seconds=cpu_seconds,
+            memory_bytes=memory_bytes,
+            memory_percent=(memory_bytes / self.total_memory * 100) if self.total_memory else 0.0,
+            io_read_bytes=io_read,
+            io_write_bytes=io_write,
+            pids=pids
+        )
+
+
+_accounting: Optional[AppResourceAccounting] = None
+_accounting_lock = threading.Lock()
+
+
+def get_app_accounting() -> AppResourceAccounting:
+    """Get the process-wide app accounting instance."""
+    global _accounting
+    with _accounting_lock:
+        if _accounting is None:
+            _accounting = AppResourceAccounting()
+        return _accounting
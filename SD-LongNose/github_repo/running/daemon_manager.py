@@ -30,6 +30,7 @@ from environment_management.shell_runner import ShellRunner
 from environment_management.variable_system import VariableSystem
 from environment_management.file_system import FileSystemManager
 from environment_management.json_handler import JSONHandler
+from running.port_allocator import get_port_allocator
 
 
 class DaemonStatus(Enum):
@@ -73,6 +74,7 @@ class DaemonInfo:
     stdout_log: Optional[str] = None
     stderr_log: Optional[str] = None
     config: Dict[str, Any] = field(default_factory=dict)
+    port: Optional[int] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert DaemonInfo to dictionary."""
@@ -123,6 +125,10 @@ class DaemonManager:
         self.file_system = FileSystemManager(str(self.base_path))
         self.json_handler = JSONHandler(str(self.base_path))
         
+        # Port leases shared with every other launcher on the host
+        self.port_allocator = get_port_allocator()
+        self.port_range = (7860, 7999)
+        
         # Event callbacks
         self.event_callbacks: Dict[str, List[Callable]] = {
             'daemon_started': [],
@@ -164,9 +170,14 @@ class DaemonManager:
         daemon_config.setdefault('health_check_interval', 30.0)
         daemon_config.setdefault('auto_restart', True)
         
+        # Reserve a port (a configured port is honoured when it is free)
+        port = self.port_allocator.allocate(
+            app_name, *self.port_range, preferred=daemon_config.get('port')
+        )
+        
         # Prepare environment and command
         working_dir = self._get_working_directory(script_path)
-        command = self._prepare_daemon_command(script_path, app_name, daemon_config)
+        command = self._prepare_daemon_command(script_path, app_name, daemon_config, port)
         env_path = daemon_config.get('environment_path')
         
         # Create log files
@@ -180,9 +191,12 @@ class DaemonManager:
         
         try:
             pid = self._start_daemon_process(
-                command, working_dir, env_path, stdout_log, stderr_log
+                command, working_dir, env_path, stdout_log, stderr_log, port
             )
             
+            # The lease now follows the daemon and is reclaimed when it exits
+            self.port_allocator.assign(port, pid)
+            
             # Create daemon info
             daemon_info = DaemonInfo(
                 daemon_id=daemon_id,
@@ -199,7 +213,8 @@ class DaemonManager:
                 auto_restart=daemon_config['auto_restart'],
                 stdout_log=stdout_log,
                 stderr_log=stderr_log,
-                config=daemon_config
+                config=daemon_config,
+                port=port
             )
             
             # Register daemon
@@ -236,6 +251,7 @@ class DaemonManager:
                 
         except Exception as e:
             print(f"[DaemonManager] Error starting daemon {daemon_id}: {e}")
+            self.port_allocator.release(port)
             raise
     
     def stop_daemon(self, daemon_id: str, force: bool = False) -> bool:
@@ -269,6 +285,7 @@ class DaemonManager:
                     
                     # Remove from active daemons
                     del self.active_daemons[daemon_id]
+                    self._release_port(daemon_info)
                     
                     # Remove daemon configuration
                     self._remove_daemon_config(daemon_id)
@@ -320,6 +337,10 @@ class DaemonManager:
             daemon_info.restart_count += 1
             
             try:
+                # Hold the port while the daemon is down
+                if daemon_info.port is not None:
+                    self.port_allocator.assign(daemon_info.port, os.getpid())
+                
                 # Stop the current process
                 self._stop_daemon_process(daemon_info.pid, force=True)
                 
@@ -332,11 +353,14 @@ class DaemonManager:
                     daemon_info.working_directory,
                     daemon_info.environment_path,
                     daemon_info.stdout_log,
-                    daemon_info.stderr_log
+                    daemon_info.stderr_log,
+                    daemon_info.port
                 )
                 
                 # Update daemon info
                 daemon_info.pid = new_pid
+                if daemon_info.port is not None:
+                    self.port_allocator.assign(daemon_info.port, new_pid)
                 daemon_info.started_at = datetime.now()
                 daemon_info.status = DaemonStatus.RUNNING
                 daemon_info.health = DaemonHealth.HEALTHY
@@ -460,10 +484,15 @@ class DaemonManager:
     
     def _start_daemon_process(self, command: str, working_dir: str,
                             env_path: Optional[str], stdout_log: str,
-                            stderr_log: str) -> int:
+                            stderr_log: str, port: Optional[int] = None) -> int:
         """Start the actual daemon process."""
         # Prepare environment
         env = os.environ.copy()
+        if port is not None:
+            # Point common web frameworks at the leased port
+            env['PORT'] = str(port)
+            env['GRADIO_SERVER_PORT'] = str(port)
+            env['STREAMLIT_SERVER_PORT'] = str(port)
         if env_path:
             if env_path.endswith('venv'):
                 # Virtual environment
@@ -608,12 +637,13 @@ class DaemonManager:
         return True  # For now, consider all lines recent
     
     def _prepare_daemon_command(self, script_path: str, app_name: str,
-                               config: Dict[str, Any]) -> str:
+                               config: Dict[str, Any], port: Optional[int] = None) -> str:
         """Prepare the command for daemon execution."""
         # Apply variable substitution
         variables = {
             'app_name': app_name,
             'script_path': script_path,
+            'port': port,
             **config.get('variables', {})
         }
         
@@ -655,6 +685,11 @@ class DaemonManager:
         except Exception as e:
             print(f"[DaemonManager] Error loading daemon configs: {e}")
     
+    def _release_port(self, daemon_info: DaemonInfo) -> None:
+        """Release the port leased to a daemon."""
+        if daemon_info.port is not None:
+            self.port_allocator.release(daemon_info.port)
+    
     def _remove_daemon_config(self, daemon_id: str) -> None:
         """Remove daemon configuration from disk."""
         config_file = self.daemon_storage_path / f"{daemon_id}.json"
@@ -670,6 +705,7 @@ class DaemonManager:
             self.health_monitor_active = True
             self.health_monitor_thread = threading.Thread(
                 target=self._health_monitoring_loop,
+                name="DaemonManager-health",
                 daemon=True
             )
             self.health_monitor_thread.start()
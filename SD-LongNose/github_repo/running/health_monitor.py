@@ -855,6 +855,7 @@ class HealthMonitor:
             self.monitoring_active = True
             self.monitoring_thread = threading.Thread(
                 target=self._monitoring_loop,
+                name="HealthMonitor-monitor",
                 daemon=True
             )
             self.monitoring_thread.start()
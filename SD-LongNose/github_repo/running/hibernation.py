@@ -0,0 +1,779 @@
+#!/usr/bin/env python3
+"""
+PinokioCloud App Hibernation
+
+This module stops running applications that have gone idle, freeing the GPU
+and host memory their models hold, and brings them back on the first request.
+
+When an app is hibernated its public port is taken over by a WakeProxy, so a
+tunnel pointing at that port stays up while the app is gone. The first
+connection starts the app again (with its recorded launch arguments) on an
+internal port; HTTP clients get a self-refreshing "waking up" page meanwhile,
+and once the app is ready the proxy splices connections through to it.
+
+Idleness comes from the traffic seen by the proxy, new TCP connections to
+the app's port (/proc/net/tcp), the app's CPU usage and any registered
+activity sources such as tunneling.RoutingProxy.get_port_activity, which
+CloudflareManager registers for every manager in the process.
+
+ScriptManager runs a HibernationManager for the apps it starts when
+hibernation is enabled (PINOKIO_HIBERNATION=1).
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import sys
+import time
+import socket
+import weakref
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Any, Callable, Set, Tuple, Deque
+from dataclasses import dataclass, field, asdict
+from enum import Enum
+
+# Import previous phase modules
+sys.path.append('/workspace/SD-LongNose/github_repo')
+from running.port_allocator import get_port_allocator
+from environment_management.tracing import span
+
+
+# /proc/net/tcp state code for ESTABLISHED
+_TCP_ESTABLISHED = '01'
+
+_HTTP_METHODS = (b'GET ', b'POST', b'HEAD', b'PUT ', b'DELE', b'OPTI', b'PATC')
+
+_WAKING_PAGE = (
+    "<!DOCTYPE html><html><head><meta http-equiv='refresh' content='3'>"
+    "<title>Waking up</title></head><body style='font-family:sans-serif;text-align:center;"
+    "padding-top:20vh'><h2>{app_name} is waking up</h2>"
+    "<p>The app was hibernated while idle. This page reloads when it is ready.</p></body></html>"
+)
+
+
+# Activity sources consulted by every HibernationManager in the process
+_shared_activity_sources: List[Callable[[], Optional[Callable[[], Dict[int, float]]]]] = []
+_shared_activity_lock = threading.Lock()
+
+
+def register_activity_source(source: Callable[[], Dict[int, float]]) -> None:
+    """
+    Register a source of last-activity times by local port for every manager.
+
+    Bound methods are held weakly, so registering e.g. a routing proxy's
+    get_port_activity does not keep the proxy alive.
+
+    Args:
+        source: Returns {port: epoch time of the latest request}
+    """
+    if hasattr(source, '__self__'):
+        reference = weakref.WeakMethod(source)
+    else:
+        reference = lambda: source
+    with _shared_activity_lock:
+        _shared_activity_sources.append(reference)
+
+
+def _get_shared_activity_sources() -> List[Callable[[], Dict[int, float]]]:
+    """Get the live process-wide activity sources, dropping collected ones."""
+    with _shared_activity_lock:
+        sources = [reference() for reference in _shared_activity_sources]
+        _shared_activity_sources[:] = [
+            reference for reference, source in zip(_shared_activity_sources, sources) if source is not None
+        ]
+    return [source for source in sources if source is not None]
+
+
+def read_established_peers(port: int) -> Set[Tuple[str, str]]:
+    """
+    Get the remote endpoints of established connections to a local port.
+
+    Reads /proc/net/tcp and /proc/net/tcp6. Returns an empty set where /proc
+    is unavailable.
+
+    Args:
+        port: Local port
+
+    Returns:
+        Set of (remote address, remote port) pairs, as hex strings
+    """
+    peers = set()
+    for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+        try:
+            with open(table, 'r') as f:
+                next(f, None)
+                for line in f:
+                    fields = line.split()
+                    if len(fields) > 3 and fields[3] == _TCP_ESTABLISHED:
+                        if int(fields[1].rsplit(':', 1)[1], 16) == port:
+                            peers.add(tuple(fields[2].rsplit(':', 1)))
+        except (OSError, ValueError):
+            continue
+    return peers
+
+
+class HibernationState(Enum):
+    """Lifecycle of an app under hibernation management."""
+    ACTIVE = "active"
+    HIBERNATING = "hibernating"
+    HIBERNATED = "hibernated"
+    RESUMING = "resuming"
+
+
+@dataclass
+class HibernationRecord:
+    """What is needed to put an app to sleep and bring it back."""
+    app_name: str
+    public_port: int
+    idle_timeout: Optional[float]
+    state: HibernationState = HibernationState.ACTIVE
+    internal_port: Optional[int] = None
+    launch_args: Dict[str, Any] = field(default_factory=dict)
+    tunnel_urls: List[str] = field(default_factory=list)
+    last_activity: float = field(default_factory=time.time)
+    hibernated_at: Optional[float] = None
+    wake_requested_at: Optional[float] = None
+    resumed_at: Optional[float] = None
+    hibernations: int = 0
+    memory_freed_bytes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert HibernationRecord to dictionary."""
+        data = asdict(self)
+        data['state'] = self.state.value
+        return data
+
+
+class _LatencySeries:
+    """Recent latency samples with summary statistics."""
+
+    def __init__(self, max_samples: int = 200):
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.samples:
+            return {'count': self.count}
+        ordered = sorted(self.samples)
+        return {
+            'count': self.count,
+            'last': self.samples[-1],
+            'mean': sum(ordered) / len(ordered),
+            'p50': ordered[len(ordered) // 2],
+            'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            'max': ordered[-1]
+        }
+
+
+class WakeProxy:
+    """
+    TCP front door on a hibernated application's public port.
+
+    While the app sleeps, every connection asks for it to wake: HTTP requests
+    get a self-refreshing waiting page and other connections wait for the
+    app. Once the app is up on its internal port, connections are spliced
+    through and their traffic counts as activity.
+    """
+
+    def __init__(self, app_name: str, port: int, on_wake: Callable[[], None],
+                 host: str = '0.0.0.0', connect_wait: float = 30.0):
+        """
+        Initialize the wake proxy.
+
+        Args:
+            app_name: Name of the application behind the proxy
+            port: Public port to listen on
+            on_wake: Called (on the connection thread) when a client arrives while the app sleeps
+            host: Interface to listen on
+            connect_wait: Seconds a non-HTTP connection waits for the app
+        """
+        self.app_name = app_name
+        self.port = port
+        self.on_wake = on_wake
+        self.host = host
+        self.connect_wait = connect_wait
+
+        self.backend_port: Optional[int] = None
+        self.backend_ready = threading.Event()
+        self.server_socket: Optional[socket.socket] = None
+        self.accept_thread: Optional[threading.Thread] = None
+        self.active = False
+
+        self.last_activity = time.time()
+        self.connections = 0
+        self.wake_requests = 0
+        self.bytes_proxied = 0
+
+    def start(self, bind_timeout: float = 10.0) -> None:
+        """
+        Start listening, retrying while the exiting app still holds the port.
+
+        Args:
+            bind_timeout: Seconds to keep retrying the bind
+
+        Raises:
+            OSError: If the port cannot be bound in time
+        """
+        deadline = time.monotonic() + bind_timeout
+        while True:
+            server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                server_socket.bind((self.host, self.port))
+                break
+            except OSError:
+                server_socket.close()
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.2)
+
+        server_socket.listen(128)
+        self.server_socket = server_socket
+        self.active = True
+        self.accept_thread = threading.Thread(
+            target=self._accept_loop, name=f"WakeProxy-{self.app_name}", daemon=True
+        )
+        self.accept_thread.start()
+        print(f"[WakeProxy] Holding port {self.port} for {self.app_name}")
+
+    def stop(self) -> None:
+        """Stop listening; spliced connections finish on their own."""
+        self.active = False
+        if self.server_socket is not None:
+            try:
+                self.server_socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.server_socket.close()
+            self.server_socket = None
+
+    def set_backend(self, port: Optional[int]) -> None:
+        """
+        Point the proxy at the running app, or mark it asleep.
+
+        Args:
+            port: Internal port the app listens on, or None while it sleeps
+        """
+        self.backend_port = port
+        if port is None:
+            self.backend_ready.clear()
+        else:
+            self.backend_ready.set()
+
+    def _accept_loop(self) -> None:
+        """Accept connections until stopped."""
+        while self.active:
+            try:
+                client, _ = self.server_socket.accept()
+            except OSError:
+                break
+            threading.Thread(
+                target=self._handle_client, args=(client,),
+                name=f"WakeProxy-{self.app_name}-conn", daemon=True
+            ).start()
+
+    def _handle_client(self, client: socket.socket) -> None:
+        """Serve one connection: wake the app if needed, then splice."""
+        self.connections += 1
+        self.last_activity = time.time()
+        upstream = None
+        try:
+            if not self.backend_ready.is_set():
+                self.wake_requests += 1
+                self.on_wake()
+
+                client.settimeout(2.0)
+                try:
+                    head = client.recv(4, socket.MSG_PEEK)
+                except socket.timeout:
+                    head = b''
+                client.settimeout(None)
+
+                if head.startswith(_HTTP_METHODS):
+                    self._send_waking_page(client)
+                    return
+                if not self.backend_ready.wait(self.connect_wait):
+                    return
+
+            upstream = socket.create_connection(('127.0.0.1', self.backend_port), timeout=5.0)
+            upstream.settimeout(None)
+
+            reverse = threading.Thread(
+                target=self._pipe, args=(upstream, client),
+                name=f"WakeProxy-{self.app_name}-pipe", daemon=True
+            )
+            reverse.start()
+            self._pipe(client, upstream)
+            reverse.join()
+
+        except OSError:
+            pass
+        finally:
+            for sock in (upstream, client):
+                if sock is not None:
+                    try:
+                        sock.close()
+                    except OSError:
+                        pass
+
+    def _pipe(self, source: socket.socket, destination: socket.socket) -> None:
+        """Copy one direction of a spliced connection, counting traffic as activity."""
+        try:
+            while True:
+                data = source.recv(65536)
+                if not data:
+                    break
+                destination.sendall(data)
+                self.bytes_proxied += len(data)
+                self.last_activity = time.time()
+        except OSError:
+            pass
+        finally:
+            try:
+                destination.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+
+    def _send_waking_page(self, client: socket.socket) -> None:
+        """Answer an HTTP request with a page that reloads until the app is up."""
+        body = _WAKING_PAGE.format(app_name=self.app_name).encode()
+        client.sendall(
+            b"HTTP/1.1 503 Service Unavailable\r\n"
+            b"Content-Type: text/html; charset=utf-8\r\n"
+            b"Retry-After: 3\r\n"
+            b"Cache-Control: no-store\r\n"
+            b"Connection: close\r\n"
+            b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get proxy statistics."""
+        return {
+            'port': self.port,
+            'backend_port': self.backend_port,
+            'listening': self.active,
+            'connections': self.connections,
+            'wake_requests': self.wake_requests,
+            'bytes_proxied': self.bytes_proxied,
+            'last_activity': self.last_activity
+        }
+
+
+class HibernationManager:
+    """
+    Hibernates idle applications and resumes them on demand.
+
+    Apps are opted in with enable(). A monitoring thread checks them every
+    ``check_interval`` seconds and hibernates those idle for longer than
+    their idle timeout. Hibernation and resume latencies are kept as metrics
+    (get_metrics) and recorded as "app.hibernate" / "app.resume" trace spans.
+    """
+
+    def __init__(self, script_manager: Any, idle_timeout: float = 1800.0,
+                 check_interval: float = 30.0, cpu_threshold: float = 5.0,
+                 resume_timeout: float = 600.0, listen_host: str = '0.0.0.0'):
+        """
+        Initialize the hibernation manager.
+
+        Args:
+            script_manager: ScriptManager running the applications
+            idle_timeout: Default seconds without activity before hibernating
+            check_interval: Seconds between idle checks
+            cpu_threshold: Process-tree CPU percent that counts as activity
+            resume_timeout: Seconds a resumed app has to become ready
+            listen_host: Interface the wake proxies listen on
+        """
+        self.script_manager = script_manager
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        self.cpu_threshold = cpu_threshold
+        self.resume_timeout = resume_timeout
+        self.listen_host = listen_host
+
+        self.port_allocator = get_port_allocator()
+        self.records: Dict[str, HibernationRecord] = {}
+        self.wake_proxies: Dict[str, WakeProxy] = {}
+        self.resume_events: Dict[str, threading.Event] = {}
+        self.last_peers: Dict[str, Set[Tuple[str, str]]] = {}
+        self.activity_sources: List[Callable[[], Dict[int, float]]] = []
+        self.lock = threading.RLock()
+
+        self.metrics = {
+            'hibernate_latency': _LatencySeries(),
+            'resume_latency': _LatencySeries(),
+            'idle_before_hibernate': _LatencySeries()
+        }
+        self.resume_failures = 0
+
+        self.monitoring_thread: Optional[threading.Thread] = None
+        self.monitoring_active = False
+
+    def enable(self, app_name: str, idle_timeout: Optional[float] = None,
+               tunnel_urls: Optional[List[str]] = None) -> HibernationRecord:
+        """
+        Put a running application under hibernation management.
+
+        Args:
+            app_name: Name of the application
+            idle_timeout: Seconds without activity before hibernating (manager default if None)
+            tunnel_urls: Public URLs bound to the app's port, kept with the record
+
+        Returns:
+            HibernationRecord: The app's record
+
+        Raises:
+            ValueError: If the app is not running or has no port
+        """
+        with self.lock:
+            record = self.records.get(app_name)
+            if record is None:
+                process_info = self.script_manager.get_process_info(app_name)
+                if process_info is None or process_info.port is None:
+                    raise ValueError(f"Application {app_name} is not running on a leased port")
+                record = HibernationRecord(
+                    app_name=app_name,
+                    public_port=process_info.port,
+                    idle_timeout=idle_timeout or self.idle_timeout,
+                    internal_port=process_info.port,
+                    launch_args=dict(process_info.launch_args)
+                )
+                self.records[app_name] = record
+            else:
+                record.idle_timeout = idle_timeout or self.idle_timeout
+            if tunnel_urls:
+                record.tunnel_urls = list(tunnel_urls)
+
+        self.start_monitoring()
+        print(f"[HibernationManager] Hibernating {app_name} after {record.idle_timeout:.0f}s idle")
+        return record
+
+    def disable(self, app_name: str) -> bool:
+        """
+        Stop hibernating an application automatically.
+
+        Its wake proxy keeps serving the public port until the app stops.
+
+        Args:
+            app_name: Name of the application
+
+        Returns:
+            bool: True if the app was managed
+        """
+        with self.lock:
+            record = self.records.get(app_name)
+            if record is None:
+                return False
+            record.idle_timeout = None
+            return True
+
+    def record_activity(self, app_name: str) -> None:
+        """Note that an application was just used."""
+        record = self.records.get(app_name)
+        if record is not None:
+            record.last_activity = time.time()
+
+    def add_activity_source(self, source: Callable[[], Dict[int, float]]) -> None:
+        """
+        Register a source of last-activity times by local port.
+
+        Args:
+            source: Returns {port: epoch time of the latest request}
+        """
+        self.activity_sources.append(source)
+
+    def hibernate(self, app_name: str) -> bool:
+        """
+        Stop an application gracefully and hold its public port until it is needed.
+
+        Args:
+            app_name: Name of the application
+
+        Returns:
+            bool: True if the app is now hibernated
+        """
+        with self.lock:
+            record = self.records.get(app_name)
+            if record is None or record.state != HibernationState.ACTIVE:
+                return False
+            process_info = self.script_manager.get_process_info(app_name)
+            if process_info is None or not process_info.launch_args:
+                print(f"[HibernationManager] Cannot hibernate {app_name}: launch arguments unknown")
+                return False
+            record.state = HibernationState.HIBERNATING
+
+        started = time.monotonic()
+        idle_for = time.time() - record.last_activity
+
+        with span("app.hibernate", category="run", app_name=app_name, idle_seconds=round(idle_for, 1)):
+            record.launch_args = dict(process_info.launch_args)
+            memory = process_info.resource_usage.get('memory_rss', 0)
+
+            wake_proxy = self.wake_proxies.get(app_name)
+            if wake_proxy is not None:
+                wake_proxy.set_backend(None)
+
+            if not self.script_manager.stop_application(app_name):
+                print(f"[HibernationManager] Could not stop {app_name}, keeping it running")
+                if wake_proxy is not None:
+                    wake_proxy.set_backend(record.internal_port)
+                record.state = HibernationState.ACTIVE
+                return False
+
+            if wake_proxy is None:
+                wake_proxy = WakeProxy(app_name, record.public_port,
+                                       on_wake=lambda: self._on_wake(app_name), host=self.listen_host)
+                try:
+                    wake_proxy.start()
+                except OSError as e:
+                    print(f"[HibernationManager] Cannot hold port {record.public_port} for {app_name}: {e}")
+                    record.state = HibernationState.HIBERNATED
+                    self._relaunch_on_public_port(record)
+                    return False
+                self.wake_proxies[app_name] = wake_proxy
+                self.port_allocator.claim(record.public_port, app_name)
+
+            record.state = HibernationState.HIBERNATED
+            record.hibernated_at = time.time()
+            record.hibernations += 1
+            record.memory_freed_bytes = memory
+
+        self.metrics['hibernate_latency'].add(time.monotonic() - started)
+        self.metrics['idle_before_hibernate'].add(idle_for)
+        print(f"[HibernationManager] Hibernated {app_name} after {idle_for:.0f}s idle, "
+              f"freed {memory / (1024 * 1024):.0f} MB")
+        return True
+
+    def resume(self, app_name: str, wait: bool = True) -> bool:
+        """
+        Start a hibernated application again behind its wake proxy.
+
+        Args:
+            app_name: Name of the application
+            wait: Whether to wait until it is ready
+
+        Returns:
+            bool: True if the app is active (or, without wait, resuming)
+        """
+        with self.lock:
+            record = self.records.get(app_name)
+            if record is None:
+                return False
+            if record.state == HibernationState.ACTIVE:
+                return True
+            if record.state == HibernationState.HIBERNATED:
+                record.state = HibernationState.RESUMING
+                record.wake_requested_at = record.wake_requested_at or time.time()
+                done = self.resume_events[app_name] = threading.Event()
+                starter = True
+            else:
+                done = self.resume_events.get(app_name)
+                starter = False
+
+        if not wait:
+            if starter:
+                threading.Thread(
+                    target=self._resume, args=(record, done),
+                    name=f"HibernationManager-resume-{app_name}", daemon=True
+                ).start()
+            return True
+
+        if starter:
+            self._resume(record, done)
+        elif done is not None:
+            done.wait(self.resume_timeout)
+        return record.state == HibernationState.ACTIVE
+
+    def get_record(self, app_name: str) -> Optional[HibernationRecord]:
+        """Get the hibernation record of an application."""
+        return self.records.get(app_name)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get every managed app's record and wake proxy statistics."""
+        with self.lock:
+            return {
+                app_name: {
+                    **record.to_dict(),
+                    'wake_proxy': self.wake_proxies[app_name].get_stats() if app_name in self.wake_proxies else None
+                }
+                for app_name, record in self.records.items()
+            }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get hibernation metrics.
+
+        Returns:
+            Dict[str, Any]: Latency summaries in seconds (count, last, mean, p50,
+            p95, max) plus app counts and memory currently freed
+        """
+        with self.lock:
+            hibernated = [r for r in self.records.values() if r.state == HibernationState.HIBERNATED]
+            return {
+                'managed_apps': len(self.records),
+                'hibernated_apps': len(hibernated),
+                'memory_freed_bytes': sum(r.memory_freed_bytes for r in hibernated),
+                'resume_failures': self.resume_failures,
+                **{name: series.summary() for name, series in self.metrics.items()}
+            }
+
+    def start_monitoring(self) -> None:
+        """Start the idle-check thread."""
+        if self.monitoring_thread is None or not self.monitoring_thread.is_alive():
+            self.monitoring_active = True
+            self.monitoring_thread = threading.Thread(
+                target=self._monitoring_loop,
+                name="HibernationManager-monitor",
+                daemon=True
+            )
+            self.monitoring_thread.start()
+
+    def stop_monitoring(self) -> None:
+        """Stop the idle-check thread."""
+        self.monitoring_active = False
+        if self.monitoring_thread and self.monitoring_thread.is_alive():
+            self.monitoring_thread.join(timeout=5.0)
+
+    def _monitoring_loop(self) -> None:
+        """Hibernate idle apps and drop apps stopped by someone else."""
+        while self.monitoring_active:
+            try:
+                self._check_apps()
+            except Exception as e:
+                print(f"[HibernationManager] Error checking apps: {e}")
+            time.sleep(self.check_interval)
+
+    def _check_apps(self) -> None:
+        """One pass of idle checks."""
+        now = time.time()
+        for app_name, record in list(self.records.items()):
+            if record.state != HibernationState.ACTIVE:
+                continue
+
+            process_info = self.script_manager.get_process_info(app_name)
+            if process_info is None:
+                self.forget(app_name)
+                continue
+
+            last_activity = self._latest_activity(record, process_info, now)
+            if record.idle_timeout and now - last_activity >= record.idle_timeout:
+                self.hibernate(app_name)
+
+    def _latest_activity(self, record: HibernationRecord, process_info: Any, now: float) -> float:
+        """Fold every activity signal into the record's last activity time."""
+        last_activity = record.last_activity
+        ports = {record.public_port, process_info.port}
+
+        wake_proxy = self.wake_proxies.get(record.app_name)
+        if wake_proxy is not None:
+            last_activity = max(last_activity, wake_proxy.last_activity)
+        elif process_info.port is not None:
+            # New connections since the last check (keep-alive idlers are not activity)
+            peers = read_established_peers(process_info.port)
+            if peers - self.last_peers.get(record.app_name, set()):
+                last_activity = now
+            self.last_peers[record.app_name] = peers
+
+        if process_info.resource_usage.get('cpu_percent', 0.0) >= self.cpu_threshold:
+            last_activity = now
+
+        for source in self.activity_sources + _get_shared_activity_sources():
+            try:
+                activity = source()
+            except Exception:
+                continue
+            for port in ports:
+                if port in activity:
+                    last_activity = max(last_activity, activity[port])
+
+        record.last_activity = last_activity
+        return last_activity
+
+    def _on_wake(self, app_name: str) -> None:
+        """Called by a wake proxy when a client arrives while the app sleeps."""
+        record = self.records.get(app_name)
+        if record is None or record.state != HibernationState.HIBERNATED:
+            return
+        record.wake_requested_at = record.wake_requested_at or time.time()
+        self.resume(app_name, wait=False)
+
+    def _resume(self, record: HibernationRecord, done: threading.Event) -> None:
+        """Relaunch an app and point its wake proxy at it once it is ready."""
+        app_name = record.app_name
+        requested_at = record.wake_requested_at or time.time()
+        args = record.launch_args
+
+        try:
+            with span("app.resume", category="run", app_name=app_name):
+                process_info = self.script_manager.start_application(
+                    app_name, args['script_path'], daemon=args.get('daemon', False), **args.get('kwargs', {})
+                )
+
+                deadline = time.monotonic() + self.resume_timeout
+                while process_info.ready_at is None:
+                    if time.monotonic() >= deadline:
+                        raise RuntimeError(f"not ready within {self.resume_timeout:.0f}s")
+                    if self.script_manager.get_process_info(app_name) is not process_info:
+                        raise RuntimeError("exited while starting")
+                    time.sleep(0.2)
+
+            record.internal_port = process_info.port
+            wake_proxy = self.wake_proxies.get(app_name)
+            if wake_proxy is not None:
+                wake_proxy.set_backend(process_info.port)
+
+            latency = time.time() - requested_at
+            record.state = HibernationState.ACTIVE
+            record.resumed_at = time.time()
+            record.last_activity = time.time()
+            record.memory_freed_bytes = 0
+            self.metrics['resume_latency'].add(latency)
+            print(f"[HibernationManager] Resumed {app_name} in {latency:.1f}s on port {process_info.port}")
+
+        except Exception as e:
+            self.resume_failures += 1
+            record.state = HibernationState.HIBERNATED
+            print(f"[HibernationManager] Failed to resume {app_name}: {e}")
+
+        finally:
+            record.wake_requested_at = None
+            done.set()
+
+    def _relaunch_on_public_port(self, record: HibernationRecord) -> None:
+        """Bring an app straight back on its own port when no proxy could hold it."""
+        args = record.launch_args
+        try:
+            self.script_manager.start_application(
+                record.app_name, args['script_path'], daemon=args.get('daemon', False),
+                port=record.public_port, **args.get('kwargs', {})
+            )
+            record.state = HibernationState.ACTIVE
+            record.last_activity = time.time()
+        except Exception as e:
+            print(f"[HibernationManager] Failed to relaunch {record.app_name}: {e}")
+            self.forget(record.app_name)
+
+    def forget(self, app_name: str) -> bool:
+        """
+        Stop managing an app, closing its wake proxy and giving its public port back.
+
+        Args:
+            app_name: Name of the application
+
+        Returns:
+            bool: True if the app was managed
+        """
+        with self.lock:
+            record = self.records.pop(app_name, None)
+            self.last_peers.pop(app_name, None)
+            wake_proxy = self.wake_proxies.pop(app_name, None)
+        if wake_proxy is not None:
+            wake_proxy.stop()
+            self.port_allocator.release(wake_proxy.port)
+        if record is not None:
+            print(f"[HibernationManager] Stopped managing {app_name}")
+        return record is not None
@@ -25,6 +25,8 @@ from collections import defaultdict, deque
 sys.path.append('/workspace/SD-LongNose/github_repo')
 from cloud_detection.cloud_detector import CloudDetector
 from cloud_detection.resource_assessor import ResourceAssessor
+from cloud_detection.metrics_collector import get_metrics_collector
+from running.app_accounting import AppUsageSample, get_app_accounting
 
 
 class ProcessStatus(Enum):
@@ -131,6 +133,11 @@ class ProcessTracker:
         self.app_processes: Dict[str, Set[int]] = defaultdict(set)
         self.process_lock = threading.RLock()
         
+        # Whole-tree accounting per app; apps launched elsewhere (e.g. by
+        # ScriptManager) are already registered and are not unregistered here
+        self.accounting = get_app_accounting()
+        self.accounted_apps: Set[str] = set()
+        
         # Monitoring configuration
         self.monitoring_active = False
         self.monitoring_thread = None
@@ -196,6 +203,9 @@ class ProcessTracker:
                 # Add to tracking
                 self.tracked_processes[pid] = process_info
                 self.app_processes[app_name].add(pid)
+                if not self.accounting.is_registered(app_name):
+                    self.accounting.register(app_name, pid)
+                    self.accounted_apps.add(app_name)
                 
                 # Start monitoring if not already active
                 if not self.monitoring_active:
@@ -231,6 +241,9 @@ class ProcessTracker:
                 self.app_processes[app_name].discard(pid)
                 if not self.app_processes[app_name]:
                     del self.app_processes[app_name]
+                    if app_name in self.accounted_apps:
+                        self.accounted_apps.discard(app_name)
+                        self.accounting.unregister(app_name)
             
             print(f"[ProcessTracker] Stopped tracking PID {pid}")
             return True
@@ -261,6 +274,31 @@ class ProcessTracker:
         return [self.tracked_processes[pid] for pid in app_pids 
                 if pid in self.tracked_processes]
     
+    def get_app_usage(self, app_name: str) -> Optional[AppUsageSample]:
+        """
+        Get the latest resource usage of an application's whole process tree.
+        
+        Args:
+            app_name: Name of the application
+        
+        Returns:
+            Optional[AppUsageSample]: Aggregated usage if the app is accounted
+        """
+        return self.accounting.get_latest(app_name)
+    
+    def get_app_usage_history(self, app_name: str, seconds: Optional[float] = None) -> List[AppUsageSample]:
+        """
+        Get the aggregated usage time series of an application.
+        
+        Args:
+            app_name: Name of the application
+            seconds: Only return samples from the last N seconds
+        
+        Returns:
+            List[AppUsageSample]: Samples, oldest first
+        """
+        return self.accounting.get_history(app_name, seconds)
+    
     def monitor_resources(self, pid: int) -> Optional[ResourceUsage]:
         """
         Get current resource usage for a specific process.
@@ -368,65 +406,68 @@ class ProcessTracker:
         """
         Get current system-wide metrics.
         
+        Values come from the shared metrics collector's latest snapshot, so
+        this never blocks on CPU sampling.
+        
         Returns:
             Dict[str, Any]: System metrics
         """
-        # CPU usage
-        cpu_percent = psutil.cpu_percent(interval=1)
-        cpu_count = psutil.cpu.cores_logical()
-        cpu_freq = psutil.cpu_freq()
-        
-        # Memory usage
-        memory = psutil.virtual_memory()
-        swap = psutil.swap_memory()
-        
-        # Disk usage
-        disk_usage = psutil.disk_usage('/')
-        
-        # Network stats
-        network = psutil.net_io_counters()
+        snapshot = get_metrics_collector().get_snapshot()
+        if snapshot is None:
+            return self.system_metrics
         
         metrics = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': snapshot.datetime.isoformat(),
             'cpu': {
-                'percent': cpu_percent,
-                'count': cpu_count,
-                'frequency': cpu_freq.current if cpu_freq else None
+                'percent': snapshot.cpu_percent,
+                'count': snapshot.cpu_count,
+                'frequency': snapshot.cpu_frequency
             },
             'memory': {
-                'total': memory.total,
-                'available': memory.available,
-                'percent': memory.percent,
-                'used': memory.used,
-                'free': memory.free
+                'total': snapshot.memory_total,
+                'available': snapshot.memory_available,
+                'percent': snapshot.memory_percent,
+                'used': snapshot.memory_used,
+                'free': snapshot.memory_free
             },
             'swap': {
-                'total': swap.total,
-                'used': swap.used,
-                'free': swap.free,
-                'percent': swap.percent
+                'total': snapshot.swap_total,
+                'used': snapshot.swap_used,
+                'free': snapshot.swap_free,
+                'percent': snapshot.swap_percent
             },
             'disk': {
-                'total': disk_usage.total,
-                'used': disk_usage.used,
-                'free': disk_usage.free,
-                'percent': (disk_usage.used / disk_usage.total) * 100
+                'total': snapshot.disk_total,
+                'used': snapshot.disk_used,
+                'free': snapshot.disk_free,
+                'percent': snapshot.disk_percent
             },
             'network': {
-                'bytes_sent': network.bytes_sent,
-                'bytes_recv': network.bytes_recv,
-                'packets_sent': network.packets_sent,
-                'packets_recv': network.packets_recv
+                'bytes_sent': snapshot.net_bytes_sent,
+                'bytes_recv': snapshot.net_bytes_recv,
+                'packets_sent': snapshot.net_packets_sent,
+                'packets_recv': snapshot.net_packets_recv
             },
             'processes': {
-                'total': len(psutil.pids()),
+                'total': snapshot.process_count,
                 'tracked': len(self.tracked_processes)
             }
         }
         
         # Add GPU metrics if available
-        if self.gpu_available:
-            metrics['gpu'] = self._get_system_gpu_usage()
+        if snapshot.gpus:
+            metrics['gpu'] = {
+                'devices': [{
+                    'index': gpu.index,
+                    'memory_total': gpu.memory_total,
+                    'memory_used': gpu.memory_used,
+                    'memory_free': gpu.memory_free,
+                    'memory_percent': gpu.memory_percent,
+                    'utilization': gpu.utilization,
+                    'temperature': gpu.temperature
+                } for gpu in snapshot.gpus],
+                'count': len(snapshot.gpus)
+            }
         
         # Update stored metrics
         self.system_metrics = metrics
@@ -476,36 +517,38 @@ class ProcessTracker:
                 'timestamp': datetime.now().isoformat()
             })
         
-        # Process-specific alerts
-        for pid, process_info in self.tracked_processes.items():
-            if process_info.resource_history:
-                latest_usage = process_info.resource_history[-1]
-                
-                # High CPU usage for individual process
-                if latest_usage.cpu_percent > 80.0:
-                    alerts.append({
-                        'type': 'process_cpu',
-                        'severity': 'medium',
-                        'message': f"Process {process_info.app_name or process_info.name} "
-                                 f"(PID {pid}) high CPU: {latest_usage.cpu_percent:.1f}%",
-                        'pid': pid,
-                        'app_name': process_info.app_name,
-                        'current': latest_usage.cpu_percent,
-                        'timestamp': datetime.now().isoformat()
-                    })
-                
-                # High memory usage for individual process
-                if latest_usage.memory_percent > 50.0:
-                    alerts.append({
-                        'type': 'process_memory',
-                        'severity': 'medium',
-                        'message': f"Process {process_info.app_name or process_info.name} "
-                                 f"(PID {pid}) high memory: {latest_usage.memory_percent:.1f}%",
-                        'pid': pid,
-                        'app_name': process_info.app_name,
-                        'current': latest_usage.memory_percent,
-                        'timestamp': datetime.now().isoformat()
-                    })
+        # Application alerts, measured over each app's whole process tree
+        for app_name in list(self.app_processes.keys()):
+            usage = self.accounting.get_latest(app_name)
+            if usage is None:
+                continue
+            root_pid = min(self.app_processes.get(app_name) or usage.pids)
+            
+            # High CPU usage for the application
+            if usage.cpu_percent > 80.0:
+                alerts.append({
+                    'type': 'app_cpu',
+                    'severity': 'medium',
+                    'message': f"App {app_name} ({usage.process_count} processes) "
+                             f"high CPU: {usage.cpu_percent:.1f}%",
+                    'pid': root_pid,
+                    'app_name': app_name,
+                    'current': usage.cpu_percent,
+                    'timestamp': datetime.now().isoformat()
+                })
+            
+            # High memory usage for the application
+            if usage.memory_percent > 50.0:
+                alerts.append({
+                    'type': 'app_memory',
+                    'severity': 'medium',
+                    'message': f"App {app_name} ({usage.process_count} processes) "
+                             f"high memory: {usage.memory_percent:.1f}%",
+                    'pid': root_pid,
+                    'app_name': app_name,
+                    'current': usage.memory_percent,
+                    'timestamp': datetime.now().isoformat()
+                })
         
         return alerts
     
@@ -515,6 +558,7 @@ class ProcessTracker:
             self.monitoring_active = True
             self.monitoring_thread = threading.Thread(
                 target=self._monitoring_loop,
+                name="ProcessTracker-monitor",
                 daemon=True
             )
             self.monitoring_thread.start()
@@ -540,11 +584,16 @@ class ProcessTracker:
                 
                 # Update resource usage for all tracked processes
                 with self.process_lock:
+                    app_usage = self.accounting.sample()
                     for pid, process_info in self.tracked_processes.items():
                         resource_usage = self.monitor_resources(pid)
                         if resource_usage:
                             process_info.resource_history.append(resource_usage)
                             process_info.last_update = datetime.now()
+                        
+                        usage = app_usage.get(process_info.app_name)
+                        if usage is not None and pid in usage.pids:
+                            process_info.children_pids = [p for p in usage.pids if p != pid]
                 
                 # Check for alerts
                 alerts = self.get_resource_alerts()
@@ -622,47 +671,6 @@ class ProcessTracker:
         except Exception:
             return {}
     
-    def _get_system_gpu_usage(self) -> Dict[str, Any]:
-        """Get system-wide GPU usage."""
-        if not self.gpu_available:
-            return {}
-        
-        try:
-            import pynvml
-            
-            device_count = pynvml.nvmlDeviceGetCount()
-            gpus = []
-            
-            for i in range(device_count):
-                handle = pynvml.nvmlDeviceGetHandleByIndex(i)
-                
-                # Get memory info
-                memory_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                
-                # Get utilization
-                utilization = pynvml.nvmlDeviceGetUtilizationRates(handle)
-                
-                # Get temperature
-                try:
-                    temperature = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
-                except:
-                    temperature = None
-                
-                gpus.append({
-                    'index': i,
-                    'memory_total': memory_info.total,
-                    'memory_used': memory_info.used,
-                    'memory_free': memory_info.free,
-                    'memory_percent': (memory_info.used / memory_info.total) * 100,
-                    'utilization': utilization.gpu,
-                    'temperature': temperature
-                })
-            
-            return {'devices': gpus, 'count': device_count}
-            
-        except Exception:
-            return {}
-    
     def _get_network_usage(self, pid: int) -> Dict[str, Any]:
         """Get network usage for a specific process."""
         try:
@@ -11,13 +11,16 @@ Version: 1.0.0
 """
 
 import os
+import re
 import sys
 import json
 import time
 import signal
+import socket
 import psutil
 import subprocess
 import threading
+from collections import deque
 from typing import Dict, List, Optional, Any, Tuple, Callable
 from dataclasses import dataclass, field, asdict
 from enum import Enum
@@ -32,6 +35,12 @@ from environment_management.variable_system import VariableSystem
 from environment_management.file_system import FileSystemManager
 from engine.state_manager import StateManager, ApplicationStatus
 from app_analysis.app_analyzer import AppAnalyzer
+from running.port_allocator import get_port_allocator
+from running.app_accounting import get_app_accounting
+from running.admission_control import get_admission_controller
+from running.hibernation import HibernationManager
+from cloud_detection.metrics_collector import get_metrics_collector
+from environment_management.tracing import traced
 
 
 class ApplicationRunningStatus(Enum):
@@ -72,12 +81,16 @@ class ProcessInfo:
     last_health_check: Optional[datetime] = None
     restart_count: int = 0
     max_restarts: int = 3
+    port: Optional[int] = None
+    ready_at: Optional[datetime] = None
+    launch_args: Dict[str, Any] = field(default_factory=dict)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert ProcessInfo to dictionary."""
         data = asdict(self)
         data['started_at'] = self.started_at.isoformat()
         data['last_health_check'] = self.last_health_check.isoformat() if self.last_health_check else None
+        data['ready_at'] = self.ready_at.isoformat() if self.ready_at else None
         data['status'] = self.status.value
         data['process_type'] = self.process_type.value
         return data
@@ -87,6 +100,7 @@ class ProcessInfo:
         """Create ProcessInfo from dictionary."""
         data['started_at'] = datetime.fromisoformat(data['started_at'])
         data['last_health_check'] = datetime.fromisoformat(data['last_health_check']) if data['last_health_check'] else None
+        data['ready_at'] = datetime.fromisoformat(data['ready_at']) if data.get('ready_at') else None
         data['status'] = ApplicationRunningStatus(data['status'])
         data['process_type'] = ProcessType(data['process_type'])
         return cls(**data)
@@ -98,10 +112,32 @@ class ScriptManager:
     
     This class provides comprehensive process management for Pinokio applications,
     including starting, stopping, monitoring, and daemon handling.
+    
+    Launches go through admission control against the app's learned RAM/VRAM
+    footprint, and an app counts as running once its port accepts
+    connections or its output announces the server, not after a fixed sleep.
+    With hibernation enabled, apps started on a port are stopped when idle
+    and started again by the first request to that port.
     """
     
-    def __init__(self, base_path: str = "/workspace/SD-LongNose"):
-        """Initialize the script manager."""
+    # Output lines that mean a web UI is serving
+    READY_PATTERNS = re.compile(
+        r"Running on (local )?URL|Uvicorn running on|Application startup complete|"
+        r"You can now view your Streamlit app|To create a public link|"
+        r"Serving Flask app|Listening on|Server started",
+        re.IGNORECASE
+    )
+    
+    def __init__(self, base_path: str = "/workspace/SD-LongNose",
+                 enable_hibernation: Optional[bool] = None):
+        """
+        Initialize the script manager.
+        
+        Args:
+            base_path: Base path of the installation
+            enable_hibernation: Hibernate idle apps (defaults to PINOKIO_HIBERNATION=1;
+                the idle timeout comes from PINOKIO_HIBERNATION_IDLE_TIMEOUT, in seconds)
+        """
         self.base_path = Path(base_path)
         self.github_repo_path = self.base_path / "github_repo"
         self.running_processes: Dict[str, ProcessInfo] = {}
@@ -115,6 +151,22 @@ class ScriptManager:
         self.file_system = FileSystemManager(base_path)
         self.app_analyzer = AppAnalyzer(base_path)
         
+        # Port leases shared with every other launcher on the host
+        self.port_allocator = get_port_allocator()
+        self.port_range = (7860, 7999)
+        
+        # Per-app CPU/memory/IO accounting over the whole process tree
+        self.accounting = get_app_accounting()
+        
+        # RAM/VRAM admission control with per-app footprints learned from past runs
+        self.admission = get_admission_controller(os.path.join(base_path, "state", "app_footprints.json"))
+        
+        # Readiness detection
+        self.startup_grace = 2.0  # seconds start_application waits for a readiness signal
+        self.readiness_timeout = 600.0  # seconds before an app without a signal is assumed up
+        self.output_tails: Dict[str, deque] = {}
+        self.ready_events: Dict[str, threading.Event] = {}
+        
         # Process monitoring
         self.monitoring_thread = None
         self.monitoring_active = False
@@ -129,6 +181,17 @@ class ScriptManager:
             'daemon_stopped': []
         }
         
+        # Idle apps are stopped and woken on demand, when enabled
+        if enable_hibernation is None:
+            enable_hibernation = os.environ.get('PINOKIO_HIBERNATION', '0') == '1'
+        self.hibernation: Optional[HibernationManager] = None
+        if enable_hibernation:
+            self.hibernation = HibernationManager(
+                self, idle_timeout=float(os.environ.get('PINOKIO_HIBERNATION_IDLE_TIMEOUT', '1800'))
+            )
+            self.add_event_handler('process_started', self._enable_hibernation)
+            self.add_event_handler('daemon_started', self._enable_hibernation)
+        
         # Initialize monitoring
         self._start_monitoring()
         
@@ -147,6 +210,7 @@ class ScriptManager:
             except Exception as e:
                 print(f"[ScriptManager] Error in event handler: {e}")
     
+    @traced("app.start", category="run", record_args=("app_name", "script_path", "daemon"))
     def start_application(self, app_name: str, script_path: str, 
                          daemon: bool = False, **kwargs) -> ProcessInfo:
         """
@@ -157,54 +221,86 @@ class ScriptManager:
             script_path: Path to the script to run
             daemon: Whether to run as daemon process
             **kwargs: Additional arguments for the application
+                (admission_timeout: seconds to wait in the admission queue
+                when the app does not fit yet, by default it fails at once;
+                force_admission: start even if the app does not fit)
         
         Returns:
             ProcessInfo: Information about the started process
+        
+        Raises:
+            AdmissionError: If the app does not fit in the remaining RAM/VRAM
         """
         print(f"[ScriptManager] Starting application: {app_name}")
+        admission_timeout = kwargs.pop('admission_timeout', None)
+        force_admission = kwargs.pop('force_admission', False)
         
         with self.process_lock:
-            # Check if already running
-            if app_name in self.running_processes:
-                existing_process = self.running_processes[app_name]
-                if self._is_process_alive(existing_process.pid):
-                    print(f"[ScriptManager] Application {app_name} is already running (PID: {existing_process.pid})")
-                    return existing_process
-                else:
-                    # Clean up dead process
-                    print(f"[ScriptManager] Cleaning up dead process for {app_name}")
-                    self._cleanup_process(app_name)
+            existing_process = self._get_live_process(app_name)
+            if existing_process:
+                return existing_process
             
             # Get application info from state manager
             app_state = self.state_manager.get_application_state(app_name)
-            if not app_state or app_state.status != ApplicationStatus.INSTALLED:
+            # Stopped apps start again (e.g. a hibernated app being woken)
+            if not app_state or app_state.status not in (ApplicationStatus.INSTALLED, ApplicationStatus.STOPPED):
                 raise RuntimeError(f"Application {app_name} is not installed or ready to run")
-            
-            # Get application profile for running requirements
-            app_profile = self.app_analyzer.analyze_application(app_state.installation_path)
+        
+        # Reserve the app's footprint, queueing (outside the process lock, so
+        # other apps can stop meanwhile) until it fits
+        self._ensure_footprint(app_name, app_state.installation_path)
+        self.admission.acquire(app_name, timeout=admission_timeout, force=force_admission)
+        
+        try:
+            return self._launch_admitted(app_name, script_path, app_state, daemon, **kwargs)
+        except Exception:
+            self.admission.release(app_name)
+            raise
+    
+    def _launch_admitted(self, app_name: str, script_path: str, app_state: Any,
+                         daemon: bool, **kwargs) -> ProcessInfo:
+        """Launch an application whose footprint has been admitted."""
+        with self.process_lock:
+            # Another caller may have started it while this one was queued
+            existing_process = self._get_live_process(app_name)
+            if existing_process:
+                return existing_process
             
             # Prepare environment
             env_path = self._prepare_environment(app_name, app_state.installation_path)
             
-            # Prepare command with variable substitution
-            command = self._prepare_command(script_path, app_name, **kwargs)
-            
-            # Set working directory
-            working_dir = str(app_state.installation_path)
+            # Reserve a port (a requested port is honoured when it is free)
+            port = self.port_allocator.allocate(
+                app_name, *self.port_range, preferred=kwargs.pop('port', None)
+            )
             
-            # Start the process
-            start_time = datetime.now()
+            try:
+                # Prepare command with variable substitution
+                command = self._prepare_command(script_path, app_name, port=port, **kwargs)
+                
+                # Set working directory
+                working_dir = str(app_state.installation_path)
+                
+                # Start the process
+                start_time = datetime.now()
+                
+                if daemon:
+                    # Start as daemon process
+                    process_info = self._start_daemon_process(
+                        app_name, command, working_dir, env_path, start_time, port
+                    )
+                else:
+                    # Start as regular process
+                    process_info = self._start_regular_process(
+                        app_name, command, working_dir, env_path, start_time, port
+                    )
+            except Exception:
+                self.port_allocator.release(port)
+                self.accounting.unregister(app_name)
+                raise
             
-            if daemon:
-                # Start as daemon process
-                process_info = self._start_daemon_process(
-                    app_name, command, working_dir, env_path, start_time
-                )
-            else:
-                # Start as regular process
-                process_info = self._start_regular_process(
-                    app_name, command, working_dir, env_path, start_time
-                )
+            # Kept so the app can be relaunched as it was (e.g. after hibernation)
+            process_info.launch_args = {'script_path': script_path, 'daemon': daemon, 'kwargs': dict(kwargs)}
             
             # Register process
             self.running_processes[app_name] = process_info
@@ -219,6 +315,43 @@ class ScriptManager:
             print(f"[ScriptManager] Started {app_name} with PID: {process_info.pid}")
             return process_info
     
+    def _enable_hibernation(self, process_info: ProcessInfo) -> None:
+        """Put a newly started app under hibernation management."""
+        if process_info.port is None:
+            return
+        try:
+            self.hibernation.enable(process_info.app_name)
+        except ValueError as e:
+            print(f"[ScriptManager] Not hibernating {process_info.app_name}: {e}")
+    
+    def _get_live_process(self, app_name: str) -> Optional[ProcessInfo]:
+        """Get the process of an app that is already running, cleaning up a dead one."""
+        if app_name in self.running_processes:
+            existing_process = self.running_processes[app_name]
+            if self._is_process_alive(existing_process.pid):
+                print(f"[ScriptManager] Application {app_name} is already running (PID: {existing_process.pid})")
+                return existing_process
+            
+            # Clean up dead process
+            print(f"[ScriptManager] Cleaning up dead process for {app_name}")
+            self._cleanup_process(app_name)
+        return None
+    
+    def _ensure_footprint(self, app_name: str, installation_path: Path) -> None:
+        """Seed an app's footprint from the profiler's estimate on its first launch."""
+        if self.admission.get_footprint(app_name) is not None:
+            return
+        
+        try:
+            analysis = self.app_analyzer.analyze_app(app_name, str(installation_path))
+            profile = analysis.app_profile
+            if profile:
+                self.admission.seed_footprint(
+                    app_name, profile.estimated_memory_mb, profile.estimated_gpu_memory_mb
+                )
+        except Exception as e:
+            print(f"[ScriptManager] Could not estimate footprint of {app_name}: {e}")
+    
     def stop_application(self, app_name: str, force: bool = False) -> bool:
         """
         Stop a running application.
@@ -234,6 +367,9 @@ class ScriptManager:
         
         with self.process_lock:
             if app_name not in self.running_processes:
+                # A hibernated app only holds its public port through the wake proxy
+                if self.hibernation is not None and self.hibernation.forget(app_name):
+                    return True
                 print(f"[ScriptManager] Application {app_name} is not running")
                 return False
             
@@ -255,6 +391,9 @@ class ScriptManager:
                     
                     # Remove from running processes
                     del self.running_processes[app_name]
+                    self._release_port(process_info)
+                    self.accounting.unregister(app_name)
+                    self.admission.release(app_name)
                     
                     # Emit event
                     event_name = 'daemon_stopped' if process_info.daemon else 'process_stopped'
@@ -294,6 +433,10 @@ class ScriptManager:
             original_command = process_info.command
             original_daemon = process_info.daemon
             
+            # Come back on the same port when it is still free
+            if process_info.port is not None:
+                kwargs.setdefault('port', process_info.port)
+            
             # Stop the application
             if not self.stop_application(app_name):
                 print(f"[ScriptManager] Failed to stop {app_name} for restart")
@@ -377,6 +520,20 @@ class ScriptManager:
         """
         return self.running_processes.get(app_name)
     
+    def get_recent_output(self, app_name: str, lines: int = 50) -> List[str]:
+        """
+        Get the last output lines of an application started by this manager.
+        
+        Args:
+            app_name: Name of the application
+            lines: Number of lines to return
+        
+        Returns:
+            List[str]: Output lines, oldest first
+        """
+        tail = self.output_tails.get(app_name)
+        return list(tail)[-lines:] if tail else []
+    
     def _prepare_environment(self, app_name: str, installation_path: Path) -> Optional[str]:
         """Prepare the environment for running the application."""
         # Check if app has virtual environment
@@ -405,12 +562,28 @@ class ScriptManager:
         
         return command
     
+    def _port_environment(self, port: Optional[int]) -> Dict[str, str]:
+        """Environment variables that point common web frameworks at the leased port."""
+        if port is None:
+            return {}
+        return {
+            'PORT': str(port),
+            'GRADIO_SERVER_PORT': str(port),
+            'STREAMLIT_SERVER_PORT': str(port)
+        }
+    
+    def _release_port(self, process_info: ProcessInfo) -> None:
+        """Release the port leased to a process."""
+        if process_info.port is not None:
+            self.port_allocator.release(process_info.port)
+    
     def _start_regular_process(self, app_name: str, command: str, 
                              working_dir: str, env_path: Optional[str],
-                             start_time: datetime) -> ProcessInfo:
+                             start_time: datetime, port: Optional[int] = None) -> ProcessInfo:
         """Start a regular (non-daemon) process."""
         # Prepare environment
         env = os.environ.copy()
+        env.update(self._port_environment(port))
         if env_path:
             if env_path.endswith('venv'):
                 # Virtual environment
@@ -428,8 +601,13 @@ class ScriptManager:
             env=env,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            preexec_fn=os.setsid  # Create new process group
+            preexec_fn=self.accounting.launch_hook(app_name)  # New process group, in the app's cgroup
         )
+        self.accounting.register(app_name, process.pid)
+        
+        # The lease now follows the app and is reclaimed when it exits
+        if port is not None:
+            self.port_allocator.assign(port, process.pid)
         
         # Create process info
         process_info = ProcessInfo(
@@ -441,29 +619,41 @@ class ScriptManager:
             status=ApplicationRunningStatus.STARTING,
             working_directory=working_dir,
             environment_path=env_path,
-            daemon=False
+            daemon=False,
+            port=port
         )
         
-        # Wait a moment to ensure process started successfully
-        time.sleep(2.0)
+        # Drain the app's output (a full pipe would stall it) and watch for readiness
+        tail = self.output_tails[app_name] = deque(maxlen=200)
+        ready_event = self.ready_events[app_name] = threading.Event()
+        readers = [
+            threading.Thread(
+                target=self._pump_output, args=(stream, tail, ready_event),
+                name=f"ScriptManager-output-{app_name}", daemon=True
+            )
+            for stream in (process.stdout, process.stderr)
+        ]
+        for reader in readers:
+            reader.start()
         
-        if process.poll() is None:
-            # Process is running
-            process_info.status = ApplicationRunningStatus.RUNNING
-        else:
+        if not self._wait_for_startup(process, process_info, ready_event):
             # Process failed to start
-            stdout, stderr = process.communicate()
-            print(f"[ScriptManager] Process failed to start: {stderr.decode()}")
-            raise RuntimeError(f"Failed to start {app_name}: {stderr.decode()}")
+            process.wait()
+            for reader in readers:
+                reader.join(timeout=1.0)
+            output = '\n'.join(list(tail)[-20:])
+            print(f"[ScriptManager] Process failed to start: {output}")
+            raise RuntimeError(f"Failed to start {app_name}: {output}")
         
         return process_info
     
     def _start_daemon_process(self, app_name: str, command: str,
                             working_dir: str, env_path: Optional[str],
-                            start_time: datetime) -> ProcessInfo:
+                            start_time: datetime, port: Optional[int] = None) -> ProcessInfo:
         """Start a daemon process."""
         # Prepare environment
         env = os.environ.copy()
+        env.update(self._port_environment(port))
         if env_path:
             if env_path.endswith('venv'):
                 # Virtual environment
@@ -482,8 +672,13 @@ class ScriptManager:
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
             stdin=subprocess.DEVNULL,
-            preexec_fn=os.setsid  # Create new process group
+            preexec_fn=self.accounting.launch_hook(app_name)  # New process group, in the app's cgroup
         )
+        self.accounting.register(app_name, process.pid)
+        
+        # The lease now follows the app and is reclaimed when it exits
+        if port is not None:
+            self.port_allocator.assign(port, process.pid)
         
         # Create process info
         process_info = ProcessInfo(
@@ -495,17 +690,99 @@ class ScriptManager:
             status=ApplicationRunningStatus.DAEMON,
             working_directory=working_dir,
             environment_path=env_path,
-            daemon=True
+            daemon=True,
+            port=port
         )
         
-        # Wait a moment to ensure daemon started successfully
-        time.sleep(3.0)
-        
-        if not self._is_process_alive(process.pid):
+        # Daemon output is discarded, so readiness comes from the port alone
+        if not self._wait_for_startup(process, process_info, threading.Event()):
             raise RuntimeError(f"Failed to start daemon {app_name}")
         
         return process_info
     
+    def _pump_output(self, stream, tail: deque, ready_event: threading.Event) -> None:
+        """Read an output stream line by line, keeping a tail and flagging readiness."""
+        try:
+            for raw_line in iter(stream.readline, b''):
+                line = raw_line.decode(errors='replace').rstrip()
+                tail.append(line)
+                if not ready_event.is_set() and self.READY_PATTERNS.search(line):
+                    ready_event.set()
+        except (OSError, ValueError):
+            pass
+        finally:
+            stream.close()
+    
+    def _is_port_open(self, port: Optional[int]) -> bool:
+        """Check whether something accepts connections on a local port."""
+        if port is None:
+            return False
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return True
+        except OSError:
+            return False
+    
+    def _wait_for_startup(self, process: subprocess.Popen, process_info: ProcessInfo,
+                          ready_event: threading.Event) -> bool:
+        """
+        Wait for a started process to signal readiness.
+        
+        Returns as soon as the port accepts connections or the output shows a
+        ready line. An app still loading after the startup grace period is
+        left STARTING and a watcher marks it running when the signal comes.
+        
+        Args:
+            process: Started process
+            process_info: Its process information
+            ready_event: Set by the output readers on a ready line
+        
+        Returns:
+            bool: False if the process exited during startup
+        """
+        deadline = time.monotonic() + self.startup_grace
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                return False
+            if ready_event.is_set() or self._is_port_open(process_info.port):
+                self._mark_ready(process_info)
+                return True
+            ready_event.wait(0.1)
+        
+        if process.poll() is not None:
+            return False
+        
+        threading.Thread(
+            target=self._watch_readiness, args=(process, process_info, ready_event),
+            name=f"ScriptManager-ready-{process_info.app_name}", daemon=True
+        ).start()
+        return True
+    
+    def _watch_readiness(self, process: subprocess.Popen, process_info: ProcessInfo,
+                         ready_event: threading.Event) -> None:
+        """Mark a slow-loading app ready once it signals, or after the readiness timeout."""
+        deadline = time.monotonic() + self.readiness_timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                return
+            if ready_event.is_set() or self._is_port_open(process_info.port):
+                self._mark_ready(process_info)
+                return
+            ready_event.wait(0.5)
+        
+        print(f"[ScriptManager] {process_info.app_name} gave no readiness signal "
+              f"within {self.readiness_timeout:.0f}s, assuming it is up")
+        self._mark_ready(process_info)
+    
+    def _mark_ready(self, process_info: ProcessInfo) -> None:
+        """Record that an app is serving."""
+        process_info.ready_at = datetime.now()
+        self.admission.mark_ready(process_info.app_name)
+        if process_info.status == ApplicationRunningStatus.STARTING:
+            process_info.status = ApplicationRunningStatus.RUNNING
+        print(f"[ScriptManager] {process_info.app_name} is ready after "
+              f"{(process_info.ready_at - process_info.started_at).total_seconds():.1f}s")
+    
     def _stop_process(self, pid: int, force: bool = False) -> bool:
         """Stop a process by PID."""
         try:
@@ -555,6 +832,9 @@ class ScriptManager:
             
             # Remove from running processes
             del self.running_processes[app_name]
+            self._release_port(process_info)
+            self.accounting.unregister(app_name)
+            self.admission.release(app_name)
             
             # Emit event
             self._emit_event('process_crashed', process_info)
@@ -595,6 +875,7 @@ class ScriptManager:
             self.monitoring_active = True
             self.monitoring_thread = threading.Thread(
                 target=self._monitoring_loop,
+                name="ScriptManager-monitor",
                 daemon=True
             )
             self.monitoring_thread.start()
@@ -615,38 +896,41 @@ class ScriptManager:
                 time.sleep(self.monitoring_interval)
     
     def _update_resource_usage(self) -> None:
-        """Update resource usage for all running processes."""
+        """Update resource usage for all running applications (whole process trees)."""
+        samples = self.accounting.sample()
+        gpu_memory_by_pid = get_metrics_collector().get_gpu_process_memory() if samples else {}
+        
         for app_name, process_info in self.running_processes.items():
-            try:
-                process = psutil.Process(process_info.pid)
-                
-                # Get resource usage
-                cpu_percent = process.cpu_percent()
-                memory_info = process.memory_info()
-                
-                # Update process info
-                process_info.resource_usage = {
-                    'cpu_percent': cpu_percent,
-                    'memory_rss': memory_info.rss,
-                    'memory_vms': memory_info.vms,
-                    'num_threads': process.num_threads(),
-                    'status': process.status(),
-                    'updated_at': datetime.now().isoformat()
-                }
-                
-                process_info.last_health_check = datetime.now()
-                
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                # Process is dead or inaccessible
+            usage = samples.get(app_name)
+            if usage is None:
+                # Process is dead or not accounted
                 continue
-            except Exception as e:
-                print(f"[ScriptManager] Error updating resource usage for {app_name}: {e}")
+            
+            gpu_memory = sum(gpu_memory_by_pid.get(pid, 0) for pid in usage.pids)
+            self.admission.observe(app_name, usage.memory_bytes, gpu_memory)
+            
+            process_info.children_pids = [pid for pid in usage.pids if pid != process_info.pid]
+            process_info.resource_usage = {
+                'cpu_percent': usage.cpu_percent,
+                'memory_rss': usage.memory_bytes,
+                'memory_percent': usage.memory_percent,
+                'io_read_bytes': usage.io_read_bytes,
+                'io_write_bytes': usage.io_write_bytes,
+                'gpu_memory': gpu_memory,
+                'process_count': usage.process_count,
+                'source': usage.source,
+                'updated_at': usage.timestamp.isoformat()
+            }
+            
+            process_info.last_health_check = datetime.now()
     
     def stop_monitoring(self) -> None:
         """Stop the monitoring thread."""
         self.monitoring_active = False
         if self.monitoring_thread and self.monitoring_thread.is_alive():
             self.monitoring_thread.join(timeout=5.0)
+        if self.hibernation is not None:
+            self.hibernation.stop_monitoring()
         print("[ScriptManager] Stopped process monitoring")
     
     def __del__(self):
@@ -11,26 +11,49 @@ Version: 1.0.0
 
 import os
 import sys
+import json
 import time
+import shlex
+import shutil
 import subprocess
 import tempfile
 import threading
+import socket
+import signal
+import sqlite3
+import urllib.error
+import urllib.request
+import http.server
 from pathlib import Path
+from types import SimpleNamespace
 from typing import List, Dict, Any
 import unittest
 
 # Import Phase 6 modules
 sys.path.append('/workspace/SD-LongNose/github_repo')
 from running.script_manager import ScriptManager, ApplicationRunningStatus
-from running.process_tracker import ProcessTracker, HealthStatus
+from running.process_tracker import ProcessTracker
 from running.daemon_manager import DaemonManager, DaemonStatus
-from running.health_monitor import HealthMonitor, HealthCheck, HealthCheckType
-from running.virtual_drive import VirtualDriveManager, DriveType, StorageMode
+from running.health_monitor import HealthMonitor, HealthCheck, HealthCheckType, HealthStatus
+from running.hibernation import HibernationManager, HibernationState, register_activity_source
+from running.admission_control import AdmissionController, AdmissionDecision, AdmissionError
+from running.port_allocator import get_port_allocator, PortAllocator
+from running.app_accounting import AppResourceAccounting
+from tunneling.routing_proxy import RoutingProxy
+from running.virtual_drive import VirtualDriveManager, DriveType, StorageMode, FileHashCache
 
 # Import previous phase modules for integration testing
 from engine.state_manager import StateManager, ApplicationStatus
 from environment_management.venv_manager import VirtualEnvironmentManager
 
+# The notebook's Pinokio controller lives in github_upload/modules, next to this repository
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))), 'github_upload', 'modules'))
+try:
+    from pinokio_controller import PinokioController, RPCError
+except ImportError:
+    PinokioController = None
+
 
 class TestPhase6Integration(unittest.TestCase):
     """Comprehensive integration tests for Phase 6."""
@@ -537,6 +560,607 @@ print("Daemon stopped")
         print("[TEST] ✅ Performance Requirements - PASSED")
 
 
+class _LocalAppLauncher:
+    """Stand-in for ScriptManager that runs apps as plain subprocesses on leased ports."""
+    
+    def __init__(self, app_dir: str):
+        self.app_dir = app_dir
+        self.processes: Dict[str, Any] = {}
+        self.port_allocator = get_port_allocator()
+    
+    def get_process_info(self, app_name: str):
+        return self.processes.get(app_name)
+    
+    def start_application(self, app_name: str, script_path: str, daemon: bool = False, **kwargs):
+        port = self.port_allocator.allocate(app_name, 7860, 7999, preferred=kwargs.pop('port', None))
+        env = dict(os.environ, PORT=str(port))
+        process = subprocess.Popen(shlex.split(script_path), cwd=self.app_dir, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.port_allocator.assign(port, process.pid)
+        info = SimpleNamespace(app_name=app_name, port=port, process=process, ready_at=None,
+                               resource_usage={}, launch_args={'script_path': script_path,
+                                                               'daemon': daemon, 'kwargs': dict(kwargs)})
+        self.processes[app_name] = info
+        deadline = time.monotonic() + 15
+        while time.monotonic() < deadline and info.ready_at is None:
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+                info.ready_at = time.time()
+            except OSError:
+                time.sleep(0.1)
+        return info
+    
+    def stop_application(self, app_name: str, force: bool = False) -> bool:
+        info = self.processes.pop(app_name, None)
+        if info is None:
+            return False
+        info.process.kill() if force else info.process.terminate()
+        info.process.wait(timeout=10)
+        self.port_allocator.release(info.port)
+        return True
+
+
+class TestHibernation(unittest.TestCase):
+    """Idle apps are hibernated behind a wake proxy and woken by requests."""
+    
+    APP_SCRIPT = '''
+import os
+import http.server
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"hello from the app"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+http.server.HTTPServer(("127.0.0.1", int(os.environ["PORT"])), Handler).serve_forever()
+'''
+    
+    def setUp(self):
+        """Write a small HTTP app to a scratch directory."""
+        self.base_path = tempfile.mkdtemp(prefix="pinokio_phase6_")
+        with open(os.path.join(self.base_path, "app.py"), "w") as f:
+            f.write(self.APP_SCRIPT)
+        self.command = f"{sys.executable} app.py"
+        self.app_name = "hibernation_test_app"
+        self.launcher = _LocalAppLauncher(self.base_path)
+        self.manager = HibernationManager(self.launcher, check_interval=3600.0, listen_host='127.0.0.1')
+    
+    def tearDown(self):
+        """Stop the app, its wake proxy and the manager."""
+        self.launcher.stop_application(self.app_name, force=True)
+        self.manager.forget(self.app_name)
+        self.manager.stop_monitoring()
+        shutil.rmtree(self.base_path, ignore_errors=True)
+    
+    def _get(self, port: int):
+        """Request the app's page, returning (status, body)."""
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=10) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+    
+    def test_hibernate_wake_page_and_resume(self):
+        """A hibernated app answers 503 on its port, wakes up and is served through the proxy."""
+        process_info = self.launcher.start_application(self.app_name, self.command)
+        public_port = process_info.port
+        self.manager.enable(self.app_name)
+        self.assertEqual(self._get(public_port), (200, b"hello from the app"))
+        
+        self.assertTrue(self.manager.hibernate(self.app_name))
+        self.assertIsNone(self.launcher.get_process_info(self.app_name))
+        
+        status, body = self._get(public_port)
+        self.assertEqual(status, 503)
+        self.assertIn(b"waking up", body)
+        
+        record = self.manager.get_record(self.app_name)
+        deadline = time.monotonic() + 30
+        while record.state != HibernationState.ACTIVE and time.monotonic() < deadline:
+            time.sleep(0.2)
+        self.assertEqual(record.state, HibernationState.ACTIVE)
+        
+        resumed = self.launcher.get_process_info(self.app_name)
+        self.assertNotEqual(resumed.port, public_port)
+        self.assertEqual(self._get(public_port), (200, b"hello from the app"))
+        self.assertEqual(self.manager.get_metrics()['resume_latency']['count'], 1)
+    
+    def test_routing_proxy_activity_counts(self):
+        """Requests seen by a routing proxy keep an app from looking idle."""
+        process_info = self.launcher.start_application(self.app_name, self.command)
+        record = self.manager.enable(self.app_name)
+        record.last_activity = time.time() - 3600
+        
+        proxy = RoutingProxy()
+        route = proxy.add_route(self.app_name, process_info.port)
+        route.last_request_at = time.time()
+        register_activity_source(proxy.get_port_activity)
+        
+        last_activity = self.manager._latest_activity(record, process_info, time.time())
+        self.assertEqual(last_activity, route.last_request_at)
+    
+    def test_script_manager_wiring(self):
+        """ScriptManager manages apps it starts only when hibernation is enabled."""
+        script_manager = ScriptManager(self.base_path, enable_hibernation=True)
+        try:
+            self.assertIsNotNone(script_manager.hibernation)
+            process_info = self.launcher.start_application(self.app_name, self.command)
+            script_manager.running_processes[self.app_name] = process_info
+            script_manager._emit_event('process_started', process_info)
+            record = script_manager.hibernation.get_record(self.app_name)
+            self.assertIsNotNone(record)
+            self.assertEqual(record.public_port, process_info.port)
+            del script_manager.running_processes[self.app_name]
+        finally:
+            script_manager.stop_monitoring()
+        
+        os.environ.pop('PINOKIO_HIBERNATION', None)
+        disabled = ScriptManager(self.base_path)
+        try:
+            self.assertIsNone(disabled.hibernation)
+        finally:
+            disabled.stop_monitoring()
+
+
+class _FixedMetrics:
+    """Metrics collector stand-in reporting a fixed amount of free RAM and no GPU."""
+    
+    def __init__(self, total_mb: int, available_mb: int):
+        self.snapshot = SimpleNamespace(memory_total=total_mb * 1024 * 1024,
+                                        memory_available=available_mb * 1024 * 1024, gpu=None)
+    
+    def get_snapshot(self, max_age=None):
+        return self.snapshot
+
+
+class TestAdmissionControl(unittest.TestCase):
+    """Footprint learning and queueing of the admission controller."""
+    
+    MB = 1024 * 1024
+    
+    def setUp(self):
+        """Create a controller over 4 GB of RAM with its profile in a scratch directory."""
+        self.base_path = tempfile.mkdtemp(prefix="pinokio_phase6_")
+        self.controller = AdmissionController(os.path.join(self.base_path, "footprints.json"),
+                                              memory_headroom=0.0, poll_interval=0.05)
+        self.controller.metrics_collector = _FixedMetrics(total_mb=4096, available_mb=4096)
+    
+    def tearDown(self):
+        shutil.rmtree(self.base_path, ignore_errors=True)
+    
+    def test_only_ready_runs_are_learned(self):
+        """A run that never became ready leaves the seeded footprint alone."""
+        self.controller.seed_footprint("app", 2048, 0)
+        
+        self.controller.acquire("app")
+        self.controller.observe("app", 100 * self.MB)
+        self.controller.release("app")
+        footprint = self.controller.get_footprint("app")
+        self.assertFalse(footprint.learned)
+        self.assertEqual(footprint.memory_bytes, 2048 * self.MB)
+        
+        self.controller.acquire("app")
+        self.controller.observe("app", 1500 * self.MB)
+        self.controller.mark_ready("app")
+        self.controller.release("app")
+        footprint = self.controller.get_footprint("app")
+        self.assertTrue(footprint.learned)
+        self.assertEqual(footprint.memory_bytes, 1500 * self.MB)
+    
+    def test_queueing_is_opt_in(self):
+        """Without a timeout a launch that would queue fails at once; with one it waits for room."""
+        self.controller.seed_footprint("big", 3000, 0)
+        self.controller.seed_footprint("second", 3000, 0)
+        self.controller.acquire("big")
+        
+        started = time.monotonic()
+        with self.assertRaises(AdmissionError) as raised:
+            self.controller.acquire("second")
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(raised.exception.result.decision, AdmissionDecision.QUEUE)
+        
+        threading.Timer(0.3, self.controller.release, args=("big",)).start()
+        result = self.controller.acquire("second", timeout=10.0)
+        self.assertEqual(result.decision, AdmissionDecision.ADMIT)
+        self.assertGreater(result.waited, 0.0)
+
+
+class TestPortAllocator(unittest.TestCase):
+    """Leases, cross-process locking and reclaiming of the port allocator."""
+    
+    START_PORT = 45100
+    END_PORT = 45119
+    
+    def setUp(self):
+        """Point an allocator at a scratch registry."""
+        self.base_path = tempfile.mkdtemp(prefix="pinokio_phase6_")
+        self.registry_path = os.path.join(self.base_path, "port_registry.json")
+        self.allocator = PortAllocator(self.registry_path, scan_interval=0.0)
+    
+    def tearDown(self):
+        shutil.rmtree(self.base_path, ignore_errors=True)
+    
+    def allocate(self, allocator: PortAllocator, app_name: str, **kwargs) -> int:
+        return allocator.allocate(app_name, self.START_PORT, self.END_PORT, **kwargs)
+    
+    def test_leases_are_shared_through_the_registry(self):
+        """Allocators over one registry never hand out a leased or listening port."""
+        other = PortAllocator(self.registry_path, scan_interval=0.0)
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            listener.bind(('', self.START_PORT))
+            listener.listen(1)
+            
+            first = self.allocate(self.allocator, "first")
+            second = self.allocate(other, "second")
+            
+            self.assertNotIn(self.START_PORT, (first, second))
+            self.assertNotEqual(first, second)
+            self.assertEqual(other.get_app_ports("first"), [first])
+            self.assertFalse(self.allocator.is_port_available(second))
+        finally:
+            listener.close()
+        
+        self.assertEqual(self.allocator.release_app("first"), [first])
+        self.assertTrue(other.release(second))
+        self.assertEqual(self.allocator.get_leases(), {})
+    
+    def test_separate_processes_get_distinct_ports(self):
+        """Concurrent allocations from several processes are serialized by the registry lock."""
+        script = (
+            "import sys, time\n"
+            "from running.port_allocator import PortAllocator\n"
+            "allocator = PortAllocator(sys.argv[1], scan_interval=0.0)\n"
+            "ports = [allocator.allocate('child', int(sys.argv[2]), int(sys.argv[3])) for _ in range(3)]\n"
+            "print(' '.join(map(str, ports)))\n"
+            "sys.stdout.flush()\n"
+            "time.sleep(5)\n"
+        )
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        children = [subprocess.Popen([sys.executable, "-c", script, self.registry_path,
+                                      str(self.START_PORT), str(self.END_PORT)],
+                                     cwd=repo_root, stdout=subprocess.PIPE, text=True)
+                    for _ in range(3)]
+        try:
+            ports = [self.allocate(self.allocator, "parent") for _ in range(3)]
+            for child in children:
+                ports.extend(int(port) for port in child.stdout.readline().split())
+            
+            self.assertEqual(len(ports), 12)
+            self.assertEqual(len(set(ports)), 12)
+            self.assertEqual(sorted(self.allocator.get_leases()), sorted(ports))
+        finally:
+            for child in children:
+                child.kill()
+                child.wait()
+                child.stdout.close()
+    
+    def test_leases_of_exited_processes_are_reclaimed(self):
+        """A port assigned to an app is free again once the app exits, not before."""
+        app = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            port = self.allocate(self.allocator, "app")
+            self.assertTrue(self.allocator.assign(port, app.pid))
+            
+            self.assertEqual(self.allocator.get_leases()[port].pid, app.pid)
+            self.assertFalse(self.allocator.claim(port, "intruder"))
+            self.assertNotEqual(self.allocate(self.allocator, "next"), port)
+        finally:
+            app.kill()
+            app.wait()
+        
+        self.assertNotIn(port, self.allocator.get_leases())
+        self.assertTrue(self.allocator.claim(port, "intruder"))
+        self.assertEqual(self.allocator.get_app_ports("intruder"), [port])
+
+
+class TestAppAccounting(unittest.TestCase):
+    """Process-tree accounting of an application's helpers."""
+    
+    # Holds 64 MB and keeps one core busy
+    WORKER = ("import time\n"
+              "ballast = bytearray(64 * 1024 * 1024)\n"
+              "end = time.time() + 30\n"
+              "while time.time() < end:\n"
+              "    pass\n")
+    
+    def setUp(self):
+        """Launch an app whose helpers include one orphaned by an exited parent."""
+        self.accounting = AppResourceAccounting(min_interval=0.0)
+        self.accounting.cgroups_available = False
+        
+        launcher = ("import subprocess, sys, time\n"
+                    "worker = sys.argv[1]\n"
+                    "direct = subprocess.Popen([sys.executable, '-c', worker])\n"
+                    "spawner = ('import subprocess, sys; '\n"
+                    "           'print(subprocess.Popen([sys.executable, \"-c\", sys.argv[1]]).pid)')\n"
+                    "subprocess.run([sys.executable, '-c', spawner, worker], check=True)\n"
+                    "print(direct.pid, flush=True)\n"
+                    "time.sleep(30)\n")
+        self.app = subprocess.Popen([sys.executable, "-c", launcher, self.WORKER],
+                                    stdout=subprocess.PIPE, text=True,
+                                    preexec_fn=self.accounting.launch_hook("tree_app"))
+        self.orphan_pid = int(self.app.stdout.readline())
+        self.direct_pid = int(self.app.stdout.readline())
+        self.accounting.register("tree_app", self.app.pid)
+    
+    def tearDown(self):
+        os.killpg(self.app.pid, signal.SIGKILL)
+        self.app.wait()
+        self.app.stdout.close()
+    
+    def test_whole_tree_is_accounted(self):
+        """Direct and orphaned helpers count towards the app, CPU as a delta between passes."""
+        # Give the workers time to allocate their ballast
+        time.sleep(0.5)
+        first = self.accounting.sample()["tree_app"]
+        self.assertEqual(first.source, 'proc')
+        self.assertEqual(first.cpu_percent, 0.0)
+        self.assertTrue({self.app.pid, self.direct_pid, self.orphan_pid} <= set(first.pids))
+        self.assertEqual(first.process_count, len(first.pids))
+        self.assertGreaterEqual(first.memory_bytes, 2 * 64 * 1024 * 1024)
+        
+        time.sleep(0.5)
+        second = self.accounting.sample()["tree_app"]
+        self.assertGreater(second.cpu_seconds, first.cpu_seconds)
+        self.assertGreater(second.cpu_percent, 50.0)
+        self.assertEqual(len(self.accounting.get_history("tree_app")), 2)
+    
+    def test_passes_are_shared_within_the_interval(self):
+        """Samples inside min_interval reuse the last pass; unregistered apps drop out."""
+        self.accounting.min_interval = 60.0
+        first = self.accounting.sample()["tree_app"]
+        self.assertIs(self.accounting.sample()["tree_app"], first)
+        self.assertIs(self.accounting.get_latest("tree_app"), first)
+        
+        self.accounting.unregister("tree_app")
+        self.assertFalse(self.accounting.is_registered("tree_app"))
+        self.assertEqual(self.accounting.sample(), {})
+
+
+class _FakePinokioServer:
+    """Minimal Pinokio JSON-RPC API served from a background thread."""
+    
+    def __init__(self, install_seconds: float = 0.0, batches: bool = True):
+        self.install_seconds = install_seconds
+        self.batches = batches
+        self.statuses: Dict[str, List[str]] = {}  # Reported in turn; the last one repeats
+        self.posts: List[Any] = []
+        self.active_installs = 0
+        self.max_active_installs = 0
+        self.lock = threading.Lock()
+        
+        fake = self
+        
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                self.reply(200, {"pinokio": True, "version": "test"})
+            
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with fake.lock:
+                    fake.posts.append(payload)
+                if not isinstance(payload, list):
+                    self.reply(200, fake.handle(payload))
+                elif fake.batches:
+                    self.reply(200, [fake.handle(call) for call in payload])
+                else:
+                    self.reply(400, {"error": "batch requests are not supported"})
+            
+            def reply(self, code, body):
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+        
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+    
+    def handle(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        method, params = call['method'], call.get('params') or {}
+        if method == 'app.install':
+            with self.lock:
+                self.active_installs += 1
+                self.max_active_installs = max(self.max_active_installs, self.active_installs)
+            time.sleep(self.install_seconds)
+            with self.lock:
+                self.active_installs -= 1
+            return {"jsonrpc": "2.0", "id": call['id'], "result": {"name": params['name']}}
+        if method == 'app.status':
+            with self.lock:
+                statuses = self.statuses.setdefault(params['name'], ['installed'])
+                status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+            return {"jsonrpc": "2.0", "id": call['id'], "result": {"status": status}}
+        return {"jsonrpc": "2.0", "id": call['id'], "error": {"code": -32601, "message": "Method not found"}}
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@unittest.skipIf(PinokioController is None, "github_upload/modules is not available")
+class TestPinokioControllerBatching(unittest.TestCase):
+    """Batched JSON-RPC, install polling and parallel tool installs."""
+    
+    def start(self, **kwargs) -> PinokioController:
+        """Start a fake server and a controller talking to it."""
+        self.server = _FakePinokioServer(**kwargs)
+        self.addCleanup(self.server.stop)
+        controller = PinokioController(tempfile.gettempdir(), api_port=self.server.port)
+        self.addCleanup(controller.session.close)
+        return controller
+    
+    def test_rpc_batch_keeps_order_and_errors(self):
+        """A batch is one request; a failed call comes back as its exception in place."""
+        controller = self.start()
+        
+        results = controller.rpc_batch([("app.status", {"name": "a"}), ("app.missing", None),
+                                        ("app.status", {"name": "b"})])
+        
+        self.assertEqual(results[0], {"status": "installed"})
+        self.assertIsInstance(results[1], RPCError)
+        self.assertEqual(results[1].code, -32601)
+        self.assertEqual(results[2], {"status": "installed"})
+        self.assertEqual(len(self.server.posts), 1)
+        self.assertEqual(len(self.server.posts[0]), 3)
+    
+    def test_rpc_batch_falls_back_without_batch_support(self):
+        """A server rejecting batches is remembered and served one call at a time."""
+        controller = self.start(batches=False)
+        calls = [("app.status", {"name": "a"}), ("app.status", {"name": "b"})]
+        
+        self.assertEqual(controller.rpc_batch(calls), [{"status": "installed"}] * 2)
+        self.assertFalse(controller.batch_supported)
+        self.assertEqual(controller.rpc_batch(calls), [{"status": "installed"}] * 2)
+        self.assertEqual([isinstance(post, list) for post in self.server.posts], [True] + [False] * 4)
+    
+    def test_wait_for_installs_polls_pending_apps_together(self):
+        """Pending apps share one poll; failures and timeouts are reported as False."""
+        controller = self.start()
+        self.server.statuses = {
+            "done": ["installing", "installing", "installed"],
+            "broken": ["installing", "failed"],
+            "stuck": ["installing"],
+        }
+        
+        finished = controller.wait_for_installs(["done", "broken", "stuck"], timeout=1.0,
+                                                initial_delay=0.05, max_delay=0.1)
+        
+        self.assertEqual(finished, {"done": True, "broken": False, "stuck": False})
+        self.assertEqual(len(self.server.posts[0]), 3)
+        polled = [[call['params']['name'] for call in (post if isinstance(post, list) else [post])]
+                  for post in self.server.posts]
+        self.assertEqual(polled[1], ["done", "broken", "stuck"])
+        self.assertEqual(polled[2], ["done", "stuck"])
+        self.assertTrue(all(names == ["stuck"] for names in polled[3:]))
+    
+    def test_install_popular_tools_parallel_is_opt_in(self):
+        """Tools install one at a time unless parallel installs are requested."""
+        tools = ["comfyui", "fooocus", "invokeai"]
+        
+        controller = self.start(install_seconds=0.3)
+        results = controller.install_popular_tools(tools)
+        self.assertEqual(list(results), tools)
+        self.assertTrue(all(results[name].name == name for name in tools))
+        self.assertEqual(self.server.max_active_installs, 1)
+        
+        controller = self.start(install_seconds=0.3)
+        started = time.monotonic()
+        results = controller.install_popular_tools(tools, parallel=True, max_workers=3)
+        self.assertLess(time.monotonic() - started, 0.8)
+        self.assertEqual(self.server.max_active_installs, 3)
+        self.assertEqual(list(results), tools)
+        self.assertTrue(all(results[name] is not None for name in tools))
+
+
+class TestVirtualDriveSync(unittest.TestCase):
+    """Hash cache and incremental mounts of the virtual drive manager."""
+    
+    def setUp(self):
+        """Create a scratch directory for drives and trees."""
+        self.base_path = Path(tempfile.mkdtemp(prefix="pinokio_phase6_"))
+        self.db_path = self.base_path / "hash_cache.db"
+    
+    def tearDown(self):
+        shutil.rmtree(self.base_path, ignore_errors=True)
+    
+    def _write(self, relative_path: str, content: bytes) -> Path:
+        path = self.base_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        return path
+    
+    def _persisted_rows(self) -> int:
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            return conn.execute('SELECT COUNT(*) FROM hash_cache').fetchone()[0]
+        finally:
+            conn.close()
+    
+    def test_hash_cache_hit_and_miss(self):
+        """A digest is reused until the file's size or mtime changes, also after a reload."""
+        model = self._write("model.bin", b"weights" * 1000)
+        cache = FileHashCache(self.db_path)
+        
+        digest = cache.get_digest(model)
+        self.assertEqual(cache.get_digest(model), digest)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        
+        # Same content, new mtime
+        st = model.stat()
+        os.utime(model, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(cache.get_entry(model))
+        self.assertEqual(cache.get_digest(model), digest)
+        self.assertEqual(cache.misses, 2)
+        
+        # New size
+        with open(model, "ab") as f:
+            f.write(b"more")
+        self.assertNotEqual(cache.get_digest(model), digest)
+        self.assertEqual(cache.misses, 3)
+        
+        reloaded = FileHashCache(self.db_path)
+        self.assertIsNotNone(reloaded.get_entry(model))
+        reloaded.get_digest(model)
+        self.assertEqual((reloaded.hits, reloaded.misses), (1, 0))
+    
+    def test_hash_cache_batches_writes(self):
+        """Entries recorded in a batch are persisted together when it ends."""
+        files = [self._write(f"file{index}.bin", bytes([index]) * 100) for index in range(5)]
+        cache = FileHashCache(self.db_path)
+        
+        with cache.batch():
+            with cache.batch():
+                for path in files:
+                    cache.get_digest(path)
+            self.assertEqual(self._persisted_rows(), 0)
+            self.assertEqual(len(cache.pending_rows), 5)
+        
+        self.assertEqual(self._persisted_rows(), 5)
+        self.assertEqual(cache.pending_rows, {})
+    
+    def test_sync_tree_touches_only_changed_files(self):
+        """A second sync replaces the changed file, drops the deleted one and leaves the rest alone."""
+        manager = VirtualDriveManager(str(self.base_path))
+        source = self.base_path / "source"
+        target = self.base_path / "target"
+        self._write("source/keep.txt", b"keep")
+        self._write("source/nested/also_keep.txt", b"also keep")
+        self._write("source/change.txt", b"old")
+        self._write("source/delete.txt", b"gone soon")
+        
+        stats = manager._sync_tree(source, target, manager._reflink_or_copy)
+        self.assertEqual(stats, {'placed': 4, 'unchanged': 0, 'removed': 0})
+        kept = {name: os.lstat(target / name) for name in ("keep.txt", "nested/also_keep.txt")}
+        
+        self._write("source/change.txt", b"new content")
+        (source / "delete.txt").unlink()
+        
+        stats = manager._sync_tree(source, target, manager._reflink_or_copy)
+        self.assertEqual(stats, {'placed': 1, 'unchanged': 2, 'removed': 1})
+        self.assertEqual((target / "change.txt").read_bytes(), b"new content")
+        self.assertFalse((target / "delete.txt").exists())
+        for name, before in kept.items():
+            after = os.lstat(target / name)
+            self.assertEqual((after.st_ino, after.st_mtime_ns, after.st_ctime_ns),
+                             (before.st_ino, before.st_mtime_ns, before.st_ctime_ns))
+        
+        stats = manager._sync_tree(source, target, manager._reflink_or_copy)
+        self.assertEqual(stats, {'placed': 0, 'unchanged': 3, 'removed': 0})
+
+
 def run_phase6_tests():
     """Run all Phase 6 tests."""
     print("=" * 60)
@@ -545,6 +1169,12 @@ def run_phase6_tests():
     
     # Create test suite
     suite = unittest.TestLoader().loadTestsFromTestCase(TestPhase6Integration)
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestHibernation))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestAdmissionControl))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestPortAllocator))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestAppAccounting))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestPinokioControllerBatching))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestVirtualDriveSync))
     
     # Run tests with detailed output
     runner = unittest.TextTestRunner(verbosity=2, stream=sys.stdout)
@@ -12,10 +12,14 @@ Version: 1.0.0
 
 import os
 import sys
+import mmap
+import zlib
+import errno
 import shutil
 import hashlib
 import threading
-from typing import Dict, List, Optional, Any, Tuple, Set
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Tuple, Set, Callable, Iterator
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from pathlib import Path
@@ -23,12 +27,18 @@ from datetime import datetime
 import sqlite3
 import json
 
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; reflinks are simply not attempted
+    fcntl = None
+
 # Import previous phase modules
 sys.path.append('/workspace/SD-LongNose/github_repo')
 from environment_management.file_system import FileSystemManager
 from environment_management.json_handler import JSONHandler
 from cloud_detection.cloud_detector import CloudDetector
-from cloud_detection.platform_configs import PlatformConfigurationuration
+from cloud_detection.platform_configs import PlatformConfigurationManager, CloudPlatform as ConfigPlatform
 
 
 class DriveType(Enum):
@@ -117,14 +127,303 @@ class FileEntry:
         return cls(**data)
 
 
+@dataclass
+class HashCacheEntry:
+    """Cached digests of a file, valid while its size and mtime are unchanged."""
+    size_bytes: int
+    mtime_ns: int
+    prehash: str
+    digest: Optional[str] = None
+
+
+class FileHashCache:
+    """
+    Persistent (device, inode, size, mtime) -> digest cache.
+    
+    Entries are keyed by inode, so every hard link of a deduplicated file
+    shares one entry, and are only trusted while size and mtime match the
+    file on disk. Each entry also keeps a cheap non-cryptographic pre-hash
+    (CRC32 of the size and three sampled blocks) that tells whether a new
+    file can possibly duplicate a stored one before it is fully hashed.
+    
+    Entries recorded inside ``batch()`` are written to SQLite in a single
+    transaction when the outermost batch ends.
+    """
+    
+    PREHASH_SAMPLE_BYTES = 64 * 1024
+    HASH_BUFFER_BYTES = 1024 * 1024
+    MMAP_THRESHOLD_BYTES = 16 * 1024 * 1024
+    
+    def __init__(self, db_path: Path):
+        """
+        Initialize the hash cache.
+        
+        Args:
+            db_path: SQLite database the cache is persisted in
+        """
+        self.db_path = db_path
+        self.cache_lock = threading.Lock()
+        self.entries: Dict[Tuple[int, int], HashCacheEntry] = {}
+        self.digests_by_prehash: Dict[Tuple[int, str], Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.bytes_hashed = 0
+        
+        # Entries waiting to be written while a batch is open
+        self.batch_depth = 0
+        self.pending_rows: Dict[Tuple[int, int], Tuple[int, int, int, int, str, Optional[str]]] = {}
+        
+        self._load()
+    
+    def get_entry(self, file_path: Path, stat_result: Optional[os.stat_result] = None) -> Optional[HashCacheEntry]:
+        """
+        Get the cached entry for a file if it is still valid.
+        
+        Args:
+            file_path: Path to the file
+            stat_result: Optional stat of the file, to avoid another stat call
+        
+        Returns:
+            Optional[HashCacheEntry]: Valid cache entry, if any
+        """
+        st = stat_result or os.stat(file_path)
+        with self.cache_lock:
+            entry = self.entries.get((st.st_dev, st.st_ino))
+        if entry and entry.size_bytes == st.st_size and entry.mtime_ns == st.st_mtime_ns:
+            return entry
+        return None
+    
+    def get_prehash(self, file_path: Path, stat_result: Optional[os.stat_result] = None) -> str:
+        """
+        Get the pre-hash of a file, computing and caching it on a miss.
+        
+        Args:
+            file_path: Path to the file
+            stat_result: Optional stat of the file
+        
+        Returns:
+            str: Pre-hash of the file
+        """
+        st = stat_result or os.stat(file_path)
+        entry = self.get_entry(file_path, st)
+        if entry:
+            return entry.prehash
+        
+        prehash = self._calculate_prehash(file_path, st.st_size)
+        self.record(st, prehash)
+        return prehash
+    
+    def get_digest(self, file_path: Path, stat_result: Optional[os.stat_result] = None) -> str:
+        """
+        Get the SHA-256 digest of a file, hashing it only on a cache miss.
+        
+        Args:
+            file_path: Path to the file
+            stat_result: Optional stat of the file
+        
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        st = stat_result or os.stat(file_path)
+        entry = self.get_entry(file_path, st)
+        if entry and entry.digest:
+            self.hits += 1
+            return entry.digest
+        
+        self.misses += 1
+        prehash = entry.prehash if entry else self._calculate_prehash(file_path, st.st_size)
+        digest = self._calculate_digest(file_path, st.st_size)
+        self.record(st, prehash, digest)
+        return digest
+    
+    def get_candidates(self, size_bytes: int, prehash: str) -> Set[str]:
+        """
+        Get the known digests of files with the same size and pre-hash.
+        
+        Args:
+            size_bytes: File size
+            prehash: File pre-hash
+        
+        Returns:
+            Set[str]: Digests a file with this size and pre-hash could have
+        """
+        with self.cache_lock:
+            return set(self.digests_by_prehash.get((size_bytes, prehash), ()))
+    
+    def record(self, stat_result: os.stat_result, prehash: str, digest: Optional[str] = None) -> None:
+        """
+        Record the digests of a file and persist them.
+        
+        Inside a batch the entry is only queued; it is written when the
+        batch ends.
+        
+        Args:
+            stat_result: Stat of the file the digests were computed from
+            prehash: File pre-hash
+            digest: Optional SHA-256 digest
+        """
+        st = stat_result
+        key = (st.st_dev, st.st_ino)
+        entry = HashCacheEntry(st.st_size, st.st_mtime_ns, prehash, digest)
+        with self.cache_lock:
+            self.entries[key] = entry
+            if digest:
+                self.digests_by_prehash.setdefault((st.st_size, prehash), set()).add(digest)
+            self.pending_rows[key] = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, prehash, digest)
+            batching = self.batch_depth > 0
+        
+        if not batching:
+            self.flush()
+    
+    @contextmanager
+    def batch(self) -> Iterator['FileHashCache']:
+        """
+        Defer persisting recorded entries until the outermost batch ends.
+        
+        Yields:
+            FileHashCache: This cache
+        """
+        with self.cache_lock:
+            self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self.cache_lock:
+                self.batch_depth -= 1
+                done = self.batch_depth == 0
+            if done:
+                self.flush()
+    
+    def flush(self) -> int:
+        """
+        Write all queued entries in one transaction.
+        
+        Returns:
+            int: Number of entries written
+        """
+        with self.cache_lock:
+            rows = list(self.pending_rows.values())
+            self.pending_rows.clear()
+        if not rows:
+            return 0
+        
+        try:
+            conn = sqlite3.connect(str(self.db_path))
+            with conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO hash_cache
+                    (device, inode, size_bytes, mtime_ns, prehash, digest)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', rows)
+            conn.close()
+            return len(rows)
+        except Exception as e:
+            print(f"[FileHashCache] Error persisting hash cache entries: {e}")
+            return 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hash cache statistics.
+        
+        Returns:
+            Dict[str, Any]: Entry count, hit/miss counts and bytes hashed
+        """
+        with self.cache_lock:
+            entry_count = len(self.entries)
+        return {
+            'entries': entry_count,
+            'hits': self.hits,
+            'misses': self.misses,
+            'bytes_hashed': self.bytes_hashed
+        }
+    
+    def _load(self) -> None:
+        """Create the cache table and load its entries."""
+        try:
+            conn = sqlite3.connect(str(self.db_path))
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS hash_cache (
+                    device INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    prehash TEXT NOT NULL,
+                    digest TEXT,
+                    PRIMARY KEY (device, inode)
+                )
+            ''')
+            conn.commit()
+            
+            for device, inode, size_bytes, mtime_ns, prehash, digest in cursor.execute(
+                    'SELECT device, inode, size_bytes, mtime_ns, prehash, digest FROM hash_cache'):
+                self.entries[(device, inode)] = HashCacheEntry(size_bytes, mtime_ns, prehash, digest)
+                if digest:
+                    self.digests_by_prehash.setdefault((size_bytes, prehash), set()).add(digest)
+            
+            conn.close()
+            
+        except Exception as e:
+            print(f"[FileHashCache] Error loading hash cache: {e}")
+    
+    def _calculate_prehash(self, file_path: Path, size_bytes: int) -> str:
+        """Calculate the CRC32 of the size and the first, middle and last blocks."""
+        sample = self.PREHASH_SAMPLE_BYTES
+        checksum = zlib.crc32(str(size_bytes).encode())
+        
+        with open(file_path, "rb") as f:
+            if size_bytes <= 3 * sample:
+                checksum = zlib.crc32(f.read(), checksum)
+            else:
+                for offset in (0, (size_bytes - sample) // 2, size_bytes - sample):
+                    f.seek(offset)
+                    checksum = zlib.crc32(f.read(sample), checksum)
+        
+        return f"{checksum:08x}"
+    
+    def _calculate_digest(self, file_path: Path, size_bytes: int) -> str:
+        """Calculate the SHA-256 of a file, memory-mapping large files."""
+        sha256_hash = hashlib.sha256()
+        
+        with open(file_path, "rb") as f:
+            if size_bytes >= self.MMAP_THRESHOLD_BYTES:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        sha256_hash.update(mapped)
+                    self.bytes_hashed += size_bytes
+                    return sha256_hash.hexdigest()
+                except (OSError, ValueError):
+                    # Not mappable (e.g. some network filesystems)
+                    sha256_hash = hashlib.sha256()
+                    f.seek(0)
+            
+            buffer = bytearray(self.HASH_BUFFER_BYTES)
+            view = memoryview(buffer)
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                sha256_hash.update(view[:read])
+                self.bytes_hashed += read
+        
+        return sha256_hash.hexdigest()
+
+
 class VirtualDriveManager:
     """
     Creates virtual storage that applications can share.
     
     This class provides comprehensive virtual drive management with file sharing,
     deduplication, symbolic linking, and intelligent storage optimization.
+    
+    Mounts are incremental: the app's link tree is diffed against the drive
+    and only new, changed or removed files are touched, so remounting a warm
+    drive costs a directory walk.
     """
     
+    # Linux ioctl that clones a file's extents (btrfs, XFS, bcachefs, ...)
+    FICLONE = 0x40049409
+    
     def __init__(self, base_path: str = "/workspace/SD-LongNose"):
         """Initialize the virtual drive manager."""
         self.base_path = Path(base_path)
@@ -143,6 +442,9 @@ class VirtualDriveManager:
         self.active_drives: Dict[str, VirtualDrive] = {}
         self.drive_lock = threading.RLock()
         
+        # (source device, target device) pairs that rejected a reflink
+        self.reflink_unsupported: Set[Tuple[int, int]] = set()
+        
         # Initialize dependencies
         self.file_system = FileSystemManager(str(self.base_path))
         self.json_handler = JSONHandler(str(self.base_path))
@@ -150,10 +452,16 @@ class VirtualDriveManager:
         
         # Cloud platform information
         self.platform_info = self.cloud_detector.detect_platform()
-        self.platform_config = PlatformConfiguration.get_config(self.platform_info.platform)
+        # platform_configs keeps its own CloudPlatform enum with the same values
+        try:
+            config_platform = ConfigPlatform(self.platform_info.platform.value)
+        except ValueError:
+            config_platform = None
+        self.platform_config = PlatformConfigurationManager().get_config(config_platform)
         
         # Initialize database
         self._init_database()
+        self.hash_cache = FileHashCache(self.db_path)
         
         # Load existing drives
         self._load_existing_drives()
@@ -242,26 +550,26 @@ class VirtualDriveManager:
             
             app_mount_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Create mount based on storage mode
-            if virtual_drive.storage_mode == StorageMode.SYMLINK:
-                # Create symbolic link
-                if app_mount_path.exists():
-                    app_mount_path.unlink()
-                app_mount_path.symlink_to(virtual_drive.base_path)
-            
-            elif virtual_drive.storage_mode == StorageMode.COPY:
-                # Copy entire drive contents
-                if app_mount_path.exists():
-                    shutil.rmtree(app_mount_path)
-                shutil.copytree(virtual_drive.base_path, app_mount_path)
-            
-            elif virtual_drive.storage_mode == StorageMode.HARDLINK:
-                # Create hard links for all files
-                self._create_hardlink_mount(virtual_drive.base_path, app_mount_path)
-            
-            elif virtual_drive.storage_mode == StorageMode.DEDUPLICATED:
-                # Create deduplicated mount
-                self._create_dedup_mount(virtual_drive, app_mount_path, app_name)
+            # Create mount based on storage mode, persisting hash cache entries once
+            with self.hash_cache.batch():
+                if virtual_drive.storage_mode == StorageMode.SYMLINK:
+                    # Create symbolic link, keeping one that is already correct
+                    if not (app_mount_path.is_symlink() and
+                            os.readlink(app_mount_path) == str(virtual_drive.base_path)):
+                        self._remove_path(app_mount_path)
+                        app_mount_path.symlink_to(virtual_drive.base_path)
+                
+                elif virtual_drive.storage_mode == StorageMode.COPY:
+                    # Copy changed drive contents, cloning extents where possible
+                    self._sync_tree(virtual_drive.base_path, app_mount_path, self._reflink_or_copy)
+                
+                elif virtual_drive.storage_mode == StorageMode.HARDLINK:
+                    # Create hard links for all files
+                    self._create_hardlink_mount(virtual_drive.base_path, app_mount_path)
+                
+                elif virtual_drive.storage_mode == StorageMode.DEDUPLICATED:
+                    # Create deduplicated mount
+                    self._create_dedup_mount(virtual_drive, app_mount_path, app_name)
             
             # Update drive information
             virtual_drive.mounted_apps.add(app_name)
@@ -354,9 +662,10 @@ class VirtualDriveManager:
                 print(f"[VirtualDriveManager] No model files found in {source_app}")
                 return False
             
-            # Add model files to shared drive
-            for model_file in model_files:
-                self._add_file_to_drive(models_drive, model_file, source_app)
+            # Add model files to shared drive, persisting hash cache entries once
+            with self.hash_cache.batch():
+                for model_file in model_files:
+                    self._add_file_to_drive(models_drive, model_file, source_app)
             
             # Mount shared drive for target app
             self.mount_drive_for_app(target_app, models_drive.drive_id)
@@ -615,33 +924,36 @@ class VirtualDriveManager:
                              source_path: Path, app_name: str) -> bool:
         """Add a file to a deduplicated drive."""
         try:
-            # Calculate file hash
-            file_hash = self._calculate_file_hash(source_path)
+            source_stat = source_path.stat()
+            entry = self.hash_cache.get_entry(source_path, source_stat)
+            
+            if entry and entry.digest:
+                file_hash = entry.digest
+                self.hash_cache.hits += 1
+            else:
+                # Only pay for a full hash up front if a stored file could match
+                prehash = self.hash_cache.get_prehash(source_path, source_stat)
+                candidates = self.hash_cache.get_candidates(source_stat.st_size, prehash)
+                if any(self._dedup_path(digest).exists() for digest in candidates):
+                    file_hash = self.hash_cache.get_digest(source_path, source_stat)
+                else:
+                    file_hash = self._store_in_dedup(source_path, source_stat, prehash)
             
             # Check if file already exists in dedup storage
-            dedup_file_path = self.dedup_storage_path / file_hash[:2] / file_hash
+            dedup_file_path = self._dedup_path(file_hash)
             
             if not dedup_file_path.exists():
-                # Store file in dedup storage
-                dedup_file_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(source_path, dedup_file_path)
+                self._store_in_dedup(source_path, source_stat)
             
-            # Create link in virtual drive
+            # Create link in virtual drive: hard link if possible, otherwise symlink
             drive_file_path = virtual_drive.base_path / source_path.name
-            
-            # Create hard link if possible, otherwise symlink
-            try:
-                if drive_file_path.exists():
-                    drive_file_path.unlink()
-                drive_file_path.hardlink_to(dedup_file_path)
-            except OSError:
-                # Fall back to symlink
-                drive_file_path.symlink_to(dedup_file_path)
+            if not self._is_current(dedup_file_path, dedup_file_path.stat(), drive_file_path):
+                self._place_file(dedup_file_path, drive_file_path, self._hardlink_or_symlink)
             
             # Update database
             self._update_file_entry_in_db(
                 file_hash, str(source_path), str(dedup_file_path),
-                source_path.stat().st_size, app_name
+                source_stat.st_size, app_name
             )
             
             # Update drive stats
@@ -654,55 +966,244 @@ class VirtualDriveManager:
             return False
     
     def _create_hardlink_mount(self, source_path: Path, target_path: Path) -> None:
-        """Create hard link mount."""
-        if target_path.exists():
-            shutil.rmtree(target_path)
-        
-        target_path.mkdir(parents=True)
-        
-        # Create hard links for all files
-        for source_file in source_path.rglob('*'):
-            if source_file.is_file():
-                relative_path = source_file.relative_to(source_path)
-                target_file = target_path / relative_path
-                target_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                try:
-                    target_file.hardlink_to(source_file)
-                except OSError:
-                    # Fall back to copy if hard link fails
-                    shutil.copy2(source_file, target_file)
+        """Create or update a hard link mount."""
+        self._sync_tree(source_path, target_path, self._hardlink_or_copy)
     
     def _create_dedup_mount(self, virtual_drive: VirtualDrive,
                           target_path: Path, app_name: str) -> None:
-        """Create deduplicated mount."""
-        if target_path.exists():
-            shutil.rmtree(target_path)
-        
-        target_path.mkdir(parents=True)
-        
-        # Create links to deduplicated files
-        for drive_file in virtual_drive.base_path.rglob('*'):
-            if drive_file.is_file():
-                relative_path = drive_file.relative_to(virtual_drive.base_path)
-                target_file = target_path / relative_path
-                target_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                try:
-                    target_file.hardlink_to(drive_file)
-                except OSError:
-                    # Fall back to symlink
-                    target_file.symlink_to(drive_file)
+        """Create or update a deduplicated mount."""
+        self._sync_tree(virtual_drive.base_path, target_path, self._hardlink_or_symlink)
     
     def _calculate_file_hash(self, file_path: Path) -> str:
-        """Calculate SHA-256 hash of a file."""
-        sha256_hash = hashlib.sha256()
+        """Calculate SHA-256 hash of a file, using the stat cache."""
+        return self.hash_cache.get_digest(file_path)
+    
+    def _dedup_path(self, file_hash: str) -> Path:
+        """Get the dedup storage path of a digest."""
+        return self.dedup_storage_path / file_hash[:2] / file_hash
+    
+    def _store_in_dedup(self, source_path: Path, source_stat: os.stat_result,
+                        prehash: Optional[str] = None) -> str:
+        """
+        Store a file in dedup storage, reading it only once.
         
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(chunk)
+        The file is reflinked and hashed where the filesystem supports it,
+        otherwise hashed while it is copied.
         
-        return sha256_hash.hexdigest()
+        Args:
+            source_path: File to store
+            source_stat: Stat of the file
+            prehash: Optional pre-hash of the file, if already known
+        
+        Returns:
+            str: SHA-256 digest of the stored file
+        """
+        incoming_path = self.dedup_storage_path / f".incoming-{os.getpid()}-{threading.get_ident()}"
+        
+        try:
+            if self._reflink(source_path, incoming_path):
+                file_hash = self.hash_cache.get_digest(source_path, source_stat)
+            else:
+                sha256_hash = hashlib.sha256()
+                buffer = bytearray(FileHashCache.HASH_BUFFER_BYTES)
+                view = memoryview(buffer)
+                with open(source_path, "rb") as src, open(incoming_path, "wb") as dst:
+                    while True:
+                        read = src.readinto(buffer)
+                        if not read:
+                            break
+                        sha256_hash.update(view[:read])
+                        dst.write(view[:read])
+                shutil.copystat(source_path, incoming_path)
+                file_hash = sha256_hash.hexdigest()
+                self.hash_cache.bytes_hashed += source_stat.st_size
+            
+            dedup_file_path = self._dedup_path(file_hash)
+            if dedup_file_path.exists():
+                incoming_path.unlink()
+            else:
+                dedup_file_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(incoming_path, dedup_file_path)
+            
+            if prehash is None:
+                prehash = self.hash_cache.get_prehash(source_path, source_stat)
+            self.hash_cache.record(source_stat, prehash, file_hash)
+            self.hash_cache.record(dedup_file_path.stat(), prehash, file_hash)
+            return file_hash
+            
+        finally:
+            if incoming_path.exists():
+                incoming_path.unlink()
+    
+    def _sync_tree(self, source_root: Path, target_root: Path,
+                   place: Callable[[Path, Path], None]) -> Dict[str, int]:
+        """
+        Make a target tree mirror a source tree, touching only the differences.
+        
+        Args:
+            source_root: Tree to mirror
+            target_root: Tree to update
+            place: Creates one target file from a source file
+        
+        Returns:
+            Dict[str, int]: Counts of placed, unchanged and removed files
+        """
+        if target_root.is_symlink() or (target_root.exists() and not target_root.is_dir()):
+            target_root.unlink()
+        target_root.mkdir(parents=True, exist_ok=True)
+        
+        source_files, source_dirs = self._scan_tree(source_root, follow_symlinks=True)
+        target_files, target_dirs = self._scan_tree(target_root, follow_symlinks=False)
+        stats = {'placed': 0, 'unchanged': 0, 'removed': 0}
+        
+        # Drop stale entries first, so a file can turn into a directory
+        for relative_path in target_files.keys() - source_files.keys():
+            (target_root / relative_path).unlink()
+            stats['removed'] += 1
+        for relative_path in sorted(target_dirs - source_dirs, reverse=True):
+            stale_dir = target_root / relative_path
+            if relative_path in source_files:
+                shutil.rmtree(stale_dir)
+            elif stale_dir.exists() and not any(stale_dir.iterdir()):
+                stale_dir.rmdir()
+        
+        for relative_path, (source_file, source_stat) in source_files.items():
+            target_file = target_root / relative_path
+            if relative_path in target_files and self._is_current(source_file, source_stat, target_file):
+                stats['unchanged'] += 1
+                continue
+            
+            target_file.parent.mkdir(parents=True, exist_ok=True)
+            self._place_file(source_file, target_file, place)
+            stats['placed'] += 1
+        
+        print(f"[VirtualDriveManager] Synced {target_root}: {stats['placed']} placed, "
+              f"{stats['unchanged']} unchanged, {stats['removed']} removed")
+        return stats
+    
+    def _scan_tree(self, root: Path, follow_symlinks: bool) -> Tuple[Dict[str, Tuple[Path, os.stat_result]], Set[str]]:
+        """
+        Walk a tree with scandir.
+        
+        Args:
+            root: Directory to walk
+            follow_symlinks: Whether symlinks are resolved or listed as files
+        
+        Returns:
+            Tuple: Files by relative path (with their stat), and relative directories
+        """
+        files: Dict[str, Tuple[Path, os.stat_result]] = {}
+        dirs: Set[str] = set()
+        pending = [(root, "")]
+        
+        while pending:
+            directory, prefix = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        relative_path = prefix + entry.name
+                        try:
+                            if entry.is_dir(follow_symlinks=follow_symlinks):
+                                dirs.add(relative_path)
+                                pending.append((Path(entry.path), relative_path + os.sep))
+                            elif not follow_symlinks:
+                                files[relative_path] = (Path(entry.path), entry.stat(follow_symlinks=False))
+                            elif entry.is_file():
+                                # Mirror the file a symlink points at, not the link itself
+                                file_path = Path(os.path.realpath(entry.path)) if entry.is_symlink() else Path(entry.path)
+                                files[relative_path] = (file_path, entry.stat())
+                        except OSError:
+                            # Dangling symlink or file removed during the walk
+                            continue
+            except FileNotFoundError:
+                continue
+        
+        return files, dirs
+    
+    def _is_current(self, source_file: Path, source_stat: os.stat_result, target_file: Path) -> bool:
+        """Check whether a target file already mirrors a source file."""
+        try:
+            target_stat = os.lstat(target_file)
+        except FileNotFoundError:
+            return False
+        
+        if os.path.samestat(source_stat, target_stat):
+            return True
+        if os.path.islink(target_file):
+            return os.readlink(target_file) == str(source_file)
+        # Copies and reflinks keep the source size and mtime
+        return (target_stat.st_size == source_stat.st_size and
+                target_stat.st_mtime_ns == source_stat.st_mtime_ns)
+    
+    def _place_file(self, source_file: Path, target_file: Path,
+                    place: Callable[[Path, Path], None]) -> None:
+        """Create a target file next to its final name, then swap it in atomically."""
+        temp_file = target_file.with_name(f".{target_file.name}.pinokio-tmp")
+        self._remove_path(temp_file)
+        try:
+            place(source_file, temp_file)
+            if target_file.is_dir() and not target_file.is_symlink():
+                shutil.rmtree(target_file)
+            os.replace(temp_file, target_file)
+        finally:
+            if os.path.lexists(temp_file):
+                temp_file.unlink()
+    
+    def _hardlink_or_copy(self, source_file: Path, target_file: Path) -> None:
+        """Hard link a file, falling back to a reflink or copy."""
+        try:
+            os.link(source_file, target_file)
+        except OSError:
+            self._reflink_or_copy(source_file, target_file)
+    
+    def _hardlink_or_symlink(self, source_file: Path, target_file: Path) -> None:
+        """Hard link a file, falling back to a symlink."""
+        try:
+            os.link(source_file, target_file)
+        except OSError:
+            os.symlink(source_file, target_file)
+    
+    def _reflink_or_copy(self, source_file: Path, target_file: Path) -> None:
+        """Reflink a file where the filesystem supports it, otherwise copy it."""
+        if not self._reflink(source_file, target_file):
+            shutil.copy2(source_file, target_file)
+    
+    def _reflink(self, source_file: Path, target_file: Path) -> bool:
+        """
+        Clone a file's extents into a new file (copy-on-write).
+        
+        Args:
+            source_file: File to clone
+            target_file: New file to create
+        
+        Returns:
+            bool: True if the file was cloned
+        """
+        if fcntl is None or not sys.platform.startswith('linux'):
+            return False
+        
+        devices = (os.stat(source_file).st_dev, os.stat(target_file.parent).st_dev)
+        if devices in self.reflink_unsupported:
+            return False
+        
+        try:
+            with open(source_file, "rb") as src, open(target_file, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), self.FICLONE, src.fileno())
+            shutil.copystat(source_file, target_file)
+            return True
+        except OSError as e:
+            if os.path.lexists(target_file):
+                target_file.unlink()
+            if e.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL):
+                self.reflink_unsupported.add(devices)
+            return False
+    
+    def _remove_path(self, path: Path) -> None:
+        """Remove a file, symlink or directory tree if it exists."""
+        if path.is_symlink() or path.is_file():
+            path.unlink()
+        elif path.is_dir():
+            shutil.rmtree(path)
     
     def _init_database(self) -> None:
         """Initialize the SQLite database."""
@@ -16,12 +16,14 @@ __author__ = "PinokioCloud Development Team"
 # Import all testing components
 from .app_test_suite import AppTestSuite
 from .cloud_test_matrix import CloudTestMatrix  
-from .performance_benchmark import PerformanceBenchmark
+from .performance_benchmark import PerformanceBenchmark, BenchmarkStats, BenchmarkComparison
 from .error_condition_test import ErrorConditionTest
 
 __all__ = [
     'AppTestSuite',
     'CloudTestMatrix', 
     'PerformanceBenchmark',
+    'BenchmarkStats',
+    'BenchmarkComparison',
     'ErrorConditionTest'
 ]
\ No newline at end of file
@@ -2,8 +2,17 @@
 """
 PinokioCloud Performance Benchmark - Phase 10
 
-This module provides comprehensive performance benchmarking and optimization
-validation for the entire PinokioCloud system.
+This module provides a hermetic, regression-tracking benchmark suite for the
+hot paths of the PinokioCloud system. Every component is constructed against
+its own temporary base path and exercised offline (the server detection
+benchmark scans local dummy servers only). Each benchmark is timed with
+perf_counter_ns over repeated runs after a warmup, and reported as the median
+and 95th percentile per operation.
+
+Results are stored as a JSON baseline; later runs are compared against it and
+any benchmark whose median moved by more than the configured threshold is
+flagged as a regression or improvement. A component whose benchmark raises is
+reported as failed and counts as a regression.
 
 Author: PinokioCloud Development Team
 Version: 1.0.0
@@ -11,884 +20,697 @@ Version: 1.0.0
 
 import os
 import sys
+import io
 import json
 import time
-import psutil
-import threading
+import shutil
+import socket
 import subprocess
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, field
+import argparse
+import platform
+import tempfile
+import threading
+import contextlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional, Any, Callable
+from dataclasses import dataclass, asdict
 from pathlib import Path
 from datetime import datetime, timedelta
-import concurrent.futures
 
 # Add the github_repo directory to Python path for imports
 sys.path.append('/workspace/SD-LongNose/github_repo')
 
-# Import optimization and monitoring components
-from optimization.performance_monitor import PerformanceMonitor
-from optimization.cache_manager import CacheManager
-from cloud_detection.resource_assessor import ResourceAssessor
+from optimization.cache_manager import CacheManager, CacheType
+from optimization.logging_system import LoggingSystem, LogLevel, LogCategory
+from running.process_tracker import ProcessTracker
+from running.port_allocator import get_port_allocator
+from tunneling.server_detector import ServerDetector
+from app_analysis.app_catalog import AppCatalog
+from engine.script_parser import ScriptParser
+from engine.state_manager import StateManager, ApplicationStatus
+
+
+# Default location of the stored baseline
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / "benchmark_baseline.json"
+
+BASELINE_FORMAT_VERSION = 1
+
+
+@dataclass
+class BenchmarkStats:
+    """Timing statistics of one benchmark, in nanoseconds per operation."""
+    name: str
+    component: str
+    samples: int
+    ops_per_sample: int
+    median_ns: float
+    p95_ns: float
+    min_ns: float
+    max_ns: float
+    mean_ns: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert BenchmarkStats to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BenchmarkStats':
+        """Create BenchmarkStats from dictionary."""
+        return cls(**data)
 
 
 @dataclass
-class BenchmarkMetric:
-    """Represents a performance benchmark metric."""
+class BenchmarkComparison:
+    """Comparison of a benchmark against its baseline."""
     name: str
-    value: float
-    unit: str
-    baseline: Optional[float] = None
-    target: Optional[float] = None
-    category: str = "general"
-    description: str = ""
+    current_ns: Optional[float]
+    baseline_ns: Optional[float]
+    change_percent: Optional[float]
+    status: str  # "regression", "improvement", "unchanged", "new" or "failed"
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert BenchmarkComparison to dictionary."""
+        return asdict(self)
 
 
 @dataclass
-class BenchmarkResult:
-    """Result of a performance benchmark test."""
-    test_name: str
-    metrics: List[BenchmarkMetric]
-    success: bool
-    duration: float
-    peak_memory: float
-    peak_cpu: float
-    error_message: Optional[str] = None
-    timestamp: datetime = field(default_factory=datetime.now)
+class _DummyServer:
+    """A local HTTP server standing in for a running web UI."""
+    port: int
+    server: ThreadingHTTPServer
+    thread: threading.Thread
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Percentile of pre-sorted values, interpolating between neighbours."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * percent / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _make_dummy_handler(body: bytes, headers: Dict[str, str]):
+    """Build a request handler serving a fixed page."""
+
+    class DummyHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_HEAD(self):
+            self.send_response(200)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    return DummyHandler
 
 
 class PerformanceBenchmark:
     """
-    Comprehensive performance benchmarking system for PinokioCloud.
-    
-    Measures system performance across all components and validates
-    that performance targets are met for production readiness.
+    Hermetic benchmark suite for PinokioCloud hot paths.
+
+    Each benchmark_* method builds its component in a fresh temporary base
+    path, measures one or more operations and returns their statistics.
     """
-    
-    def __init__(self, base_path: str = "/workspace/SD-LongNose"):
-        """Initialize the performance benchmark system."""
-        self.base_path = Path(base_path)
-        self.github_repo_path = self.base_path / "github_repo"
-        self.benchmark_results: List[BenchmarkResult] = []
-        
-        # Initialize monitoring components
-        self.performance_monitor = PerformanceMonitor()
-        self.cache_manager = CacheManager()
-        self.resource_assessor = ResourceAssessor()
-        
-        # System information
-        self.system_info = self.get_system_info()
-        
-        # Performance targets (can be adjusted based on platform)
-        self.performance_targets = {
-            'response_time': 2.0,  # seconds
-            'memory_usage': 2048,  # MB
-            'cpu_usage': 80.0,     # percentage
-            'startup_time': 30.0,  # seconds
-            'file_io_speed': 10.0, # MB/s
-            'cache_hit_rate': 80.0, # percentage
+
+    def __init__(self, baseline_path: Optional[str] = None, threshold_percent: float = 20.0,
+                 samples: int = 30, warmup: int = 5, work_dir: Optional[str] = None):
+        """
+        Initialize the benchmark suite.
+
+        Args:
+            baseline_path: JSON file baselines are read from and written to
+            threshold_percent: Median change (in percent) flagged as a regression or improvement
+            samples: Timed samples per benchmark
+            warmup: Untimed runs before sampling
+            work_dir: Directory the temporary base paths are created in
+        """
+        self.baseline_path = Path(baseline_path) if baseline_path else DEFAULT_BASELINE_PATH
+        self.threshold_percent = threshold_percent
+        self.samples = samples
+        self.warmup = warmup
+        self.work_dir = work_dir
+
+        self.results: Dict[str, BenchmarkStats] = {}
+        self.failures: Dict[str, str] = {}  # Error by component, for components that raised
+
+        self.benchmarks: Dict[str, Callable[[], List[BenchmarkStats]]] = {
+            'cache_manager': self.benchmark_cache_manager,
+            'logging_system': self.benchmark_logging_system,
+            'server_detector': self.benchmark_server_detector,
+            'process_tracker': self.benchmark_process_tracker,
+            'app_catalog': self.benchmark_app_catalog,
+            'script_parser': self.benchmark_script_parser,
+            'state_manager': self.benchmark_state_manager
         }
-    
+
     def get_system_info(self) -> Dict[str, Any]:
-        """Get comprehensive system information."""
-        try:
-            return {
-                'cpu_count': psutil.cpu.cores_logical(),
-                'cpu_freq': psutil.cpu_freq()._asdict() if psutil.cpu_freq() else {},
-                'memory_total': psutil.virtual_memory().total,
-                'disk_total': psutil.disk_usage('/').total,
-                'python_version': sys.version,
-                'platform': os.uname()._asdict()
-            }
-        except Exception as e:
-            return {'error': str(e)}
-    
-    def monitor_resource_usage(self, duration: float = 1.0) -> Dict[str, float]:
-        """Monitor resource usage for a specified duration."""
-        start_time = time.time()
-        cpu_samples = []
-        memory_samples = []
-        
-        while time.time() - start_time < duration:
-            cpu_samples.append(psutil.cpu_percent(interval=0.1))
-            memory_samples.append(psutil.virtual_memory().percent)
-            time.sleep(0.1)
-        
+        """Get the machine description stored alongside a baseline."""
         return {
-            'peak_cpu': max(cpu_samples) if cpu_samples else 0.0,
-            'avg_cpu': sum(cpu_samples) / len(cpu_samples) if cpu_samples else 0.0,
-            'peak_memory': max(memory_samples) if memory_samples else 0.0,
-            'avg_memory': sum(memory_samples) / len(memory_samples) if memory_samples else 0.0
+            'python_version': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count()
         }
-    
-    def benchmark_system_startup(self) -> BenchmarkResult:
-        """Benchmark system startup performance."""
-        print("🚀 Benchmarking system startup performance...")
-        
-        start_time = time.time()
-        metrics = []
-        
+
+    def measure(self, name: str, component: str, func: Callable[[], Any],
+                setup: Optional[Callable[[], Any]] = None, ops_per_sample: int = 1,
+                samples: Optional[int] = None, warmup: Optional[int] = None) -> BenchmarkStats:
+        """
+        Time an operation.
+
+        Each sample runs ``func`` ``ops_per_sample`` times and is divided by
+        that count, so very short operations are not dominated by timer
+        resolution. ``setup`` runs before every sample and is not timed.
+        Output printed by the component is discarded while timing.
+
+        Args:
+            name: Benchmark name
+            component: Component the operation belongs to
+            func: Operation to time
+            setup: Untimed preparation run before every sample
+            ops_per_sample: Operations per timed sample
+            samples: Timed samples (defaults to the suite setting)
+            warmup: Untimed warmup runs (defaults to the suite setting)
+
+        Returns:
+            BenchmarkStats: Statistics in nanoseconds per operation
+        """
+        samples = samples or self.samples
+        warmup = self.warmup if warmup is None else warmup
+        timings: List[float] = []
+
+        with contextlib.redirect_stdout(io.StringIO()) as sink:
+            for _ in range(warmup):
+                if setup:
+                    setup()
+                for _ in range(ops_per_sample):
+                    func()
+
+            for _ in range(samples):
+                if setup:
+                    setup()
+                sink.seek(0)
+                sink.truncate()
+                start = time.perf_counter_ns()
+                for _ in range(ops_per_sample):
+                    func()
+                timings.append((time.perf_counter_ns() - start) / ops_per_sample)
+
+        timings.sort()
+        stats = BenchmarkStats(
+            name=name,
+            component=component,
+            samples=samples,
+            ops_per_sample=ops_per_sample,
+            median_ns=_percentile(timings, 50),
+            p95_ns=_percentile(timings, 95),
+            min_ns=timings[0],
+            max_ns=timings[-1],
+            mean_ns=sum(timings) / len(timings)
+        )
+        self.results[name] = stats
+        return stats
+
+    @contextlib.contextmanager
+    def isolated_base_path(self, component: str):
+        """Provide a fresh temporary base path, removed afterwards."""
+        base_path = tempfile.mkdtemp(prefix=f"pinokio_bench_{component}_", dir=self.work_dir)
         try:
-            # Monitor resource usage during startup simulation
-            resource_monitor = threading.Thread(
-                target=lambda: self.monitor_resource_usage(10.0)
-            )
-            resource_monitor.start()
-            
-            # Simulate system initialization
-            startup_start = time.time()
-            
-            # Initialize core components
-            component_times = {}
-            
-            # Cloud detection
-            comp_start = time.time()
-            from cloud_detection.cloud_detector import CloudDetector
-            detector = CloudDetector()
-            detection_result = detector.detect_cloud_platform()
-            component_times['cloud_detection'] = time.time() - comp_start
-            
-            # Environment management
-            comp_start = time.time()
-            from environment_management.venv_manager import VirtualEnvironmentManager
-            venv_manager = VirtualEnvironmentManager()
-            component_times['environment_management'] = time.time() - comp_start
-            
-            # App analysis
-            comp_start = time.time()
-            from app_analysis.app_analyzer import AppAnalyzer
-            app_analyzer = AppAnalyzer()
-            component_times['app_analysis'] = time.time() - comp_start
-            
-            total_startup_time = time.time() - startup_start
-            
-            # Create metrics
-            metrics.append(BenchmarkMetric(
-                name="total_startup_time",
-                value=total_startup_time,
-                unit="seconds",
-                target=self.performance_targets['startup_time'],
-                category="startup",
-                description="Total time to initialize all core components"
-            ))
-            
-            for component, duration in component_times.items():
-                metrics.append(BenchmarkMetric(
-                    name=f"{component}_startup_time",
-                    value=duration,
-                    unit="seconds",
-                    category="startup",
-                    description=f"Startup time for {component} component"
+            yield base_path
+        finally:
+            shutil.rmtree(base_path, ignore_errors=True)
+
+    def benchmark_cache_manager(self) -> List[BenchmarkStats]:
+        """Benchmark CacheManager.put and CacheManager.get (hits and misses)."""
+        with self.isolated_base_path('cache_manager') as base_path:
+            with contextlib.redirect_stdout(io.StringIO()):
+                cache_manager = CacheManager(base_path)
+            try:
+                payload = {'name': 'app', 'tags': ['image', 'diffusion'], 'stars': 1234,
+                           'description': 'x' * 256}
+                keys = [f"bench_key_{i}" for i in range(500)]
+                counter = iter(range(10 ** 9))
+
+                results = [self.measure(
+                    'cache_manager.put', 'cache_manager',
+                    lambda: cache_manager.put(f"bench_put_{next(counter)}", payload, CacheType.APP_METADATA),
+                    ops_per_sample=20
+                )]
+
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for key in keys:
+                        cache_manager.put(key, payload, CacheType.APP_METADATA)
+                key_cycle = iter(keys * (10 ** 4))
+                results.append(self.measure(
+                    'cache_manager.get_hit', 'cache_manager',
+                    lambda: cache_manager.get(next(key_cycle), CacheType.APP_METADATA),
+                    ops_per_sample=100
                 ))
-            
-            # Resource usage
-            resource_usage = self.monitor_resource_usage(1.0)
-            metrics.append(BenchmarkMetric(
-                name="startup_peak_cpu",
-                value=resource_usage['peak_cpu'],
-                unit="percent",
-                target=self.performance_targets['cpu_usage'],
-                category="resources",
-                description="Peak CPU usage during startup"
-            ))
-            
-            metrics.append(BenchmarkMetric(
-                name="startup_peak_memory",
-                value=resource_usage['peak_memory'],
-                unit="percent",
-                category="resources",
-                description="Peak memory usage during startup"
-            ))
-            
-            total_duration = time.time() - start_time
-            success = total_startup_time <= self.performance_targets['startup_time']
-            
-            return BenchmarkResult(
-                test_name="system_startup",
-                metrics=metrics,
-                success=success,
-                duration=total_duration,
-                peak_memory=resource_usage['peak_memory'],
-                peak_cpu=resource_usage['peak_cpu']
-            )
-            
-        except Exception as e:
-            return BenchmarkResult(
-                test_name="system_startup",
-                metrics=metrics,
-                success=False,
-                duration=time.time() - start_time,
-                peak_memory=0.0,
-                peak_cpu=0.0,
-                error_message=str(e)
-            )
-    
-    def benchmark_file_operations(self) -> BenchmarkResult:
-        """Benchmark file I/O performance."""
-        print("📁 Benchmarking file operations performance...")
-        
-        start_time = time.time()
-        metrics = []
-        
-        try:
-            import tempfile
-            import shutil
-            
-            test_dir = tempfile.mkdtemp(prefix="pinokio_perf_test_")
-            test_data_size = 10 * 1024 * 1024  # 10MB
-            test_data = b"x" * test_data_size
-            
-            # Write performance test
-            write_start = time.time()
-            test_files = []
-            for i in range(5):  # Write 50MB total
-                test_file = os.path.join(test_dir, f"test_file_{i}.dat")
-                with open(test_file, 'wb') as f:
-                    f.write(test_data)
-                test_files.append(test_file)
-            write_duration = time.time() - write_start
-            write_speed = (50.0) / write_duration  # MB/s
-            
-            # Read performance test
-            read_start = time.time()
-            for test_file in test_files:
-                with open(test_file, 'rb') as f:
-                    _ = f.read()
-            read_duration = time.time() - read_start
-            read_speed = (50.0) / read_duration  # MB/s
-            
-            # Random access test
-            random_start = time.time()
-            for test_file in test_files[:3]:
-                with open(test_file, 'r+b') as f:
-                    f.seek(test_data_size // 2)
-                    f.write(b"random_access_test")
-            random_duration = time.time() - random_start
-            
-            # Directory operations test
-            dir_start = time.time()
-            sub_dirs = []
-            for i in range(100):
-                sub_dir = os.path.join(test_dir, f"subdir_{i}")
-                os.makedirs(sub_dir)
-                sub_dirs.append(sub_dir)
-            dir_duration = time.time() - dir_start
-            
-            # Cleanup
-            shutil.rmtree(test_dir, ignore_errors=True)
-            
-            # Create metrics
-            metrics.append(BenchmarkMetric(
-                name="file_write_speed",
-                value=write_speed,
-                unit="MB/s",
-                target=self.performance_targets['file_io_speed'],
-                category="file_io",
-                description="Sequential file write speed"
-            ))
-            
-            metrics.append(BenchmarkMetric(
-                name="file_read_speed",
-                value=read_speed,
-                unit="MB/s",
-                target=self.performance_targets['file_io_speed'],
-                category="file_io", 
-                description="Sequential file read speed"
-            ))
-            
-            metrics.append(BenchmarkMetric(
-                name="random_access_time",
-                value=random_duration,
-                unit="seconds",
-                category="file_io",
-                description="Random file access performance"
-            ))
-            
-            metrics.append(BenchmarkMetric(
-                name="directory_creation_rate",
-                value=100.0 / dir_duration,
-                unit="dirs/s",
-                category="file_io",
-                description="Directory creation rate"
-            ))
-            
-            total_duration = time.time() - start_time
-            success = (write_speed >= self.performance_targets['file_io_speed'] and 
-                      read_speed >= self.performance_targets['file_io_speed'])
-            
-            resource_usage = self.monitor_resource_usage(1.0)
-            
-            return BenchmarkResult(
-                test_name="file_operations",
-                metrics=metrics,
-                success=success,
-                duration=total_duration,
-                peak_memory=resource_usage['peak_memory'],
-                peak_cpu=resource_usage['peak_cpu']
-            )
-            
-        except Exception as e:
-            return BenchmarkResult(
-                test_name="file_operations",
-                metrics=metrics,
-                success=False,
-                duration=time.time() - start_time,
-                peak_memory=0.0,
-                peak_cpu=0.0,
-                error_message=str(e)
-            )
-    
-    def benchmark_cache_performance(self) -> BenchmarkResult:
-        """Benchmark cache system performance."""
-        print("🚀 Benchmarking cache performance...")
-        
-        start_time = time.time()
-        metrics = []
-        
-        try:
-            # Test cache operations
-            cache_operations = 1000
-            test_data_size = 1024  # 1KB per cache entry
-            test_data = b"x" * test_data_size
-            
-            # Cache write performance
-            write_start = time.time()
-            for i in range(cache_operations):
-                self.cache_manager.put(
-                    f"test_key_{i}", test_data, 
-                    cache_type="memory", ttl=3600
-                )
-            write_duration = time.time() - write_start
-            write_rate = cache_operations / write_duration
-            
-            # Cache read performance (should be fast due to memory cache)
-            read_start = time.time()
-            hit_count = 0
-            for i in range(cache_operations):
-                result = self.cache_manager.get(f"test_key_{i}")
-                if result is not None:
-                    hit_count += 1
-            read_duration = time.time() - read_start
-            read_rate = cache_operations / read_duration
-            hit_rate = (hit_count / cache_operations) * 100
-            
-            # Cache statistics
-            cache_stats = self.cache_manager.get_cache_statistics()
-            
-            # Create metrics
-            metrics.append(BenchmarkMetric(
-                name="cache_write_rate",
-                value=write_rate,
-                unit="ops/s",
-                category="cache",
-                description="Cache write operations per second"
-            ))
-            
-            metrics.append(BenchmarkMetric(
-                name="cache_read_rate",
-                value=read_rate,
-                unit="ops/s",
-                category="cache",
-                description="Cache read operations per second"
-            ))
-            
-            metrics.append(BenchmarkMetric(
-                name="cache_hit_rate",
-                value=hit_rate,
-                unit="percent",
-                target=self.performance_targets['cache_hit_rate'],
-                category="cache",
-                description="Cache hit rate percentage"
+                results.append(self.measure(
+                    'cache_manager.get_miss', 'cache_manager',
+                    lambda: cache_manager.get('bench_missing_key', CacheType.APP_METADATA),
+                    ops_per_sample=100
+                ))
+                return results
+            finally:
+                cache_manager.cleanup_active = False
+
+    def benchmark_logging_system(self) -> List[BenchmarkStats]:
+        """Benchmark LoggingSystem._log and LoggingSystem.get_logs."""
+        with self.isolated_base_path('logging_system') as base_path:
+            with contextlib.redirect_stdout(io.StringIO()):
+                logging_system = LoggingSystem(base_path)
+
+            results = [self.measure(
+                'logging_system.log', 'logging_system',
+                lambda: logging_system._log(LogLevel.INFO, LogCategory.APPLICATION,
+                                            'Benchmark', 'benchmark message', app_name='bench_app'),
+                ops_per_sample=50
+            )]
+
+            for i in range(2000):
+                logging_system._log(LogLevel.WARNING if i % 10 == 0 else LogLevel.INFO,
+                                    LogCategory.PROCESS, f"Component{i % 5}", f"message {i}",
+                                    app_name=f"app_{i % 20}")
+            since = datetime.now() - timedelta(hours=1)
+
+            results.append(self.measure(
+                'logging_system.get_logs_filtered', 'logging_system',
+                lambda: logging_system.get_logs(start_time=since, level=LogLevel.WARNING,
+                                                app_name='app_0'),
+                ops_per_sample=5
             ))
-            
-            metrics.append(BenchmarkMetric(
-                name="cache_memory_usage",
-                value=cache_stats.get('memory_usage', 0),
-                unit="MB",
-                category="cache",
-                description="Cache memory usage"
+            results.append(self.measure(
+                'logging_system.get_logs_all', 'logging_system',
+                lambda: logging_system.get_logs(),
+                ops_per_sample=5
             ))
-            
-            total_duration = time.time() - start_time
-            success = hit_rate >= self.performance_targets['cache_hit_rate']
-            
-            resource_usage = self.monitor_resource_usage(1.0)
-            
-            return BenchmarkResult(
-                test_name="cache_performance",
-                metrics=metrics,
-                success=success,
-                duration=total_duration,
-                peak_memory=resource_usage['peak_memory'],
-                peak_cpu=resource_usage['peak_cpu']
-            )
-            
-        except Exception as e:
-            return BenchmarkResult(
-                test_name="cache_performance",
-                metrics=metrics,
-                success=False,
-                duration=time.time() - start_time,
-                peak_memory=0.0,
-                peak_cpu=0.0,
-                error_message=str(e)
-            )
-    
-    def benchmark_concurrent_operations(self) -> BenchmarkResult:
-        """Benchmark concurrent operations performance."""
-        print("⚡ Benchmarking concurrent operations performance...")
-        
-        start_time = time.time()
-        metrics = []
-        
+
+            for handler_logger in getattr(logging_system, 'loggers', {}).values():
+                for handler in list(handler_logger.handlers):
+                    handler.close()
+                    handler_logger.removeHandler(handler)
+            return results
+
+    def start_dummy_servers(self) -> List[_DummyServer]:
+        """Start local servers that look like Gradio and Streamlit apps."""
+        pages = [
+            (b'<html><head><script>window.gradio_config = {"version": "4.0"};</script></head>'
+             b'<body><gradio-app></gradio-app></body></html>', {'Content-Type': 'text/html'}),
+            (b'<html><head><title>Streamlit</title></head><body>'
+             b'<div id="root"></div><script src="/static/js/streamlit.js"></script></body></html>',
+             {'Content-Type': 'text/html'}),
+            (b'{"status": "ok"}', {'Content-Type': 'application/json', 'Server': 'uvicorn'})
+        ]
+
+        servers = []
+        for body, headers in pages:
+            server = ThreadingHTTPServer(('127.0.0.1', 0), _make_dummy_handler(body, headers))
+            server.daemon_threads = True
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            servers.append(_DummyServer(server.server_address[1], server, thread))
+        return servers
+
+    def benchmark_server_detector(self) -> List[BenchmarkStats]:
+        """Benchmark ServerDetector.detect_servers against local dummy servers."""
+        servers = self.start_dummy_servers()
         try:
-            # Test concurrent file operations
-            def concurrent_file_task(task_id: int) -> float:
-                task_start = time.time()
-                
-                # Create temporary file
-                import tempfile
-                with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                    temp_path = temp_file.name
-                    # Write data
-                    test_data = f"Task {task_id} data " * 1000  # ~15KB
-                    temp_file.write(test_data.encode())
-                
-                # Read data back
-                with open(temp_path, 'r') as f:
-                    _ = f.read()
-                
-                # Cleanup
-                os.unlink(temp_path)
-                
-                return time.time() - task_start
-            
-            # Run concurrent tasks
-            num_threads = min(10, os.cpu.cores_logical() or 4)
-            concurrent_start = time.time()
-            
-            with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
-                futures = [executor.submit(concurrent_file_task, i) for i in range(50)]
-                task_durations = [future.result() for future in concurrent.futures.as_completed(futures)]
-            
-            concurrent_duration = time.time() - concurrent_start
-            concurrent_throughput = 50 / concurrent_duration  # tasks/second
-            
-            # Test concurrent cache operations
-            def concurrent_cache_task(task_id: int) -> float:
-                task_start = time.time()
-                
-                # Cache operations
-                key = f"concurrent_key_{task_id}"
-                data = f"concurrent_data_{task_id}" * 100
-                
-                self.cache_manager.put(key, data, cache_type="memory")
-                result = self.cache_manager.get(key)
-                
-                return time.time() - task_start
-            
-            cache_start = time.time()
-            with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
-                futures = [executor.submit(concurrent_cache_task, i) for i in range(100)]
-                cache_durations = [future.result() for future in concurrent.futures.as_completed(futures)]
-            
-            cache_concurrent_duration = time.time() - cache_start
-            cache_throughput = 100 / cache_concurrent_duration  # ops/second
-            
-            # Create metrics
-            metrics.append(BenchmarkMetric(
-                name="concurrent_file_throughput",
-                value=concurrent_throughput,
-                unit="tasks/s",
-                category="concurrency",
-                description="Concurrent file operation throughput"
-            ))
-            
-            metrics.append(BenchmarkMetric(
-                name="avg_concurrent_task_duration",
-                value=sum(task_durations) / len(task_durations),
-                unit="seconds",
-                category="concurrency",
-                description="Average concurrent task duration"
-            ))
-            
-            metrics.append(BenchmarkMetric(
-                name="concurrent_cache_throughput",
-                value=cache_throughput,
-                unit="ops/s",
-                category="concurrency",
-                description="Concurrent cache operation throughput"
-            ))
-            
-            metrics.append(BenchmarkMetric(
-                name="thread_efficiency",
-                value=num_threads / max(task_durations) * concurrent_duration,
-                unit="ratio",
-                category="concurrency",
-                description="Thread utilization efficiency"
-            ))
-            
-            total_duration = time.time() - start_time
-            success = concurrent_throughput > 5.0  # At least 5 tasks/second
-            
-            resource_usage = self.monitor_resource_usage(2.0)
-            
-            return BenchmarkResult(
-                test_name="concurrent_operations",
-                metrics=metrics,
-                success=success,
-                duration=total_duration,
-                peak_memory=resource_usage['peak_memory'],
-                peak_cpu=resource_usage['peak_cpu']
-            )
-            
-        except Exception as e:
-            return BenchmarkResult(
-                test_name="concurrent_operations",
-                metrics=metrics,
-                success=False,
-                duration=time.time() - start_time,
-                peak_memory=0.0,
-                peak_cpu=0.0,
-                error_message=str(e)
-            )
-    
-    def benchmark_memory_efficiency(self) -> BenchmarkResult:
-        """Benchmark memory usage efficiency."""
-        print("🧠 Benchmarking memory efficiency...")
-        
-        start_time = time.time()
-        metrics = []
-        
+            with self.isolated_base_path('server_detector') as base_path:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    detector = ServerDetector(base_path)
+                detector.port_allocator = get_port_allocator(os.path.join(base_path, 'ports.json'))
+
+                # Scan the dummy servers plus ports with nothing listening
+                closed_ports = []
+                for _ in range(5):
+                    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                        sock.bind(('127.0.0.1', 0))
+                        closed_ports.append(sock.getsockname()[1])
+                detector.scan_ports = [server.port for server in servers] + closed_ports
+                detector.timeout = 1.0
+
+                return [self.measure(
+                    'server_detector.detect_servers', 'server_detector',
+                    lambda: detector.detect_servers(force_scan=True),
+                    samples=max(5, self.samples // 3),
+                    warmup=min(self.warmup, 2)
+                )]
+        finally:
+            for server in servers:
+                server.server.shutdown()
+                server.server.server_close()
+
+    def benchmark_process_tracker(self) -> List[BenchmarkStats]:
+        """Benchmark ProcessTracker resource sampling of tracked processes."""
+        children = [
+            subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(600)'])
+            for _ in range(4)
+        ]
         try:
-            import gc
-            
-            # Get initial memory state
-            gc.collect()  # Force garbage collection
-            initial_memory = psutil.virtual_memory().used
-            
-            # Memory allocation test
-            large_data = []
-            allocation_start = time.time()
-            
-            # Allocate memory in chunks
-            for i in range(100):
-                chunk = b"x" * (1024 * 1024)  # 1MB chunks
-                large_data.append(chunk)
-                
-                if i % 10 == 0:  # Check memory every 10 allocations
-                    current_memory = psutil.virtual_memory().used
-                    allocated_memory = (current_memory - initial_memory) / (1024 * 1024)  # MB
-            
-            allocation_duration = time.time() - allocation_start
-            peak_allocated = (psutil.virtual_memory().used - initial_memory) / (1024 * 1024)  # MB
-            
-            # Memory deallocation test
-            deallocation_start = time.time()
-            large_data.clear()
-            gc.collect()
-            deallocation_duration = time.time() - deallocation_start
-            
-            # Check memory recovery
-            final_memory = psutil.virtual_memory().used
-            memory_recovered = (psutil.virtual_memory().used - final_memory) / (1024 * 1024)  # MB
-            memory_recovery_rate = (memory_recovered / peak_allocated) * 100 if peak_allocated > 0 else 100
-            
-            # Memory fragmentation test (estimate)
-            fragmentation_start = time.time()
-            small_allocations = []
-            for i in range(1000):
-                small_allocations.append(bytearray(1024))  # 1KB each
-            fragmentation_duration = time.time() - fragmentation_start
-            
-            # Create metrics
-            metrics.append(BenchmarkMetric(
-                name="memory_allocation_rate",
-                value=100.0 / allocation_duration,  # MB/s
-                unit="MB/s",
-                category="memory",
-                description="Memory allocation rate"
-            ))
-            
-            metrics.append(BenchmarkMetric(
-                name="peak_memory_usage",
-                value=peak_allocated,
-                unit="MB",
-                target=self.performance_targets['memory_usage'],
-                category="memory",
-                description="Peak memory usage during test"
-            ))
-            
-            metrics.append(BenchmarkMetric(
-                name="memory_recovery_rate",
-                value=memory_recovery_rate,
-                unit="percent",
-                category="memory",
-                description="Memory recovery after deallocation"
-            ))
-            
-            metrics.append(BenchmarkMetric(
-                name="small_allocation_rate",
-                value=1000.0 / fragmentation_duration,
-                unit="allocs/s",
-                category="memory",
-                description="Small allocation performance"
-            ))
-            
-            total_duration = time.time() - start_time
-            success = (peak_allocated <= self.performance_targets['memory_usage'] and 
-                      memory_recovery_rate >= 80.0)
-            
-            resource_usage = self.monitor_resource_usage(1.0)
-            
-            return BenchmarkResult(
-                test_name="memory_efficiency",
-                metrics=metrics,
-                success=success,
-                duration=total_duration,
-                peak_memory=resource_usage['peak_memory'],
-                peak_cpu=resource_usage['peak_cpu']
-            )
-            
-        except Exception as e:
-            return BenchmarkResult(
-                test_name="memory_efficiency",
-                metrics=metrics,
-                success=False,
-                duration=time.time() - start_time,
-                peak_memory=0.0,
-                peak_cpu=0.0,
-                error_message=str(e)
+            with self.isolated_base_path('process_tracker') as base_path:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    tracker = ProcessTracker(base_path)
+                    for child in children:
+                        tracker.track_process(child.pid, 'benchmark')
+                    # Sample only on demand so the monitoring thread does not skew timings
+                    tracker.stop_monitoring()
+                pids = [child.pid for child in children]
+
+                return [
+                    self.measure(
+                        'process_tracker.monitor_resources', 'process_tracker',
+                        lambda: tracker.monitor_resources(pids[0]),
+                        ops_per_sample=5
+                    ),
+                    self.measure(
+                        'process_tracker.sample_all_tracked', 'process_tracker',
+                        lambda: [tracker.monitor_resources(pid) for pid in tracker.get_all_tracked_processes()]
+                    )
+                ]
+        finally:
+            for child in children:
+                child.kill()
+                child.wait()
+
+    def build_catalog_data(self, count: int = 2000) -> Dict[str, Dict[str, Any]]:
+        """Build a synthetic apps database."""
+        categories = ['IMAGE_GENERATION', 'AUDIO', 'VIDEO', 'LLM', 'UTILITY']
+        words = ['stable', 'diffusion', 'voice', 'clone', 'video', 'upscale', 'chat', 'llama',
+                 'whisper', 'comfy', 'forge', 'music', 'depth', 'segment', 'face', 'swap']
+        apps = {}
+        for i in range(count):
+            name = f"{words[i % len(words)]}-{words[(i * 7) % len(words)]}-{i}"
+            apps[name] = {
+                'name': name,
+                'description': ' '.join(words[(i + k) % len(words)] for k in range(6)),
+                'category': categories[i % len(categories)],
+                'tags': [words[(i * 3) % len(words)], words[(i * 5) % len(words)]],
+                'stars': (i * 37) % 5000,
+                'installer_type': 'js' if i % 3 else 'json',
+                'repo_url': f"https://github.com/bench/{name}"
+            }
+        return apps
+
+    def benchmark_app_catalog(self) -> List[BenchmarkStats]:
+        """Benchmark AppCatalog index build and (uncached) search."""
+        apps_data = self.build_catalog_data()
+        catalog = AppCatalog(apps_data)
+        queries = ['stable diffusion', 'voice clone', 'llama chat', 'upscle', 'face swap video']
+        query_cycle = iter(queries * (10 ** 5))
+
+        return [
+            self.measure(
+                'app_catalog.build', 'app_catalog',
+                lambda: AppCatalog(apps_data),
+                samples=max(5, self.samples // 3)
+            ),
+            self.measure(
+                'app_catalog.search', 'app_catalog',
+                lambda: catalog.search(next(query_cycle), limit=50),
+                setup=catalog.query_cache.clear,
+                ops_per_sample=len(queries)
             )
-    
-    def run_comprehensive_benchmark(self) -> Dict[str, Any]:
-        """Run comprehensive performance benchmark suite."""
-        print("🎯 PinokioCloud Performance Benchmark - Phase 10")
-        print("=" * 60)
-        
-        start_time = datetime.now()
-        
-        print("💻 System Information:")
-        for key, value in self.system_info.items():
-            if key != 'error':
-                if isinstance(value, dict):
-                    print(f"  {key}: {json.dumps(value, default=str)}")
-                else:
-                    print(f"  {key}: {value}")
-        
-        print("\n🎯 Performance Targets:")
-        for target, value in self.performance_targets.items():
-            print(f"  {target}: {value}")
-        
-        print("\n🚀 Running Performance Benchmarks...")
-        
-        # Run all benchmark tests
-        benchmark_tests = [
-            self.benchmark_system_startup,
-            self.benchmark_file_operations,
-            self.benchmark_cache_performance,
-            self.benchmark_concurrent_operations,
-            self.benchmark_memory_efficiency,
         ]
-        
-        for benchmark_test in benchmark_tests:
+
+    def benchmark_script_parser(self) -> List[BenchmarkStats]:
+        """Benchmark ScriptParser.parse_script on JSON and JavaScript installers."""
+        with self.isolated_base_path('script_parser') as base_path:
+            json_script = os.path.join(base_path, 'install.json')
+            with open(json_script, 'w', encoding='utf-8') as f:
+                json.dump({'steps': [
+                    {'id': f"step_{i}", 'type': 'shell_command',
+                     'command': f"pip install package_{i}", 'timeout': 600,
+                     'environment_variables': {'STEP': str(i)}}
+                    for i in range(200)
+                ]}, f)
+
+            js_script = os.path.join(base_path, 'install.js')
+            with open(js_script, 'w', encoding='utf-8') as f:
+                f.write("module.exports = async (kernel) => {\n")
+                for i in range(200):
+                    f.write(f"  await shell.run('pip install package_{i}')\n")
+                    f.write(f"  await fs.download('https://example.invalid/model_{i}.bin')\n")
+                f.write("}\n")
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                parser = ScriptParser(base_path)
+
+            return [
+                self.measure('script_parser.parse_json', 'script_parser',
+                             lambda: parser.parse_script(json_script), ops_per_sample=5),
+                self.measure('script_parser.parse_javascript', 'script_parser',
+                             lambda: parser.parse_script(js_script), ops_per_sample=5)
+            ]
+
+    def benchmark_state_manager(self) -> List[BenchmarkStats]:
+        """Benchmark StateManager updates and their persistence."""
+        with self.isolated_base_path('state_manager') as base_path:
+            with contextlib.redirect_stdout(io.StringIO()):
+                state_manager = StateManager(base_path)
+            try:
+                app_names = [f"bench_app_{i}" for i in range(100)]
+                for app_name in app_names:
+                    state_manager.register_application(app_name, os.path.join(base_path, app_name),
+                                                       {'version': '1.0.0'})
+                state_manager._save_state()
+
+                statuses = [ApplicationStatus.RUNNING, ApplicationStatus.STOPPED]
+                counter = iter(range(10 ** 9))
+
+                def update_one():
+                    i = next(counter)
+                    state_manager.update_application_status(app_names[i % len(app_names)],
+                                                            statuses[i % 2])
+
+                def update_and_persist():
+                    for _ in range(10):
+                        update_one()
+                    state_manager._save_state()
+
+                return [
+                    self.measure('state_manager.update_status', 'state_manager',
+                                 update_one, ops_per_sample=20),
+                    self.measure('state_manager.persist_10_updates', 'state_manager',
+                                 update_and_persist)
+                ]
+            finally:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    state_manager.shutdown()
+
+    def run_benchmarks(self, selected: Optional[List[str]] = None) -> Dict[str, BenchmarkStats]:
+        """
+        Run the benchmark suite.
+
+        Components that raise are recorded in ``failures``.
+
+        Args:
+            selected: Component names to run (all when None)
+
+        Returns:
+            Dict[str, BenchmarkStats]: Statistics by benchmark name
+        """
+        self.results = {}
+        self.failures = {}
+        for component, benchmark in self.benchmarks.items():
+            if selected and component not in selected:
+                continue
+            print(f"[PerformanceBenchmark] Running {component}...")
             try:
-                result = benchmark_test()
-                self.benchmark_results.append(result)
-                
-                status = "✅ PASS" if result.success else "❌ FAIL"
-                print(f"  {status} - {result.test_name} ({result.duration:.1f}s)")
-                
-                if result.error_message:
-                    print(f"    Error: {result.error_message}")
-                    
+                for stats in benchmark():
+                    print(f"[PerformanceBenchmark]   {stats.name}: median {_format_ns(stats.median_ns)}, "
+                          f"p95 {_format_ns(stats.p95_ns)}")
             except Exception as e:
-                print(f"  ❌ FAIL - {benchmark_test.__name__}: {e}")
-        
-        end_time = datetime.now()
-        
-        # Generate comprehensive report
-        return self.generate_benchmark_report(start_time, end_time)
-    
-    def generate_benchmark_report(self, start_time: datetime, end_time: datetime) -> Dict[str, Any]:
-        """Generate comprehensive benchmark report."""
-        total_tests = len(self.benchmark_results)
-        successful_tests = sum(1 for r in self.benchmark_results if r.success)
-        success_rate = (successful_tests / total_tests) * 100 if total_tests > 0 else 0
-        
-        # Aggregate metrics by category
-        metrics_by_category = {}
-        for result in self.benchmark_results:
-            for metric in result.metrics:
-                category = metric.category
-                if category not in metrics_by_category:
-                    metrics_by_category[category] = []
-                metrics_by_category[category].append(metric)
-        
-        # Calculate performance scores
-        performance_scores = {}
-        for category, metrics in metrics_by_category.items():
-            scores = []
-            for metric in metrics:
-                if metric.target is not None:
-                    if metric.unit in ['seconds', 'percent'] and metric.name.endswith('_time'):
-                        # Lower is better for time metrics
-                        score = min(100, (metric.target / max(metric.value, 0.01)) * 100)
-                    else:
-                        # Higher is better for most other metrics
-                        score = min(100, (metric.value / metric.target) * 100)
-                    scores.append(score)
-            
-            performance_scores[category] = sum(scores) / len(scores) if scores else 0
-        
-        overall_performance_score = sum(performance_scores.values()) / len(performance_scores) if performance_scores else 0
-        
-        report = {
-            'benchmark_summary': {
-                'total_tests': total_tests,
-                'successful_tests': successful_tests,
-                'failed_tests': total_tests - successful_tests,
-                'success_rate': success_rate,
-                'overall_performance_score': overall_performance_score,
-                'test_duration': str(end_time - start_time),
-                'timestamp': datetime.now().isoformat(),
-                'system_info': self.system_info
-            },
-            'performance_scores': performance_scores,
-            'performance_targets': self.performance_targets,
-            'detailed_results': [
-                {
-                    'test_name': r.test_name,
-                    'success': r.success,
-                    'duration': r.duration,
-                    'peak_memory': r.peak_memory,
-                    'peak_cpu': r.peak_cpu,
-                    'metrics': [
-                        {
-                            'name': m.name,
-                            'value': m.value,
-                            'unit': m.unit,
-                            'target': m.target,
-                            'category': m.category,
-                            'description': m.description
-                        }
-                        for m in r.metrics
-                    ],
-                    'error_message': r.error_message
-                }
-                for r in self.benchmark_results
-            ],
-            'failed_tests': [
-                {
-                    'test_name': r.test_name,
-                    'error_message': r.error_message,
-                    'duration': r.duration
-                }
-                for r in self.benchmark_results if not r.success
-            ],
-            'recommendations': self.generate_performance_recommendations()
+                self.failures[component] = f"{type(e).__name__}: {e}"
+                print(f"[PerformanceBenchmark] {component} failed: {self.failures[component]}")
+        return dict(self.results)
+
+    def load_baseline(self) -> Dict[str, BenchmarkStats]:
+        """
+        Load the stored baseline.
+
+        Returns:
+            Dict[str, BenchmarkStats]: Baseline statistics (empty if none is stored)
+        """
+        try:
+            with open(self.baseline_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {name: BenchmarkStats.from_dict(stats) for name, stats in data.get('results', {}).items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError) as e:
+            print(f"[PerformanceBenchmark] Ignoring unreadable baseline {self.baseline_path}: {e}")
+            return {}
+
+    def save_baseline(self, results: Dict[str, BenchmarkStats]) -> None:
+        """
+        Store results as the baseline, keeping entries for benchmarks not in this run.
+
+        Args:
+            results: Statistics by benchmark name
+        """
+        merged = self.load_baseline()
+        merged.update(results)
+
+        data = {
+            'version': BASELINE_FORMAT_VERSION,
+            'updated': datetime.now().isoformat(),
+            'system': self.get_system_info(),
+            'results': {name: stats.to_dict() for name, stats in sorted(merged.items())}
         }
-        
-        return report
-    
-    def generate_performance_recommendations(self) -> List[str]:
-        """Generate performance optimization recommendations."""
-        recommendations = []
-        
-        if not self.benchmark_results:
-            return ["No benchmark results available for analysis."]
-        
-        total_tests = len(self.benchmark_results)
-        successful_tests = sum(1 for r in self.benchmark_results if r.success)
-        
-        # Overall performance assessment
-        if successful_tests == total_tests:
-            recommendations.append("🎉 All performance benchmarks passed! System is optimally configured.")
-        elif successful_tests >= total_tests * 0.8:
-            recommendations.append("✅ Good performance overall. Minor optimizations recommended.")
-        elif successful_tests >= total_tests * 0.5:
-            recommendations.append("⚠️  Moderate performance issues. Optimization needed.")
-        else:
-            recommendations.append("❌ Significant performance issues detected. Major optimization required.")
-        
-        # Specific recommendations based on failed tests
-        failed_tests = [r for r in self.benchmark_results if not r.success]
-        for result in failed_tests:
-            if result.test_name == "system_startup":
-                recommendations.append("🚀 Optimize system startup - consider lazy loading and component caching.")
-            elif result.test_name == "file_operations":
-                recommendations.append("📁 Improve file I/O performance - check disk speed and implement buffering.")
-            elif result.test_name == "cache_performance":
-                recommendations.append("🚀 Optimize caching strategy - increase cache size or improve eviction policy.")
-            elif result.test_name == "concurrent_operations":
-                recommendations.append("⚡ Enhance concurrency handling - optimize thread pool size and task distribution.")
-            elif result.test_name == "memory_efficiency":
-                recommendations.append("🧠 Optimize memory usage - implement memory pooling and reduce allocations.")
-        
-        # Resource-specific recommendations
-        high_cpu_tests = [r for r in self.benchmark_results if r.peak_cpu > 90]
-        if high_cpu_tests:
-            recommendations.append("🔥 High CPU usage detected - optimize algorithms and reduce computational complexity.")
-        
-        high_memory_tests = [r for r in self.benchmark_results if r.peak_memory > 80]
-        if high_memory_tests:
-            recommendations.append("🧠 High memory usage detected - implement memory optimization and garbage collection tuning.")
-        
-        return recommendations
-    
-    def save_benchmark_report(self, report: Dict[str, Any], filename: str = None):
-        """Save benchmark report to file."""
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"performance_benchmark_report_{timestamp}.json"
-        
-        report_path = self.base_path / filename
-        with open(report_path, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
-        
-        print(f"📊 Benchmark report saved: {report_path}")
-
-
-def main():
-    """Main benchmarking function."""
+
+        self.baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.baseline_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, self.baseline_path)
+        print(f"[PerformanceBenchmark] Baseline saved: {self.baseline_path}")
+
+    def compare_to_baseline(self, results: Dict[str, BenchmarkStats],
+                            baseline: Optional[Dict[str, BenchmarkStats]] = None,
+                            failures: Optional[Dict[str, str]] = None) -> List[BenchmarkComparison]:
+        """
+        Compare results against the baseline medians.
+
+        A change beyond the threshold is only flagged when it also leaves the
+        baseline's own spread: a regression needs the new median above the
+        baseline p95, an improvement needs the new p95 below the baseline
+        median. This keeps ordinary run-to-run jitter from being reported.
+
+        Every baseline benchmark of a failed component that produced no result
+        is reported as 'failed' (or the component itself, if the baseline has
+        none of its benchmarks).
+
+        Args:
+            results: Statistics by benchmark name
+            baseline: Baseline to compare with (the stored one when None)
+            failures: Error by failed component (those of the last run when None)
+
+        Returns:
+            List[BenchmarkComparison]: One comparison per result or failed benchmark
+        """
+        baseline = self.load_baseline() if baseline is None else baseline
+        failures = self.failures if failures is None else failures
+        comparisons = []
+
+        for name, stats in sorted(results.items()):
+            reference = baseline.get(name)
+            if reference is None or reference.median_ns <= 0:
+                comparisons.append(BenchmarkComparison(name, stats.median_ns, None, None, 'new'))
+                continue
+
+            change = (stats.median_ns - reference.median_ns) / reference.median_ns * 100.0
+            if change > self.threshold_percent and stats.median_ns > reference.p95_ns:
+                status = 'regression'
+            elif change < -self.threshold_percent and stats.p95_ns < reference.median_ns:
+                status = 'improvement'
+            else:
+                status = 'unchanged'
+            comparisons.append(BenchmarkComparison(name, stats.median_ns, reference.median_ns, change, status))
+
+        for component, error in sorted(failures.items()):
+            missing = sorted(name for name, stats in baseline.items()
+                             if stats.component == component and name not in results)
+            for name in missing or [component]:
+                reference = baseline.get(name)
+                comparisons.append(BenchmarkComparison(
+                    name, None, reference.median_ns if reference else None, None, 'failed', error))
+
+        return comparisons
+
+    def generate_report(self, results: Dict[str, BenchmarkStats],
+                        comparisons: List[BenchmarkComparison]) -> Dict[str, Any]:
+        """Build a JSON-serializable report of a run."""
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'system': self.get_system_info(),
+            'threshold_percent': self.threshold_percent,
+            'results': {name: stats.to_dict() for name, stats in results.items()},
+            'comparisons': [comparison.to_dict() for comparison in comparisons],
+            'failures': dict(self.failures),
+            'regressions': [c.name for c in comparisons if c.status in ('regression', 'failed')]
+        }
+
+
+def _format_ns(value: float) -> str:
+    """Format a duration in nanoseconds for display."""
+    if value >= 1e9:
+        return f"{value / 1e9:.2f}s"
+    if value >= 1e6:
+        return f"{value / 1e6:.2f}ms"
+    if value >= 1e3:
+        return f"{value / 1e3:.2f}us"
+    return f"{value:.0f}ns"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description="PinokioCloud performance benchmark")
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE_PATH), help="Baseline JSON file")
+    parser.add_argument('--threshold', type=float, default=20.0,
+                        help="Median change in percent flagged as a regression")
+    parser.add_argument('--samples', type=int, default=30, help="Timed samples per benchmark")
+    parser.add_argument('--warmup', type=int, default=5, help="Untimed warmup runs per benchmark")
+    parser.add_argument('--only', nargs='*', help="Components to run")
+    parser.add_argument('--update-baseline', action='store_true', help="Store this run as the baseline")
+    parser.add_argument('--report', help="Write the full report to this JSON file")
+    args = parser.parse_args(argv)
+
     print("🎯 PinokioCloud Performance Benchmark - Phase 10")
     print("=" * 60)
-    
-    # Initialize benchmark system
-    benchmark = PerformanceBenchmark()
-    
-    # Run comprehensive benchmarking
-    report = benchmark.run_comprehensive_benchmark()
-    
-    # Print summary
+
+    benchmark = PerformanceBenchmark(args.baseline, args.threshold, args.samples, args.warmup)
+    results = benchmark.run_benchmarks(args.only)
+    baseline = benchmark.load_baseline()
+    comparisons = benchmark.compare_to_baseline(results, baseline)
+
     print("\n📊 PERFORMANCE BENCHMARK RESULTS")
-    print("=" * 50)
-    summary = report['benchmark_summary']
-    print(f"Total Tests: {summary['total_tests']}")
-    print(f"Successful: {summary['successful_tests']}")
-    print(f"Failed: {summary['failed_tests']}")
-    print(f"Success Rate: {summary['success_rate']:.1f}%")
-    print(f"Overall Performance Score: {summary['overall_performance_score']:.1f}/100")
-    print(f"Test Duration: {summary['test_duration']}")
-    
-    print("\n📈 Performance Scores by Category:")
-    for category, score in report['performance_scores'].items():
-        print(f"  {category}: {score:.1f}/100")
-    
-    if report['failed_tests']:
-        print("\n❌ Failed Tests:")
-        for test in report['failed_tests']:
-            print(f"  - {test['test_name']}: {test['error_message']}")
-    
-    print("\n💡 Recommendations:")
-    for rec in report['recommendations']:
-        print(f"  {rec}")
-    
-    # Save report
-    benchmark.save_benchmark_report(report)
-    
-    return report['benchmark_summary']['success_rate'] >= 80  # Return True if success rate >= 80%
+    print("=" * 60)
+    for comparison in comparisons:
+        if comparison.status == 'failed':
+            print(f"{comparison.name:40s} FAILED: {comparison.error}")
+            continue
+        stats = results[comparison.name]
+        line = f"{comparison.name:40s} median {_format_ns(stats.median_ns):>10s}  p95 {_format_ns(stats.p95_ns):>10s}"
+        if comparison.change_percent is not None:
+            line += f"  {comparison.change_percent:+6.1f}%  {comparison.status}"
+        else:
+            line += "  (no baseline)"
+        print(line)
+
+    regressions = [c for c in comparisons if c.status == 'regression']
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.1f}%:")
+        for comparison in regressions:
+            print(f"  - {comparison.name}: {comparison.change_percent:+.1f}%")
+
+    if benchmark.failures:
+        print(f"\n❌ {len(benchmark.failures)} component(s) failed:")
+        for component, error in sorted(benchmark.failures.items()):
+            print(f"  - {component}: {error}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(benchmark.generate_report(results, comparisons), f, indent=2)
+
+    if args.update_baseline or not baseline:
+        benchmark.save_baseline(results)
+
+    return 1 if regressions or benchmark.failures else 0
 
 
 if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(main())
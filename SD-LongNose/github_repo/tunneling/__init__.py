@@ -15,6 +15,8 @@ from tunneling.ngrok_manager import NgrokManager, NgrokTunnel, NgrokStatus
 from tunneling.cloudflare_manager import CloudflareManager, CloudflareTunnel, CloudflareStatus
 from tunneling.gradio_integration import GradioIntegration, GradioConfig
 from tunneling.url_manager import URLManager, TunnelURL, QRCodeGenerator
+from tunneling.routing_proxy import RoutingProxy, ProxyRoute
+from tunneling.tunnel_supervisor import TunnelSupervisor, SupervisedProcess
 
 __all__ = [
     'ServerDetector',
@@ -30,7 +32,11 @@ __all__ = [
     'GradioConfig',
     'URLManager',
     'TunnelURL',
-    'QRCodeGenerator'
+    'QRCodeGenerator',
+    'RoutingProxy',
+    'ProxyRoute',
+    'TunnelSupervisor',
+    'SupervisedProcess'
 ]
 
 __version__ = "1.0.0"
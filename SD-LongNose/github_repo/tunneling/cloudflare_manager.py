@@ -22,6 +22,7 @@ from dataclasses import dataclass, field, asdict
 from enum import Enum
 from pathlib import Path
 from datetime import datetime, timedelta
+from urllib.parse import urlsplit
 import uuid
 
 # Import previous phase modules
@@ -29,6 +30,10 @@ sys.path.append('/workspace/SD-LongNose/github_repo')
 from environment_management.shell_runner import ShellRunner
 from environment_management.json_handler import JSONHandler
 from cloud_detection.cloud_detector import CloudDetector
+from environment_management.tracing import traced
+from tunneling.routing_proxy import RoutingProxy, make_route_prefix
+from running.hibernation import register_activity_source
+from tunneling.tunnel_supervisor import TunnelSupervisor, SupervisedProcess, CLOUDFLARE_URL_PATTERN
 
 
 class CloudflareStatus(Enum):
@@ -112,6 +117,24 @@ class CloudflareManager:
         self.cloudflared_binary = "cloudflared"
         self.cloudflare_processes: Dict[str, subprocess.Popen] = {}
         
+        # Multiplexed mode: one shared connector in front of a local routing
+        # proxy; HTTP apps are exposed as routes instead of separate tunnels
+        self.multiplexed = True
+        self.routing_proxy = RoutingProxy()
+        # Requests routed to an app keep it from hibernating
+        register_activity_source(self.routing_proxy.get_port_activity)
+        self.shared_connector_name = "shared_connector"
+        self.shared_connector_url: Optional[str] = None
+        self.connector_lock = threading.Lock()
+        
+        # Connector processes are supervised: their output is piped, logged and
+        # matched as it arrives, and a standby pool of connectors pointed at the
+        # routing proxy is kept warm so new tunnels do not wait for a handshake
+        self.tunnel_supervisor = TunnelSupervisor(str(self.cloudflare_storage_path))
+        self.connector_handles: Dict[str, SupervisedProcess] = {}
+        self.standby_pool_size = 1
+        self.connector_timeout = 30.0  # seconds
+        
         # Monitoring
         self.monitoring_active = False
         self.monitoring_thread = None
@@ -139,6 +162,7 @@ class CloudflareManager:
         
         print(f"[CloudflareManager] Initialized for platform: {self.platform_info.platform}")
     
+    @traced("tunnel.cloudflare.create", category="tunnel", record_args=("local_port", "app_name"))
     def create_tunnel(self, local_port: int, app_name: str = None,
                      protocol: CloudflareProtocol = CloudflareProtocol.HTTP,
                      config: Dict[str, Any] = None) -> CloudflareTunnel:
@@ -149,7 +173,8 @@ class CloudflareManager:
             local_port: Local port to expose
             app_name: Name of the application (optional)
             protocol: Protocol to use (HTTP, HTTPS, TCP, etc.)
-            config: Additional tunnel configuration
+            config: Additional tunnel configuration. In multiplexed mode the
+                keys 'multiplexed', 'hostname' and 'strip_prefix' control routing.
         
         Returns:
             CloudflareTunnel: Created tunnel information
@@ -172,10 +197,13 @@ class CloudflareManager:
         
         try:
             # Create tunnel using cloudflared
-            if protocol == CloudflareProtocol.HTTP:
-                # Use quick tunnel for HTTP
-                tunnel_url = self._create_quick_tunnel(local_port, tunnel_name)
-                tunnel.public_url = tunnel_url
+            if protocol == CloudflareProtocol.HTTP and tunnel.config.get('multiplexed', self.multiplexed):
+                # Route through the shared connector
+                tunnel.config['multiplexed'] = True
+                tunnel.public_url = self._register_route(tunnel)
+            elif protocol == CloudflareProtocol.HTTP:
+                # Use a dedicated quick tunnel for HTTP
+                tunnel.public_url = self._attach_dedicated_connector(tunnel)
             else:
                 # Use named tunnel for other protocols
                 cf_tunnel_id = self._create_named_tunnel(tunnel_name, local_port, protocol)
@@ -240,11 +268,15 @@ class CloudflareManager:
                         process.kill()
                     
                     del self.cloudflare_processes[tunnel_id]
+                self._release_connector(tunnel_id)
                 
                 # Clean up named tunnel if it exists
                 if tunnel.cloudflare_tunnel_id:
                     self._cleanup_named_tunnel(tunnel.cloudflare_tunnel_id)
                 
+                # Remove the route; the shared connector stays up for the next app
+                self.routing_proxy.remove_route(tunnel_id)
+                
                 tunnel.status = CloudflareStatus.STOPPED
                 
                 # Remove from active tunnels
@@ -314,6 +346,15 @@ class CloudflareManager:
         tunnel = self.active_tunnels[tunnel_id]
         
         try:
+            # Multiplexed tunnels are healthy while the shared connector and proxy are
+            if tunnel.config.get('multiplexed'):
+                if self._shared_connector_alive() and self.routing_proxy.running:
+                    tunnel.status = CloudflareStatus.CONNECTED
+                    tunnel.last_check = datetime.now()
+                    return True
+                tunnel.status = CloudflareStatus.DISCONNECTED
+                return False
+            
             # Check if the cloudflared process is still running
             if tunnel_id in self.cloudflare_processes:
                 process = self.cloudflare_processes[tunnel_id]
@@ -376,6 +417,20 @@ class CloudflareManager:
             tunnel.status = CloudflareStatus.RECONNECTING
             tunnel.reconnect_count += 1
             
+            if tunnel.config.get('multiplexed'):
+                # Restart the shared connector if needed; quick tunnel URLs
+                # change on restart, so every routed tunnel is updated
+                self._ensure_shared_connector()
+                self._refresh_multiplexed_urls()
+                
+                tunnel.status = CloudflareStatus.CONNECTED
+                tunnel.last_check = datetime.now()
+                tunnel.error_message = None
+                self._emit_event('tunnel_reconnected', tunnel)
+                
+                print(f"[CloudflareManager] Tunnel {tunnel_id} reconnected: {tunnel.public_url}")
+                return True
+            
             # Stop existing process
             if tunnel_id in self.cloudflare_processes:
                 process = self.cloudflare_processes[tunnel_id]
@@ -385,16 +440,16 @@ class CloudflareManager:
                 except subprocess.TimeoutExpired:
                     process.kill()
                 del self.cloudflare_processes[tunnel_id]
-            
-            # Wait a moment
-            time.sleep(3.0)
+            self._release_connector(tunnel_id)
             
             # Recreate tunnel
             if tunnel.protocol == CloudflareProtocol.HTTP:
-                # Recreate quick tunnel
-                tunnel_url = self._create_quick_tunnel(tunnel.local_port, tunnel.name)
-                tunnel.public_url = tunnel_url
+                # Take a fresh quick tunnel (from the standby pool when one is ready)
+                tunnel.public_url = self._attach_dedicated_connector(tunnel)
             else:
+                # Wait a moment
+                time.sleep(3.0)
+                
                 # Recreate named tunnel
                 cf_tunnel_id = self._create_named_tunnel(tunnel.name, tunnel.local_port, tunnel.protocol)
                 tunnel.cloudflare_tunnel_id = cf_tunnel_id
@@ -440,7 +495,11 @@ class CloudflareManager:
                     'available': True,
                     'version': version_info,
                     'active_tunnels': len(self.active_tunnels),
-                    'running_processes': len(self.cloudflare_processes)
+                    'running_processes': len(self.cloudflare_processes),
+                    'multiplexed': self.multiplexed,
+                    'shared_connector_url': self.shared_connector_url,
+                    'routing_proxy': self.routing_proxy.get_stats(),
+                    'supervisor': self.tunnel_supervisor.get_status()
                 }
             else:
                 return {
@@ -462,6 +521,7 @@ class CloudflareManager:
             self.monitoring_active = True
             self.monitoring_thread = threading.Thread(
                 target=self._monitoring_loop,
+                name="CloudflareManager-monitor",
                 daemon=True
             )
             self.monitoring_thread.start()
@@ -530,46 +590,149 @@ class CloudflareManager:
         except Exception as e:
             print(f"[CloudflareManager] Error installing cloudflared: {e}")
     
+    def _quick_tunnel_command(self, local_port: int) -> List[str]:
+        """Build the cloudflared command for a quick tunnel to a local port."""
+        return [
+            self.cloudflared_binary,
+            "tunnel",
+            "--url", f"http://localhost:{local_port}",
+            "--no-autoupdate"
+        ]
+    
+    @traced("tunnel.cloudflare.wait_url", category="tunnel")
     def _create_quick_tunnel(self, local_port: int, tunnel_name: str) -> str:
         """Create a quick Cloudflare tunnel (temporary)."""
         try:
             print(f"[CloudflareManager] Creating quick tunnel for port {local_port}")
             
-            # Start cloudflared tunnel
-            cmd = [
-                self.cloudflared_binary,
-                "tunnel",
-                "--url", f"http://localhost:{local_port}",
-                "--no-autoupdate"
-            ]
-            
-            # Create log file for this tunnel
-            log_file = self.cloudflare_storage_path / f"{tunnel_name}.log"
-            
-            with open(log_file, 'w') as f:
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=f,
-                    stderr=subprocess.STDOUT,
-                    preexec_fn=os.setsid
-                )
+            # Start cloudflared under the supervisor; the URL future resolves as
+            # soon as the line appears in its output, which is logged to
+            # <tunnel_name>.log as it is read
+            handle = self.tunnel_supervisor.start(
+                tunnel_name, self._quick_tunnel_command(local_port), CLOUDFLARE_URL_PATTERN
+            )
             
             # Store process
-            tunnel_id = tunnel_name  # Use tunnel name as temporary ID
-            self.cloudflare_processes[tunnel_id] = process
+            self.cloudflare_processes[tunnel_name] = handle.process
+            self.connector_handles[tunnel_name] = handle
             
-            # Wait for tunnel to establish and extract URL
-            tunnel_url = self._extract_tunnel_url(log_file, timeout=30)
+            tunnel_url = handle.wait_for_match(timeout=self.connector_timeout)
             
             if tunnel_url:
                 return tunnel_url
             else:
-                raise RuntimeError("Failed to extract tunnel URL from logs")
+                self.cloudflare_processes.pop(tunnel_name, None)
+                self._release_connector(tunnel_name)
+                raise RuntimeError("Failed to extract tunnel URL from cloudflared output")
                 
         except Exception as e:
             print(f"[CloudflareManager] Error creating quick tunnel: {e}")
             raise
     
+    def warm_standby_pool(self, size: Optional[int] = None) -> int:
+        """
+        Pre-start standby connectors so the next tunnel is available immediately.
+        
+        Standby connectors point at the routing proxy and are claimed by
+        create_tunnel(); a claim refills the pool when it leaves it below target.
+        
+        Args:
+            size: Number of standby connectors to keep (defaults to standby_pool_size)
+        
+        Returns:
+            int: Number of connectors started
+        """
+        try:
+            proxy_port = self.routing_proxy.start()
+            return self.tunnel_supervisor.fill_standby(
+                self.standby_pool_size if size is None else size,
+                lambda: self._quick_tunnel_command(proxy_port),
+                CLOUDFLARE_URL_PATTERN
+            )
+        except Exception as e:
+            print(f"[CloudflareManager] Error warming standby connectors: {e}")
+            return 0
+    
+    @traced("tunnel.cloudflare.claim_connector", category="tunnel")
+    def _claim_connector(self, key: str) -> str:
+        """Get a connector to the routing proxy, registered under key, and return its URL."""
+        proxy_port = self.routing_proxy.start()
+        
+        handle = self.tunnel_supervisor.claim_standby(timeout=self.connector_timeout)
+        if handle is not None:
+            self.cloudflare_processes[key] = handle.process
+            self.connector_handles[key] = handle
+            tunnel_url = handle.url
+        else:
+            tunnel_url = self._create_quick_tunnel(proxy_port, key)
+        
+        # Replace what was taken so the next tunnel is immediate too
+        if self.tunnel_supervisor.standby_count() < self.standby_pool_size:
+            self.warm_standby_pool()
+        return tunnel_url
+    
+    def _attach_dedicated_connector(self, tunnel: CloudflareTunnel) -> str:
+        """Give a tunnel its own quick tunnel hostname, routed by Host header."""
+        tunnel_url = self._claim_connector(tunnel.tunnel_id)
+        self.routing_proxy.add_route(
+            tunnel.tunnel_id,
+            tunnel.local_port,
+            hostname=urlsplit(tunnel_url).hostname
+        )
+        return tunnel_url
+    
+    def _release_connector(self, key: str) -> None:
+        """Stop supervising the connector registered under key."""
+        handle = self.connector_handles.pop(key, None)
+        if handle is not None:
+            self.tunnel_supervisor.stop(handle.name, timeout=5.0)
+    
+    def _shared_connector_alive(self) -> bool:
+        """Check whether the shared connector process is running."""
+        process = self.cloudflare_processes.get(self.shared_connector_name)
+        return process is not None and process.poll() is None and bool(self.shared_connector_url)
+    
+    def _ensure_shared_connector(self) -> str:
+        """Start the routing proxy and the shared connector if needed and return its URL."""
+        with self.connector_lock:
+            if self._shared_connector_alive() and self.routing_proxy.running:
+                return self.shared_connector_url
+            
+            # Replace a dead connector
+            self.cloudflare_processes.pop(self.shared_connector_name, None)
+            self._release_connector(self.shared_connector_name)
+            
+            self.shared_connector_url = self._claim_connector(self.shared_connector_name)
+            print(f"[CloudflareManager] Shared connector up: {self.shared_connector_url}")
+            return self.shared_connector_url
+    
+    def _register_route(self, tunnel: CloudflareTunnel) -> str:
+        """Route a tunnel through the shared connector and return its public URL."""
+        base_url = self._ensure_shared_connector()
+        
+        path_prefix = make_route_prefix(tunnel.app_name or tunnel.name)
+        if self.routing_proxy.has_prefix(path_prefix):
+            path_prefix = f"{path_prefix}-{tunnel.local_port}"
+        
+        self.routing_proxy.add_route(
+            tunnel.tunnel_id,
+            tunnel.local_port,
+            path_prefix=path_prefix,
+            hostname=tunnel.config.get('hostname'),
+            strip_prefix=tunnel.config.get('strip_prefix', True)
+        )
+        tunnel.config['path_prefix'] = path_prefix
+        
+        return f"{base_url}{path_prefix}/"
+    
+    def _refresh_multiplexed_urls(self) -> None:
+        """Point every routed tunnel at the current shared connector URL."""
+        for tunnel in list(self.active_tunnels.values()):
+            if tunnel.config.get('multiplexed') and self.shared_connector_url:
+                tunnel.public_url = f"{self.shared_connector_url}{tunnel.config['path_prefix']}/"
+                self._save_tunnel_config(tunnel)
+    
+    @traced("tunnel.cloudflare.named", category="tunnel")
     def _create_named_tunnel(self, tunnel_name: str, local_port: int, 
                            protocol: CloudflareProtocol) -> str:
         """Create a named Cloudflare tunnel (persistent)."""
@@ -619,35 +782,6 @@ class CloudflareManager:
             print(f"[CloudflareManager] Error creating named tunnel: {e}")
             raise
     
-    def _extract_tunnel_url(self, log_file: Path, timeout: int = 30) -> Optional[str]:
-        """Extract tunnel URL from cloudflared logs."""
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            try:
-                if log_file.exists():
-                    content = log_file.read_text()
-                    
-                    # Look for tunnel URL patterns
-                    patterns = [
-                        r'https://[a-zA-Z0-9-]+\.trycloudflare\.com',
-                        r'https://[a-zA-Z0-9-]+\.cfargotunnel\.com'
-                    ]
-                    
-                    import re
-                    for pattern in patterns:
-                        match = re.search(pattern, content)
-                        if match:
-                            return match.group(0)
-                
-                time.sleep(1)
-                
-            except Exception as e:
-                print(f"[CloudflareManager] Error reading log file: {e}")
-                time.sleep(1)
-        
-        return None
-    
     def _extract_tunnel_id(self, output: str) -> str:
         """Extract tunnel ID from cloudflared output."""
         import re
@@ -762,6 +896,8 @@ class CloudflareManager:
     def __del__(self):
         """Cleanup when object is destroyed."""
         self.stop_monitoring()
+        self.routing_proxy.stop()
+        self.tunnel_supervisor.stop_all()
         
         # Stop all cloudflared processes
         for tunnel_id, process in self.cloudflare_processes.items():
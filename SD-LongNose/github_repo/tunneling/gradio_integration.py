@@ -28,6 +28,7 @@ sys.path.append('/workspace/SD-LongNose/github_repo')
 from environment_management.file_system import FileSystemManager
 from environment_management.json_handler import JSONHandler
 from app_analysis.webui_detector import WebUIDetector, WebUIType
+from app_analysis.app_tree import AppTree, get_app_tree
 
 
 class GradioShareMode(Enum):
@@ -144,22 +145,25 @@ class GradioIntegration:
         )
         
         try:
+            # Share one file index with the web UI detector
+            app_tree = get_app_tree(app_path)
+            
             # Use WebUIDetector to check if it's a Gradio app
-            webui_info = self.webui_detector.detect_webui_type(app_path)
+            webui_info = self.webui_detector.detect_webui(app_path, app_tree)
             
-            if webui_info.ui_type != WebUIType.GRADIO:
+            if webui_info.webui_type != WebUIType.GRADIO:
                 config.status = GradioIntegrationStatus.NOT_GRADIO
                 return config
             
             config.status = GradioIntegrationStatus.DETECTED
-            config.gradio_version = webui_info.version
+            config.gradio_version = webui_info.metadata.get("version")
             
             # Find Gradio interface files
-            interface_files = self._find_gradio_files(app_path_obj)
+            interface_files = self._find_gradio_files(app_tree)
             config.interface_files = [str(f) for f in interface_files]
             
             # Analyze existing launch parameters
-            launch_params = self._analyze_launch_parameters(interface_files)
+            launch_params = self._analyze_launch_parameters(interface_files, app_tree)
             config.launch_parameters = launch_params
             
             # Register the app
@@ -309,28 +313,10 @@ class GradioIntegration:
         if event in self.event_callbacks:
             self.event_callbacks[event].append(callback)
     
-    def _find_gradio_files(self, app_path: Path) -> List[Path]:
+    def _find_gradio_files(self, app_tree: AppTree) -> List[Path]:
         """Find all Python files that contain Gradio interfaces."""
-        gradio_files = []
-        
-        try:
-            # Search for Python files with Gradio patterns
-            for py_file in app_path.rglob("*.py"):
-                if self._contains_gradio_interface(py_file):
-                    gradio_files.append(py_file)
-            
-            return gradio_files
-            
-        except Exception as e:
-            print(f"[GradioIntegration] Error finding Gradio files: {e}")
-            return []
-    
-    def _contains_gradio_interface(self, file_path: Path) -> bool:
-        """Check if a Python file contains Gradio interface code."""
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            
-            # Check for Gradio import and interface patterns
+            # Gradio import and interface patterns
             gradio_indicators = [
                 'import gradio',
                 'from gradio',
@@ -343,18 +329,23 @@ class GradioIntegration:
                 '.queue().launch('
             ]
             
-            return any(indicator in content for indicator in gradio_indicators)
+            # Answered from the detector's signature index, without rereading files
+            gradio_files = self.webui_detector.find_files_with_signatures(app_tree, gradio_indicators)
+            return [Path(file_path) for file_path in gradio_files if file_path.endswith('.py')]
             
-        except Exception:
-            return False
+        except Exception as e:
+            print(f"[GradioIntegration] Error finding Gradio files: {e}")
+            return []
     
-    def _analyze_launch_parameters(self, interface_files: List[Path]) -> Dict[str, Any]:
+    def _analyze_launch_parameters(self, interface_files: List[Path], app_tree: AppTree) -> Dict[str, Any]:
         """Analyze existing launch parameters in Gradio files."""
         launch_params = {}
         
         try:
             for file_path in interface_files:
-                content = file_path.read_text(encoding='utf-8', errors='ignore')
+                content = app_tree.read_text(str(file_path), fallback_encoding='latin-1')
+                if content is None:
+                    continue
                 
                 # Find launch() calls
                 launch_matches = re.finditer(r'\.launch\s*\([^)]*\)', content)
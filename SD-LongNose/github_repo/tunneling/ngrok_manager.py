@@ -29,6 +29,8 @@ sys.path.append('/workspace/SD-LongNose/github_repo')
 from environment_management.shell_runner import ShellRunner
 from environment_management.json_handler import JSONHandler
 from cloud_detection.cloud_detector import CloudDetector
+from environment_management.tracing import traced
+from tunneling.tunnel_supervisor import TunnelSupervisor, NGROK_READY_PATTERN
 
 
 class NgrokStatus(Enum):
@@ -109,6 +111,9 @@ class NgrokManager:
         # Ngrok configuration
         self.ngrok_api_url = "http://localhost:4040/api"
         self.ngrok_process = None
+        self.ngrok_handle = None
+        self.ngrok_start_timeout = 10.0
+        self.tunnel_supervisor = TunnelSupervisor(str(self.ngrok_storage_path / "logs"))
         self.ngrok_config_path = self.ngrok_storage_path / "ngrok.yml"
         self.auth_token = None
         
@@ -139,6 +144,7 @@ class NgrokManager:
         
         print(f"[NgrokManager] Initialized for platform: {self.platform_info.platform}")
     
+    @traced("tunnel.ngrok.create", category="tunnel", record_args=("local_port", "app_name"))
     def create_tunnel(self, local_port: int, app_name: str = None,
                      protocol: NgrokProtocol = NgrokProtocol.HTTP,
                      config: Dict[str, Any] = None) -> NgrokTunnel:
@@ -174,7 +180,6 @@ class NgrokManager:
             # Ensure ngrok is running
             if not self._is_ngrok_running():
                 self._start_ngrok()
-                time.sleep(3)  # Wait for ngrok to start
             
             # Create tunnel via ngrok API
             tunnel_config = {
@@ -536,6 +541,7 @@ class NgrokManager:
             self.monitoring_active = True
             self.monitoring_thread = threading.Thread(
                 target=self._monitoring_loop,
+                name="NgrokManager-monitor",
                 daemon=True
             )
             self.monitoring_thread.start()
@@ -636,6 +642,7 @@ class NgrokManager:
         except Exception as e:
             print(f"[NgrokManager] Error creating ngrok config: {e}")
     
+    @traced("tunnel.ngrok.start_agent", category="tunnel")
     def _start_ngrok(self) -> None:
         """Start ngrok service."""
         try:
@@ -645,22 +652,22 @@ class NgrokManager:
             
             print("[NgrokManager] Starting ngrok service...")
             
-            # Start ngrok with configuration
-            cmd = f"ngrok start --config {self.ngrok_config_path} --none"
+            # Start ngrok with configuration, logging to stdout so readiness is
+            # seen the moment its web service comes up
+            cmd = [
+                "ngrok", "start",
+                "--config", str(self.ngrok_config_path),
+                "--none",
+                "--log", "stdout"
+            ]
             
-            self.ngrok_process = subprocess.Popen(
-                cmd.split(),
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                preexec_fn=os.setsid
-            )
+            self.ngrok_handle = self.tunnel_supervisor.start("ngrok", cmd, NGROK_READY_PATTERN)
+            self.ngrok_process = self.ngrok_handle.process
             
-            # Wait for ngrok to start
-            for _ in range(10):  # Wait up to 10 seconds
-                time.sleep(1)
-                if self._is_ngrok_running():
-                    print("[NgrokManager] Ngrok started successfully")
-                    return
+            # Wait for the readiness line, then confirm the API answers
+            if self.ngrok_handle.wait_for_match(self.ngrok_start_timeout) is not None and self._is_ngrok_running():
+                print("[NgrokManager] Ngrok started successfully")
+                return
             
             print("[NgrokManager] Ngrok failed to start within timeout")
             
@@ -737,6 +744,11 @@ class NgrokManager:
                 os.killpg(os.getpgid(self.ngrok_process.pid), 9)
             except:
                 pass
+        
+        try:
+            self.tunnel_supervisor.stop_all()
+        except Exception:
+            pass
 
 
 def main():
@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+PinokioCloud Routing Proxy
+
+This module provides the local reverse proxy that lets a single tunnel
+connector expose many applications. Requests are routed to local apps by
+Host header or by path prefix (e.g. /comfyui/...), WebSocket upgrades are
+passed through as raw byte streams (Gradio queues, Streamlit sessions), and
+routes can be added or removed while the proxy is serving, so exposing a new
+app does not need a new tunnel.
+
+The proxy only listens on localhost and has no external dependencies, so it
+can be exercised without network access.
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import re
+import time
+import asyncio
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime
+from urllib.parse import urlsplit
+
+
+# Hop-by-hop headers that are not forwarded on plain HTTP requests
+HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'proxy-connection', 'te', 'trailer', 'upgrade'}
+
+# Largest request head (request line plus headers) accepted from clients
+MAX_HEAD_SIZE = 64 * 1024
+
+
+@dataclass
+class ProxyRoute:
+    """A local application reachable through the routing proxy."""
+    name: str
+    local_port: int
+    path_prefix: Optional[str] = None
+    hostname: Optional[str] = None
+    strip_prefix: bool = True
+    created_at: datetime = field(default_factory=datetime.now)
+    requests: int = 0
+    websockets: int = 0
+    last_request_at: Optional[float] = None
+
+
+def make_route_prefix(name: str) -> str:
+    """Turn an application name into a URL path prefix."""
+    slug = re.sub(r'[^a-z0-9-]+', '-', name.lower()).strip('-')
+    return f"/{slug or 'app'}"
+
+
+class RoutingProxy:
+    """
+    Host/path routing HTTP and WebSocket reverse proxy.
+
+    The proxy runs its own asyncio event loop on a background thread, so it
+    can be driven from the thread-based tunnel managers.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 upstream_host: str = "127.0.0.1", connect_timeout: float = 10.0):
+        """
+        Initialize the routing proxy.
+
+        Args:
+            host: Address to listen on
+            port: Port to listen on (0 picks a free port)
+            upstream_host: Address the routed applications listen on
+            connect_timeout: Seconds to wait for an application connection
+        """
+        self.host = host
+        self.port = port
+        self.upstream_host = upstream_host
+        self.connect_timeout = connect_timeout
+
+        self.routes: Dict[str, ProxyRoute] = {}
+        self.prefix_routes: List[ProxyRoute] = []  # longest prefix first
+        self.routes_lock = threading.RLock()
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.server = None
+        self.thread: Optional[threading.Thread] = None
+        self.ready = threading.Event()
+        self.start_error: Optional[Exception] = None
+
+        self.stats = {'requests': 0, 'websockets': 0, 'not_found': 0, 'upstream_errors': 0}
+
+    @property
+    def running(self) -> bool:
+        """Whether the proxy is serving."""
+        return self.thread is not None and self.thread.is_alive() and self.server is not None
+
+    def start(self) -> int:
+        """
+        Start serving on a background thread.
+
+        Returns:
+            int: Port the proxy listens on
+
+        Raises:
+            RuntimeError: If the proxy cannot start listening
+        """
+        if self.running:
+            return self.port
+
+        self.ready.clear()
+        self.start_error = None
+        self.thread = threading.Thread(target=self._run_loop, name="RoutingProxy", daemon=True)
+        self.thread.start()
+        self.ready.wait(timeout=10.0)
+
+        if self.start_error is not None or self.server is None:
+            raise RuntimeError(f"Routing proxy failed to start: {self.start_error}")
+
+        print(f"[RoutingProxy] Listening on {self.host}:{self.port}")
+        return self.port
+
+    def stop(self) -> None:
+        """Stop serving and close open connections."""
+        if self.loop is not None and self.thread is not None and self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=5.0)
+        self.server = None
+
+    def add_route(self, name: str, local_port: int, path_prefix: Optional[str] = None,
+                  hostname: Optional[str] = None, strip_prefix: bool = True) -> ProxyRoute:
+        """
+        Add or replace a route.
+
+        Args:
+            name: Unique route name
+            local_port: Port the application listens on
+            path_prefix: Path prefix routed to the application (e.g. "/comfyui")
+            hostname: Host header routed to the application
+            strip_prefix: Whether the prefix is removed before forwarding
+
+        Returns:
+            ProxyRoute: The registered route
+        """
+        if path_prefix is not None:
+            path_prefix = '/' + path_prefix.strip('/')
+
+        route = ProxyRoute(
+            name=name,
+            local_port=local_port,
+            path_prefix=path_prefix,
+            hostname=hostname.lower() if hostname else None,
+            strip_prefix=strip_prefix
+        )
+
+        with self.routes_lock:
+            self.routes[name] = route
+            self._rebuild_prefix_index()
+
+        return route
+
+    def remove_route(self, name: str) -> bool:
+        """
+        Remove a route.
+
+        Args:
+            name: Route name
+
+        Returns:
+            bool: True if the route existed
+        """
+        with self.routes_lock:
+            if self.routes.pop(name, None) is None:
+                return False
+            self._rebuild_prefix_index()
+            return True
+
+    def get_route(self, name: str) -> Optional[ProxyRoute]:
+        """Get a route by name."""
+        return self.routes.get(name)
+
+    def list_routes(self) -> List[ProxyRoute]:
+        """Get all routes."""
+        with self.routes_lock:
+            return list(self.routes.values())
+
+    def has_prefix(self, path_prefix: str) -> bool:
+        """Check whether a path prefix is already routed."""
+        path_prefix = '/' + path_prefix.strip('/')
+        with self.routes_lock:
+            return any(route.path_prefix == path_prefix for route in self.routes.values())
+
+    def resolve(self, host: Optional[str], path: str,
+                referer: Optional[str] = None) -> Tuple[Optional[ProxyRoute], str]:
+        """
+        Choose the route for a request.
+
+        Host routes win, then the longest matching path prefix. Requests for
+        absolute paths outside any prefix (assets referenced as /assets/...)
+        follow the prefix of their Referer, and with a single route that is
+        not bound to a hostname every request goes to it.
+
+        Args:
+            host: Host header
+            path: Request path including the query string
+            referer: Referer header
+
+        Returns:
+            (route, upstream path); route is None if nothing matches
+        """
+        with self.routes_lock:
+            routes = list(self.routes.values())
+            prefix_routes = self.prefix_routes
+
+        if host:
+            hostname = host.rsplit(':', 1)[0].lower() if not host.endswith(']') else host.lower()
+            for route in routes:
+                if route.hostname and route.hostname == hostname:
+                    return route, path
+
+        route = self._match_prefix(prefix_routes, path)
+        if route is not None:
+            if not route.strip_prefix:
+                return route, path
+            remainder = path[len(route.path_prefix):]
+            if not remainder.startswith('/'):
+                remainder = '/' + remainder
+            return route, remainder
+
+        if referer:
+            route = self._match_prefix(prefix_routes, urlsplit(referer).path or '/')
+            if route is not None:
+                return route, path
+
+        unbound = [route for route in routes if not route.hostname]
+        if len(unbound) == 1:
+            return unbound[0], path
+
+        return None, path
+
+    def _match_prefix(self, prefix_routes: List[ProxyRoute], path: str) -> Optional[ProxyRoute]:
+        """Find the longest path prefix route matching a path."""
+        for route in prefix_routes:
+            prefix = route.path_prefix
+            if path.startswith(prefix):
+                rest = path[len(prefix):]
+                if not rest or rest[0] in '/?':
+                    return route
+        return None
+
+    def _rebuild_prefix_index(self) -> None:
+        """Rebuild the longest-prefix-first route list (lock must be held)."""
+        self.prefix_routes = sorted(
+            (route for route in self.routes.values() if route.path_prefix),
+            key=lambda route: len(route.path_prefix),
+            reverse=True
+        )
+
+    def _run_loop(self) -> None:
+        """Event loop thread body."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self.loop = loop
+
+        try:
+            self.server = loop.run_until_complete(asyncio.start_server(
+                self._handle_client, self.host, self.port, limit=MAX_HEAD_SIZE
+            ))
+            self.port = self.server.sockets[0].getsockname()[1]
+        except Exception as e:
+            self.start_error = e
+            self.server = None
+            self.ready.set()
+            loop.close()
+            return
+
+        self.ready.set()
+
+        try:
+            loop.run_forever()
+        finally:
+            server = self.server
+            self.server = None
+            server.close()
+            loop.run_until_complete(server.wait_closed())
+
+            tasks = [task for task in asyncio.all_tasks(loop) if not task.done()]
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Route one client connection."""
+        upstream_writer = None
+        try:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except asyncio.LimitOverrunError:
+                await self._send_error(writer, 431, "Request Header Fields Too Large")
+                return
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+
+            request = self._parse_head(head)
+            if request is None:
+                await self._send_error(writer, 400, "Bad Request")
+                return
+            method, target, version, headers = request
+
+            header_map = {name.lower(): value for name, value in headers}
+            upgrade = 'upgrade' in header_map.get('connection', '').lower() and 'upgrade' in header_map
+
+            route, upstream_path = self.resolve(header_map.get('host'), target, header_map.get('referer'))
+            if route is None:
+                self.stats['not_found'] += 1
+                await self._send_error(writer, 404, "No application is routed at this path")
+                return
+
+            # Send /app to /app/ so relative links in the page resolve under the prefix
+            if route.path_prefix and route.strip_prefix and target.split('?', 1)[0] == route.path_prefix:
+                query = target[len(route.path_prefix):]
+                await self._send_redirect(writer, route.path_prefix + '/' + query)
+                return
+
+            try:
+                upstream_reader, upstream_writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.upstream_host, route.local_port),
+                    timeout=self.connect_timeout
+                )
+            except (OSError, asyncio.TimeoutError):
+                self.stats['upstream_errors'] += 1
+                await self._send_error(writer, 502, f"Application '{route.name}' is not reachable")
+                return
+
+            route.requests += 1
+            route.last_request_at = time.time()
+            self.stats['requests'] += 1
+            if upgrade:
+                route.websockets += 1
+                self.stats['websockets'] += 1
+
+            peer = writer.get_extra_info('peername')
+            prefix = route.path_prefix if upstream_path != target else None
+            upstream_writer.write(self._build_head(
+                method, upstream_path, version, headers, prefix, upgrade,
+                peer[0] if peer else None
+            ))
+            await upstream_writer.drain()
+
+            # Plain requests are sent with Connection: close, so the response
+            # ends when the application closes; upgrades stream until either side closes
+            to_client = asyncio.ensure_future(self._pipe(upstream_reader, writer))
+            to_upstream = asyncio.ensure_future(self._pipe(reader, upstream_writer))
+            done, pending = await asyncio.wait({to_client, to_upstream}, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[RoutingProxy] Error handling request: {e}")
+        finally:
+            for stream in (upstream_writer, writer):
+                if stream is not None:
+                    try:
+                        stream.close()
+                    except Exception:
+                        pass
+
+    def _parse_head(self, head: bytes) -> Optional[Tuple[str, str, str, List[Tuple[str, str]]]]:
+        """Parse a request head into (method, target, version, headers)."""
+        try:
+            lines = head.decode('latin-1').split('\r\n')
+            method, target, version = lines[0].split(' ', 2)
+        except ValueError:
+            return None
+
+        # Absolute-form targets (http://host/path) are reduced to the path
+        if not target.startswith('/'):
+            parts = urlsplit(target)
+            if not parts.scheme:
+                return None
+            target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+        headers = []
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, sep, value = line.partition(':')
+            if not sep:
+                return None
+            headers.append((name.strip(), value.strip()))
+
+        return method, target, version, headers
+
+    def _build_head(self, method: str, path: str, version: str, headers: List[Tuple[str, str]],
+                    prefix: Optional[str], upgrade: bool, client_ip: Optional[str]) -> bytes:
+        """Build the request head forwarded to the application."""
+        lines = [f"{method} {path} {version}"]
+        forwarded_host = None
+        forwarded_proto = None
+
+        for name, value in headers:
+            lower = name.lower()
+            if lower == 'host':
+                forwarded_host = value
+            elif lower == 'x-forwarded-proto':
+                forwarded_proto = value
+            elif lower in ('x-forwarded-host', 'x-forwarded-prefix'):
+                continue
+            if not upgrade and lower in HOP_BY_HOP_HEADERS:
+                continue
+            lines.append(f"{name}: {value}")
+
+        if not upgrade:
+            lines.append("Connection: close")
+        if forwarded_host:
+            lines.append(f"X-Forwarded-Host: {forwarded_host}")
+        if forwarded_proto is None:
+            lines.append("X-Forwarded-Proto: https")
+        if prefix:
+            lines.append(f"X-Forwarded-Prefix: {prefix}")
+        if client_ip:
+            lines.append(f"X-Forwarded-For: {client_ip}")
+
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    async def _pipe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Copy bytes from reader to writer until EOF."""
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+
+    async def _send_error(self, writer: asyncio.StreamWriter, status: int, message: str) -> None:
+        """Send a plain-text error response."""
+        body = message.encode('utf-8')
+        reason = {400: "Bad Request", 404: "Not Found", 431: "Request Header Fields Too Large",
+                  502: "Bad Gateway"}.get(status, "Error")
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: text/plain; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body
+        )
+        try:
+            await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+
+    async def _send_redirect(self, writer: asyncio.StreamWriter, location: str) -> None:
+        """Send a permanent redirect."""
+        writer.write(
+            f"HTTP/1.1 301 Moved Permanently\r\nLocation: {location}\r\n"
+            f"Content-Length: 0\r\nConnection: close\r\n\r\n".encode('latin-1')
+        )
+        try:
+            await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+
+    def get_port_activity(self) -> Dict[int, float]:
+        """
+        Get when each local port last received a proxied request.
+
+        Usable as an activity source for running.hibernation.HibernationManager.
+
+        Returns:
+            Dict[int, float]: Epoch time of the latest request by local port
+        """
+        activity: Dict[int, float] = {}
+        for route in self.list_routes():
+            if route.last_request_at is not None:
+                activity[route.local_port] = max(activity.get(route.local_port, 0.0), route.last_request_at)
+        return activity
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get proxy statistics."""
+        return {
+            **self.stats,
+            'running': self.running,
+            'port': self.port,
+            'routes': len(self.routes)
+        }
@@ -29,6 +29,7 @@ import json
 sys.path.append('/workspace/SD-LongNose/github_repo')
 from running.process_tracker import ProcessTracker
 from running.script_manager import ScriptManager
+from running.port_allocator import get_port_allocator
 from app_analysis.webui_detector import WebUIDetector, WebUIType
 
 
@@ -138,6 +139,7 @@ class ServerDetector:
         # Integration with previous phases
         self.process_tracker = ProcessTracker(str(self.base_path))
         self.webui_detector = WebUIDetector(str(self.base_path))
+        self.port_allocator = get_port_allocator()
         
         # Monitoring
         self.monitoring_active = False
@@ -266,13 +268,20 @@ class ServerDetector:
         except Exception:
             return True
     
-    def find_available_port(self, start_port: int = 7860, end_port: int = 7900) -> int:
+    def find_available_port(self, start_port: int = 7860, end_port: int = 7900,
+                            app_name: str = "server", pid: Optional[int] = None) -> int:
         """
-        Find the next available port in a range.
+        Reserve the next available port in a range.
+        
+        The port is leased through the shared port allocator, so no other
+        launcher is handed the same port until the lease holder exits or the
+        port is released with release_port().
         
         Args:
             start_port: Starting port number
             end_port: Ending port number
+            app_name: Name of the application the port is for
+            pid: PID holding the lease (defaults to the calling process)
         
         Returns:
             int: Available port number
@@ -280,11 +289,11 @@ class ServerDetector:
         Raises:
             RuntimeError: If no available port is found
         """
-        for port in range(start_port, end_port + 1):
-            if self.is_port_available(port):
-                return port
-        
-        raise RuntimeError(f"No available port found in range {start_port}-{end_port}")
+        return self.port_allocator.allocate(app_name, start_port, end_port, pid=pid)
+    
+    def release_port(self, port: int) -> bool:
+        """Release a port reserved with find_available_port()."""
+        return self.port_allocator.release(port)
     
     def start_monitoring(self) -> None:
         """Start continuous server monitoring."""
@@ -292,6 +301,7 @@ class ServerDetector:
             self.monitoring_active = True
             self.monitoring_thread = threading.Thread(
                 target=self._monitoring_loop,
+                name="ServerDetector-monitor",
                 daemon=True
             )
             self.monitoring_thread.start()
@@ -14,6 +14,7 @@ import sys
 import time
 import subprocess
 import tempfile
+import shutil
 import threading
 import socket
 from pathlib import Path
@@ -29,6 +30,9 @@ from tunneling.ngrok_manager import NgrokManager, NgrokStatus, NgrokProtocol
 from tunneling.cloudflare_manager import CloudflareManager, CloudflareStatus
 from tunneling.gradio_integration import GradioIntegration, GradioShareMode
 from tunneling.url_manager import URLManager, TunnelType, URLStatus
+from tunneling.routing_proxy import RoutingProxy
+from app_analysis.app_tree import AppTree, SignatureMatcher
+from app_analysis.webui_detector import WebUIDetector, WebUIType
 
 
 class TestWebServer:
@@ -241,6 +245,47 @@ if __name__ == "__main__":
         
         print("[TEST] ✅ Cloudflare Manager Basic - PASSED")
     
+    def test_routing_proxy(self):
+        """Test the local routing proxy used by multiplexed tunnels (no network needed)."""
+        print("\n[TEST] Routing Proxy")
+        
+        import urllib.request
+        
+        proxy = RoutingProxy()
+        proxy_port = proxy.start()
+        
+        try:
+            proxy.add_route('gradio', 8001, path_prefix='/gradio')
+            proxy.add_route('streamlit', 8002, path_prefix='/streamlit')
+            
+            # Path prefixes route to the right app
+            for prefix, marker in (('/gradio/', 'gradio test server'), ('/streamlit/', 'streamlit test server')):
+                body = urllib.request.urlopen(f"http://127.0.0.1:{proxy_port}{prefix}", timeout=5).read().decode()
+                self.assertIn(marker, body)
+            
+            # Absolute asset paths follow the Referer's prefix
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{proxy_port}/assets/app.js",
+                headers={'Referer': f"http://127.0.0.1:{proxy_port}/streamlit/"}
+            )
+            self.assertIn('streamlit test server', urllib.request.urlopen(request, timeout=5).read().decode())
+            
+            # WebSocket upgrades are forwarded with their Upgrade headers intact
+            with socket.create_connection(('127.0.0.1', proxy_port), timeout=5) as sock:
+                sock.sendall(b"GET /gradio/queue/join HTTP/1.1\r\nHost: localhost\r\n"
+                             b"Connection: Upgrade\r\nUpgrade: websocket\r\n\r\n")
+                self.assertTrue(sock.recv(1024).startswith(b"HTTP/1."))
+            self.assertEqual(proxy.get_route('gradio').websockets, 1)
+            
+            # Removed routes are no longer served (the remaining route takes unmatched paths)
+            proxy.remove_route('gradio')
+            body = urllib.request.urlopen(f"http://127.0.0.1:{proxy_port}/gradio/", timeout=5).read().decode()
+            self.assertNotIn('gradio test server', body)
+        finally:
+            proxy.stop()
+        
+        print("[TEST] ✅ Routing Proxy - PASSED")
+    
     def test_gradio_integration(self):
         """Test Gradio integration functionality."""
         print("\n[TEST] Gradio Integration")
@@ -424,6 +469,77 @@ if __name__ == "__main__":
         print("[TEST] ✅ Performance Requirements - PASSED")
 
 
+class TestWebUISignatures(unittest.TestCase):
+    """Signature matching and the persisted per-file signature index."""
+    
+    def setUp(self):
+        """Create a small app with a Gradio and a Flask entry point."""
+        self.base_path = tempfile.mkdtemp(prefix="pinokio_phase7_")
+        self.app_path = os.path.join(self.base_path, "apps", "demo")
+        self.write("app.py", "import gradio as gr\ndemo = gr.Blocks()\ndemo.launch()\n")
+        self.write("server.py", "print('no framework here')\n")
+        self.write("README.txt", "import gradio\n")
+    
+    def tearDown(self):
+        shutil.rmtree(self.base_path, ignore_errors=True)
+    
+    def write(self, name: str, content: str):
+        os.makedirs(self.app_path, exist_ok=True)
+        with open(os.path.join(self.app_path, name), 'w') as f:
+            f.write(content)
+    
+    def test_signature_matcher(self):
+        """All occurring signatures are found, including ones inside longer ones."""
+        matcher = SignatureMatcher(["import gradio", "gradio", "from flask", ""])
+        
+        self.assertEqual(matcher.signatures, frozenset(["import gradio", "gradio", "from flask"]))
+        self.assertEqual(matcher.match("import gradio as gr"), {"import gradio", "gradio"})
+        self.assertEqual(matcher.match("from fastapi import FastAPI"), set())
+        self.assertEqual(matcher.match(""), set())
+        
+        # The cache key depends on the signature set, not its order
+        self.assertEqual(matcher.key, SignatureMatcher(["from flask", "gradio", "import gradio"]).key)
+        self.assertNotEqual(matcher.key, SignatureMatcher(["gradio"]).key)
+    
+    def test_file_signatures_are_persisted(self):
+        """Unchanged files are answered from the stored index, even by a new detector."""
+        detector = WebUIDetector(self.base_path)
+        tree = AppTree(self.app_path)
+        signatures = detector.get_file_signatures(tree)
+        
+        self.assertEqual(set(signatures), {"app.py", "server.py"})
+        self.assertIn("import gradio", signatures["app.py"])
+        self.assertIn("gr.Blocks", signatures["app.py"])
+        self.assertEqual(signatures["server.py"], frozenset())
+        self.assertEqual(tree.cache_misses, 2)
+        
+        # A fresh process reads nothing while the files are unchanged
+        restarted = WebUIDetector(self.base_path)
+        tree = AppTree(self.app_path)
+        self.assertEqual(restarted.get_file_signatures(tree), signatures)
+        self.assertEqual(tree.cache_misses, 0)
+        
+        # Only the edited file is rescanned; deleted files drop out
+        self.write("server.py", "from flask import Flask\napp = Flask(__name__)\napp.run()\n")
+        os.remove(os.path.join(self.app_path, "app.py"))
+        tree = AppTree(self.app_path)
+        signatures = restarted.get_file_signatures(tree)
+        self.assertEqual(set(signatures), {"server.py"})
+        self.assertIn("from flask", signatures["server.py"])
+        self.assertEqual(tree.cache_misses, 1)
+        self.assertEqual(restarted.detect_webui(self.app_path, tree).webui_type, WebUIType.FLASK)
+    
+    def test_find_files_with_signatures(self):
+        """Known signatures come from the index; others are searched for in the files."""
+        detector = WebUIDetector(self.base_path)
+        tree = AppTree(self.app_path)
+        app_file = os.path.join(self.app_path, "app.py")
+        
+        self.assertEqual(detector.find_files_with_signatures(tree, ["gr.Blocks"]), [app_file])
+        self.assertEqual(detector.find_files_with_signatures(tree, ["demo.launch"]), [app_file])
+        self.assertEqual(detector.find_files_with_signatures(tree, ["no such call"]), [])
+
+
 def run_basic_phase7_tests():
     """Run basic Phase 7 tests without complex dependencies."""
     print("=" * 60)
@@ -547,6 +663,7 @@ def run_phase7_tests():
     
     # Create test suite
     suite = unittest.TestLoader().loadTestsFromTestCase(TestPhase7Integration)
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestWebUISignatures))
     
     # Run tests with detailed output
     runner = unittest.TextTestRunner(verbosity=2, stream=sys.stdout)
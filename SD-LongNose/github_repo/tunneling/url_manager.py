@@ -499,6 +499,7 @@ class URLManager:
             self.monitoring_active = True
             self.monitoring_thread = threading.Thread(
                 target=self._monitoring_loop,
+                name="URLManager-monitor",
                 daemon=True
             )
             self.monitoring_thread.start()
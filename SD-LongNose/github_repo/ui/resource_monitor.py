@@ -31,6 +31,7 @@ sys.path.append('/workspace/SD-LongNose/github_repo')
 
 from optimization.performance_monitor import PerformanceMonitor
 from cloud_detection.cloud_detector import CloudDetector
+from cloud_detection.metrics_collector import get_metrics_collector
 from optimization.logging_system import LoggingSystem
 
 
@@ -70,6 +71,7 @@ class ResourceMonitor:
             performance_monitor: Performance monitoring system
         """
         self.performance_monitor = performance_monitor
+        self.metrics_collector = get_metrics_collector()
         self.cloud_detector = CloudDetector()
         self.logging_system = LoggingSystem()
         
@@ -98,9 +100,10 @@ class ResourceMonitor:
         self.platform_info = self.cloud_detector.detect_platform()
         
     def get_current_metrics(self) -> Dict[str, Any]:
-        """Get current system metrics."""
+        """Get current system metrics from the shared collector's latest snapshot."""
         try:
-            return self.performance_monitor.get_current_metrics()
+            snapshot = self.metrics_collector.get_snapshot()
+            return snapshot.to_dict() if snapshot else {}
         except Exception as e:
             self.logging_system.log_error("Failed to get current metrics", {"error": str(e)})
             return {}
@@ -28,6 +28,7 @@ sys.path.append('/workspace/SD-LongNose/github_repo')
 from cloud_detection.cloud_detector import CloudDetector
 from environment_management.venv_manager import VirtualEnvironmentManager
 from environment_management.file_system import FileSystemManager
+from environment_management.tracing import get_tracer
 from app_analysis.app_analyzer import AppAnalyzer
 from dependencies.dependency_finder import DependencyFinder
 from engine.installer import ApplicationInstaller
@@ -37,6 +38,7 @@ from platforms.colab_optimizer import ColabOptimizer
 from optimization.cache_manager import CacheManager
 from optimization.performance_monitor import PerformanceMonitor
 from optimization.logging_system import LoggingSystem
+from optimization.sampling_profiler import get_profiler, format_result
 
 # Import UI components
 from .terminal_widget import TerminalWidget
@@ -245,6 +247,10 @@ class PinokioCloudApp:
             self.cache_manager = CacheManager()
             self.performance_monitor = PerformanceMonitor()
             
+            # Answer profile dump requests from optimization/sampling_profiler.py --pid
+            self.profiler = get_profiler()
+            self.profiler.enable_dump_requests()
+            
             # Initialize UI components
             self.terminal_widget = TerminalWidget()
             self.app_gallery = AppGallery(st.session_state.apps_data)
@@ -302,6 +308,8 @@ class PinokioCloudApp:
                 "📊 Resource Monitor": "resources", 
                 "🌐 Tunnel Dashboard": "tunnels",
                 "📺 Terminal": "terminal",
+                "🔥 Install Traces": "traces",
+                "🩺 Diagnostics": "diagnostics",
                 "⚙️ Settings": "settings"
             }
             
@@ -357,6 +365,10 @@ class PinokioCloudApp:
             self.render_tunnels_page()
         elif current_page == "terminal":
             self.render_terminal_page()
+        elif current_page == "traces":
+            self.render_traces_page()
+        elif current_page == "diagnostics":
+            self.render_diagnostics_page()
         elif current_page == "settings":
             self.render_settings_page()
             
@@ -396,6 +408,121 @@ class PinokioCloudApp:
         st.markdown("## 📺 Terminal")
         self.terminal_widget.render_terminal()
         
+    def render_traces_page(self):
+        """Render the per-install trace page (flame summary of recorded spans)."""
+        st.markdown("## 🔥 Install Traces")
+        tracer = get_tracer()
+        
+        record = st.checkbox("Record traces", value=tracer.enabled,
+                             help="Time installer, runner and tunnel phases (PINOKIO_TRACE=1 enables this at startup)")
+        if record and not tracer.enabled:
+            tracer.enable()
+        elif not record and tracer.enabled:
+            tracer.disable()
+        
+        traces = tracer.get_traces(category="install")
+        if not traces:
+            st.info("No installation traces yet. Enable recording and install an application.")
+            return
+        
+        options = {
+            f"{trace.attributes.get('app_name', trace.name)} ({trace.duration_ns / 1e9:.1f}s, trace {trace.trace_id})": trace
+            for trace in traces
+        }
+        trace = options[st.selectbox("Installation", list(options.keys()))]
+        rows = tracer.flame_summary(trace.trace_id)
+        slowest = max(rows, key=lambda row: row['self_ns'])
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Time", f"{trace.duration_ns / 1e9:.1f}s")
+        with col2:
+            st.metric("Spans", sum(row['count'] for row in rows))
+        with col3:
+            st.metric("Slowest Phase", slowest['name'], f"{slowest['self_ns'] / 1e9:.1f}s self", delta_color="off")
+        
+        # Flame summary: one bar per call path, indented by depth
+        st.markdown("### Time by Phase")
+        for row in rows:
+            indent = "&nbsp;" * 6 * row['depth']
+            st.markdown(
+                f"{indent}**{row['name']}** ×{row['count']} · {row['total_ns'] / 1e9:.2f}s total · "
+                f"{row['self_ns'] / 1e9:.2f}s self · {row['percent']:.1f}%",
+                unsafe_allow_html=True
+            )
+            st.progress(min(row['percent'] / 100, 1.0))
+        
+        st.download_button(
+            label="Download Chrome Trace",
+            data=json.dumps(tracer.export_chrome_trace(trace_id=trace.trace_id)),
+            file_name=f"install_trace_{trace.trace_id}.json",
+            mime="application/json"
+        )
+        
+    def render_diagnostics_page(self):
+        """Render the diagnostics page (sampling profiler and per-thread CPU time)."""
+        st.markdown("## 🩺 Diagnostics")
+        st.caption(f"Launcher PID {os.getpid()} · dump from a shell with "
+                   f"`python optimization/sampling_profiler.py --pid {os.getpid()}`")
+        
+        # Cumulative CPU time per thread since it started
+        st.markdown("### 🧵 Threads")
+        st.dataframe([
+            {"Thread": thread.label, "TID": thread.native_id, "CPU (s)": round(thread.cpu_seconds, 2)}
+            for thread in self.profiler.get_thread_cpu_snapshot()
+        ], use_container_width=True)
+        
+        # Sampling session
+        st.markdown("### 🔬 Sampling Profile")
+        col1, col2 = st.columns(2)
+        with col1:
+            duration = st.slider("Duration (seconds)", 1, 60, 10)
+        with col2:
+            hz = st.slider("Sample rate (Hz)", 10, 500, 100)
+        
+        if st.button("Profile", disabled=self.profiler.is_running):
+            with st.spinner(f"Sampling all threads for {duration}s..."):
+                st.session_state.profile_result = self.profiler.profile(duration, hz)
+        
+        result = st.session_state.get('profile_result')
+        if result is None:
+            st.info("Run a profile to see which threads are using CPU.")
+            return
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Samples", result.sample_count)
+        with col2:
+            st.metric("Duration", f"{result.duration:.1f}s")
+        with col3:
+            busiest = result.threads[0].label if result.threads else "-"
+            st.metric("Busiest Thread", busiest)
+        
+        st.dataframe([
+            {"Thread": thread.label, "CPU (s)": round(thread.cpu_seconds, 2),
+             "CPU %": round(thread.cpu_percent, 1), "Samples": thread.samples}
+            for thread in result.threads
+        ], use_container_width=True)
+        
+        st.markdown("### 📚 Top Stacks")
+        st.code("\n".join(f"{count:6d}  {stack}" for stack, count in result.top_stacks(20)))
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="Download Collapsed Stacks",
+                data=result.to_collapsed(),
+                file_name=f"profile_{os.getpid()}.collapsed",
+                mime="text/plain"
+            )
+        with col2:
+            st.download_button(
+                label="Download Report",
+                data=format_result(result),
+                file_name=f"profile_{os.getpid()}.txt",
+                mime="text/plain"
+            )
+        
     def render_settings_page(self):
         """Render the settings page."""
         st.markdown("## ⚙️ Settings")
@@ -29,6 +29,7 @@ from ui.terminal_widget import TerminalWidget, LogLevel, ANSIConverter
 from ui.app_gallery import AppGallery, AppStatus
 from ui.resource_monitor import ResourceMonitor, AlertLevel
 from ui.tunnel_dashboard import TunnelDashboard, TunnelHealth
+from ui_enhanced.terminal_buffer import TerminalRingBuffer, TerminalView
 
 # Import backend systems for mocking
 from optimization.performance_monitor import PerformanceMonitor
@@ -381,6 +382,93 @@ class TestPhase11Components(unittest.TestCase):
         print("✅ Production quality test passed")
 
 
+class TestTerminalRingBuffer(unittest.TestCase):
+    """Test suite for the enhanced terminal's ring buffer and views."""
+    
+    def render(self, message):
+        """Renderer that counts its calls."""
+        self.render_calls += 1
+        return f"<span>{message}</span>"
+        
+    def setUp(self):
+        """Set up a small buffer."""
+        self.buffer = TerminalRingBuffer(max_lines=5)
+        self.render_calls = 0
+        
+    def test_since_returns_only_new_lines(self):
+        """Test sequence numbers and cursor reads."""
+        seqs = [self.buffer.append(f"line {i}") for i in range(3)]
+        self.assertEqual(seqs, [1, 2, 3])
+        
+        self.assertEqual([line.seq for line in self.buffer.since(0)], [1, 2, 3])
+        self.assertEqual([line.message for line in self.buffer.since(2)], ["line 2"])
+        self.assertEqual(self.buffer.since(3), [])
+        self.assertEqual([line.seq for line in self.buffer.tail(2)], [2, 3])
+        
+        print("✅ Ring buffer since test passed")
+        
+    def test_rotation_and_clear_keep_sequence(self):
+        """Test that rotation drops the oldest lines and clear() keeps numbering."""
+        for i in range(8):
+            self.buffer.append(f"line {i}")
+        self.assertEqual(len(self.buffer), 5)
+        self.assertEqual([line.seq for line in self.buffer.since(0)], [4, 5, 6, 7, 8])
+        self.assertEqual([line.seq for line in self.buffer.since(6)], [7, 8])
+        
+        generation = self.buffer.generation
+        self.buffer.clear()
+        self.assertEqual(self.buffer.since(0), [])
+        self.assertNotEqual(self.buffer.generation, generation)
+        self.assertEqual(self.buffer.append("after clear"), 9)
+        
+        self.buffer.resize(2)
+        self.assertEqual(self.buffer.max_lines, 2)
+        self.assertEqual(self.buffer.messages(), ["after clear"])
+        
+        print("✅ Ring buffer rotation test passed")
+        
+    def test_lines_render_once_per_setting(self):
+        """Test that a line's HTML is cached per display setting."""
+        self.buffer.append("hello")
+        line = self.buffer.since(0)[0]
+        
+        self.assertEqual(TerminalRingBuffer.render(line, "dark", self.render), "<span>hello</span>")
+        TerminalRingBuffer.render(line, "dark", self.render)
+        self.assertEqual(self.render_calls, 1)
+        TerminalRingBuffer.render(line, "light", self.render)
+        self.assertEqual(self.render_calls, 2)
+        
+        print("✅ Ring buffer render cache test passed")
+        
+    def test_view_renders_only_new_lines(self):
+        """Test incremental view updates, filtering and rebuilds."""
+        view = TerminalView(window=3)
+        for i in range(4):
+            self.buffer.append(f"line {i}")
+        
+        self.assertEqual(view.update(self.buffer, self.render), 4)
+        self.assertEqual(len(view), 3)
+        self.assertEqual(view.update(self.buffer, self.render), 0)
+        self.buffer.append("line 4")
+        self.assertEqual(view.update(self.buffer, self.render), 1)
+        self.assertEqual(self.render_calls, 5)
+        self.assertTrue(view.html.endswith("<span>line 4</span>"))
+        
+        # A new filter rebuilds from the buffer, reusing the cached HTML
+        added = view.update(self.buffer, self.render, predicate=lambda message: message.endswith(("1", "3")),
+                            filter_key="odd")
+        self.assertEqual(added, 2)
+        self.assertEqual(view.html, "<span>line 1</span><br><span>line 3</span>")
+        self.assertEqual(self.render_calls, 5)
+        
+        # Clearing the buffer empties the view on its next update
+        self.buffer.clear()
+        self.assertEqual(view.update(self.buffer, self.render, filter_key="odd"), 0)
+        self.assertEqual(len(view), 0)
+        
+        print("✅ Terminal view test passed")
+
+
 def run_phase11_tests():
     """Run all Phase 11 tests."""
     print("🧪 Starting Phase 11 UI Development Test Suite")
@@ -388,6 +476,7 @@ def run_phase11_tests():
     
     # Create test suite
     test_suite = unittest.TestLoader().loadTestsFromTestCase(TestPhase11Components)
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestTerminalRingBuffer))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
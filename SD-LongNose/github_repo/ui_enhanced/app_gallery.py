@@ -23,17 +23,24 @@ from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from datetime import datetime
+from html import escape
 import re
 
 # Add the github_repo directory to Python path for imports
 sys.path.append('/workspace/SD-LongNose/github_repo')
 
 from app_analysis.app_analyzer import AppAnalyzer
+from app_analysis.app_catalog import AppCatalog, get_app_catalog
 from engine.installer import ApplicationInstaller
 from running.script_manager import ScriptManager
 from optimization.logging_system import LoggingSystem
 
 
+# Gallery pagination: only one page of apps is rendered and sent to the browser per run
+GALLERY_PAGE_SIZES = [12, 24, 48, 96]
+GALLERY_STATUS_REFRESH_SECONDS = 3
+
+
 class AppStatus(Enum):
     """Application installation and running status."""
     NOT_INSTALLED = "not_installed"
@@ -76,12 +83,13 @@ class EnhancedAppGallery:
     dialogs, popovers, pills, segmented controls, and advanced analytics.
     """
     
-    def __init__(self, apps_data: Dict[str, Any]):
+    def __init__(self, apps_data: Dict[str, Any], apps_database_path: Optional[str] = None):
         """
         Initialize the enhanced app gallery.
         
         Args:
             apps_data: Dictionary containing all application data
+            apps_database_path: File apps_data was loaded from, for the shared catalog
         """
         self.apps_data = apps_data
         self.app_analyzer = AppAnalyzer()
@@ -104,9 +112,21 @@ class EnhancedAppGallery:
             st.session_state.app_ratings = {}
         if 'app_analytics' not in st.session_state:
             st.session_state.app_analytics = {}
-            
-        # Process apps data
-        self.display_apps = self._process_enhanced_apps_data()
+        # Shared catalog, indexed once per database file for every session
+        self.app_catalog = get_app_catalog(apps_database_path) if apps_database_path else None
+        if self.app_catalog is None:
+            if 'app_catalog' not in st.session_state:
+                st.session_state.app_catalog = AppCatalog(self.apps_data)
+            self.app_catalog = st.session_state.app_catalog
+        if 'card_html_cache' not in st.session_state:
+            st.session_state.card_html_cache = {}
+            
+        # Process apps data once per session; only statuses and ratings change between reruns
+        if 'enhanced_display_apps' not in st.session_state:
+            st.session_state.enhanced_display_apps = self._process_enhanced_apps_data()
+        self.display_apps = st.session_state.enhanced_display_apps
+        self.display_apps_by_id = {app.id: app for app in self.display_apps}
+        self._refresh_display_statuses()
         
     def _create_apps_dataframe(self) -> pd.DataFrame:
         """Create a pandas DataFrame from apps data for advanced table features."""
@@ -164,6 +184,67 @@ class EnhancedAppGallery:
             
         return display_apps
         
+    def _refresh_display_statuses(self):
+        """Apply session statuses and ratings to the cached display objects."""
+        for app_id, status in st.session_state.enhanced_app_statuses.items():
+            app = self.display_apps_by_id.get(app_id)
+            if app is not None:
+                app.status = status
+                
+        for app_id, rating in st.session_state.app_ratings.items():
+            app = self.display_apps_by_id.get(app_id)
+            if app is not None:
+                app.user_rating = rating
+                
+    def _paginate_apps(self, apps: List[EnhancedAppDisplayInfo]) -> List[EnhancedAppDisplayInfo]:
+        """Render page controls and return the slice of apps for the current page."""
+        page_size = st.session_state.get('gallery_page_size', GALLERY_PAGE_SIZES[0])
+        total_pages = max(1, (len(apps) + page_size - 1) // page_size)
+        
+        # Jump back to the first page whenever the filtered result set changes
+        result_signature = (len(apps), page_size, tuple(app.id for app in apps[:page_size]))
+        if st.session_state.get('gallery_result_signature') != result_signature:
+            st.session_state.gallery_result_signature = result_signature
+            st.session_state.gallery_page = 1
+        elif st.session_state.get('gallery_page', 1) > total_pages:
+            st.session_state.gallery_page = total_pages
+            
+        col1, col2, col3 = st.columns([1, 1, 2])
+        
+        with col1:
+            st.selectbox("Apps per page", GALLERY_PAGE_SIZES, key="gallery_page_size")
+            
+        with col2:
+            page = st.number_input("Page", min_value=1, max_value=total_pages, step=1, key="gallery_page")
+            
+        start = (int(page) - 1) * page_size
+        end = min(start + page_size, len(apps))
+        
+        with col3:
+            st.caption(f"Showing {start + 1 if apps else 0}–{end} of {len(apps)} apps (page {int(page)} of {total_pages})")
+            
+        return apps[start:end]
+        
+    def _get_card_html(self, app: EnhancedAppDisplayInfo) -> str:
+        """Get card HTML for an app, rebuilding it only when the app's status changes."""
+        cache = st.session_state.card_html_cache
+        cached = cache.get(app.id)
+        if cached is not None and cached[0] == app.status:
+            return cached[1]
+            
+        description = app.description[:100]
+        card_html = (
+            f'<div class="glass-card">'
+            f'<h3>{escape(app.name)}</h3>'
+            f'<p><strong>📂 {escape(app.category)}</strong> | <strong>⭐ {app.stars}</strong> | '
+            f'{app.status.value.replace("_", " ").title()}</p>'
+            f'<p><em>{escape(description)}...</em></p>'
+            f'</div>'
+        )
+        
+        cache[app.id] = (app.status, card_html)
+        return card_html
+        
     def render_enhanced_search_controls(self):
         """Render enhanced search controls with cutting-edge features."""
         st.markdown("### 🔍 Enhanced Search & Discovery")
@@ -198,7 +279,7 @@ class EnhancedAppGallery:
         
         with filter_col1:
             # Category filter with pills
-            categories = ["ALL"] + sorted(set(app.category for app in self.display_apps))
+            categories = ["ALL"] + self.app_catalog.categories
             try:
                 selected_categories = st.pills(
                     "Categories",
@@ -240,7 +321,9 @@ class EnhancedAppGallery:
         st.markdown("### 📊 Interactive Application Table")
         st.markdown("*Select multiple apps for bulk operations*")
         
-        # Create DataFrame for the filtered apps
+        filtered_apps = self._paginate_apps(filtered_apps)
+        
+        # Create DataFrame for the current page of filtered apps
         df_data = []
         for app in filtered_apps:
             df_data.append({
@@ -275,7 +358,7 @@ class EnhancedAppGallery:
             "Category": st.column_config.SelectboxColumn(
                 "Category",
                 help="Application category",
-                options=sorted(set(app.category for app in self.display_apps)),
+                options=self.app_catalog.categories,
                 width="medium"
             ),
             "Stars": st.column_config.NumberColumn(
@@ -704,23 +787,14 @@ class EnhancedAppGallery:
     def filter_enhanced_apps(self, search_term: str, categories: List[str], statuses: List[str], 
                            min_rating: int, min_stars: int) -> List[EnhancedAppDisplayInfo]:
         """Enhanced app filtering with multiple criteria."""
-        filtered_apps = self.display_apps.copy()
-        
-        # Enhanced text search with fuzzy matching
-        if search_term:
-            search_lower = search_term.lower()
-            filtered_apps = [
-                app for app in filtered_apps
-                if (search_lower in app.name.lower() or 
-                    search_lower in app.description.lower() or
-                    search_lower in app.author.lower() or
-                    any(search_lower in tag.lower() for tag in app.tags) or
-                    any(word in app.name.lower() for word in search_lower.split()))
-            ]
-            
-        # Category filter
-        if categories and "ALL" not in categories:
-            filtered_apps = [app for app in filtered_apps if app.category in categories]
+        # Text search (prefix + fuzzy), category and stars filters run on the shared catalog index
+        matching_ids = self.app_catalog.filter(
+            query=search_term,
+            categories=categories if categories and "ALL" not in categories else None,
+            min_stars=min_stars
+        )
+        filtered_apps = [self.display_apps_by_id[app_id] for app_id in matching_ids
+                         if app_id in self.display_apps_by_id]
             
         # Status filter
         if statuses and "ALL" not in statuses:
@@ -737,10 +811,6 @@ class EnhancedAppGallery:
         if min_rating > 0:
             filtered_apps = [app for app in filtered_apps if (app.user_rating or 0) >= min_rating]
             
-        # Stars filter
-        if min_stars > 0:
-            filtered_apps = [app for app in filtered_apps if app.stars >= min_stars]
-            
         return filtered_apps
         
     def render_enhanced_gallery_stats(self, filtered_apps: List[EnhancedAppDisplayInfo]):
@@ -755,20 +825,33 @@ class EnhancedAppGallery:
         with col2:
             st.metric("🔍 Filtered", len(filtered_apps), delta=f"{len(filtered_apps) - len(self.display_apps)}")
             
+        # Counts come from the session dicts, which only hold apps that left the default state
+        statuses = list(st.session_state.enhanced_app_statuses.values())
+        ratings = [rating for rating in st.session_state.app_ratings.values() if rating]
+            
         with col3:
-            installed_count = len([app for app in self.display_apps if app.status == AppStatus.INSTALLED])
+            installed_count = statuses.count(AppStatus.INSTALLED)
             st.metric("📦 Installed", installed_count)
             
         with col4:
-            running_count = len([app for app in self.display_apps if app.status == AppStatus.RUNNING])
+            running_count = statuses.count(AppStatus.RUNNING)
             st.metric("🏃 Running", running_count, delta=f"+{running_count}" if running_count > 0 else None)
             
         with col5:
-            avg_rating = np.mean([app.user_rating for app in self.display_apps if app.user_rating]) if any(app.user_rating for app in self.display_apps) else 0
+            avg_rating = np.mean(ratings) if ratings else 0
             st.metric("⭐ Avg Rating", f"{avg_rating:.1f}")
             
     def render_enhanced_card_grid(self, apps: List[EnhancedAppDisplayInfo]):
-        """Render apps in enhanced card grid with glass morphism."""
+        """Render the current page of apps in enhanced card grid with glass morphism."""
+        page_apps = self._paginate_apps(apps)
+        self.render_card_page_fragment([app.id for app in page_apps])
+        
+    @st.fragment(run_every=GALLERY_STATUS_REFRESH_SECONDS)
+    def render_card_page_fragment(self, app_ids: List[str]):
+        """Render one page of cards; reruns on its own so status changes don't rerun the page."""
+        self._refresh_display_statuses()
+        apps = [self.display_apps_by_id[app_id] for app_id in app_ids if app_id in self.display_apps_by_id]
+        
         cols_per_row = 2
         for i in range(0, len(apps), cols_per_row):
             cols = st.columns(cols_per_row)
@@ -780,21 +863,14 @@ class EnhancedAppGallery:
                     with cols[j]:
                         # Enhanced card with glass morphism
                         with st.container():
-                            st.markdown(f'<div class="glass-card">', unsafe_allow_html=True)
-                            
-                            # Card content
-                            st.markdown(f"### {app.name}")
-                            st.markdown(f"**📂 {app.category}** | **⭐ {app.stars}**")
-                            st.markdown(f"*{app.description[:100]}...*")
+                            st.markdown(self._get_card_html(app), unsafe_allow_html=True)
                             
                             # Enhanced action buttons
                             self.render_enhanced_app_actions(app)
                             
-                            st.markdown('</div>', unsafe_allow_html=True)
-                            
     def render_enhanced_detailed_list(self, apps: List[EnhancedAppDisplayInfo]):
-        """Render apps in enhanced detailed list view."""
-        for app in apps:
+        """Render the current page of apps in enhanced detailed list view."""
+        for app in self._paginate_apps(apps):
             with st.expander(f"{app.name} - {app.category}", expanded=False):
                 col1, col2, col3 = st.columns([2, 1, 1])
                 
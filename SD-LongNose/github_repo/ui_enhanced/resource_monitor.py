@@ -31,6 +31,7 @@ sys.path.append('/workspace/SD-LongNose/github_repo')
 
 from optimization.performance_monitor import PerformanceMonitor
 from cloud_detection.cloud_detector import CloudDetector
+from cloud_detection.metrics_collector import get_metrics_collector
 from optimization.logging_system import LoggingSystem
 
 
@@ -70,6 +71,7 @@ class EnhancedResourceMonitor:
     def __init__(self, performance_monitor: PerformanceMonitor):
         """Initialize the enhanced resource monitor."""
         self.performance_monitor = performance_monitor
+        self.metrics_collector = get_metrics_collector()
         self.cloud_detector = CloudDetector()
         self.logging_system = LoggingSystem()
         
@@ -91,6 +93,11 @@ class EnhancedResourceMonitor:
             
         self.platform_info = self.cloud_detector.detect_platform()
         
+    def get_current_metrics(self) -> Dict[str, Any]:
+        """Get current system metrics from the shared collector's latest snapshot."""
+        snapshot = self.metrics_collector.get_snapshot()
+        return snapshot.to_dict() if snapshot else {}
+        
     @st.fragment(run_every=3)
     def render_real_time_metrics_fragment(self):
         """Real-time metrics fragment that updates every 3 seconds."""
@@ -99,7 +106,7 @@ class EnhancedResourceMonitor:
                 return
                 
             # Get current metrics
-            metrics = self.performance_monitor.get_current_metrics()
+            metrics = self.get_current_metrics()
             
             if metrics:
                 # Update history
@@ -190,7 +197,7 @@ class EnhancedResourceMonitor:
         st.markdown("### 🖥️ Enhanced System Overview")
         
         # Get current metrics
-        metrics = self.performance_monitor.get_current_metrics()
+        metrics = self.get_current_metrics()
         
         if not metrics:
             st.error("Unable to retrieve enhanced system metrics")
@@ -45,6 +45,9 @@ from ui_enhanced.app_gallery import EnhancedAppGallery
 from ui_enhanced.resource_monitor import EnhancedResourceMonitor
 from ui_enhanced.tunnel_dashboard import EnhancedTunnelDashboard
 
+# Apps database shown by the gallery
+APPS_DATABASE_PATH = '/workspace/SD-LongNose/cleaned_pinokio_apps.json'
+
 
 @dataclass
 class EnhancedAppState:
@@ -368,7 +371,8 @@ class PinokioCloudEnhancedApp:
             
             # Initialize enhanced UI components
             self.terminal_widget = EnhancedTerminalWidget()
-            self.app_gallery = EnhancedAppGallery(st.session_state.apps_data)
+            self.app_gallery = EnhancedAppGallery(st.session_state.apps_data,
+                                                  apps_database_path=APPS_DATABASE_PATH)
             self.resource_monitor = EnhancedResourceMonitor(self.performance_monitor)
             self.tunnel_dashboard = EnhancedTunnelDashboard(self.url_manager)
             
@@ -388,7 +392,7 @@ class PinokioCloudEnhancedApp:
     def load_apps_data(self) -> Dict[str, Any]:
         """Load applications data from JSON file."""
         try:
-            apps_file = Path('/workspace/SD-LongNose/cleaned_pinokio_apps.json')
+            apps_file = Path(APPS_DATABASE_PATH)
             if apps_file.exists():
                 with open(apps_file, 'r', encoding='utf-8') as f:
                     return json.load(f)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+PinokioCloud Enhanced Terminal Buffer
+
+This module provides the storage behind the enhanced terminal widget: a
+bounded ring buffer of sequence-numbered lines, and per-view cursors that
+only consume the lines appended since their last update. Each line keeps its
+rendered HTML per display setting, so ANSI conversion happens once per line
+and the cost of a busy command log scales with new output, not buffer size.
+
+The buffer is safe to append to from command-runner threads.
+
+Author: PinokioCloud Development Team
+Version: 2.0.0 (Enhanced)
+"""
+
+import threading
+from collections import deque
+from itertools import islice
+from typing import Dict, List, Optional, Any, Callable, Hashable, Deque
+from dataclasses import dataclass, field
+
+
+@dataclass
+class TerminalLine:
+    """A buffered terminal message with its sequence number and rendered HTML."""
+    seq: int
+    message: Any
+    rendered: Dict[Hashable, str] = field(default_factory=dict)
+
+
+class TerminalRingBuffer:
+    """
+    Bounded, thread-safe ring buffer of terminal lines.
+
+    Sequence numbers increase monotonically and survive clear(), so a cursor
+    held by a view stays meaningful; ``generation`` changes whenever lines
+    are dropped other than by rotation, telling views to rebuild.
+    """
+
+    def __init__(self, max_lines: int = 2000):
+        """
+        Initialize the ring buffer.
+
+        Args:
+            max_lines: Maximum number of lines kept
+        """
+        self.lines: Deque[TerminalLine] = deque(maxlen=max_lines)
+        self.lock = threading.Lock()
+        self.last_seq = 0
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    @property
+    def max_lines(self) -> int:
+        """Maximum number of lines kept."""
+        return self.lines.maxlen
+
+    def append(self, message: Any) -> int:
+        """
+        Append a message.
+
+        Args:
+            message: Terminal message
+
+        Returns:
+            int: Sequence number of the new line
+        """
+        with self.lock:
+            self.last_seq += 1
+            self.lines.append(TerminalLine(self.last_seq, message))
+            return self.last_seq
+
+    def since(self, cursor: int) -> List[TerminalLine]:
+        """
+        Get the lines appended after a cursor, oldest first.
+
+        Only the new lines are visited, so this is O(new lines).
+
+        Args:
+            cursor: Sequence number of the last line already seen
+
+        Returns:
+            List[TerminalLine]: New lines still in the buffer
+        """
+        with self.lock:
+            count = min(self.last_seq - cursor, len(self.lines))
+            if count <= 0:
+                return []
+            new_lines = list(islice(reversed(self.lines), count))
+        new_lines.reverse()
+        return new_lines
+
+    def tail(self, count: int) -> List[TerminalLine]:
+        """Get the newest lines, oldest first."""
+        return self.since(max(0, self.last_seq - count))
+
+    def messages(self) -> List[Any]:
+        """Get every buffered message, oldest first."""
+        with self.lock:
+            return [line.message for line in self.lines]
+
+    def clear(self) -> None:
+        """Drop all lines."""
+        with self.lock:
+            self.lines.clear()
+            self.generation += 1
+
+    def resize(self, max_lines: int) -> None:
+        """
+        Change the capacity, keeping the newest lines.
+
+        Args:
+            max_lines: New maximum number of lines
+        """
+        with self.lock:
+            if max_lines == self.lines.maxlen:
+                return
+            self.lines = deque(self.lines, maxlen=max_lines)
+            self.generation += 1
+
+    @staticmethod
+    def render(line: TerminalLine, key: Hashable, renderer: Callable[[Any], str]) -> str:
+        """
+        Get the HTML of a line for a display setting, rendering it at most once.
+
+        Args:
+            line: Buffered line
+            key: Display settings the HTML depends on
+            renderer: Turns a message into HTML
+
+        Returns:
+            str: Rendered HTML
+        """
+        html_text = line.rendered.get(key)
+        if html_text is None:
+            html_text = renderer(line.message)
+            line.rendered[key] = html_text
+        return html_text
+
+
+class TerminalView:
+    """
+    Rendered window over a ring buffer, advanced by cursor.
+
+    A view renders only the lines appended since its last update and keeps
+    the newest ``window`` of them. Changing the filter or display settings
+    rebuilds it from the buffer once.
+    """
+
+    def __init__(self, window: int = 100):
+        """
+        Initialize the view.
+
+        Args:
+            window: Number of rendered lines kept for display
+        """
+        self.window = window
+        self.cursor = 0
+        self.generation = -1
+        self.view_key: Optional[Hashable] = None
+        self.rendered: Deque[str] = deque(maxlen=window)
+
+    def update(self, buffer: TerminalRingBuffer, renderer: Callable[[Any], str],
+               render_key: Hashable = None, predicate: Optional[Callable[[Any], bool]] = None,
+               filter_key: Hashable = None) -> int:
+        """
+        Bring the view up to date with the buffer.
+
+        Args:
+            buffer: Ring buffer to read
+            renderer: Turns a message into HTML
+            render_key: Display settings the HTML depends on
+            predicate: Selects the messages shown (None shows all)
+            filter_key: Identifies the predicate, so a new filter rebuilds the view
+
+        Returns:
+            int: Number of lines added to the view
+        """
+        view_key = (render_key, filter_key)
+        if self.generation != buffer.generation or self.view_key != view_key:
+            self.reset()
+            self.generation = buffer.generation
+            self.view_key = view_key
+
+        new_lines = buffer.since(self.cursor)
+        added = 0
+        for line in new_lines:
+            if predicate is None or predicate(line.message):
+                self.rendered.append(buffer.render(line, render_key, renderer))
+                added += 1
+        if new_lines:
+            self.cursor = new_lines[-1].seq
+        return added
+
+    def reset(self) -> None:
+        """Forget the cursor and rendered lines."""
+        self.cursor = 0
+        self.rendered.clear()
+
+    def __len__(self) -> int:
+        return len(self.rendered)
+
+    @property
+    def html(self) -> str:
+        """Rendered lines joined for display."""
+        return '<br>'.join(self.rendered)
@@ -31,6 +31,7 @@ sys.path.append('/workspace/SD-LongNose/github_repo')
 
 from environment_management.shell_runner import ShellRunner
 from optimization.logging_system import LoggingSystem
+from ui_enhanced.terminal_buffer import TerminalRingBuffer, TerminalView
 
 
 class LogLevel(Enum):
@@ -167,8 +168,13 @@ class EnhancedTerminalWidget:
         self.ai_suggestions = []
         
         # Initialize enhanced session state
-        if 'enhanced_terminal_messages' not in st.session_state:
-            st.session_state.enhanced_terminal_messages = []
+        if 'enhanced_terminal_buffer' not in st.session_state:
+            st.session_state.enhanced_terminal_buffer = TerminalRingBuffer(max_lines)
+        if 'enhanced_terminal_views' not in st.session_state:
+            st.session_state.enhanced_terminal_views = {
+                'live': TerminalView(window=10),
+                'output': TerminalView(window=100)
+            }
         if 'terminal_preferences' not in st.session_state:
             st.session_state.terminal_preferences = {
                 'auto_scroll': True,
@@ -186,6 +192,9 @@ class EnhancedTerminalWidget:
                 'failed_commands': 0,
                 'average_execution_time': 0.0
             }
+        
+        # Shared with the command thread, which must not touch st.session_state
+        self.buffer: TerminalRingBuffer = st.session_state.enhanced_terminal_buffer
             
     def add_enhanced_message(self, level: LogLevel, source: str, message: str, 
                            raw_output: bool = False, command_id: str = None, 
@@ -203,30 +212,21 @@ class EnhancedTerminalWidget:
             exit_code=exit_code
         )
         
-        # Add to session state
-        st.session_state.enhanced_terminal_messages.append(terminal_message)
+        # Add to the ring buffer (safe from the command thread)
+        self.buffer.append(terminal_message)
         
-        # Limit message history
-        if len(st.session_state.enhanced_terminal_messages) > self.max_lines:
-            st.session_state.enhanced_terminal_messages = st.session_state.enhanced_terminal_messages[-self.max_lines:]
-            
-        # Enhanced logging
-        self.logging_system.log_info("Terminal", f"Enhanced Terminal: [{source}] {message}")
+        # Enhanced logging (raw command output stays in the terminal only)
+        if not raw_output:
+            self.logging_system.log_info("Terminal", f"Enhanced Terminal: [{source}] {message}")
         
     @st.fragment(run_every=2)
     def render_live_terminal_fragment(self):
         """Render live terminal updates using fragment (cutting-edge feature)."""
         try:
-            # This fragment updates every 2 seconds for real-time terminal display
-            if st.session_state.enhanced_terminal_messages:
-                latest_messages = st.session_state.enhanced_terminal_messages[-10:]
-                
-                # Create live terminal display
-                terminal_content = []
-                for message in latest_messages:
-                    formatted_msg = self.format_enhanced_message(message)
-                    terminal_content.append(formatted_msg)
-                    
+            # This fragment updates every 2 seconds; only lines added since the last run are rendered
+            live_view = st.session_state.enhanced_terminal_views['live']
+            live_view.update(self.buffer, self.format_enhanced_message, self._render_key())
+            if len(live_view):
                 # Enhanced terminal with holographic effect
                 terminal_html = f"""
                 <div class="terminal-enhanced" style="
@@ -250,7 +250,7 @@ class EnhancedTerminalWidget:
                     <div style="margin-bottom: 10px; color: #00d4ff; font-weight: bold;">
                         📺 Live Terminal Feed
                     </div>
-                    {'<br>'.join(terminal_content)}
+                    {live_view.html}
                 </div>
                 """
                 
@@ -502,6 +502,11 @@ class EnhancedTerminalWidget:
                     
                 self.add_enhanced_message(level, source, line, raw_output=True)
                 
+    def _render_key(self) -> Tuple[bool, bool]:
+        """Display preferences that the rendered HTML of a line depends on."""
+        preferences = st.session_state.terminal_preferences
+        return (preferences['show_timestamps'], preferences['enhanced_mode'])
+        
     def format_enhanced_message(self, message: EnhancedTerminalMessage) -> str:
         """Format an enhanced terminal message for display."""
         timestamp_str = ""
@@ -549,7 +554,7 @@ class EnhancedTerminalWidget:
         with control_col1:
             # Basic controls
             if st.button("🧹 Clear Terminal", type="secondary"):
-                st.session_state.enhanced_terminal_messages = []
+                self.buffer.clear()
                 self.add_enhanced_message(LogLevel.SYSTEM, "Enhanced Terminal", "Terminal cleared with enhanced cleanup")
                 st.toast("🧹 Terminal cleared!", icon="🧹")
                 st.rerun()
@@ -616,23 +621,19 @@ class EnhancedTerminalWidget:
         }
         min_level = level_hierarchy.get(filter_level, 0)
         
-        filtered_messages = st.session_state.enhanced_terminal_messages
+        predicate = None
         if filter_level != "ALL":
-            filtered_messages = [
-                msg for msg in st.session_state.enhanced_terminal_messages
-                if level_hierarchy.get(msg.level.value.upper(), 1) >= min_level
-            ]
+            predicate = lambda msg: level_hierarchy.get(msg.level.value.upper(), 1) >= min_level
+        
+        # Render only the lines appended since the last run (last 100 matching lines are shown)
+        output_view = st.session_state.enhanced_terminal_views['output']
+        output_view.update(self.buffer, self.format_enhanced_message, self._render_key(),
+                           predicate=predicate, filter_key=filter_level)
         
         # Enhanced terminal display
-        if not filtered_messages:
+        if not len(output_view):
             st.info("📝 Enhanced terminal ready. Execute a command to see enhanced output.")
         else:
-            # Build enhanced terminal content
-            terminal_content = []
-            for message in filtered_messages[-100:]:  # Show last 100 messages
-                formatted_msg = self.format_enhanced_message(message)
-                terminal_content.append(formatted_msg)
-                
             # Enhanced terminal container with effects
             terminal_html = f"""
             <div class="terminal-enhanced" style="
@@ -664,7 +665,7 @@ class EnhancedTerminalWidget:
                     background: linear-gradient(90deg, transparent, #00ff9f, transparent);
                     animation: scanline 4s linear infinite;
                 "></div>
-                {'<br>'.join(terminal_content)}
+                {output_view.html}
             </div>
             
             <style>
@@ -699,7 +700,7 @@ class EnhancedTerminalWidget:
             st.metric("⚡ Avg Time", f"{stats['average_execution_time']:.2f}s")
             
         with col4:
-            st.metric("📝 Messages", len(st.session_state.enhanced_terminal_messages))
+            st.metric("📝 Messages", len(self.buffer))
             
     def render_enhanced_terminal(self):
         """Render the complete enhanced terminal interface."""
@@ -762,8 +763,9 @@ class EnhancedTerminalWidget:
                 with st.popover("🎛️ Terminal Settings"):
                     st.markdown("**Enhanced Terminal Configuration**")
                     
-                    max_lines = st.slider("Max History Lines", 500, 5000, self.max_lines)
+                    max_lines = st.slider("Max History Lines", 500, 5000, self.buffer.max_lines)
                     self.max_lines = max_lines
+                    self.buffer.resize(max_lines)
                     
                     theme_mode = st.radio("Terminal Theme", ["🌙 Dark", "🌈 Cyberpunk", "💫 Holographic"])
                     
@@ -772,15 +774,16 @@ class EnhancedTerminalWidget:
             except:
                 # Fallback to expander
                 with st.expander("🎛️ Terminal Settings"):
-                    max_lines = st.slider("Max History Lines", 500, 5000, self.max_lines)
+                    max_lines = st.slider("Max History Lines", 500, 5000, self.buffer.max_lines)
                     self.max_lines = max_lines
+                    self.buffer.resize(max_lines)
                     
     def export_enhanced_logs(self, format_type: str):
         """Export enhanced terminal logs in multiple formats."""
         try:
             if format_type == "📄 Plain Text":
                 log_content = []
-                for message in st.session_state.enhanced_terminal_messages:
+                for message in self.buffer.messages():
                     timestamp = message.timestamp.strftime('%Y-%m-%d %H:%M:%S')
                     log_line = f"[{timestamp}] [{message.level.value.upper()}] [{message.source}] {message.message}"
                     log_content.append(log_line)
@@ -795,7 +798,7 @@ class EnhancedTerminalWidget:
                 
             elif format_type == "📊 JSON":
                 json_data = []
-                for message in st.session_state.enhanced_terminal_messages:
+                for message in self.buffer.messages():
                     json_data.append({
                         'timestamp': message.timestamp.isoformat(),
                         'level': message.level.value,
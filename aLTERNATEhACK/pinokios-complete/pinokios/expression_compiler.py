@@ -0,0 +1,749 @@
+#!/usr/bin/env python3
+# Vendored from SD-LongNose/github_repo/environment_management/expression_compiler.py by sync_vendored_modules.py; edit the original.
+"""
+PinokioCloud Expression Compiler
+
+This module compiles Pinokio's {{ }} template language into cached,
+context-independent callables. It supports literals, property access,
+indexing, ternaries, &&/||/!, ==/===/!=/!==, comparisons, arithmetic, regex
+literals with .test(), common string/array methods and calls to functions
+provided by the context (e.g. which('git')). Each source string is parsed
+once; evaluation only walks prebuilt closures against a mapping, and no
+Python eval() is involved.
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import re
+import math
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+
+class ExpressionError(Exception):
+    """Base class for expression errors."""
+
+
+class ExpressionSyntaxError(ExpressionError):
+    """Raised when an expression cannot be parsed."""
+
+
+class ExpressionEvaluationError(ExpressionError):
+    """Raised when an expression cannot be evaluated against a context."""
+
+
+Evaluator = Callable[[Mapping], Any]
+
+TEMPLATE_PATTERN = re.compile(r'\{\{([^}]+)\}\}')
+
+_TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<number>\d+\.\d*|\.\d+|\d+)
+      | (?P<string>'(?:\\.|[^'\\])*'|"(?:\\.|[^"\\])*"|`(?:\\.|[^`\\])*`)
+      | (?P<name>[A-Za-z_$][A-Za-z0-9_$]*)
+      | (?P<op>===|!==|==|!=|<=|>=|&&|\|\||[-+*/%<>!?:.,()\[\]])
+    )
+""", re.VERBOSE)
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+
+_LITERALS = {'true': True, 'false': False, 'null': None, 'undefined': None}
+
+# Tokens after which a '/' starts a regex literal rather than a division
+_REGEX_PRECEDERS = {'(', ',', '=', '==', '===', '!=', '!==', '!', '&&', '||', '?', ':', '[', '<', '>', '<=', '>='}
+
+_REGEX_FLAGS = {'i': re.IGNORECASE, 'm': re.MULTILINE, 's': re.DOTALL, 'g': 0, 'u': 0, 'y': 0}
+
+
+# ---------------------------------------------------------------------------
+# JavaScript-style value semantics
+# ---------------------------------------------------------------------------
+
+def is_truthy(value: Any) -> bool:
+    """JavaScript truthiness: null, false, 0, NaN and '' are falsy; everything else is truthy."""
+    if value is None or value is False:
+        return False
+    if isinstance(value, (int, float)):
+        return value == value and value != 0
+    if isinstance(value, str):
+        return value != ''
+    return True
+
+
+def to_string(value: Any) -> str:
+    """Convert a value to a string the way JavaScript's String() does."""
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, float):
+        if value != value:
+            return 'NaN'
+        if value.is_integer():
+            return str(int(value))
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return ','.join('' if item is None else to_string(item) for item in value)
+    if isinstance(value, dict):
+        return '[object Object]'
+    return str(value)
+
+
+def format_value(value: Any) -> str:
+    """Format an expression result for insertion into a template (null renders as '')."""
+    if value is None:
+        return ''
+    return to_string(value)
+
+
+def _to_number(value: Any) -> Union[int, float]:
+    """Convert a value to a number the way JavaScript's Number() does."""
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return 0
+        try:
+            return int(text)
+        except ValueError:
+            try:
+                return float(text)
+            except ValueError:
+                return math.nan
+    return math.nan
+
+
+def _is_number(value: Any) -> bool:
+    """Check for a non-boolean number."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _strict_equals(left: Any, right: Any) -> bool:
+    """JavaScript ===."""
+    if left is None or right is None:
+        return left is None and right is None
+    if isinstance(left, bool) or isinstance(right, bool):
+        return isinstance(left, bool) and isinstance(right, bool) and left == right
+    if _is_number(left) and _is_number(right):
+        return left == right
+    if type(left) is not type(right):
+        return False
+    return left == right
+
+
+def _loose_equals(left: Any, right: Any) -> bool:
+    """JavaScript ==."""
+    if left is None or right is None:
+        return left is None and right is None
+    if isinstance(left, str) and isinstance(right, str):
+        return left == right
+    if isinstance(left, (bool, int, float, str)) and isinstance(right, (bool, int, float, str)):
+        return _to_number(left) == _to_number(right)
+    return left == right
+
+
+def _add(left: Any, right: Any) -> Any:
+    """JavaScript +: string concatenation if either side is a string (or object), else addition."""
+    if isinstance(left, (str, list, tuple, dict)) or isinstance(right, (str, list, tuple, dict)):
+        return to_string(left) + to_string(right)
+    return _to_number(left) + _to_number(right)
+
+
+def _divide(left: Any, right: Any) -> Any:
+    """JavaScript /."""
+    numerator, denominator = _to_number(left), _to_number(right)
+    if denominator == 0:
+        if numerator == 0 or numerator != numerator:
+            return math.nan
+        return math.inf if numerator > 0 else -math.inf
+    return numerator / denominator
+
+
+def _modulo(left: Any, right: Any) -> Any:
+    """JavaScript % (sign follows the dividend)."""
+    numerator, denominator = _to_number(left), _to_number(right)
+    if denominator == 0:
+        return math.nan
+    result = math.fmod(numerator, denominator)
+    return int(result) if isinstance(numerator, int) and isinstance(denominator, int) else result
+
+
+def _compare(operator: str, left: Any, right: Any) -> bool:
+    """JavaScript relational comparison."""
+    if not (isinstance(left, str) and isinstance(right, str)):
+        left, right = _to_number(left), _to_number(right)
+    if operator == '<':
+        return left < right
+    if operator == '>':
+        return left > right
+    if operator == '<=':
+        return left <= right
+    return left >= right
+
+
+_BINARY_OPERATORS = {
+    '===': _strict_equals,
+    '!==': lambda left, right: not _strict_equals(left, right),
+    '==': _loose_equals,
+    '!=': lambda left, right: not _loose_equals(left, right),
+    '+': _add,
+    '-': lambda left, right: _to_number(left) - _to_number(right),
+    '*': lambda left, right: _to_number(left) * _to_number(right),
+    '/': _divide,
+    '%': _modulo,
+    '<': lambda left, right: _compare('<', left, right),
+    '>': lambda left, right: _compare('>', left, right),
+    '<=': lambda left, right: _compare('<=', left, right),
+    '>=': lambda left, right: _compare('>=', left, right),
+}
+
+
+def _lookup(context: Mapping, name: str) -> Any:
+    """Resolve a root identifier."""
+    try:
+        return context[name]
+    except KeyError:
+        raise ExpressionEvaluationError(f"{name} is not defined")
+
+
+def _get_property(value: Any, name: Any) -> Any:
+    """Read value.name / value[name]; missing properties are undefined (None)."""
+    if value is None:
+        raise ExpressionEvaluationError(f"Cannot read property '{name}' of null")
+
+    if isinstance(value, Mapping):
+        if name in value:
+            return value[name]
+        if isinstance(name, float) and name.is_integer():
+            return value.get(int(name))
+        if not isinstance(name, str):
+            return value.get(to_string(name))
+        return None
+
+    if isinstance(value, (str, list, tuple)):
+        if name == 'length':
+            return len(value)
+        if _is_number(name) or (isinstance(name, str) and name.isdigit()):
+            index = _to_number(name)
+            if isinstance(index, float):
+                if not index.is_integer():
+                    return None
+                index = int(index)
+            return value[index] if 0 <= index < len(value) else None
+        return None
+
+    if not isinstance(name, str) or name.startswith('_'):
+        return None
+    return getattr(value, name, None)
+
+
+def _string_method(value: str, name: str) -> Optional[Callable]:
+    """JavaScript String.prototype methods."""
+    methods = {
+        'includes': lambda search, *_: to_string(search) in value,
+        'startsWith': lambda search, *_: value.startswith(to_string(search)),
+        'endsWith': lambda search, *_: value.endswith(to_string(search)),
+        'indexOf': lambda search, *_: value.find(to_string(search)),
+        'toLowerCase': lambda: value.lower(),
+        'toUpperCase': lambda: value.upper(),
+        'trim': lambda: value.strip(),
+        'split': lambda separator=None, *_: _split(value, separator),
+        'replace': lambda search, replacement, *_: (search.sub(to_string(replacement), value, count=1) if isinstance(search, re.Pattern)
+                                                     else value.replace(to_string(search), to_string(replacement), 1)),
+        'toString': lambda: value,
+    }
+    return methods.get(name)
+
+
+def _split(value: str, separator: Any) -> List[str]:
+    """JavaScript String.prototype.split."""
+    if separator is None:
+        return [value]
+    if isinstance(separator, re.Pattern):
+        return separator.split(value)
+    if separator == '':
+        return list(value)
+    return value.split(to_string(separator))
+
+
+def _array_method(value: Union[list, tuple], name: str) -> Optional[Callable]:
+    """JavaScript Array.prototype methods."""
+    methods = {
+        'includes': lambda search, *_: any(_strict_equals(item, search) for item in value),
+        'indexOf': lambda search, *_: next((i for i, item in enumerate(value) if _strict_equals(item, search)), -1),
+        'join': lambda separator=',', *_: to_string(separator).join('' if item is None else to_string(item) for item in value),
+        'toString': lambda: to_string(value),
+    }
+    return methods.get(name)
+
+
+def _call_method(receiver: Any, name: str, args: List[Any]) -> Any:
+    """Call receiver.name(*args)."""
+    if receiver is None:
+        raise ExpressionEvaluationError(f"Cannot read property '{name}' of null")
+
+    method = None
+    if isinstance(receiver, re.Pattern) and name == 'test':
+        return receiver.search(to_string(args[0] if args else None)) is not None
+    if isinstance(receiver, str):
+        method = _string_method(receiver, name)
+    elif isinstance(receiver, (list, tuple)):
+        method = _array_method(receiver, name)
+
+    if method is None:
+        method = _get_property(receiver, name)
+
+    if not callable(method):
+        raise ExpressionEvaluationError(f"{name} is not a function")
+    return method(*args)
+
+
+# ---------------------------------------------------------------------------
+# Tokenizer and parser
+# ---------------------------------------------------------------------------
+
+def _unescape(body: str) -> str:
+    """Resolve backslash escapes in a string literal body."""
+    if '\\' not in body:
+        return body
+    return re.sub(r'\\(.)', lambda m: _ESCAPES.get(m.group(1), m.group(1)), body, flags=re.DOTALL)
+
+
+def _tokenize(source: str) -> List[Tuple[str, Any]]:
+    """Split an expression into (kind, value) tokens."""
+    tokens: List[Tuple[str, Any]] = []
+    position = 0
+    length = len(source)
+
+    while position < length:
+        if source[position].isspace():
+            position += 1
+            continue
+
+        # A '/' at the start or after an operator begins a regex literal; otherwise it divides
+        regex_allowed = not tokens or (tokens[-1][0] == 'op' and tokens[-1][1] in _REGEX_PRECEDERS)
+        if source[position] == '/' and regex_allowed:
+            # Regex literal: scan to the closing slash outside any character class
+            index = position + 1
+            in_class = False
+            while index < length:
+                char = source[index]
+                if char == '\\':
+                    index += 2
+                    continue
+                if char == '[':
+                    in_class = True
+                elif char == ']':
+                    in_class = False
+                elif char == '/' and not in_class:
+                    break
+                index += 1
+            else:
+                raise ExpressionSyntaxError(f"Unterminated regex literal in: {source}")
+
+            pattern = source[position + 1:index]
+            index += 1
+            flags = 0
+            while index < length and source[index] in _REGEX_FLAGS:
+                flags |= _REGEX_FLAGS[source[index]]
+                index += 1
+            try:
+                tokens.append(('regex', re.compile(pattern, flags)))
+            except re.error as e:
+                raise ExpressionSyntaxError(f"Invalid regex /{pattern}/: {e}")
+            position = index
+            continue
+
+        match = _TOKEN_PATTERN.match(source, position)
+        if not match or match.end() == position:
+            raise ExpressionSyntaxError(f"Unexpected character {source[position]!r} in: {source}")
+
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'number':
+            tokens.append(('number', float(text) if '.' in text else int(text)))
+        elif kind == 'string':
+            tokens.append(('string', _unescape(text[1:-1])))
+        else:
+            tokens.append((kind, text))
+        position = match.end()
+
+    tokens.append(('end', None))
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing evaluator closures."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.tokens = _tokenize(source)
+        self.position = 0
+
+    def parse(self) -> Evaluator:
+        evaluator = self._ternary()
+        if self._peek() != ('end', None):
+            raise ExpressionSyntaxError(f"Unexpected token {self._peek()[1]!r} in: {self.source}")
+        return evaluator
+
+    def _peek(self) -> Tuple[str, Any]:
+        return self.tokens[self.position]
+
+    def _at_op(self, *operators: str) -> bool:
+        kind, value = self.tokens[self.position]
+        return kind == 'op' and value in operators
+
+    def _advance(self) -> Tuple[str, Any]:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _expect(self, operator: str):
+        if not self._at_op(operator):
+            raise ExpressionSyntaxError(f"Expected {operator!r} in: {self.source}")
+        self.position += 1
+
+    def _ternary(self) -> Evaluator:
+        condition = self._or()
+        if not self._at_op('?'):
+            return condition
+        self._advance()
+        when_true = self._ternary()
+        self._expect(':')
+        when_false = self._ternary()
+        return lambda context: when_true(context) if is_truthy(condition(context)) else when_false(context)
+
+    def _or(self) -> Evaluator:
+        left = self._and()
+        while self._at_op('||'):
+            self._advance()
+            right = self._and()
+            left = (lambda l, r: lambda context: (lambda value: value if is_truthy(value) else r(context))(l(context)))(left, right)
+        return left
+
+    def _and(self) -> Evaluator:
+        left = self._binary_level(0)
+        while self._at_op('&&'):
+            self._advance()
+            right = self._binary_level(0)
+            left = (lambda l, r: lambda context: (lambda value: r(context) if is_truthy(value) else value)(l(context)))(left, right)
+        return left
+
+    # Binary operator precedence levels, loosest first
+    _LEVELS = (('==', '!=', '===', '!=='), ('<', '>', '<=', '>='), ('+', '-'), ('*', '/', '%'))
+
+    def _binary_level(self, level: int) -> Evaluator:
+        if level == len(self._LEVELS):
+            return self._unary()
+        left = self._binary_level(level + 1)
+        while self._at_op(*self._LEVELS[level]):
+            operation = _BINARY_OPERATORS[self._advance()[1]]
+            right = self._binary_level(level + 1)
+            left = (lambda op, l, r: lambda context: op(l(context), r(context)))(operation, left, right)
+        return left
+
+    def _unary(self) -> Evaluator:
+        if self._at_op('!'):
+            self._advance()
+            operand = self._unary()
+            return lambda context: not is_truthy(operand(context))
+        if self._at_op('-'):
+            self._advance()
+            operand = self._unary()
+            return lambda context: -_to_number(operand(context))
+        if self._at_op('+'):
+            self._advance()
+            operand = self._unary()
+            return lambda context: _to_number(operand(context))
+        return self._postfix()
+
+    def _arguments(self) -> List[Evaluator]:
+        arguments = []
+        self._expect('(')
+        if not self._at_op(')'):
+            arguments.append(self._ternary())
+            while self._at_op(','):
+                self._advance()
+                arguments.append(self._ternary())
+        self._expect(')')
+        return arguments
+
+    def _postfix(self) -> Evaluator:
+        kind, value = self._peek()
+        path: Optional[List[str]] = None
+
+        if kind == 'name' and value not in _LITERALS:
+            self._advance()
+            path = [value]
+            evaluator = None
+        else:
+            evaluator = self._primary()
+
+        while True:
+            if self._at_op('.'):
+                self._advance()
+                name_kind, name = self._advance()
+                if name_kind != 'name':
+                    raise ExpressionSyntaxError(f"Expected property name in: {self.source}")
+
+                if self._at_op('('):
+                    receiver = evaluator if path is None else self._path_evaluator(path)
+                    path = None
+                    arguments = self._arguments()
+                    evaluator = (lambda rec, n, args: lambda context: _call_method(rec(context), n, [a(context) for a in args]))(receiver, name, arguments)
+                elif path is not None:
+                    path.append(name)
+                else:
+                    evaluator = (lambda obj, n: lambda context: _get_property(obj(context), n))(evaluator, name)
+
+            elif self._at_op('['):
+                if path is not None:
+                    evaluator, path = self._path_evaluator(path), None
+                self._advance()
+                index = self._ternary()
+                self._expect(']')
+                evaluator = (lambda obj, idx: lambda context: _get_property(obj(context), idx(context)))(evaluator, index)
+
+            elif self._at_op('('):
+                function = evaluator if path is None else self._path_evaluator(path)
+                path = None
+                arguments = self._arguments()
+                evaluator = (lambda fn, args: lambda context: _call_function(fn(context), [a(context) for a in args]))(function, arguments)
+
+            else:
+                break
+
+        return evaluator if path is None else self._path_evaluator(path)
+
+    @staticmethod
+    def _path_evaluator(path: List[str]) -> Evaluator:
+        """Evaluator for a dotted identifier path (also matches flat 'a.b' context keys)."""
+        names = tuple(path)
+        root = names[0]
+
+        if len(names) == 1:
+            return lambda context: _lookup(context, root)
+
+        full_name = '.'.join(names)
+        rest = names[1:]
+
+        def evaluate(context: Mapping) -> Any:
+            if full_name in context:
+                return context[full_name]
+            value = _lookup(context, root)
+            for name in rest:
+                value = _get_property(value, name)
+            return value
+
+        return evaluate
+
+    def _primary(self) -> Evaluator:
+        kind, value = self._advance()
+
+        if kind in ('number', 'string', 'regex'):
+            return lambda context: value
+        if kind == 'name' and value in _LITERALS:
+            literal = _LITERALS[value]
+            return lambda context: literal
+        if kind == 'op' and value == '(':
+            inner = self._ternary()
+            self._expect(')')
+            return inner
+        if kind == 'op' and value == '[':
+            items = []
+            if not self._at_op(']'):
+                items.append(self._ternary())
+                while self._at_op(','):
+                    self._advance()
+                    items.append(self._ternary())
+            self._expect(']')
+            return lambda context: [item(context) for item in items]
+
+        raise ExpressionSyntaxError(f"Unexpected token {value!r} in: {self.source}")
+
+
+def _call_function(function: Any, args: List[Any]) -> Any:
+    """Call a function value from the context."""
+    if not callable(function):
+        raise ExpressionEvaluationError("Value is not a function")
+    return function(*args)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+class CompiledExpression:
+    """A parsed expression; evaluate it against any mapping context."""
+
+    __slots__ = ('source', '_evaluator')
+
+    def __init__(self, source: str, evaluator: Evaluator):
+        self.source = source
+        self._evaluator = evaluator
+
+    def evaluate(self, context: Mapping) -> Any:
+        """
+        Evaluate the expression.
+
+        Args:
+            context: Mapping of root identifiers to values
+
+        Returns:
+            Expression value
+        """
+        return self._evaluator(context)
+
+    __call__ = evaluate
+
+
+class TemplateExpression:
+    """A {{ }} placeholder in a compiled template."""
+
+    __slots__ = ('text', 'source', 'expression', 'error')
+
+    def __init__(self, text: str, source: str):
+        self.text = text
+        self.source = source
+        self.expression: Optional[CompiledExpression] = None
+        self.error: Optional[ExpressionSyntaxError] = None
+        try:
+            self.expression = compile_expression(source)
+        except ExpressionSyntaxError as e:
+            self.error = e
+
+    def evaluate(self, context: Mapping) -> Any:
+        """Evaluate the placeholder (raises the syntax error for unparsable placeholders)."""
+        if self.expression is None:
+            raise self.error
+        return self.expression.evaluate(context)
+
+
+class CompiledTemplate:
+    """A template split into literal text and compiled {{ }} placeholders."""
+
+    __slots__ = ('source', 'parts', 'expressions')
+
+    def __init__(self, source: str):
+        self.source = source
+        self.parts: List[Union[str, TemplateExpression]] = []
+        self.expressions: List[TemplateExpression] = []
+
+        position = 0
+        for match in TEMPLATE_PATTERN.finditer(source):
+            if match.start() > position:
+                self.parts.append(source[position:match.start()])
+            placeholder = TemplateExpression(match.group(0), match.group(1).strip())
+            self.parts.append(placeholder)
+            self.expressions.append(placeholder)
+            position = match.end()
+        if position < len(source):
+            self.parts.append(source[position:])
+
+    @property
+    def is_single_expression(self) -> bool:
+        """True if the whole template is exactly one placeholder."""
+        return len(self.parts) == 1 and bool(self.expressions)
+
+    def render(self, context: Mapping, formatter: Callable[[Any], str] = format_value) -> str:
+        """
+        Render the template.
+
+        Placeholders that fail to evaluate are left as written.
+
+        Args:
+            context: Mapping of root identifiers to values
+            formatter: Converts placeholder values to text
+
+        Returns:
+            Rendered text
+        """
+        if not self.expressions:
+            return self.source
+
+        output = []
+        for part in self.parts:
+            if part.__class__ is str:
+                output.append(part)
+                continue
+            try:
+                output.append(formatter(part.evaluate(context)))
+            except Exception:
+                output.append(part.text)
+        return ''.join(output)
+
+
+@lru_cache(maxsize=4096)
+def compile_expression(source: str) -> CompiledExpression:
+    """
+    Compile an expression (cached by source string).
+
+    Args:
+        source: Expression source, without {{ }}
+
+    Returns:
+        CompiledExpression
+
+    Raises:
+        ExpressionSyntaxError: If the expression cannot be parsed
+    """
+    return CompiledExpression(source, _Parser(source).parse())
+
+
+@lru_cache(maxsize=4096)
+def compile_template(text: str) -> CompiledTemplate:
+    """
+    Compile a template string (cached by source string).
+
+    Args:
+        text: Template text containing {{ }} placeholders
+
+    Returns:
+        CompiledTemplate
+    """
+    return CompiledTemplate(text)
+
+
+def render_template(text: str, context: Mapping, formatter: Callable[[Any], str] = format_value) -> str:
+    """
+    Render a template string against a context.
+
+    Args:
+        text: Template text containing {{ }} placeholders
+        context: Mapping of root identifiers to values
+        formatter: Converts placeholder values to text
+
+    Returns:
+        Rendered text
+    """
+    return compile_template(text).render(context, formatter)
+
+
+def evaluate_condition(condition: str, context: Mapping) -> bool:
+    """
+    Evaluate a condition such as "{{platform === 'linux' && gpu}}".
+
+    Args:
+        condition: Condition expression, with or without surrounding {{ }}
+        context: Mapping of root identifiers to values
+
+    Returns:
+        bool: Truthiness of the expression
+
+    Raises:
+        ExpressionError: If the condition cannot be parsed or evaluated
+    """
+    source = condition.strip()
+    if source.startswith('{{') and source.endswith('}}'):
+        source = source[2:-2].strip()
+    if not source:
+        return True
+    return is_truthy(compile_expression(source).evaluate(context))
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# Vendored from SD-LongNose/github_repo/running/port_allocator.py by sync_vendored_modules.py; edit the original.
+"""
+PinokioCloud Port Allocator
+
+This module hands out TCP ports to launched applications. Ports in use are
+kept in an in-memory bitmap seeded from a single read of /proc/net/tcp{,6},
+and every handed-out port is recorded as a lease tied to the PID of the app
+holding it. Leases of exited processes are reclaimed automatically, and the
+lease registry is a small JSON file guarded by a file lock, so separate
+processes (e.g. the notebook kernel and the Streamlit UI) never hand out the
+same port.
+
+Author: PinokioCloud Development Team
+Version: 1.0.0
+"""
+
+import os
+import json
+import time
+import errno
+import socket
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Iterator, Set
+from dataclasses import dataclass, asdict
+
+try:
+    import fcntl
+except ImportError:  # Windows: leases are only shared within the process
+    fcntl = None
+
+
+# Registry shared by every launcher on the host unless overridden
+DEFAULT_REGISTRY_PATH = os.environ.get(
+    'PINOKIO_PORT_REGISTRY',
+    os.path.join(tempfile.gettempdir(), 'pinokio_port_registry.json')
+)
+
+# /proc/net/tcp state code for LISTEN
+_TCP_LISTEN = '0A'
+
+_MAX_PORT = 65535
+
+
+@dataclass
+class PortLease:
+    """A port handed out to an application."""
+    port: int
+    app_name: str
+    pid: int
+    start_time: Optional[str]
+    leased_at: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert PortLease to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PortLease':
+        """Create PortLease from dictionary."""
+        return cls(**data)
+
+
+def _process_start_time(pid: int) -> Optional[str]:
+    """Get a process start time token, used to detect PID reuse (Linux only)."""
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            stat = f.read()
+        # Field 22 (starttime); the command name in field 2 may contain spaces
+        return stat[stat.rindex(')') + 2:].split()[19]
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _is_pid_alive(pid: int, start_time: Optional[str] = None) -> bool:
+    """Check whether a lease holder is still running."""
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    except OSError:
+        return False
+
+    if start_time is not None:
+        current = _process_start_time(pid)
+        if current is not None and current != start_time:
+            return False
+
+    return True
+
+
+def read_listening_ports() -> Set[int]:
+    """
+    Get the local TCP ports in LISTEN state.
+
+    Reads /proc/net/tcp and /proc/net/tcp6 once each. Returns an empty set
+    where /proc is unavailable; allocation then relies on its bind check.
+
+    Returns:
+        Set of listening port numbers
+    """
+    ports = set()
+    for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+        try:
+            with open(table, 'r') as f:
+                next(f, None)
+                for line in f:
+                    fields = line.split()
+                    if len(fields) > 3 and fields[3] == _TCP_LISTEN:
+                        ports.add(int(fields[1].rsplit(':', 1)[1], 16))
+        except (OSError, ValueError):
+            continue
+    return ports
+
+
+class PortAllocator:
+    """
+    Reservation-based port allocator shared across processes.
+
+    Busy ports (listening sockets plus live leases) are held as bits of a
+    single integer, so finding a free port in a range is a mask and a
+    lowest-set-bit operation instead of one probe per port.
+    """
+
+    def __init__(self, registry_path: Optional[str] = None, scan_interval: float = 2.0):
+        """
+        Initialize the port allocator.
+
+        Args:
+            registry_path: Path to the shared lease registry file
+            scan_interval: Seconds a /proc/net/tcp snapshot is reused for
+        """
+        self.registry_path = registry_path or DEFAULT_REGISTRY_PATH
+        self.lock_path = self.registry_path + '.lock'
+        self.scan_interval = scan_interval
+
+        self.thread_lock = threading.RLock()
+        self.leases: Dict[int, PortLease] = {}
+
+        self.listening_bits = 0
+        self.last_scan = 0.0
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.registry_path)), exist_ok=True)
+
+    def allocate(self, app_name: str, start_port: int = 7860, end_port: int = 7900,
+                 pid: Optional[int] = None, preferred: Optional[int] = None) -> int:
+        """
+        Reserve a free port for an application.
+
+        The lease is held by ``pid`` (the calling process by default); call
+        assign() once the application has been launched so the port is
+        reclaimed when the application exits.
+
+        Args:
+            app_name: Name of the application the port is for
+            start_port: First port of the range
+            end_port: Last port of the range (inclusive)
+            pid: PID holding the lease
+            preferred: Port to try before the range
+
+        Returns:
+            int: Reserved port number
+
+        Raises:
+            RuntimeError: If no port in the range is free
+        """
+        holder = pid or os.getpid()
+
+        with self._locked():
+            busy = self._busy_bits()
+
+            if preferred is not None and not (busy >> preferred) & 1 and self._can_bind(preferred):
+                return self._lease(preferred, app_name, holder)
+
+            width = end_port - start_port + 1
+            free = ~(busy >> start_port) & ((1 << width) - 1) if width > 0 else 0
+
+            while free:
+                offset = (free & -free).bit_length() - 1
+                port = start_port + offset
+                if self._can_bind(port):
+                    return self._lease(port, app_name, holder)
+                # Taken by a socket opened since the last scan
+                self.listening_bits |= 1 << port
+                free &= free - 1
+
+        raise RuntimeError(f"No available port found in range {start_port}-{end_port}")
+
+    def claim(self, port: int, app_name: str, pid: Optional[int] = None) -> bool:
+        """
+        Lease a port the caller has already bound.
+
+        Used when a listener takes a port over from an application that
+        just exited, where the bind itself is the proof the port is free.
+
+        Args:
+            port: Port bound by the caller
+            app_name: Name of the application the port is for
+            pid: PID holding the lease (the calling process by default)
+
+        Returns:
+            bool: False if another live process holds a lease on the port
+        """
+        holder = pid or os.getpid()
+
+        with self._locked():
+            lease = self.leases.get(port)
+            if lease is not None and lease.pid != holder:
+                return False
+            self._lease(port, app_name, holder)
+            return True
+
+    def assign(self, port: int, pid: int) -> bool:
+        """
+        Transfer a lease to the process that now owns the port.
+
+        Args:
+            port: Leased port
+            pid: PID of the launched application
+
+        Returns:
+            bool: True if the lease exists and was transferred
+        """
+        with self._locked():
+            lease = self.leases.get(port)
+            if lease is None:
+                return False
+            lease.pid = pid
+            lease.start_time = _process_start_time(pid)
+            self._save_leases()
+            return True
+
+    def release(self, port: int) -> bool:
+        """
+        Release a leased port.
+
+        Args:
+            port: Port to release
+
+        Returns:
+            bool: True if a lease was released
+        """
+        with self._locked():
+            if self.leases.pop(port, None) is None:
+                return False
+            self._save_leases()
+            return True
+
+    def release_app(self, app_name: str) -> List[int]:
+        """
+        Release every port leased to an application.
+
+        Args:
+            app_name: Name of the application
+
+        Returns:
+            List[int]: Released ports
+        """
+        with self._locked():
+            ports = [port for port, lease in self.leases.items() if lease.app_name == app_name]
+            for port in ports:
+                del self.leases[port]
+            if ports:
+                self._save_leases()
+            return ports
+
+    def get_leases(self) -> Dict[int, PortLease]:
+        """Get all live leases by port."""
+        with self._locked():
+            return dict(self.leases)
+
+    def get_app_ports(self, app_name: str) -> List[int]:
+        """Get the ports currently leased to an application."""
+        return sorted(port for port, lease in self.get_leases().items() if lease.app_name == app_name)
+
+    def is_port_available(self, port: int) -> bool:
+        """Check whether a port is neither leased nor listening."""
+        with self._locked():
+            return not (self._busy_bits() >> port) & 1
+
+    def _lease(self, port: int, app_name: str, pid: int) -> int:
+        """Record a lease and persist the registry (lock must be held)."""
+        self.leases[port] = PortLease(
+            port=port,
+            app_name=app_name,
+            pid=pid,
+            start_time=_process_start_time(pid),
+            leased_at=time.time()
+        )
+        self._save_leases()
+        return port
+
+    def _busy_bits(self) -> int:
+        """Bitmap of listening and leased ports (lock must be held)."""
+        now = time.monotonic()
+        if now - self.last_scan >= self.scan_interval:
+            bits = 0
+            for port in read_listening_ports():
+                bits |= 1 << port
+            self.listening_bits = bits
+            self.last_scan = now
+
+        busy = self.listening_bits
+        for port in self.leases:
+            busy |= 1 << port
+        return busy
+
+    def _can_bind(self, port: int) -> bool:
+        """Confirm a candidate port can actually be bound."""
+        if not 0 < port <= _MAX_PORT:
+            return False
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.bind(('', port))
+            return True
+        except OSError as e:
+            return e.errno not in (errno.EADDRINUSE, errno.EACCES)
+        finally:
+            sock.close()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the thread lock and the registry file lock, with leases loaded."""
+        with self.thread_lock:
+            lock_file = None
+            if fcntl is not None:
+                lock_file = open(self.lock_path, 'a')
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                self._load_leases()
+                yield
+            finally:
+                if lock_file is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                    lock_file.close()
+
+    def _load_leases(self) -> None:
+        """Reload the registry (other processes may have changed it) and drop leases of exited processes."""
+        leases = {}
+        try:
+            with open(self.registry_path, 'r', encoding='utf-8') as f:
+                for data in json.load(f).get('leases', []):
+                    lease = PortLease.from_dict(data)
+                    leases[lease.port] = lease
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, AttributeError):
+            leases = {}
+        self.leases = leases
+
+        dead = [port for port, lease in self.leases.items()
+                if not _is_pid_alive(lease.pid, lease.start_time)]
+        if dead:
+            for port in dead:
+                del self.leases[port]
+            self._save_leases()
+
+    def _save_leases(self) -> None:
+        """Write the registry atomically (lock must be held)."""
+        directory = os.path.dirname(os.path.abspath(self.registry_path))
+        fd, temp_path = tempfile.mkstemp(prefix='.tmp_', suffix='.json', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'leases': [lease.to_dict() for lease in self.leases.values()]}, f)
+            os.replace(temp_path, self.registry_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+_allocators: Dict[str, PortAllocator] = {}
+_allocators_lock = threading.Lock()
+
+
+def get_port_allocator(registry_path: Optional[str] = None) -> PortAllocator:
+    """
+    Get the shared allocator for a registry path.
+
+    Args:
+        registry_path: Path to the lease registry (defaults to the host-wide registry)
+
+    Returns:
+        PortAllocator
+    """
+    path = os.path.abspath(registry_path or DEFAULT_REGISTRY_PATH)
+    with _allocators_lock:
+        allocator = _allocators.get(path)
+        if allocator is None:
+            allocator = PortAllocator(path)
+            _allocators[path] = allocator
+        return allocator
@@ -8,14 +8,17 @@ import os
 import sys
 import json
 import re
+import signal
 import asyncio
 import subprocess
 import platform
 import shutil
-import venv
 import time
 import datetime
 import threading
+import weakref
+import contextvars
+from collections import ChainMap, deque
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union, Tuple
 from dataclasses import dataclass, field
@@ -23,10 +26,19 @@ import logging
 import git
 import psutil
 
+from .expression_compiler import compile_template, evaluate_condition, ExpressionError
+from .port_allocator import get_port_allocator
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Per-task script args and event input, so concurrent installs on one loop don't share them
+_script_args: contextvars.ContextVar = contextvars.ContextVar('pinokio_script_args', default=None)
+_script_input: contextvars.ContextVar = contextvars.ContextVar('pinokio_script_input', default=None)
+# App whose script is running, so kernel.port() leases are owned by that app
+_script_app: contextvars.ContextVar = contextvars.ContextVar('pinokio_script_app', default=None)
+
 @dataclass
 class PinokioContext:
     """Execution context for Pinokio scripts"""
@@ -84,7 +96,7 @@ class PinokioContext:
 class UnifiedPinokioEngine:
     """Unified engine for executing Pinokio apps with full JS/JSON support"""
     
-    def __init__(self, base_path: str = "./pinokio_apps"):
+    def __init__(self, base_path: str = "./pinokio_apps", max_concurrent_processes: int = 4):
         self.base_path = Path(base_path)
         self.base_path.mkdir(exist_ok=True)
         
@@ -101,8 +113,14 @@ class UnifiedPinokioEngine:
         self.context = PinokioContext(cwd=str(self.base_path))
         self.installed_apps = {}
         self.running_processes = {}
+        self.running_apps = {}
+        self.output_tasks = {}  # App -> task draining a daemon's output into its run log
         self.script_locals = {}  # Script-specific local variables
-        self.app_ports = {}  # App -> port mapping
+        self.app_ports = {}  # App -> ports leased through kernel.port()
+        
+        # Bound on subprocesses executing at once (detached daemons don't count)
+        self.max_concurrent_processes = max_concurrent_processes
+        self._process_semaphores = weakref.WeakKeyDictionary()  # Event loop -> semaphore
         
         # Load state
         self._load_state()
@@ -174,130 +192,68 @@ class UnifiedPinokioEngine:
     
     async def port(self) -> int:
         """Get next available port (Pinokio kernel.port() implementation)"""
-        import socket
-        for port in range(8000, 9000):
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                if sock.connect_ex(('127.0.0.1', port)) != 0:
-                    return port
-        raise RuntimeError("No available ports")
+        # The port is leased to the running script's app until stop_app() (or until
+        # its daemon dies), so concurrent starts here or in another launcher never
+        # get the same one
+        app_name = _script_app.get()
+        port = await asyncio.to_thread(get_port_allocator().allocate, app_name or 'kernel.port', 8000, 8999)
+        if app_name:
+            self.app_ports.setdefault(app_name, []).append(port)
+        return port
+    
+    def _release_app_ports(self, app_name: str):
+        """Release every port leased to an app through kernel.port()"""
+        allocator = get_port_allocator()
+        for port in self.app_ports.pop(app_name, []):
+            allocator.release(port)
     
     def which(self, command: str) -> Optional[str]:
         """Find command path (Pinokio kernel.which() implementation)"""
         return shutil.which(command)
     
+    def _template_scope(self, local_vars: Dict[str, Any] = None) -> ChainMap:
+        """Build the lookup scope for template expressions (locals shadow globals)"""
+        return ChainMap(
+            local_vars or {},
+            {
+                'kernel': self.context.kernel,
+                'input': self._get_script_input(),
+                'args': self._get_script_args(),
+                'which': self.which
+            },
+            self.context.kernel,
+            self.context.__dict__
+        )
+    
     def evaluate_template(self, text: str, local_vars: Dict[str, Any] = None) -> str:
         """Evaluate Pinokio template expressions {{variable}}"""
         if not isinstance(text, str):
             return text
         
-        # Combine all contexts
-        eval_context = {
-            **self.context.__dict__,
-            **self.context.kernel,
-            **(local_vars or {}),
-            'kernel': self.context.kernel,
-            'input': self.context.input,
-            'args': self.context.args,
-            'which': self.which
-        }
-        
-        def replace_expr(match):
-            expr = match.group(1).strip()
-            try:
-                # Handle ternary operator (condition ? true_val : false_val)
-                if '?' in expr and ':' in expr:
-                    parts = expr.split('?')
-                    condition = parts[0].strip()
-                    true_false = parts[1].split(':')
-                    true_val = true_false[0].strip()
-                    false_val = true_false[1].strip() if len(true_false) > 1 else ''
-                    
-                    # Evaluate condition
-                    if self.evaluate_condition(condition, eval_context):
-                        return self.evaluate_template(true_val, eval_context)
-                    else:
-                        return self.evaluate_template(false_val, eval_context)
-                
-                # Handle function calls
-                if '(' in expr and ')' in expr:
-                    func_match = re.match(r'(\w+)\((.*)\)', expr)
-                    if func_match:
-                        func_name = func_match.group(1)
-                        func_args = func_match.group(2)
-                        if func_name in eval_context and callable(eval_context[func_name]):
-                            # Simple argument parsing
-                            args = [a.strip().strip("'\"") for a in func_args.split(',') if a.strip()]
-                            result = eval_context[func_name](*args)
-                            return str(result) if result is not None else ''
-                
-                # Handle property access (e.g., args.venv, kernel.gpu)
-                parts = expr.split('.')
-                value = eval_context
-                for part in parts:
-                    # Handle array access
-                    if '[' in part and ']' in part:
-                        base, index = part.split('[')
-                        index = int(index.rstrip(']'))
-                        if base in value:
-                            value = value[base]
-                            if isinstance(value, (list, tuple)) and index < len(value):
-                                value = value[index]
-                            else:
-                                return match.group(0)
-                        else:
-                            return match.group(0)
-                    else:
-                        if isinstance(value, dict) and part in value:
-                            value = value[part]
-                        elif hasattr(value, part):
-                            value = getattr(value, part)
-                        else:
-                            return match.group(0)
-                
-                return str(value) if value is not None else ''
-                
-            except Exception as e:
-                logger.debug(f"Failed to evaluate '{expr}': {e}")
-                return match.group(0)
-        
-        return re.sub(r'\{\{([^}]+)\}\}', replace_expr, text)
+        # Templates are parsed once and cached; unresolvable placeholders are left as written
+        template = compile_template(text)
+        if not template.expressions:
+            return text
+        return template.render(self._template_scope(local_vars))
     
     def evaluate_condition(self, condition: str, context: Dict[str, Any] = None) -> bool:
         """Evaluate JavaScript-like conditions"""
         if not condition:
             return True
         
-        # Remove {{ }} if present
-        condition = condition.strip().strip('{}').strip()
-        
-        # Prepare evaluation context
-        eval_ctx = {
-            'platform': self.context.platform,
-            'gpu': self.context.gpu,
-            'gpu_model': self.context.gpu_model,
-            **(context or {})
-        }
-        
-        # Convert JS operators to Python
-        condition = re.sub(r'===', '==', condition)
-        condition = re.sub(r'!==', '!=', condition)
-        condition = condition.replace('&&', ' and ')
-        condition = condition.replace('||', ' or ')
-        condition = condition.replace('!', ' not ')
-        condition = condition.replace('true', 'True')
-        condition = condition.replace('false', 'False')
-        condition = condition.replace('null', 'None')
-        
-        # Handle regex test
-        condition = re.sub(r'/(.+?)/\.test\(([^)]+)\)', 
-                          lambda m: f're.search(r"{m.group(1)}", {m.group(2)})', 
-                          condition)
+        eval_ctx = ChainMap(
+            context or {},
+            {
+                'platform': self.context.platform,
+                'gpu': self.context.gpu,
+                'gpu_model': self.context.gpu_model
+            },
+            self._template_scope()
+        )
         
         try:
-            import re as re_module
-            result = eval(condition, {"__builtins__": {}, "re": re_module}, eval_ctx)
-            return bool(result)
-        except Exception as e:
+            return evaluate_condition(condition, eval_ctx)
+        except ExpressionError as e:
             logger.warning(f"Condition evaluation failed for '{condition}': {e}")
             return False
     
@@ -336,6 +292,9 @@ class UnifiedPinokioEngine:
                 venv_bin = venv_path / "bin"
             full_env['PATH'] = f"{venv_bin}{os.pathsep}{full_env.get('PATH', '')}"
         
+        # Compile the event watchers once for every command in this step
+        watchers = self._compile_event_watchers(on_events)
+        
         results = []
         for message in messages:
             # Evaluate templates in command
@@ -343,71 +302,10 @@ class UnifiedPinokioEngine:
             logger.info(f"Executing: {command}")
             
             try:
-                process = subprocess.Popen(
-                    command,
-                    shell=True,
-                    cwd=str(working_dir),
-                    env=full_env,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1
-                )
-                
-                # Handle event monitoring
-                event_result = None
-                if on_events:
-                    for line in iter(process.stdout.readline, ''):
-                        if line:
-                            print(line.rstrip())
-                            
-                            for event in on_events:
-                                pattern = event.get('event', '').strip('/')
-                                if pattern and re.search(pattern, line):
-                                    logger.info(f"Event matched: {pattern}")
-                                    # Store match result for input.event access
-                                    match = re.search(pattern, line)
-                                    if match:
-                                        self.context.input['event'] = match.groups() or [match.group(0)]
-                                    
-                                    if event.get('done'):
-                                        event_result = 'done'
-                                        break
-                                    elif event.get('kill'):
-                                        process.terminate()
-                                        event_result = 'killed'
-                                        break
-                            
-                            if event_result:
-                                break
-                
-                # Handle daemon mode
-                if daemon and event_result == 'done':
-                    # Keep process running in background
-                    app_name = app_path.name if app_path else 'unknown'
-                    self.running_processes[app_name] = process
-                    results.append({'success': True, 'daemon': True, 'pid': process.pid})
-                else:
-                    # Wait for completion and capture output
-                    stdout, stderr = process.communicate()
-                    returncode = process.returncode
-                    
-                    # Log the output
-                    if stdout:
-                        logger.info(f"Command output: {stdout}")
-                        print(stdout)
-                    if stderr:
-                        logger.error(f"Command error: {stderr}")
-                        print(f"Error: {stderr}")
-                    
-                    # Record result
-                    if returncode == 0:
-                        results.append({'success': True, 'returncode': returncode, 'output': stdout})
-                    else:
-                        error_msg = f"Command failed with code {returncode}: {stderr or 'Unknown error'}"
-                        logger.error(error_msg)
-                        results.append({'success': False, 'returncode': returncode, 'error': error_msg, 'output': stdout})
-                    
+                result = await self._run_command(command, working_dir, full_env, watchers, daemon, app_path)
+                results.append(result)
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"Command failed: {e}")
                 results.append({'success': False, 'error': str(e)})
@@ -415,6 +313,202 @@ class UnifiedPinokioEngine:
         
         return {'success': all(r.get('success', False) for r in results), 'results': results}
     
+    def _compile_event_watchers(self, on_events: List[Dict[str, Any]]) -> List[Tuple[re.Pattern, Dict[str, Any]]]:
+        """Precompile the regexes of a step's on: [{event, done, kill}] watchers"""
+        watchers = []
+        for event in on_events or []:
+            pattern = event.get('event', '').strip('/')
+            if not pattern:
+                continue
+            try:
+                watchers.append((re.compile(pattern), event))
+            except re.error as e:
+                logger.warning(f"Invalid event pattern '{pattern}': {e}")
+        return watchers
+    
+    async def _run_command(self, command: str, working_dir: Path, env: Dict[str, str],
+                           watchers: List[Tuple[re.Pattern, Dict[str, Any]]], daemon: bool,
+                           app_path: Path = None) -> Dict[str, Any]:
+        """Run one shell command without blocking the event loop, matching its output against watchers"""
+        semaphore = self._get_process_semaphore()
+        await semaphore.acquire()
+        process = None
+        
+        try:
+            process = await asyncio.create_subprocess_shell(
+                command,
+                cwd=str(working_dir),
+                env=env,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                **self._process_group_kwargs()
+            )
+            
+            lines = self._read_lines(process.stdout)
+            output_lines = deque(maxlen=1000)
+            
+            # Handle event monitoring
+            event_result = None
+            async for line in lines:
+                print(line)
+                output_lines.append(line)
+                
+                for pattern, event in watchers:
+                    match = pattern.search(line)
+                    if match:
+                        logger.info(f"Event matched: {pattern.pattern}")
+                        # Store match result for input.event access
+                        self._get_script_input()['event'] = match.groups() or [match.group(0)]
+                        
+                        if event.get('done'):
+                            event_result = 'done'
+                            break
+                        elif event.get('kill'):
+                            self._signal_process_group(process.pid, signal.SIGTERM)
+                            event_result = 'killed'
+                            break
+                
+                if event_result:
+                    break
+            
+            # Handle daemon mode
+            if daemon and event_result == 'done':
+                # Keep process running in background, draining its output into the run log
+                app_name = app_path.name if app_path else 'unknown'
+                self.running_processes[app_name] = process
+                # Hand the app's port leases to the daemon, so they're reaped if it dies
+                allocator = get_port_allocator()
+                for port in self.app_ports.get(app_name, []):
+                    allocator.assign(port, process.pid)
+                self.output_tasks[app_name] = asyncio.ensure_future(self._drain_output(app_name, process, lines))
+                return {'success': True, 'daemon': True, 'pid': process.pid}
+            
+            # Wait for completion, still streaming output
+            async for line in lines:
+                print(line)
+                output_lines.append(line)
+            returncode = await process.wait()
+            output = '\n'.join(output_lines)
+            
+            # Record result
+            if returncode == 0:
+                return {'success': True, 'returncode': returncode, 'output': output}
+            
+            error_msg = f"Command failed with code {returncode}: {output_lines[-1] if output_lines else 'Unknown error'}"
+            logger.error(error_msg)
+            return {'success': False, 'returncode': returncode, 'error': error_msg, 'output': output}
+        
+        except asyncio.CancelledError:
+            # Take the whole process group down with the cancelled step
+            if process is not None and process.returncode is None:
+                self._signal_process_group(process.pid, signal.SIGKILL)
+            raise
+        
+        finally:
+            semaphore.release()
+    
+    async def _run_exec(self, *args: str, cwd: str = None) -> Tuple[int, str]:
+        """Run a program to completion without a shell, under the subprocess bound"""
+        semaphore = self._get_process_semaphore()
+        await semaphore.acquire()
+        process = None
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                **self._process_group_kwargs()
+            )
+            stdout, _ = await process.communicate()
+            return process.returncode, stdout.decode('utf-8', errors='replace')
+        
+        except asyncio.CancelledError:
+            if process is not None and process.returncode is None:
+                self._signal_process_group(process.pid, signal.SIGKILL)
+            raise
+        
+        finally:
+            semaphore.release()
+    
+    async def _read_lines(self, stream: asyncio.StreamReader):
+        """Yield decoded output lines as they arrive (no line-length limit)"""
+        buffer = b''
+        while True:
+            chunk = await stream.read(65536)
+            if not chunk:
+                if buffer:
+                    yield buffer.decode('utf-8', errors='replace').rstrip('\r')
+                return
+            
+            buffer += chunk
+            *complete, buffer = buffer.split(b'\n')
+            for line in complete:
+                yield line.decode('utf-8', errors='replace').rstrip('\r')
+    
+    async def _drain_output(self, app_name: str, process: asyncio.subprocess.Process, lines):
+        """Write a daemon's remaining output to its run log until it exits"""
+        log_file = self.logs_dir / f"{app_name}_run.log"
+        try:
+            with open(log_file, 'a', encoding='utf-8') as f:
+                async for line in lines:
+                    f.write(line + '\n')
+                    f.flush()
+            await process.wait()
+        except Exception as e:
+            logger.debug(f"Output drain for {app_name} ended: {e}")
+        finally:
+            if self.output_tasks.get(app_name) is asyncio.current_task():
+                del self.output_tasks[app_name]
+    
+    def _get_process_semaphore(self) -> asyncio.Semaphore:
+        """Get the subprocess concurrency bound for the running event loop"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._process_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent_processes)
+            self._process_semaphores[loop] = semaphore
+        return semaphore
+    
+    def _process_group_kwargs(self) -> Dict[str, Any]:
+        """Start each command in its own process group so kills reach its children"""
+        if self.context.platform == 'win32':
+            return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+        return {'start_new_session': True}
+    
+    def _signal_process_group(self, pid: int, sig: int):
+        """Signal a command's whole process group"""
+        try:
+            if self.context.platform == 'win32':
+                parent = psutil.Process(pid)
+                for child in parent.children(recursive=True):
+                    child.kill()
+                parent.kill()
+            else:
+                os.killpg(pid, sig)
+        except (ProcessLookupError, PermissionError, psutil.NoSuchProcess):
+            pass
+    
+    def _get_script_args(self) -> Dict[str, Any]:
+        """Get the args of the script running in the current task"""
+        args = _script_args.get()
+        return self.context.args if args is None else args
+    
+    def _set_script_args(self, args: Dict[str, Any]):
+        """Set the args for scripts run from the current task"""
+        _script_args.set(args)
+        self.context.args = args
+    
+    def _get_script_input(self) -> Dict[str, Any]:
+        """Get the input (e.g. input.event) of the script running in the current task"""
+        script_input = _script_input.get()
+        if script_input is None:
+            script_input = {}
+            _script_input.set(script_input)
+            self.context.input = script_input
+        return script_input
+    
     async def script_start(self, params: Dict[str, Any], app_path: Path = None) -> Dict[str, Any]:
         """Execute script.start to run another script"""
         uri = params.get('uri')
@@ -430,7 +524,7 @@ class UnifiedPinokioEngine:
             script_path = Path(uri)
         
         # Update context args for the called script
-        self.context.args = script_params
+        self._set_script_args(script_params)
         
         return await self.execute_script(script_path, app_path)
     
@@ -468,16 +562,21 @@ class UnifiedPinokioEngine:
         else:
             return {'success': False, 'error': 'Unsupported script format'}
         
-        # Handle async function scripts (e.g., start.js)
-        if callable(script_data):
-            # Execute async function with kernel context
-            script_data = await script_data(self)
-        
-        # Execute run steps
-        if 'run' in script_data:
-            return await self._execute_run_steps(script_data['run'], script_path, app_path)
-        
-        return {'success': True}
+        app_token = _script_app.set(app_path.name) if app_path else None
+        try:
+            # Handle async function scripts (e.g., start.js)
+            if callable(script_data):
+                # Execute async function with kernel context
+                script_data = await script_data(self)
+            
+            # Execute run steps
+            if 'run' in script_data:
+                return await self._execute_run_steps(script_data['run'], script_path, app_path)
+            
+            return {'success': True}
+        finally:
+            if app_token is not None:
+                _script_app.reset(app_token)
     
     def _parse_js_script(self, content: str, script_path: Path) -> Dict[str, Any]:
         """Parse JavaScript module.exports to Python dict"""
@@ -668,7 +767,7 @@ class UnifiedPinokioEngine:
         
         try:
             import urllib.request
-            urllib.request.urlretrieve(uri, str(dest_path))
+            await asyncio.to_thread(urllib.request.urlretrieve, uri, str(dest_path))
             return {'success': True, 'path': str(dest_path)}
         except Exception as e:
             return {'success': False, 'error': str(e)}
@@ -676,11 +775,13 @@ class UnifiedPinokioEngine:
     async def _create_venv(self, venv_path: Path):
         """Create virtual environment with uv for speed"""
         logger.info(f"Creating venv: {venv_path}")
-        venv.create(str(venv_path), with_pip=True)
+        returncode, output = await self._run_exec(sys.executable, "-m", "venv", str(venv_path))
+        if returncode != 0:
+            raise RuntimeError(f"Failed to create venv {venv_path}: {output.strip()}")
         
         # Install uv for faster package management
         pip_path = venv_path / ("Scripts" if self.context.platform == "win32" else "bin") / "pip"
-        subprocess.run([str(pip_path), "install", "uv"], capture_output=True)
+        await self._run_exec(str(pip_path), "install", "uv")
     
     def _get_venv_path(self, venv_name: str, app_path: Path = None) -> Path:
         """Get virtual environment path for an app"""
@@ -713,7 +814,7 @@ class UnifiedPinokioEngine:
             # If app directory doesn't exist and we have repo_url, clone it
             if not app_path.exists() and repo_url:
                 logger.info(f"Cloning {repo_url} to {app_path}")
-                git.Repo.clone_from(repo_url, str(app_path))
+                await asyncio.to_thread(git.Repo.clone_from, repo_url, str(app_path))
             elif not app_path.exists():
                 return False, f"App directory not found: {app_path}"
             
@@ -731,11 +832,11 @@ class UnifiedPinokioEngine:
             
             if install_script:
                 # Set context for the install script
-                self.context.args = {
+                self._set_script_args({
                     'repo_url': repo_url,
                     'app_name': app_name,
                     'app_path': str(app_path)
-                }
+                })
                 
                 logger.info(f"Executing install script: {install_script}")
                 result = await self.execute_script(install_script, app_path)
@@ -770,6 +871,11 @@ class UnifiedPinokioEngine:
             logger.error(f"Full traceback: {traceback.format_exc()}")
             return False, f"❌ Installation failed: {str(e)}"
     
+    async def install_apps(self, apps_data: List[Dict[str, Any]], progress_callback=None) -> List[Tuple[bool, str]]:
+        """Install several apps concurrently on the current event loop"""
+        # Each install runs in its own task, so script args and input stay separate
+        return await asyncio.gather(*(self.install_app(app_data, progress_callback) for app_data in apps_data))
+    
     async def run_app(self, app_name, progress_callback=None):
         """Run an installed Pinokio app with detailed logging"""
         logger.info(f"=== ENGINE: Starting run_app for {app_name} ===")
@@ -822,7 +928,7 @@ class UnifiedPinokioEngine:
             
             # Add to running apps
             self.running_apps[app_name] = {
-                'start_time': datetime.now(),
+                'start_time': datetime.datetime.now(),
                 'status': 'starting',
                 'script_path': str(start_script)
             }
@@ -843,7 +949,7 @@ class UnifiedPinokioEngine:
                 return False, f"Error reading start script: {str(e)}"
             
             logger.info(f"Calling execute_script with app_path={app_path}, app_name={app_name}")
-            result = await self.execute_script(script_content, {'app_path': str(app_path), 'app_name': app_name})
+            result = await self.execute_script(start_script, app_path)
             logger.info(f"execute_script returned: {result}")
             
             if result.get('success'):
@@ -864,9 +970,13 @@ class UnifiedPinokioEngine:
             else:
                 error_msg = f"Failed to execute start script: {result.get('error', 'Unknown error')}"
                 logger.error(error_msg)
+                if app_name not in self.running_processes:
+                    self._release_app_ports(app_name)
                 return False, error_msg
                 
         except Exception as e:
+            if app_name not in self.running_processes:
+                self._release_app_ports(app_name)
             logger.error(f"Exception in run_app for {app_name}: {e}")
             import traceback
             logger.error(f"Full traceback: {traceback.format_exc()}")
@@ -874,34 +984,60 @@ class UnifiedPinokioEngine:
         finally:
             logger.info(f"=== ENGINE: Completed run_app for {app_name} ===")
     
-    def stop_app(self, app_name: str) -> Tuple[bool, str]:
+    async def stop_app(self, app_name: str) -> Tuple[bool, str]:
         """Stop a running app"""
-        if app_name not in self.running_processes:
+        process = self.running_processes.get(app_name)
+        if process is None:
             return False, f"App {app_name} not running"
         
         try:
-            process = self.running_processes[app_name]
-            process.terminate()
-            process.wait(timeout=10)
-            del self.running_processes[app_name]
-            
-            # Clear port mapping
-            if app_name in self.app_ports:
-                del self.app_ports[app_name]
-            
-            return True, f"✅ {app_name} stopped"
-        except subprocess.TimeoutExpired:
-            process.kill()
-            del self.running_processes[app_name]
-            return True, f"✅ {app_name} forcefully stopped"
+            self._signal_process_group(process.pid, signal.SIGTERM)
+            # Wait in a worker thread: the process may have been started on another
+            # event loop, so its own wait() can't be awaited here
+            stopped = await asyncio.to_thread(self._wait_for_exit, process.pid, 10)
+            return self._finish_stop(app_name, process, stopped)
         except Exception as e:
             return False, f"❌ Failed to stop: {str(e)}"
     
+    def _finish_stop(self, app_name: str, process, stopped: bool) -> Tuple[bool, str]:
+        """Kill an app that ignored SIGTERM and forget its process and ports"""
+        if not stopped:
+            self._signal_process_group(process.pid, signal.SIGKILL)
+        
+        self.running_processes.pop(app_name, None)
+        self.running_apps.pop(app_name, None)
+        
+        # Clear port mapping
+        self._release_app_ports(app_name)
+        
+        if stopped:
+            return True, f"✅ {app_name} stopped"
+        return True, f"✅ {app_name} forcefully stopped"
+    
+    def _wait_for_exit(self, pid: int, timeout: float) -> bool:
+        """Wait for a process to exit; returns False on timeout"""
+        try:
+            psutil.Process(pid).wait(timeout=timeout)
+        except psutil.NoSuchProcess:
+            pass
+        except psutil.TimeoutExpired:
+            return False
+        return True
+    
+    def _is_process_running(self, process) -> bool:
+        """Check whether a launched process is still alive"""
+        if process.returncode is not None:
+            return False
+        try:
+            return psutil.Process(process.pid).status() != psutil.STATUS_ZOMBIE
+        except psutil.NoSuchProcess:
+            return False
+    
     def get_app_status(self, app_name: str) -> str:
         """Get status of an app"""
         if app_name in self.running_processes:
             process = self.running_processes[app_name]
-            if process.poll() is None:
+            if self._is_process_running(process):
                 return "🟢 Running"
             else:
                 # Process terminated
@@ -932,7 +1068,7 @@ class UnifiedPinokioEngine:
         
         # Stop if running
         if app_name in self.running_processes:
-            self.stop_app(app_name)
+            await self.stop_app(app_name)
         
         try:
             # Remove the entire app directory (downloaded during installation)
@@ -968,9 +1104,13 @@ class UnifiedPinokioEngine:
             return False, f"❌ Failed to uninstall: {str(e)}"
     
     def cleanup(self):
-        """Cleanup all running processes"""
-        for app_name in list(self.running_processes.keys()):
-            self.stop_app(app_name)
+        """Cleanup all running processes (blocks; call it outside the event loop)"""
+        for app_name, process in list(self.running_processes.items()):
+            try:
+                self._signal_process_group(process.pid, signal.SIGTERM)
+                self._finish_stop(app_name, process, self._wait_for_exit(process.pid, timeout=10))
+            except Exception as e:
+                logger.error(f"Failed to stop {app_name}: {e}")
 
 
 # Export the main class
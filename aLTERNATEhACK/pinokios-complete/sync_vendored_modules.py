@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Keep the modules pinokios shares with PinokioCloud in sync.
+
+The expression compiler and port allocator are maintained in
+SD-LongNose/github_repo and vendored into pinokios/ unchanged, apart from a
+one-line header naming the original. Run this script after changing an
+original, or with --check to fail when a vendored copy has drifted.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+SOURCE_REPO = ROOT.parent.parent / 'SD-LongNose' / 'github_repo'
+
+# Vendored file (relative to this directory) -> original (relative to SOURCE_REPO)
+VENDORED_MODULES = {
+    'pinokios/expression_compiler.py': 'environment_management/expression_compiler.py',
+    'pinokios/port_allocator.py': 'running/port_allocator.py',
+}
+
+
+def vendored_text(original: str) -> str:
+    """Render the vendored copy of an original module."""
+    source = (SOURCE_REPO / original).read_text(encoding='utf-8')
+    header = f"# Vendored from SD-LongNose/github_repo/{original} by sync_vendored_modules.py; edit the original.\n"
+    if source.startswith('#!'):
+        shebang, _, rest = source.partition('\n')
+        return f"{shebang}\n{header}{rest}"
+    return header + source
+
+
+def find_drift() -> list:
+    """Get the vendored files that differ from their originals."""
+    return [target for target, original in VENDORED_MODULES.items()
+            if (ROOT / target).read_text(encoding='utf-8') != vendored_text(original)]
+
+
+def sync() -> list:
+    """Rewrite every drifted vendored file from its original."""
+    drifted = find_drift()
+    for target in drifted:
+        (ROOT / target).write_text(vendored_text(VENDORED_MODULES[target]), encoding='utf-8')
+    return drifted
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--check', action='store_true', help='only report drifted copies')
+    args = parser.parse_args()
+
+    if not SOURCE_REPO.is_dir():
+        print(f"⚠️ {SOURCE_REPO} not found; nothing to sync against")
+        return 0
+
+    if args.check:
+        drifted = find_drift()
+        for target in drifted:
+            print(f"❌ {target} differs from {VENDORED_MODULES[target]}")
+        if not drifted:
+            print("✅ Vendored modules are in sync")
+        return 1 if drifted else 0
+
+    for target in sync():
+        print(f"🔄 Updated {target}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""Check that the modules vendored into pinokios/ match their PinokioCloud originals."""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import sync_vendored_modules
+
+
+@unittest.skipUnless(sync_vendored_modules.SOURCE_REPO.is_dir(), "PinokioCloud sources not available")
+class TestVendoredModules(unittest.TestCase):
+    """The vendored copies are current."""
+
+    def test_vendored_modules_in_sync(self):
+        """Every vendored module equals its original plus the vendoring header."""
+        self.assertEqual(sync_vendored_modules.find_drift(), [],
+                         "run sync_vendored_modules.py to update the vendored copies")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,13 +9,23 @@ import json
 import time
 import logging
 import platform
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Dict, List, Any, Tuple
 from pathlib import Path
 from functools import wraps
+from requests.adapters import HTTPAdapter
 from dataclasses import dataclass
 from datetime import datetime
 import socket
 
+try:
+    # Span tracing from the PinokioCloud engine, when it is importable
+    from environment_management.tracing import get_tracer
+except ImportError:
+    get_tracer = None
+
 
 @dataclass
 class AppInfo:
@@ -30,6 +40,23 @@ class AppInfo:
     last_launched: Optional[datetime] = None
 
 
+# App statuses reported while an installation is still in progress
+INSTALL_PENDING_STATES = {"installing", "downloading", "pending", "queued"}
+
+# App statuses reported when an installation failed
+INSTALL_FAILED_STATES = {"error", "failed"}
+
+
+class RPCError(Exception):
+    """JSON-RPC error returned by the Pinokio server"""
+
+    def __init__(self, method: str, code: int, message: str):
+        super().__init__(f"RPC Error ({code}) in {method}: {message}")
+        self.method = method
+        self.code = code
+        self.message = message
+
+
 def retry_on_failure(max_retries: int = 3, delay: float = 1.0, backoff: float = 2.0):
     """Decorator for retrying failed operations"""
     def decorator(func):
@@ -64,16 +91,26 @@ def retry_on_failure(max_retries: int = 3, delay: float = 1.0, backoff: float =
 class PinokioController:
     """Controls Pinokio via JSON-RPC API with enhanced error handling"""
     
-    def __init__(self, pinokio_path: str, api_port: int = 42000, timeout: int = 30):
+    def __init__(self, pinokio_path: str, api_port: int = 42000, timeout: int = 30,
+                 max_workers: int = 4):
         self.pinokio_path = pinokio_path
         self.api_port = api_port
         self.api_url = f"http://localhost:{api_port}/api"
         self.pinokio_process = None
         self.timeout = timeout
-        self.session = requests.Session()  # Connection pooling
-        self.session.headers.update({"Content-Type": "application/json"})
+        self.max_workers = max_workers  # Concurrent installs
+        self.session = self._new_session()  # Keep-alive connection pool
         self.installed_apps = {}  # Cache of installed apps
         
+        # JSON-RPC request IDs must be unique within a batch
+        self._request_ids = itertools.count(1)
+        self._request_id_lock = threading.Lock()
+        self.batch_supported = True  # Cleared if the server rejects batches
+        
+        # Skip the liveness probe for calls made shortly after a successful one
+        self.liveness_ttl = 5.0
+        self._last_alive = 0.0
+        
         # Setup logging
         self.logger = logging.getLogger(__name__)
         if not self.logger.handlers:
@@ -196,8 +233,8 @@ class PinokioController:
             
             # Clear session
             self.session.close()
-            self.session = requests.Session()
-            self.session.headers.update({"Content-Type": "application/json"})
+            self.session = self._new_session()
+            self._last_alive = 0.0
             
             if stopped:
                 self.logger.info("🛑 Pinokio server stopped")
@@ -207,6 +244,27 @@ class PinokioController:
             self.logger.error(f"⚠️ Error stopping server: {e}")
             return False
     
+    def _new_session(self) -> requests.Session:
+        """Create a keep-alive session sized for concurrent installs"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(10, self.max_workers * 2))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"Content-Type": "application/json"})
+        return session
+    
+    def _next_request_id(self) -> int:
+        """Get a request ID unique for this controller"""
+        with self._request_id_lock:
+            return next(self._request_ids)
+    
+    def _ensure_running(self):
+        """Raise ConnectionError unless the server answered recently or answers now"""
+        if time.time() - self._last_alive < self.liveness_ttl:
+            return
+        if not self.is_running():
+            raise ConnectionError("Pinokio server is not running")
+    
     def is_running(self) -> bool:
         """Check if Pinokio server is running and responsive"""
         try:
@@ -217,7 +275,10 @@ class PinokioController:
             if response.status_code == 200:
                 # Verify it's actually Pinokio
                 data = response.json()
-                return data.get("pinokio", False) or "version" in data
+                alive = bool(data.get("pinokio", False) or "version" in data)
+                if alive:
+                    self._last_alive = time.time()
+                return alive
             return False
         except requests.exceptions.RequestException:
             return False
@@ -228,12 +289,11 @@ class PinokioController:
     @retry_on_failure(max_retries=3, delay=1.0)
     def rpc_call(self, method: str, params: Dict = None, timeout: int = None) -> Optional[Dict]:
         """Make JSON-RPC API call with retry and error handling"""
-        if not self.is_running():
-            raise ConnectionError("Pinokio server is not running")
+        self._ensure_running()
         
         try:
             # Generate unique request ID
-            request_id = int(time.time() * 1000) % 1000000
+            request_id = self._next_request_id()
             
             payload = {
                 "jsonrpc": "2.0",
@@ -260,28 +320,13 @@ class PinokioController:
             
             # Parse response
             data = response.json()
-            
-            # Check for JSON-RPC error
-            if "error" in data:
-                error = data["error"]
-                error_msg = error.get("message", "Unknown error")
-                error_code = error.get("code", -1)
-                
-                # Handle specific error codes
-                if error_code == -32601:
-                    raise Exception(f"Method not found: {method}")
-                elif error_code == -32602:
-                    raise ValueError(f"Invalid params for {method}: {params}")
-                elif error_code == -32603:
-                    raise Exception(f"Internal error: {error_msg}")
-                else:
-                    raise Exception(f"RPC Error ({error_code}): {error_msg}")
+            self._last_alive = time.time()
             
             # Verify response ID matches
             if data.get("id") != request_id:
                 self.logger.warning(f"Response ID mismatch: expected {request_id}, got {data.get('id')}")
             
-            result = data.get("result")
+            result = self._parse_rpc_response(data, method, params)
             self.logger.debug(f"RPC response: {result}")
             return result
             
@@ -293,6 +338,91 @@ class PinokioController:
             self.logger.error(f"RPC call {method} failed: {e}")
             raise
     
+    def _parse_rpc_response(self, data: Dict, method: str, params: Dict = None) -> Any:
+        """Return the result of a JSON-RPC response, raising on JSON-RPC errors"""
+        if "error" in data:
+            error = data["error"] or {}
+            error_msg = error.get("message", "Unknown error")
+            error_code = error.get("code", -1)
+            
+            # Handle specific error codes
+            if error_code == -32601:
+                raise RPCError(method, error_code, f"Method not found: {method}")
+            elif error_code == -32602:
+                raise ValueError(f"Invalid params for {method}: {params}")
+            elif error_code == -32603:
+                raise RPCError(method, error_code, f"Internal error: {error_msg}")
+            else:
+                raise RPCError(method, error_code, error_msg)
+        
+        return data.get("result")
+    
+    def rpc_batch(self, calls: List[Tuple[str, Optional[Dict]]], timeout: int = None) -> List[Any]:
+        """
+        Make several JSON-RPC calls in one HTTP request.
+        
+        Results are returned in call order; a call that failed is returned as
+        its exception instead of raising. Servers that reject batch requests
+        are remembered and served one call at a time over the pooled session.
+        """
+        if not calls:
+            return []
+        
+        self._ensure_running()
+        
+        if not self.batch_supported or len(calls) == 1:
+            return self._rpc_each(calls, timeout)
+        
+        payload = []
+        for method, params in calls:
+            payload.append({
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": params or {},
+                "id": self._next_request_id()
+            })
+        
+        try:
+            response = self.session.post(self.api_url, json=payload, timeout=timeout or self.timeout)
+            data = response.json() if response.status_code == 200 else None
+        except requests.exceptions.Timeout:
+            raise TimeoutError(f"RPC batch of {len(calls)} calls timed out after {timeout or self.timeout}s")
+        except requests.exceptions.ConnectionError as e:
+            raise ConnectionError(f"Failed to connect to Pinokio server: {e}")
+        except ValueError:
+            data = None
+        
+        if not isinstance(data, list):
+            self.logger.info("Pinokio server does not accept JSON-RPC batches, sending calls individually")
+            self.batch_supported = False
+            return self._rpc_each(calls, timeout)
+        
+        self._last_alive = time.time()
+        responses = {item.get("id"): item for item in data if isinstance(item, dict)}
+        
+        results = []
+        for request, (method, params) in zip(payload, calls):
+            item = responses.get(request["id"])
+            if item is None:
+                results.append(RPCError(method, -32603, "No response in batch"))
+                continue
+            try:
+                results.append(self._parse_rpc_response(item, method, params))
+            except Exception as e:
+                results.append(e)
+        
+        return results
+    
+    def _rpc_each(self, calls: List[Tuple[str, Optional[Dict]]], timeout: int = None) -> List[Any]:
+        """Make calls one at a time, returning exceptions in place of failed results"""
+        results = []
+        for method, params in calls:
+            try:
+                results.append(self.rpc_call(method, params, timeout=timeout))
+            except Exception as e:
+                results.append(e)
+        return results
+    
     def _is_port_available(self, port: int) -> bool:
         """Check if a port is available"""
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
@@ -474,18 +604,20 @@ class PinokioController:
             raise
     
     def _wait_for_app_ready(self, url: str, timeout: int = 60) -> bool:
-        """Wait for app to be ready by checking its URL"""
+        """Wait for app to be ready by checking its URL, backing off between checks"""
         start_time = time.time()
+        delay = 0.25
         
         while time.time() - start_time < timeout:
             try:
-                response = requests.get(url, timeout=5)
+                response = self.session.get(url, timeout=5)
                 if response.status_code == 200:
                     self.logger.info(f"App is ready at {url}")
                     return True
             except:
                 pass
-            time.sleep(2)
+            time.sleep(min(delay, max(0.0, timeout - (time.time() - start_time))))
+            delay = min(delay * 2, 4.0)
         
         self.logger.warning(f"App at {url} may not be ready after {timeout}s")
         return False
@@ -519,26 +651,8 @@ class PinokioController:
         try:
             result = self.rpc_call("app.status", {"name": app_name})
             if result:
-                status = result.get("status", "unknown")
-                
-                # Update or create app info
-                if app_name in self.installed_apps:
-                    app_info = self.installed_apps[app_name]
-                    app_info.status = status
-                    app_info.url = result.get('url')
-                    app_info.port = result.get('port')
-                    app_info.pid = result.get('pid')
-                else:
-                    app_info = AppInfo(
-                        name=app_name,
-                        status=status,
-                        url=result.get('url'),
-                        port=result.get('port'),
-                        pid=result.get('pid')
-                    )
-                    self.installed_apps[app_name] = app_info
-                
-                self.logger.info(f"📊 {app_name} status: {status}")
+                app_info = self._update_app_status(app_name, result)
+                self.logger.info(f"📊 {app_name} status: {app_info.status}")
                 return app_info
             
             return None
@@ -546,6 +660,81 @@ class PinokioController:
             self.logger.error(f"Failed to get app status: {e}")
             return None
     
+    def get_app_statuses(self, app_names: List[str]) -> Dict[str, Optional[AppInfo]]:
+        """Get the status of several applications in one batched request"""
+        statuses = {}
+        try:
+            results = self.rpc_batch([("app.status", {"name": name}) for name in app_names])
+        except Exception as e:
+            self.logger.error(f"Failed to get app statuses: {e}")
+            return {name: None for name in app_names}
+        
+        for name, result in zip(app_names, results):
+            if isinstance(result, Exception) or not result:
+                statuses[name] = None
+            else:
+                statuses[name] = self._update_app_status(name, result)
+        return statuses
+    
+    def _update_app_status(self, app_name: str, result: Dict) -> AppInfo:
+        """Update or create the cached info of an app from an app.status result"""
+        status = result.get("status", "unknown")
+        
+        if app_name in self.installed_apps:
+            app_info = self.installed_apps[app_name]
+            app_info.status = status
+            app_info.url = result.get('url')
+            app_info.port = result.get('port')
+            app_info.pid = result.get('pid')
+        else:
+            app_info = AppInfo(
+                name=app_name,
+                status=status,
+                url=result.get('url'),
+                port=result.get('port'),
+                pid=result.get('pid')
+            )
+            self.installed_apps[app_name] = app_info
+        
+        return app_info
+    
+    def wait_for_installs(self, app_names: List[str], timeout: float = 300,
+                          initial_delay: float = 0.5, max_delay: float = 8.0) -> Dict[str, bool]:
+        """
+        Wait until installations finish, polling all pending apps in one batch.
+        
+        The poll interval starts at initial_delay and doubles up to max_delay.
+        Returns whether each app finished installing successfully; apps still
+        installing at the timeout are reported as False. An app whose status
+        cannot be queried counts as installed, since app.install returned.
+        """
+        pending = list(app_names)
+        finished = {}
+        deadline = time.time() + timeout
+        delay = initial_delay
+        
+        while pending:
+            for name, app_info in self.get_app_statuses(pending).items():
+                status = (app_info.status or "").lower() if app_info else ""
+                if status in INSTALL_FAILED_STATES:
+                    finished[name] = False
+                elif status not in INSTALL_PENDING_STATES:
+                    finished[name] = True
+            
+            pending = [name for name in pending if name not in finished]
+            remaining = deadline - time.time()
+            if not pending or remaining <= 0:
+                break
+            
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+        
+        for name in pending:
+            self.logger.warning(f"⚠️ {name} still installing after {timeout}s")
+            finished[name] = False
+        
+        return finished
+    
     @retry_on_failure(max_retries=2, delay=2.0)
     def execute_script(self, script_path: str, params: Dict = None, timeout: int = 120) -> Optional[Dict]:
         """Execute a Pinokio script with validation and error handling"""
@@ -584,8 +773,16 @@ class PinokioController:
             self.logger.error(f"❌ Script execution failed: {e}")
             raise
     
-    def install_popular_tools(self, tools: List[str] = None, parallel: bool = False) -> Dict[str, AppInfo]:
-        """Install popular AI tools with progress tracking"""
+    def install_popular_tools(self, tools: List[str] = None, parallel: bool = False,
+                              max_workers: int = None) -> Dict[str, AppInfo]:
+        """
+        Install popular AI tools with progress tracking.
+        
+        Tools install one at a time by default. With parallel set, up to
+        max_workers installs run at once over the pooled session, so a bundle
+        takes about as long as its slowest tool. Finished installs are then
+        confirmed with batched status polls.
+        """
         available_tools = {
             "stable-diffusion": "https://github.com/AUTOMATIC1111/stable-diffusion-webui",
             "comfyui": "https://github.com/comfyanonymous/ComfyUI",
@@ -609,22 +806,37 @@ class PinokioController:
         
         results = {}
         failed_count = 0
+        workers = max(1, min(max_workers or self.max_workers, len(tools_to_install))) if parallel else 1
         
-        for i, name in enumerate(tools_to_install, 1):
-            try:
-                url = available_tools[name]
-                self.logger.info(f"\n🔧 Installing {name} ({i}/{len(tools_to_install)})...")
+        if tools_to_install:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pinokio-install") as executor:
+                futures = {}
+                for i, name in enumerate(tools_to_install, 1):
+                    self.logger.info(f"\n🔧 Installing {name} ({i}/{len(tools_to_install)})...")
+                    # Keep each install's spans under the span that started the bundle
+                    install = get_tracer().wrap(self.install_app) if get_tracer else self.install_app
+                    futures[executor.submit(install, available_tools[name], name)] = name
                 
-                app_info = self.install_app(url, name)
-                results[name] = app_info
-                
-                if not parallel:
-                    time.sleep(3)  # Rate limiting for sequential installs
-                    
-            except Exception as e:
-                self.logger.error(f"Failed to install {name}: {e}")
-                failed_count += 1
-                results[name] = None
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Failed to install {name}: {e}")
+                        failed_count += 1
+                        results[name] = None
+            
+            # Confirm every install has settled, polling all of them per request
+            installed = [name for name in tools_to_install if results.get(name) is not None]
+            if installed:
+                for name, ok in self.wait_for_installs(installed).items():
+                    if not ok:
+                        self.logger.error(f"Failed to install {name}: installation did not complete")
+                        failed_count += 1
+                        results[name] = None
+        
+        # Report in the requested order
+        results = {name: results.get(name) for name in tools_to_install}
         
         success_count = len([r for r in results.values() if r is not None])
         self.logger.info(f"\n📊 Installation complete: {success_count}/{len(tools_to_install)} successful")
@@ -680,7 +892,8 @@ class PinokioController:
             
             # Wait for installation to settle
             self.logger.info("Waiting for installation to complete...")
-            time.sleep(3)
+            if not self.wait_for_installs([tool_key]).get(tool_key):
+                raise Exception(f"Installation of {tool_name} did not complete")
             
             # Launch the tool
             launched_app = self.launch_app(tool_key, config, wait_for_ready)
@@ -12,11 +12,16 @@ import logging
 import threading
 import platform
 import socket
+import tempfile
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from functools import wraps
 from dataclasses import dataclass
 
+from tunnel_supervisor import (
+    TunnelSupervisor, CLOUDFLARE_URL_PATTERN, LOCALTUNNEL_URL_PATTERN, NGROK_URL_PATTERN
+)
+
 
 @dataclass
 class TunnelInfo:
@@ -73,6 +78,7 @@ class TunnelManager:
         self.logger = logger or self._setup_logger()
         self.tunnel_monitor_thread = None
         self.monitoring = False
+        self.supervisor = TunnelSupervisor(os.path.join(tempfile.gettempdir(), 'pinokio_tunnel_logs'))
 
     def _setup_logger(self) -> logging.Logger:
         """Setup default logger"""
@@ -104,6 +110,13 @@ class TunnelManager:
         except:
             return False
 
+    def _verify_in_background(self, url: str) -> None:
+        """Check a new tunnel URL without delaying the caller"""
+        def verify():
+            if self._verify_tunnel_connectivity(url):
+                self.logger.info("✅ Tunnel verified as working")
+        threading.Thread(target=verify, daemon=True).start()
+
     @retry_on_failure(max_attempts=3, delay=2)
     def install_ngrok(self) -> bool:
         """Install ngrok binary with platform detection"""
@@ -283,44 +296,33 @@ class TunnelManager:
                     raise Exception("ngrok binary not found")
 
                 # Build command
-                cmd = [ngrok_path, "http", str(port), "--log-level", "info"]
+                cmd = [ngrok_path, "http", str(port), "--log", "stdout", "--log-level", "info"]
                 if region:
                     cmd.extend(["--region", region])
                 if subdomain and auth_token:
                     cmd.extend(["--subdomain", subdomain])
 
-                # Start ngrok
-                self.ngrok_process = subprocess.Popen(
-                    cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+                # Start ngrok; the URL is read from its log as soon as it is printed
+                handle = self.supervisor.start("ngrok", cmd, NGROK_URL_PATTERN)
+                self.ngrok_process = handle.process
+
+                url = handle.wait_for_match(timeout=10)
+                if not url:
+                    self.supervisor.stop("ngrok")
+                    self.ngrok_process = None
+                    raise Exception(f"Could not get ngrok URL: {' | '.join(handle.get_output_tail()[-5:])}")
+
+                # Store tunnel info
+                tunnel_info = TunnelInfo(
+                    service="ngrok",
+                    url=url,
+                    port=port,
+                    process=self.ngrok_process
                 )
+                self.active_tunnels['ngrok'] = tunnel_info
 
-                # Wait for tunnel to establish
-                max_wait = 10
-                for i in range(max_wait):
-                    time.sleep(1)
-                    try:
-                        response = requests.get("http://localhost:4040/api/tunnels", timeout=2)
-                        data = response.json()
-
-                        for tunnel in data.get('tunnels', []):
-                            if tunnel.get('proto') == 'https':
-                                url = tunnel['public_url']
-
-                                # Store tunnel info
-                                tunnel_info = TunnelInfo(
-                                    service="ngrok",
-                                    url=url,
-                                    port=port,
-                                    process=self.ngrok_process
-                                )
-                                self.active_tunnels['ngrok'] = tunnel_info
-
-                                self.logger.info(f"🌐 ngrok tunnel started: {url}")
-                                return url
-                    except:
-                        if i == max_wait - 1:
-                            raise
-                raise Exception("Could not get ngrok URL after waiting")
+                self.logger.info(f"🌐 ngrok tunnel started: {url}")
+                return url
 
         except Exception as e:
             self.logger.error(f"❌ ngrok tunnel failed: {e}")
@@ -410,63 +412,37 @@ class TunnelManager:
             if hostname:
                 cmd.extend(["--hostname", hostname])
             
-            # Start cloudflared
-            self.cloudflared_process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1  # Line buffered
-            )
-            
-            # Parse output for URL with timeout
-            import re
-            url_pattern = re.compile(r'https://[^\s]+\.trycloudflare\.com')
+            # Start cloudflared; its output is drained and matched as it arrives
+            handle = self.supervisor.start("cloudflare", cmd, CLOUDFLARE_URL_PATTERN)
+            self.cloudflared_process = handle.process
             
-            start_time = time.time()
             timeout = 30  # 30 seconds timeout
+            url = handle.wait_for_match(timeout)
+            if not url:
+                if handle.alive:
+                    raise Exception(f"Timeout waiting for Cloudflare tunnel URL after {timeout} seconds")
+                output = ' | '.join(handle.get_output_tail()[-5:])
+                raise Exception(f"cloudflared process ended unexpectedly: {output}")
             
-            while time.time() - start_time < timeout:
-                if self.cloudflared_process.poll() is not None:
-                    # Process ended
-                    stderr = self.cloudflared_process.stderr.read()
-                    raise Exception(f"cloudflared process ended unexpectedly: {stderr}")
-                
-                line = self.cloudflared_process.stderr.readline()
-                if line:
-                    self.logger.debug(f"cloudflared: {line.strip()}")
-                    
-                    if "https://" in line and ".trycloudflare.com" in line:
-                        match = url_pattern.search(line)
-                        if match:
-                            url = match.group(0)
-                            
-                            # Verify tunnel is working
-                            time.sleep(2)
-                            if self._verify_tunnel_connectivity(url):
-                                self.logger.info("✅ Tunnel verified as working")
-                            
-                            # Store tunnel info
-                            tunnel_info = TunnelInfo(
-                                service="cloudflare",
-                                url=url,
-                                port=port,
-                                process=self.cloudflared_process
-                            )
-                            self.active_tunnels['cloudflare'] = tunnel_info
-                            
-                            self.logger.info(f"🌐 Cloudflare tunnel started: {url}")
-                            return url
-                
-                time.sleep(0.1)  # Small sleep to avoid busy waiting
+            self._verify_in_background(url)
+            
+            # Store tunnel info
+            tunnel_info = TunnelInfo(
+                service="cloudflare",
+                url=url,
+                port=port,
+                process=self.cloudflared_process
+            )
+            self.active_tunnels['cloudflare'] = tunnel_info
             
-            raise Exception(f"Timeout waiting for Cloudflare tunnel URL after {timeout} seconds")
+            self.logger.info(f"🌐 Cloudflare tunnel started: {url}")
+            return url
             
         except Exception as e:
             self.logger.error(f"❌ Cloudflare tunnel failed: {e}")
             # Clean up process if it's still running
             if self.cloudflared_process and self.cloudflared_process.poll() is None:
-                self.cloudflared_process.terminate()
+                self.supervisor.stop("cloudflare")
                 self.cloudflared_process = None
             raise
     
@@ -511,60 +487,36 @@ class TunnelManager:
             
             self.logger.debug(f"Running command: {' '.join(cmd)}")
             
-            # Start localtunnel
-            self.localtunnel_process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1
-            )
-            
-            # Parse output for URL with timeout
-            import re
-            url_pattern = re.compile(r'https://[^\s]+\.(loca\.lt|localtunnel\.me)')
+            # Start localtunnel; its output is drained and matched as it arrives
+            handle = self.supervisor.start("localtunnel", cmd, LOCALTUNNEL_URL_PATTERN)
+            self.localtunnel_process = handle.process
             
-            start_time = time.time()
             timeout = 20
+            url = handle.wait_for_match(timeout)
+            if not url:
+                if handle.alive:
+                    raise Exception(f"Timeout waiting for LocalTunnel URL after {timeout} seconds")
+                output = ' | '.join(handle.get_output_tail()[-5:])
+                raise Exception(f"LocalTunnel process ended: {output}")
             
-            while time.time() - start_time < timeout:
-                if self.localtunnel_process.poll() is not None:
-                    # Process ended
-                    stderr = self.localtunnel_process.stderr.read()
-                    stdout = self.localtunnel_process.stdout.read()
-                    raise Exception(f"LocalTunnel process ended: stdout={stdout}, stderr={stderr}")
-                
-                line = self.localtunnel_process.stdout.readline()
-                if line:
-                    self.logger.debug(f"LocalTunnel: {line.strip()}")
-                    
-                    if "https://" in line:
-                        match = url_pattern.search(line)
-                        if match:
-                            url = match.group(0)
-                            
-                            # Store tunnel info
-                            tunnel_info = TunnelInfo(
-                                service="localtunnel",
-                                url=url,
-                                port=port,
-                                process=self.localtunnel_process
-                            )
-                            self.active_tunnels['localtunnel'] = tunnel_info
-                            
-                            self.logger.info(f"🌐 LocalTunnel started: {url}")
-                            self.logger.info("Note: LocalTunnel may require password authentication")
-                            return url
-                
-                time.sleep(0.1)
+            # Store tunnel info
+            tunnel_info = TunnelInfo(
+                service="localtunnel",
+                url=url,
+                port=port,
+                process=self.localtunnel_process
+            )
+            self.active_tunnels['localtunnel'] = tunnel_info
             
-            raise Exception(f"Timeout waiting for LocalTunnel URL after {timeout} seconds")
+            self.logger.info(f"🌐 LocalTunnel started: {url}")
+            self.logger.info("Note: LocalTunnel may require password authentication")
+            return url
             
         except Exception as e:
             self.logger.error(f"❌ LocalTunnel failed: {e}")
             # Clean up process
             if self.localtunnel_process and self.localtunnel_process.poll() is None:
-                self.localtunnel_process.terminate()
+                self.supervisor.stop("localtunnel")
                 self.localtunnel_process = None
             raise
     
@@ -654,6 +606,7 @@ class TunnelManager:
                                 tunnel_info.process.kill()
                                 tunnel_info.process.wait(timeout=2)
                             self.logger.debug(f"Terminated process for {svc}")
+                        self.supervisor.stop(svc)
                     
                     # Update status
                     tunnel_info.status = "stopped"
@@ -0,0 +1,328 @@
+"""
+Tunnel Supervisor Module - Runs tunnel connectors and resolves their URLs from piped output
+
+Each connector's output is drained by a reader thread, appended to its log
+file and matched incrementally, resolving a future as soon as the public URL
+(or readiness line) appears, so callers never poll logs on a timer.
+"""
+
+import os
+import re
+import logging
+import uuid
+import threading
+import subprocess
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Any, Callable, Pattern, Deque
+from pathlib import Path
+
+logger = logging.getLogger('TunnelManager')
+
+
+# Public URL printed by cloudflared quick tunnels
+CLOUDFLARE_URL_PATTERN = re.compile(rb'https://[a-zA-Z0-9-]+\.(?:trycloudflare|cfargotunnel)\.com')
+
+# Public URL printed by localtunnel
+LOCALTUNNEL_URL_PATTERN = re.compile(rb'https://[^\s]+\.(?:loca\.lt|localtunnel\.me)')
+
+# Public URL logged by an ngrok agent started with --log stdout
+NGROK_URL_PATTERN = re.compile(rb'https://[a-zA-Z0-9-]+\.ngrok(?:-free)?\.(?:io|app|dev)')
+
+# ngrok log line written once its local API is serving
+NGROK_READY_PATTERN = re.compile(rb'starting web service[^\n]*')
+
+# Bytes kept from the previous chunk so matches spanning two reads are found
+_MATCH_OVERLAP = 512
+
+
+class SupervisedProcess:
+    """
+    A connector process whose output is drained and matched by a reader thread.
+
+    The match future resolves with the first pattern match (decoded), or
+    fails if the process exits first.
+    """
+
+    def __init__(self, name: str, process: subprocess.Popen, pattern: Pattern,
+                 log_path: Optional[Path] = None, tail_lines: int = 50):
+        """
+        Start supervising a process.
+
+        Args:
+            name: Connector name
+            process: Process started with stdout=PIPE
+            pattern: Precompiled bytes pattern to wait for
+            log_path: File the output is appended to
+            tail_lines: Number of recent output lines kept in memory
+        """
+        self.name = name
+        self.process = process
+        self.pattern = pattern
+        self.log_path = log_path
+        self.match: Future = Future()
+        self.tail: Deque[str] = deque(maxlen=tail_lines)
+
+        self.reader_thread = threading.Thread(
+            target=self._read_output,
+            name=f"TunnelSupervisor-{name}",
+            daemon=True
+        )
+        self.reader_thread.start()
+
+    @property
+    def pid(self) -> int:
+        """Connector process ID."""
+        return self.process.pid
+
+    @property
+    def alive(self) -> bool:
+        """Whether the connector process is running."""
+        return self.process.poll() is None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the pattern was matched and the process is still running."""
+        return self.match.done() and self.match.exception() is None and self.alive
+
+    @property
+    def url(self) -> Optional[str]:
+        """The matched text, once available."""
+        if self.match.done() and self.match.exception() is None:
+            return self.match.result()
+        return None
+
+    def wait_for_match(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Wait for the pattern to appear in the output.
+
+        Args:
+            timeout: Seconds to wait (None waits indefinitely)
+
+        Returns:
+            Matched text, or None on timeout or if the process exited first
+        """
+        try:
+            return self.match.result(timeout=timeout)
+        except FutureTimeoutError:
+            return None
+        except Exception as e:
+            logger.debug(f"{self.name}: {e}")
+            return None
+
+    def add_done_callback(self, callback: Callable[[Future], None]) -> None:
+        """Run a callback when the match future resolves."""
+        self.match.add_done_callback(callback)
+
+    def get_output_tail(self) -> List[str]:
+        """Get the most recent output lines."""
+        return list(self.tail)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Terminate the connector process."""
+        if self.alive:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.reader_thread.join(timeout=timeout)
+
+    def _read_output(self) -> None:
+        """Drain the output pipe, persist it and resolve the match future."""
+        fd = self.process.stdout.fileno()
+        log_file = open(self.log_path, 'ab') if self.log_path else None
+        carry = b''
+        partial_line = b''
+
+        try:
+            while True:
+                try:
+                    chunk = os.read(fd, 65536)
+                except OSError:
+                    break
+                if not chunk:
+                    break
+
+                if log_file is not None:
+                    log_file.write(chunk)
+                    log_file.flush()
+
+                lines = (partial_line + chunk).split(b'\n')
+                partial_line = lines.pop()[-4096:]
+                for line in lines:
+                    self.tail.append(line.decode('utf-8', 'replace').rstrip('\r'))
+
+                if not self.match.done():
+                    window = carry + chunk
+                    found = self.pattern.search(window)
+                    if found:
+                        self.match.set_result(found.group(0).decode('utf-8', 'replace'))
+                    else:
+                        carry = window[-_MATCH_OVERLAP:]
+        finally:
+            if log_file is not None:
+                log_file.close()
+            try:
+                self.process.stdout.close()
+            except OSError:
+                pass
+
+            if not self.match.done():
+                self.process.wait()
+                last_output = ' | '.join(list(self.tail)[-5:])
+                self.match.set_exception(RuntimeError(
+                    f"{self.name} exited with code {self.process.returncode} before becoming ready: {last_output}"
+                ))
+
+
+class TunnelSupervisor:
+    """
+    Starts and tracks supervised connector processes.
+
+    Connectors that do not depend on the exposed app (e.g. cloudflared
+    pointed at the local routing proxy) can be pre-started into a standby
+    pool and claimed when a tunnel is requested.
+    """
+
+    def __init__(self, log_dir: str):
+        """
+        Initialize the tunnel supervisor.
+
+        Args:
+            log_dir: Directory connector logs are written to
+        """
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+
+        self.processes: Dict[str, SupervisedProcess] = {}
+        self.standby: Deque[SupervisedProcess] = deque()
+        self.lock = threading.RLock()
+
+    def start(self, name: str, cmd: List[str], pattern: Pattern,
+              env: Optional[Dict[str, str]] = None, cwd: Optional[str] = None) -> SupervisedProcess:
+        """
+        Start a supervised connector.
+
+        Args:
+            name: Connector name (also used for the log file name)
+            cmd: Command to run
+            pattern: Precompiled bytes pattern marking readiness
+            env: Environment for the process
+            cwd: Working directory for the process
+
+        Returns:
+            SupervisedProcess: Handle whose match future resolves on readiness
+        """
+        log_path = self.log_dir / f"{name}.log"
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            env=env,
+            cwd=cwd,
+            start_new_session=True
+        )
+
+        handle = SupervisedProcess(name, process, pattern, log_path)
+        with self.lock:
+            self.processes[name] = handle
+        return handle
+
+    def get(self, name: str) -> Optional[SupervisedProcess]:
+        """Get a supervised connector by name."""
+        return self.processes.get(name)
+
+    def stop(self, name: str, timeout: float = 10.0) -> bool:
+        """
+        Stop a supervised connector.
+
+        Args:
+            name: Connector name
+            timeout: Seconds to wait for it to exit
+
+        Returns:
+            bool: True if the connector existed
+        """
+        with self.lock:
+            handle = self.processes.pop(name, None)
+            if handle is not None and handle in self.standby:
+                self.standby.remove(handle)
+        if handle is None:
+            return False
+        handle.stop(timeout)
+        return True
+
+    def fill_standby(self, size: int, cmd_factory: Callable[[], List[str]], pattern: Pattern) -> int:
+        """
+        Start standby connectors until the pool holds ``size`` live ones.
+
+        Args:
+            size: Target pool size
+            cmd_factory: Returns the command for a new standby connector
+            pattern: Precompiled bytes pattern marking readiness
+
+        Returns:
+            int: Number of connectors started
+        """
+        started = 0
+        with self.lock:
+            self._prune_standby()
+            while len(self.standby) < size:
+                handle = self.start(f"standby_{uuid.uuid4().hex[:8]}", cmd_factory(), pattern)
+                self.standby.append(handle)
+                started += 1
+        return started
+
+    def claim_standby(self, timeout: Optional[float] = None) -> Optional[SupervisedProcess]:
+        """
+        Take a connector from the standby pool.
+
+        A ready connector is returned immediately; otherwise the one that
+        was started first is waited for.
+
+        Args:
+            timeout: Seconds to wait for a warming connector
+
+        Returns:
+            A ready SupervisedProcess, or None if the pool is empty or the wait fails
+        """
+        with self.lock:
+            self._prune_standby()
+            handle = next((h for h in self.standby if h.ready), None)
+            if handle is None and self.standby:
+                handle = self.standby[0]
+            if handle is None:
+                return None
+            self.standby.remove(handle)
+
+        if handle.wait_for_match(timeout) is None or not handle.alive:
+            self.stop(handle.name, timeout=5.0)
+            return None
+        return handle
+
+    def stop_all(self, timeout: float = 5.0) -> None:
+        """Stop every supervised connector."""
+        with self.lock:
+            names = list(self.processes.keys())
+        for name in names:
+            self.stop(name, timeout)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get supervisor status."""
+        with self.lock:
+            return {
+                'connectors': len(self.processes),
+                'standby': len(self.standby),
+                'standby_ready': sum(1 for h in self.standby if h.ready)
+            }
+
+    def _prune_standby(self) -> None:
+        """Drop standby connectors that exited or failed (lock must be held)."""
+        for handle in list(self.standby):
+            failed = handle.match.done() and handle.match.exception() is not None
+            if failed or not handle.alive:
+                self.standby.remove(handle)
+                self.processes.pop(handle.name, None)